@@ -0,0 +1,7 @@
+"""Núcleo de datos del Panel de Administración del Aeropuerto.
+
+Los módulos de este paquete viven fuera de ``app.py`` porque Streamlit
+re-ejecuta el script completo en cada interacción: todo estado que deba
+sobrevivir entre reruns (cachés, conexiones, índices) tiene que residir en
+un módulo importado, que Python mantiene una sola vez por proceso.
+"""
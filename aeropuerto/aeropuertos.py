@@ -0,0 +1,279 @@
+# ============================================================
+# CATÁLOGO DE AEROPUERTOS (tabla + índice espacial en memoria)
+# ============================================================
+# La tabla `aeropuertos` se rellena desde datos/aeropuertos.csv (o
+# desde cualquier CSV con el formato de OurAirports) y se carga una
+# vez por proceso en un Catalogo: códigos IATA internados, arrays de
+# NumPy con lat/lon y una rejilla de celdas de pocos grados para
+# responder "aeropuertos en este radio / en esta caja" sin recorrer
+# el catálogo completo. El catálogo solo se recarga cuando cambia la
+# versión de la tabla en versiones_datos (la mantienen triggers, así
+# que un cambio hecho por otro proceso también se ve).
+#
+#   python -m aeropuerto.aeropuertos airports.csv --reemplazar
+# ============================================================
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from aeropuerto.cache import cache_consultas
+from aeropuerto.conexion import get_pool
+from aeropuerto.grafo import haversine
+
+RUTA_DATOS = os.path.join(os.path.dirname(__file__), "datos", "aeropuertos.csv")
+
+COLUMNAS = ["iata", "nombre", "ciudad", "pais", "lat", "lon"]
+
+# Encabezados de OurAirports (airports.csv) -> columnas propias.
+_ALIAS = {
+    "iata_code": "iata", "name": "nombre", "municipality": "ciudad",
+    "iso_country": "pais", "latitude_deg": "lat", "longitude_deg": "lon",
+}
+
+TABLA_SQL = '''
+    CREATE TABLE IF NOT EXISTS aeropuertos (
+        iata TEXT PRIMARY KEY,
+        nombre TEXT,
+        ciudad TEXT,
+        pais TEXT,
+        lat REAL NOT NULL,
+        lon REAL NOT NULL
+    )
+'''
+
+KM_POR_GRADO = 111.195
+
+
+def leer_archivo(ruta=RUTA_DATOS):
+    """Lee y normaliza un CSV de aeropuertos; descarta filas sin IATA válido o sin coordenadas."""
+    df = pd.read_csv(ruta, dtype=str, keep_default_na=False).rename(columns=_ALIAS)
+    faltantes = set(COLUMNAS) - set(df.columns)
+    if faltantes:
+        raise ValueError(f"Faltan columnas en {ruta}: {', '.join(sorted(faltantes))}")
+    df = df[COLUMNAS].copy()
+    df["iata"] = df["iata"].str.strip().str.upper()
+    df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
+    df["lon"] = pd.to_numeric(df["lon"], errors="coerce")
+    validas = (
+        df["iata"].str.fullmatch(r"[A-Z0-9]{3}")
+        & df["lat"].between(-90, 90) & df["lon"].between(-180, 180)
+    )
+    return df[validas].drop_duplicates("iata").reset_index(drop=True)
+
+
+def cargar(conn, ruta=RUTA_DATOS, reemplazar=False):
+    """Inserta (o actualiza) el catálogo desde ``ruta``. Devuelve el número de aeropuertos leídos."""
+    df = leer_archivo(ruta)
+    if reemplazar:
+        conn.execute("DELETE FROM aeropuertos")
+    conn.executemany(
+        f"INSERT OR REPLACE INTO aeropuertos ({', '.join(COLUMNAS)}) VALUES (?, ?, ?, ?, ?, ?)",
+        df.itertuples(index=False, name=None),
+    )
+    return len(df)
+
+
+VERSIONES_SQL = '''
+    CREATE TABLE IF NOT EXISTS versiones_datos (
+        tabla TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+'''
+
+_OPERACIONES = {"ins": "INSERT", "del": "DELETE", "upd": "UPDATE"}
+
+
+def nombres_triggers():
+    return [f"trg_version_aeropuertos_{op}" for op in _OPERACIONES]
+
+
+def migracion_aeropuertos(c):
+    """
+    Migración de esquema: crea la tabla, su contador de versión en
+    versiones_datos (incrementado por triggers) y la rellena con el archivo
+    incluido si está vacía.
+    """
+    c.execute(TABLA_SQL)
+    c.execute(VERSIONES_SQL)
+    c.execute("INSERT OR IGNORE INTO versiones_datos (tabla) VALUES ('aeropuertos')")
+    for op, evento in _OPERACIONES.items():
+        c.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_version_aeropuertos_{op} AFTER {evento} ON aeropuertos "
+            f"BEGIN UPDATE versiones_datos SET version = version + 1 WHERE tabla = 'aeropuertos'; END"
+        )
+    if not c.execute("SELECT EXISTS(SELECT 1 FROM aeropuertos)").fetchone()[0]:
+        cargar(c.connection)
+
+
+# ------------------------------------------------------------
+# ÍNDICE ESPACIAL
+# ------------------------------------------------------------
+class RejillaEspacial:
+    """
+    Rejilla fija de celdas de ``tamano`` grados. Los puntos se ordenan por
+    celda, así que cada fila de celdas de una caja es un rango contiguo que
+    se localiza con searchsorted.
+    """
+
+    def __init__(self, lat, lon, tamano=2.0):
+        self.tamano = tamano
+        self.columnas = int(np.ceil(360 / tamano))
+        self.filas = int(np.ceil(180 / tamano))
+        celdas = self._fila(lat) * self.columnas + self._columna(lon)
+        self.orden = np.argsort(celdas, kind="stable")
+        self.celdas = celdas[self.orden]
+
+    def _fila(self, lat):
+        return np.clip(((np.asarray(lat) + 90) // self.tamano).astype(np.int64), 0, self.filas - 1)
+
+    def _columna(self, lon):
+        return np.clip(((np.asarray(lon) + 180) // self.tamano).astype(np.int64), 0, self.columnas - 1)
+
+    def candidatos(self, lat_min, lat_max, lon_min, lon_max):
+        """Posiciones de los puntos en las celdas que tocan la caja (superconjunto)."""
+        filas = np.arange(self._fila(lat_min), self._fila(lat_max) + 1)
+        if lon_min <= lon_max:
+            tramos = [(self._columna(lon_min), self._columna(lon_max))]
+        else:  # la caja cruza el antimeridiano
+            tramos = [(self._columna(lon_min), self.columnas - 1), (0, self._columna(lon_max))]
+        partes = []
+        for c0, c1 in tramos:
+            inicios = np.searchsorted(self.celdas, filas * self.columnas + c0, side="left")
+            fines = np.searchsorted(self.celdas, filas * self.columnas + c1, side="right")
+            partes += [self.orden[i:f] for i, f in zip(inicios, fines) if f > i]
+        return np.concatenate(partes) if partes else np.empty(0, dtype=np.intp)
+
+
+# ------------------------------------------------------------
+# CATÁLOGO EN MEMORIA
+# ------------------------------------------------------------
+class Catalogo:
+    """Aeropuertos ordenados por código, con búsqueda por código y por zona."""
+
+    def __init__(self, df, huella=None):
+        df = df.sort_values("iata").reset_index(drop=True)
+        self.huella = huella
+        self.codigos = np.array([sys.intern(c) for c in df["iata"]], dtype=object)
+        self.nombres = df["nombre"].to_numpy(dtype=object)
+        self.ciudades = df["ciudad"].to_numpy(dtype=object)
+        self.paises = df["pais"].to_numpy(dtype=object)
+        self.lat = df["lat"].to_numpy(dtype=np.float64)
+        self.lon = df["lon"].to_numpy(dtype=np.float64)
+        self._posiciones = {codigo: i for i, codigo in enumerate(self.codigos)}
+        self._indice = pd.Index(self.codigos)
+        self.rejilla = RejillaEspacial(self.lat, self.lon)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __contains__(self, codigo):
+        return codigo in self._posiciones
+
+    def posicion(self, codigo):
+        return self._posiciones.get(codigo, -1)
+
+    def indices(self, codigos):
+        """Posición de cada código (-1 si no está en el catálogo)."""
+        return self._indice.get_indexer(pd.Index(codigos, dtype=object))
+
+    def coordenadas(self, codigo):
+        i = self.posicion(codigo)
+        return None if i < 0 else (float(self.lat[i]), float(self.lon[i]))
+
+    def en_caja(self, lat_min, lat_max, lon_min, lon_max):
+        """Posiciones dentro de la caja; si ``lon_min > lon_max`` la caja cruza el antimeridiano."""
+        candidatos = self.rejilla.candidatos(lat_min, lat_max, lon_min, lon_max)
+        lat, lon = self.lat[candidatos], self.lon[candidatos]
+        dentro_lon = (lon >= lon_min) & (lon <= lon_max) if lon_min <= lon_max else (lon >= lon_min) | (lon <= lon_max)
+        return np.sort(candidatos[(lat >= lat_min) & (lat <= lat_max) & dentro_lon])
+
+    def en_radio(self, lat, lon, radio_km):
+        """Posiciones a menos de ``radio_km`` (gran círculo), de la más cercana a la más lejana."""
+        dlat = radio_km / KM_POR_GRADO
+        lat_min, lat_max = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        coseno = np.cos(np.radians(max(abs(lat_min), abs(lat_max))))
+        if lat_min <= -90 or lat_max >= 90 or dlat / max(coseno, 1e-12) >= 180:
+            lon_min, lon_max = -180.0, 180.0
+        else:
+            dlon = dlat / coseno
+            lon_min, lon_max = (lon - dlon + 180) % 360 - 180, (lon + dlon + 180) % 360 - 180
+        candidatos = self.en_caja(lat_min, lat_max, lon_min, lon_max)
+        distancias = haversine(lat, lon, self.lat[candidatos], self.lon[candidatos])
+        cerca = distancias <= radio_km
+        return candidatos[cerca][np.argsort(distancias[cerca], kind="stable")]
+
+    def tabla(self, posiciones=None):
+        """DataFrame con los aeropuertos indicados (todos por defecto)."""
+        posiciones = slice(None) if posiciones is None else np.asarray(posiciones, dtype=np.intp)
+        return pd.DataFrame({
+            "iata": self.codigos[posiciones], "nombre": self.nombres[posiciones],
+            "ciudad": self.ciudades[posiciones], "pais": self.paises[posiciones],
+            "lat": self.lat[posiciones], "lon": self.lon[posiciones],
+        })
+
+
+_catalogos = {}
+_lock = threading.Lock()
+
+
+def _version(pool):
+    """
+    Versión persistida de la tabla (versiones_datos). Si la base aún no la
+    tiene (migraciones en curso), la versión local de la caché de consultas.
+    """
+    try:
+        with pool.lectura() as conn:
+            fila = conn.execute("SELECT version FROM versiones_datos WHERE tabla = 'aeropuertos'").fetchone()
+    except sqlite3.OperationalError:
+        fila = None
+    return fila[0] if fila is not None else ("local", cache_consultas.version("aeropuertos"))
+
+
+def catalogo(pool=None):
+    """Catálogo de la base del pool; se reutiliza mientras la tabla no cambie."""
+    pool = pool or get_pool()
+    # La versión se lee antes que la tabla: un cambio entre medias solo provoca otra recarga.
+    version = _version(pool)
+    actual = _catalogos.get(pool.ruta)
+    if actual is not None and actual.huella == (pool.ruta, version):
+        return actual
+    with _lock:
+        actual = _catalogos.get(pool.ruta)
+        if actual is None or actual.huella != (pool.ruta, version):
+            with pool.lectura() as conn:
+                df = pd.read_sql_query(f"SELECT {', '.join(COLUMNAS)} FROM aeropuertos", conn)
+            actual = _catalogos[pool.ruta] = Catalogo(df, (pool.ruta, version))
+        return actual
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga el catálogo de aeropuertos desde un CSV.")
+    parser.add_argument("archivo", nargs="?", default=RUTA_DATOS,
+                        help="CSV propio o airports.csv de OurAirports (por defecto, el incluido)")
+    parser.add_argument("--db", help="Ruta de la base SQLite (por defecto AEROPUERTO_DB o aeropuerto.db)")
+    parser.add_argument("--reemplazar", action="store_true", help="Borrar el catálogo actual antes de cargar")
+    args = parser.parse_args(argv)
+
+    # Import local: esquema.py importa este módulo para sus migraciones.
+    from aeropuerto.esquema import crear_esquema
+
+    pool = get_pool(args.db)
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+        total = cargar(conn, args.archivo, reemplazar=args.reemplazar)
+    cache_consultas.invalidar("aeropuertos")
+    print(f"{total:,} aeropuertos cargados en {pool.ruta}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
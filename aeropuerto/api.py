@@ -0,0 +1,516 @@
+# ============================================================
+# API HTTP/JSON (ASGI)
+# ============================================================
+# Un proceso aparte, sin Streamlit, que expone los mismos datos que
+# el panel con las mismas funciones del paquete: las lecturas pasan
+# por la caché de consultas, los resúmenes y la paginación por clave,
+# y las altas por la cola de escritura (aeropuerto/registros.py).
+#
+#   GET  /vuelos  /pasajeros  /transito      listados paginados
+#   GET  /vuelos/{id}                        un vuelo con su ocupación
+#   GET  /kpis                               indicadores del dashboard
+#   GET  /rutas  /ocupacion                  estadísticas por ruta
+#   GET  /edades                             distribución de edades
+#   GET  /cambios?desde=marca                registro de cambios (CDC)
+#   POST /vuelos  /pasajeros  /transito      altas (JSON)
+#   GET  /salud
+#
+# Cada lectura declara las tablas de las que depende; su ETag es la
+# huella de la base, la ruta, los parámetros y las versiones de datos
+# de esas tablas (versiones_datos). Con If-None-Match vigente se
+# responde 304 sin tocar la base. El canal de cambios
+# (aeropuerto/notificaciones.py) mantiene las versiones al día entre
+# procesos; sin él se sincronizan en cada petición. Las respuestas
+# de más de GZIP_MINIMO bytes se comprimen si el cliente lo acepta.
+#
+# Los listados devuelven {"datos": [...], "siguiente": cursor}; el
+# cursor es opaco y se pasa tal cual en ?cursor= para la página
+# siguiente (null en la última).
+#
+#   python -m aeropuerto.api --puerto 8000 --procesos 4
+# ============================================================
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import date
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import Response
+from starlette.routing import Route
+
+from aeropuerto import busqueda, cambios, consultas, demografia, ocupacion, registros, resumenes
+from aeropuerto.aeropuertos import catalogo
+from aeropuerto.conexion import VARIABLE_RUTA_DB, get_pool
+from aeropuerto.consultas import Consulta, leer_sql
+from aeropuerto.esquema import crear_esquema
+from aeropuerto.fuzzy import EDAD_MAX, EDAD_MIN
+from aeropuerto.grafo import agregados_rutas, obtener_grafo
+from aeropuerto.instantaneas import almacen_instantaneas
+from aeropuerto.notificaciones import get_canal
+from aeropuerto.paginacion import contar_estimado, pagina_keyset
+
+TAMANO_PAGINA = 50
+TAMANO_MAXIMO = 1000
+GZIP_MINIMO = 1024
+
+# Segundos que una petición de alta espera la confirmación del lote.
+ESPERA_ALTA_S = 10.0
+
+# Columnas de orden admitidas por listado (la clave siempre desempata).
+ORDENES_VUELOS = ("id_vuelo", "fecha", "num_pasajeros")
+ORDENES_TRANSITO = ("id_transito", "fecha", "num_pasajeros")
+
+# Tipos JSON de cada posición del cursor. "desplazamiento" es el de los
+# resultados paginados por posición (búsqueda, agregados).
+TIPOS_CURSOR = {
+    "id_vuelo": (int,), "id_pasajero": (int,), "id_transito": (int,), "desplazamiento": (int,),
+    "fecha": (str,), "num_pasajeros": (int, float),
+}
+
+
+class PeticionInvalida(ValueError):
+    """Parámetros incorrectos: se responde 400 con el mensaje."""
+
+
+class NoEncontrado(LookupError):
+    """El cuerpo de un alta referencia algo que no existe: se responde 404 con el mensaje."""
+
+
+# ------------------------------------------------------------
+# PARÁMETROS
+# ------------------------------------------------------------
+def _entero(params, nombre, defecto=None, minimo=None, maximo=None):
+    valor = params.get(nombre)
+    if valor in (None, ""):
+        return defecto
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise PeticionInvalida(f"{nombre} debe ser un entero") from None
+    if (minimo is not None and numero < minimo) or (maximo is not None and numero > maximo):
+        raise PeticionInvalida(f"{nombre} fuera de rango: {numero}")
+    return numero
+
+
+def _fecha(params, nombre):
+    valor = params.get(nombre)
+    if not valor:
+        return None
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise PeticionInvalida(f"{nombre} debe ser AAAA-MM-DD") from None
+
+
+def _lista(params, nombre, mayusculas=False):
+    """Valores repetidos (?x=a&x=b) o separados por comas (?x=a,b)."""
+    valores = [v.strip() for valor in params.getlist(nombre) for v in valor.split(",") if v.strip()]
+    return [v.upper() for v in valores] if mayusculas else valores
+
+
+def _elegir(params, nombre, opciones, defecto):
+    valor = params.get(nombre) or defecto
+    if valor not in opciones:
+        raise PeticionInvalida(f"{nombre} debe ser uno de: {', '.join(opciones)}")
+    return valor
+
+
+def _codificar_cursor(cursor):
+    if cursor is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(list(cursor)).encode()).decode().rstrip("=")
+
+
+def _decodificar_cursor(params, columnas):
+    """
+    Cursor de ?cursor= (None si no viene), comprobado contra ``columnas``:
+    un valor por columna y del tipo de cada una. Solo la última (la clave
+    que desempata) no puede ser null; las demás lo son en el tramo de filas
+    con el orden nulo.
+    """
+    texto = params.get("cursor")
+    if not texto:
+        return None
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4)))
+    except ValueError:
+        raise PeticionInvalida("cursor no válido") from None
+    if not isinstance(cursor, list) or len(cursor) != len(columnas):
+        raise PeticionInvalida("cursor no válido")
+    for posicion, (valor, columna) in enumerate(zip(cursor, columnas), 1):
+        if valor is None and posicion < len(columnas):
+            continue
+        if isinstance(valor, bool) or not isinstance(valor, TIPOS_CURSOR[columna]):
+            raise PeticionInvalida(f"cursor no válido para el orden {', '.join(columnas)}")
+    return tuple(cursor)
+
+
+def _cursor_keyset(params, clave, orden):
+    """Cursor de pagina_keyset(): (orden, clave), o solo (clave,) si se ordena por ella."""
+    return _decodificar_cursor(params, (clave,) if orden == clave else (orden, clave))
+
+
+def _desplazamiento(params):
+    desde = (_decodificar_cursor(params, ("desplazamiento",)) or (0,))[0]
+    if desde < 0:
+        raise PeticionInvalida("cursor no válido")
+    return desde
+
+
+# ------------------------------------------------------------
+# CUERPOS JSON
+# ------------------------------------------------------------
+def _json(valor):
+    # Los DataFrames se serializan con pandas (NaN -> null, fechas ISO) sin pasar por dicts.
+    if hasattr(valor, "to_json"):
+        return valor.to_json(orient="records", date_format="iso", force_ascii=False)
+    return json.dumps(valor, ensure_ascii=False, default=_por_defecto)
+
+
+def _por_defecto(valor):
+    if hasattr(valor, "item"):  # escalares de numpy
+        return valor.item()
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()
+    raise TypeError(f"No serializable: {type(valor).__name__}")
+
+
+def _cuerpo(partes):
+    return ("{" + ",".join(f"{json.dumps(clave)}:{_json(valor)}" for clave, valor in partes.items()) + "}").encode()
+
+
+def _respuesta(partes, estado=200, cabeceras=None):
+    return Response(_cuerpo(partes), status_code=estado, media_type="application/json", headers=cabeceras)
+
+
+def _error(estado, mensaje):
+    return _respuesta({"error": mensaje}, estado)
+
+
+def _pagina(df, cursor, **extra):
+    return {"datos": df, "siguiente": _codificar_cursor(cursor), **extra}
+
+
+def _rebanada(df, params):
+    """Página de un resultado ya en memoria (agregados): el cursor es el desplazamiento."""
+    tamano = _entero(params, "tamano", TAMANO_PAGINA, 1, TAMANO_MAXIMO)
+    desde = _desplazamiento(params)
+    hasta = desde + tamano
+    return _pagina(df.iloc[desde:hasta], (hasta,) if hasta < len(df) else None, total=len(df))
+
+
+# ------------------------------------------------------------
+# ETAG POR VERSIÓN DE DATOS
+# ------------------------------------------------------------
+def _sincronizar(tablas):
+    pool = get_pool()
+    almacen_instantaneas.sincronizar(pool)
+    return almacen_instantaneas.versiones(tablas, pool)
+
+
+async def _versiones(tablas):
+    pool = get_pool()
+    if get_canal(pool).activo:
+        # El canal ya las mantiene al día: es una lectura en memoria, sin salir del bucle.
+        return almacen_instantaneas.versiones(tablas, pool)
+    return await run_in_threadpool(_sincronizar, tablas)
+
+
+def _etag(peticion, tablas, versiones):
+    huella = hashlib.sha1(
+        repr((get_pool().ruta, peticion.url.path, sorted(peticion.query_params.multi_items()),
+              tuple(zip(tablas, versiones)))).encode()
+    ).hexdigest()[:20]
+    # Débil: el mismo contenido puede viajar comprimido o no.
+    return f'W/"{huella}"'
+
+
+def _vigente(peticion, etag):
+    cabecera = peticion.headers.get("if-none-match")
+    if not cabecera:
+        return False
+    etiquetas = {e.strip().removeprefix("W/") for e in cabecera.split(",")}
+    return "*" in etiquetas or etag.removeprefix("W/") in etiquetas
+
+
+def lectura(tablas):
+    """
+    Convierte ``funcion(params, **ruta) -> dict`` en un endpoint GET con ETag.
+    ``tablas`` son las tablas de las que depende la respuesta.
+    """
+    def decorador(funcion):
+        async def endpoint(peticion):
+            versiones = await _versiones(tablas)
+            etag = _etag(peticion, tablas, versiones)
+            cabeceras = {"ETag": etag, "Cache-Control": "no-cache"}
+            if _vigente(peticion, etag):
+                return Response(status_code=304, headers=cabeceras)
+            try:
+                partes = await run_in_threadpool(funcion, peticion.query_params, **peticion.path_params)
+            except PeticionInvalida as e:
+                return _error(400, str(e))
+            if partes is None:
+                return _error(404, "No encontrado")
+            return _respuesta(partes, cabeceras=cabeceras)
+        endpoint.__name__ = funcion.__name__
+        return endpoint
+    return decorador
+
+
+# ------------------------------------------------------------
+# LECTURAS
+# ------------------------------------------------------------
+@lectura(("vuelos",))
+def listar_vuelos(params):
+    consulta = consultas.consulta_vuelos(params.get("texto"), params.get("estado"))
+    orden = _elegir(params, "orden", ORDENES_VUELOS, "id_vuelo")
+    df, siguiente = pagina_keyset(
+        consulta, "id_vuelo", orden=orden, descendente=params.get("desc") == "1",
+        tamano=_entero(params, "tamano", TAMANO_PAGINA, 1, TAMANO_MAXIMO),
+        cursor=_cursor_keyset(params, "id_vuelo", orden),
+    )
+    total, texto_total = contar_estimado(consulta, "id_vuelo")
+    return _pagina(df, siguiente, total=total, total_texto=texto_total)
+
+
+@lectura(("vuelos", "pasajeros"))
+def ver_vuelo(params, id_vuelo):
+    df = leer_sql(
+        "SELECT v.*, COALESCE(r.registrados, 0) AS registrados FROM vuelos v "
+        "LEFT JOIN resumen_pasajeros_vuelo r ON r.vuelo_id = v.id_vuelo WHERE v.id_vuelo = ?",
+        (id_vuelo,), ("vuelos", "pasajeros"),
+    )
+    if df.empty:
+        return None
+    return {"vuelo": json.loads(_json(df))[0]}
+
+
+@lectura(("pasajeros",))
+def listar_pasajeros(params):
+    tamano = _entero(params, "tamano", TAMANO_PAGINA, 1, TAMANO_MAXIMO)
+    texto = params.get("texto")
+    if texto:
+        # Búsqueda por relevancia (FTS5): se pagina por desplazamiento.
+        if params.get("vuelo_id"):
+            raise PeticionInvalida("texto y vuelo_id no se combinan")
+        desde = _desplazamiento(params)
+        df = busqueda.buscar_pasajeros(texto, limite=tamano + 1, desplazamiento=desde)
+        siguiente = (desde + tamano,) if len(df) > tamano else None
+        return _pagina(df.iloc[:tamano], siguiente)
+    consulta = Consulta("pasajeros")
+    vuelo_id = _entero(params, "vuelo_id", minimo=1)
+    if vuelo_id is not None:
+        consulta.igual("vuelo_id", vuelo_id)
+    edad_min = _entero(params, "edad_min", minimo=0)
+    edad_max = _entero(params, "edad_max", minimo=0)
+    if edad_min is not None or edad_max is not None:
+        consulta.entre("edad", edad_min or 0, registros.EDAD_MAXIMA if edad_max is None else edad_max)
+    df, siguiente = pagina_keyset(consulta, "id_pasajero", tamano=tamano,
+                                  cursor=_cursor_keyset(params, "id_pasajero", "id_pasajero"))
+    return _pagina(df, siguiente)
+
+
+@lectura(("pasajeros_transito",))
+def listar_transito(params):
+    consulta = consultas.consulta_transito(params.get("aeropuerto"))
+    orden = _elegir(params, "orden", ORDENES_TRANSITO, "id_transito")
+    df, siguiente = pagina_keyset(
+        consulta, "id_transito", orden=orden, descendente=params.get("desc") == "1",
+        tamano=_entero(params, "tamano", TAMANO_PAGINA, 1, TAMANO_MAXIMO),
+        cursor=_cursor_keyset(params, "id_transito", orden),
+    )
+    return _pagina(df, siguiente)
+
+
+@lectura(("vuelos", "pasajeros", "pasajeros_transito"))
+def kpis(params):
+    return {
+        "kpis": resumenes.kpis_dashboard(),
+        "vuelos_por_estado": resumenes.vuelos_por_estado().to_dict(),
+        "top_origenes": resumenes.top_origenes(_entero(params, "top", 5, 1, 100)).to_dict(),
+    }
+
+
+@lectura(("vuelos", "pasajeros", "aeropuertos"))
+def rutas(params):
+    df = agregados_rutas(
+        obtener_grafo(catalogo()),
+        origenes=_lista(params, "origen", True), destinos=_lista(params, "destino", True),
+        estados=_lista(params, "estado"),
+    )
+    return _rebanada(df.drop(columns=["i_origen", "i_destino"]), params)
+
+
+@lectura(("vuelos", "pasajeros"))
+def ocupacion_rutas(params):
+    filtros = {
+        "desde": _fecha(params, "desde"), "hasta": _fecha(params, "hasta"),
+        "aeropuertos": _lista(params, "aeropuerto", True), "estados": _lista(params, "estado"),
+    }
+    df = ocupacion.por_ruta(min_vuelos=_entero(params, "min_vuelos", 1, 1), **filtros)
+    return {"resumen": ocupacion.resumen(**filtros), **_rebanada(df, params)}
+
+
+@lectura(("vuelos", "pasajeros"))
+def edades(params):
+    h = demografia.histograma(
+        _entero(params, "vuelo_id", minimo=1),
+        (params.get("origen") or "").upper() or None, (params.get("destino") or "").upper() or None,
+    )
+    edad_min = _entero(params, "edad_min", EDAD_MIN)
+    edad_max = _entero(params, "edad_max", EDAD_MAX)
+    estadisticas = h.estadisticas(edad_min, edad_max)
+    histograma = estadisticas.pop("histograma")
+    return {
+        **estadisticas,
+        "bandas": h.por_bandas().to_dict(),
+        "histograma": {int(edad): int(n) for edad, n in histograma.items()},
+    }
+
+
+@lectura(tuple(cambios.CLAVES))
+def registro_cambios(params):
+    """
+    Cambios posteriores a ``desde``: el consumidor guarda ``marca`` y la
+    reenvía. Con ``recargar`` la marca ya no está en el registro (compactado
+    o restaurado) y hay que releer las tablas enteras.
+    """
+    desde = _entero(params, "desde", 0, 0)
+    tablas = _lista(params, "tabla")
+    if any(t not in cambios.CLAVES for t in tablas):
+        raise PeticionInvalida(f"tabla debe ser una de: {', '.join(cambios.CLAVES)}")
+    tamano = _entero(params, "tamano", TAMANO_MAXIMO, 1, cambios.MAX_CAMBIOS_DELTA)
+    return cambios.desde(desde, tablas, limite=tamano)
+
+
+# ------------------------------------------------------------
+# ALTAS
+# ------------------------------------------------------------
+def _vuelo_existente(datos):
+    """La tabla pasajeros no hace cumplir su clave foránea: el vuelo se comprueba antes de encolar."""
+    try:
+        vuelo_id = int(datos["vuelo_id"])
+    except (TypeError, ValueError):
+        return  # el formato lo rechaza registrar_pasajero()
+    with get_pool().lectura() as conn:
+        if conn.execute("SELECT 1 FROM vuelos WHERE id_vuelo = ?", (vuelo_id,)).fetchone() is None:
+            raise NoEncontrado(f"Vuelo no encontrado: {vuelo_id}")
+
+
+def alta(funcion, campos, comprobar=None):
+    """
+    Endpoint POST que llama a ``funcion`` de registros.py con los ``campos``
+    del cuerpo JSON. ``comprobar(datos)``, si se indica, valida contra la
+    base antes de encolar (lanza PeticionInvalida o NoEncontrado).
+    """
+    async def endpoint(peticion):
+        try:
+            datos = await peticion.json()
+        except ValueError:
+            return _error(400, "El cuerpo debe ser JSON")
+        if not isinstance(datos, dict):
+            return _error(400, "El cuerpo debe ser un objeto JSON")
+        faltan = [c for c in campos if c not in datos]
+        if faltan:
+            return _error(400, f"Faltan campos: {', '.join(faltan)}")
+        try:
+            if comprobar is not None:
+                await run_in_threadpool(comprobar, datos)
+            futuro = funcion(**{c: datos[c] for c in campos})
+        except NoEncontrado as e:
+            return _error(404, str(e))
+        except ValueError as e:
+            return _error(400, str(e))
+        try:
+            id_nuevo = await asyncio.wait_for(asyncio.wrap_future(futuro), ESPERA_ALTA_S)
+        except asyncio.TimeoutError:
+            # Sigue en la cola: se confirmará, pero no sabemos aún su id.
+            return _respuesta({"estado": "en_cola"}, 202)
+        except sqlite3.IntegrityError as e:
+            return _error(409, str(e))
+        except sqlite3.Error as e:
+            return _error(503, str(e))
+        return _respuesta({"id": id_nuevo}, 201)
+    endpoint.__name__ = f"alta_{funcion.__name__}"
+    return endpoint
+
+
+# ------------------------------------------------------------
+# APLICACIÓN
+# ------------------------------------------------------------
+async def salud(peticion):
+    pool = get_pool()
+    ok, mensaje = await run_in_threadpool(pool.salud)
+    return _respuesta({"ok": ok, "mensaje": mensaje, "canal": get_canal(pool).metricas()}, 200 if ok else 503)
+
+
+@contextlib.asynccontextmanager
+async def _ciclo_vida(app):
+    pool = get_pool()
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+    get_canal(pool)
+    yield
+
+
+def crear_app():
+    rutas_api = [
+        Route("/salud", salud),
+        Route("/vuelos", listar_vuelos),
+        Route("/vuelos", alta(registros.registrar_vuelo, ("fecha", "origen", "destino", "num_pasajeros", "estado")),
+              methods=["POST"]),
+        Route("/vuelos/{id_vuelo:int}", ver_vuelo),
+        Route("/pasajeros", listar_pasajeros),
+        Route("/pasajeros", alta(registros.registrar_pasajero, ("vuelo_id", "ticket", "nombre", "edad"),
+                                 comprobar=_vuelo_existente), methods=["POST"]),
+        Route("/transito", listar_transito),
+        Route("/transito", alta(registros.registrar_transito, ("fecha", "aeropuerto", "num_pasajeros")),
+              methods=["POST"]),
+        Route("/kpis", kpis),
+        Route("/rutas", rutas),
+        Route("/ocupacion", ocupacion_rutas),
+        Route("/edades", edades),
+        Route("/cambios", registro_cambios),
+    ]
+    return Starlette(
+        routes=rutas_api,
+        middleware=[Middleware(GZipMiddleware, minimum_size=GZIP_MINIMO)],
+        lifespan=_ciclo_vida,
+    )
+
+
+app = crear_app()
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="API HTTP/JSON del aeropuerto.")
+    parser.add_argument("--db", help="Ruta de la base SQLite (por defecto AEROPUERTO_DB o aeropuerto.db)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos de uvicorn (comparten la base)")
+    args = parser.parse_args(argv)
+    if args.db:
+        # Los procesos de uvicorn importan la app de cero: la base viaja por el entorno.
+        os.environ[VARIABLE_RUTA_DB] = args.db
+    uvicorn.run("aeropuerto.api:app", host=args.host, port=args.puerto, workers=args.procesos,
+                log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,418 @@
+# ============================================================
+# BENCHMARK DE LAS RUTAS DE DATOS DEL PANEL
+# ============================================================
+# Siembra una base por escala (filas de pasajeros; los vuelos y el
+# tránsito se generan en proporción) y mide, sin Streamlit, los
+# mismos caminos que recorre app.py: carga tipada de tablas,
+# agregados del Dashboard, filtros de vuelos y pasajeros, lógica
+# fuzzy, agregados de rutas y exportación CSV. Cada caso se repite
+# tras unas ejecuciones de calentamiento, con la caché de consultas
+# vacía en cada repetición (la caché de páginas de SQLite sí queda
+# caliente), y se ejecuta una vez más bajo tracemalloc para obtener
+# el pico de memoria. El resultado es un JSON comparable entre
+# commits:
+#
+#   python -m aeropuerto.benchmark --escalas 1e3 1e4 1e5 --salida actual.json
+#   python -m aeropuerto.benchmark --comparar base.json actual.json --umbral 0.2
+# ============================================================
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from aeropuerto import (
+    busqueda, consultas, demografia, exportacion, filtros, fuzzy, generador, grafo, ocupacion, resumenes,
+)
+from aeropuerto.aeropuertos import catalogo
+from aeropuerto.cache import cache_consultas
+from aeropuerto.columnar import leer_tabla
+from aeropuerto.conexion import VARIABLE_RUTA_DB, get_pool
+from aeropuerto.esquema import crear_esquema
+from aeropuerto.instantaneas import AlmacenInstantaneas
+from aeropuerto.paginacion import contar_estimado, pagina_keyset
+
+ESCALAS_POR_DEFECTO = (1_000, 10_000, 100_000)
+
+# Por cada escala (pasajeros): un vuelo cada 10 pasajeros y un conteo de tránsito cada 20.
+VUELOS_POR_PASAJERO = 0.1
+TRANSITO_POR_PASAJERO = 0.05
+
+# Filas que modifica el caso refresco_delta en cada repetición.
+FILAS_DELTA = 100
+
+# Fecha fija para que dos corridas con la misma semilla siembren lo mismo.
+FECHA_BASE = date(2025, 1, 1)
+DIAS = 365
+
+TABLAS_COMPLETAS = ("vuelos", "pasajeros", "pasajeros_transito")
+
+
+# ------------------------------------------------------------
+# CASOS
+# ------------------------------------------------------------
+class Contexto:
+    """Base sembrada de una escala y los datos que los casos en memoria reciben ya cargados."""
+
+    def __init__(self, pool, escala):
+        self.pool = pool
+        self.escala = escala
+        self.pasajeros = leer_tabla("pasajeros", pool)
+        self.edades = self.pasajeros["edad"].to_numpy(dtype=float, na_value=np.nan)
+        self.instantaneas = AlmacenInstantaneas()
+
+
+def _cargar_datos(ctx):
+    return sum(len(leer_tabla(tabla, ctx.pool)) for tabla in TABLAS_COMPLETAS)
+
+
+def _dashboard(ctx):
+    kpis = resumenes.kpis_dashboard()
+    resumenes.vuelos_por_estado()
+    resumenes.top_origenes(5)
+    rango = resumenes.rango_series()
+    if rango:
+        resumenes.serie_transito(*rango)
+    return kpis["total_vuelos"]
+
+
+def _filtro_vuelos(ctx):
+    consulta = consultas.consulta_vuelos("MEX", "Completado")
+    pagina, _ = pagina_keyset(consulta, "id_vuelo")
+    contar_estimado(consulta, "id_vuelo")
+    return len(pagina)
+
+
+def _filtro_pasajeros(ctx):
+    df = filtros.filtrar_pasajeros(ctx.pasajeros, 18, 30)
+    df = filtros.con_pertenencias(df, list(fuzzy.CONJUNTOS_EDAD))
+    filtros.estadisticas_edad(df)
+    return len(df)
+
+
+def _filtro_pasajeros_texto(ctx):
+    df = filtros.filtrar_pasajeros(ctx.pasajeros, 18, 80, "maria garcia")
+    filtros.estadisticas_edad(df)
+    return len(df)
+
+
+def _busqueda(ctx):
+    busqueda.contar_coincidencias("lopez")
+    return len(busqueda.buscar_pasajeros("lopez"))
+
+
+def _busqueda_prefijo(ctx):
+    # El prefijo más corto que se busca en el índice: coincide con buena parte de
+    # los pasajeros (peor caso del ranking), y su conteo acotado.
+    busqueda.buscar_pasajeros("ma", desplazamiento=500)
+    busqueda.contar_coincidencias("ma")
+    return len(busqueda.buscar_pasajeros("ma"))
+
+
+def _triangular(ctx):
+    return len(fuzzy.triangular(ctx.edades))
+
+
+def _pertenencias(ctx):
+    return len(fuzzy.pertenencias(ctx.edades)["Joven"])
+
+
+def _agregados_rutas(ctx):
+    return len(grafo.agregados_rutas(grafo.obtener_grafo(catalogo(ctx.pool))))
+
+
+def _ocupacion(ctx):
+    ocupacion.resumen()
+    ocupacion.por_periodo()
+    ocupacion.por_vuelo(solo_sobrevendidos=True, limite=100)
+    return len(ocupacion.por_ruta())
+
+
+def _demografia(ctx):
+    edades = demografia.histograma()
+    edades.por_bandas()
+    edades.estadisticas(18, 30)
+    o, d = next(iter(demografia.rutas_con_pasajeros()), (None, None))
+    return len(demografia.histograma(origen=o, destino=d).serie())
+
+
+def _exportar_csv(ctx):
+    return sum(
+        exportacion.exportar(os.devnull, exportacion.EXPORTACIONES[tabla], pool=ctx.pool)
+        for tabla in TABLAS_COMPLETAS
+    )
+
+
+def _refresco_delta(ctx):
+    # Reescribe FILAS_DELTA pasajeros con sus mismos valores y pone al día la instantánea.
+    ctx.instantaneas.obtener("pasajeros", ctx.pool)
+    with ctx.pool.escritura() as conn:
+        conn.execute(
+            "UPDATE pasajeros SET edad = edad WHERE id_pasajero IN "
+            "(SELECT id_pasajero FROM pasajeros ORDER BY random() LIMIT ?)", (FILAS_DELTA,),
+        )
+    ctx.instantaneas.sincronizar(ctx.pool)
+    return len(ctx.instantaneas.obtener("pasajeros", ctx.pool))
+
+
+# nombre -> función(contexto) que devuelve el número de filas producidas.
+CASOS = {
+    "cargar_datos": _cargar_datos,
+    "dashboard": _dashboard,
+    "filtro_vuelos": _filtro_vuelos,
+    "filtro_pasajeros": _filtro_pasajeros,
+    "filtro_pasajeros_texto": _filtro_pasajeros_texto,
+    "busqueda": _busqueda,
+    "busqueda_prefijo": _busqueda_prefijo,
+    "triangular": _triangular,
+    "pertenencias": _pertenencias,
+    "agregados_rutas": _agregados_rutas,
+    "ocupacion": _ocupacion,
+    "demografia": _demografia,
+    "exportar_csv": _exportar_csv,
+    "refresco_delta": _refresco_delta,
+}
+
+# La generación se mide al sembrar (una vez por escala), no con repeticiones.
+CASO_GENERAR = "generar_datos"
+
+
+# ------------------------------------------------------------
+# MEDICIÓN
+# ------------------------------------------------------------
+def _resultado(caso, escala, tiempos, filas, pico_bytes):
+    return {
+        "caso": caso,
+        "escala": escala,
+        "filas": filas,
+        "repeticiones": len(tiempos),
+        "min_s": min(tiempos),
+        "mediana_s": statistics.median(tiempos),
+        "media_s": statistics.fmean(tiempos),
+        "desv_s": statistics.stdev(tiempos) if len(tiempos) > 1 else 0.0,
+        "pico_mb": None if pico_bytes is None else round(pico_bytes / 1e6, 3),
+    }
+
+
+def medir(funcion, repeticiones=5, calentamiento=1, memoria=True):
+    """
+    Ejecuta ``funcion()`` ``calentamiento`` veces sin medir y ``repeticiones``
+    veces midiendo; luego, si ``memoria``, una vez más bajo tracemalloc.
+    Devuelve ``(tiempos, filas, pico_bytes)``.
+    """
+    for _ in range(calentamiento):
+        cache_consultas.limpiar()
+        funcion()
+    tiempos = []
+    filas = None
+    for _ in range(repeticiones):
+        cache_consultas.limpiar()
+        inicio = time.perf_counter()
+        filas = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    pico = None
+    if memoria:
+        cache_consultas.limpiar()
+        tracemalloc.start()
+        try:
+            funcion()
+            pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return tiempos, filas, pico
+
+
+def sembrar(ruta, escala, semilla=0, progreso=None):
+    """Crea la base ``ruta`` con ``escala`` pasajeros. Devuelve (pool, segundos, filas)."""
+    for sufijo in ("", "-wal", "-shm"):
+        if os.path.exists(ruta + sufijo):
+            os.remove(ruta + sufijo)
+    pool = get_pool(ruta)
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+    inicio = time.perf_counter()
+    generador.generar(
+        vuelos=max(1, int(escala * VUELOS_POR_PASAJERO)),
+        transito=max(1, int(escala * TRANSITO_POR_PASAJERO)),
+        pasajeros=escala, semilla=semilla, forzar=True,
+        fecha_base=FECHA_BASE, dias=DIAS, progreso=progreso, pool=pool,
+    )
+    segundos = time.perf_counter() - inicio
+    with pool.lectura() as conn:
+        filas = sum(conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in TABLAS_COMPLETAS)
+    return pool, segundos, filas
+
+
+def _commit():
+    try:
+        salida = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return salida.stdout.strip() or None
+
+
+def _metadatos(args):
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "semilla": args.semilla,
+        "repeticiones": args.repeticiones,
+        "calentamiento": args.calentamiento,
+    }
+
+
+def ejecutar(escalas, casos, directorio, repeticiones=5, calentamiento=1, semilla=0, memoria=True, informar=None):
+    """Siembra cada escala en ``directorio`` y mide los ``casos``. Devuelve la lista de resultados."""
+    informar = informar or (lambda resultado: None)
+    resultados = []
+    ruta_anterior = os.environ.get(VARIABLE_RUTA_DB)
+    try:
+        for escala in escalas:
+            ruta = os.path.join(directorio, f"benchmark-{escala}.db")
+            # Las consultas de la app usan el pool por defecto: se apunta a la base de esta escala.
+            os.environ[VARIABLE_RUTA_DB] = ruta
+            cache_consultas.limpiar()
+            cache_consultas.invalidar()
+
+            # La siembra se mide sin tracemalloc (lo ralentizaría); no tiene pico de memoria.
+            pool, segundos, filas = sembrar(ruta, escala, semilla)
+            resultado = _resultado(CASO_GENERAR, escala, [segundos], filas, None)
+            resultados.append(resultado)
+            informar(resultado)
+
+            ctx = Contexto(pool, escala)
+            for caso in casos:
+                tiempos, filas, pico = medir(
+                    lambda caso=caso, ctx=ctx: CASOS[caso](ctx), repeticiones, calentamiento, memoria
+                )
+                resultado = _resultado(caso, escala, tiempos, filas, pico)
+                resultados.append(resultado)
+                informar(resultado)
+            # Suelta las tablas del contexto antes de sembrar la escala siguiente.
+            ctx = None
+            pool.cerrar()
+    finally:
+        if ruta_anterior is None:
+            os.environ.pop(VARIABLE_RUTA_DB, None)
+        else:
+            os.environ[VARIABLE_RUTA_DB] = ruta_anterior
+    return resultados
+
+
+# ------------------------------------------------------------
+# COMPARACIÓN ENTRE CORRIDAS
+# ------------------------------------------------------------
+def comparar(base, actual, umbral=0.2, metrica="mediana_s"):
+    """
+    Cruza dos JSON de benchmark por (caso, escala). Devuelve un DataFrame con
+    el tiempo de cada uno, el cambio relativo y si supera ``umbral`` (regresión).
+    """
+    def indexar(datos):
+        return {(r["caso"], r["escala"]): r for r in datos["resultados"]}
+
+    previos, nuevos = indexar(base), indexar(actual)
+    filas = []
+    for clave in sorted(previos.keys() & nuevos.keys()):
+        antes, despues = previos[clave][metrica], nuevos[clave][metrica]
+        cambio = despues / antes - 1 if antes > 0 else 0.0
+        filas.append({
+            "caso": clave[0], "escala": clave[1], "base_s": antes, "actual_s": despues,
+            "cambio": round(cambio, 4), "regresion": cambio > umbral,
+        })
+    return pd.DataFrame(filas, columns=["caso", "escala", "base_s", "actual_s", "cambio", "regresion"])
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def _escala(valor):
+    escala = int(float(valor))  # admite 1e6
+    if escala < 1:
+        raise argparse.ArgumentTypeError("La escala debe ser al menos 1")
+    return escala
+
+
+def _informar(resultado):
+    pico = "" if resultado["pico_mb"] is None else f"  pico {resultado['pico_mb']:.1f} MB"
+    print(
+        f"{resultado['escala']:>12,}  {resultado['caso']:<24} "
+        f"mediana {resultado['mediana_s'] * 1000:10.2f} ms  "
+        f"(min {resultado['min_s'] * 1000:.2f}, ±{resultado['desv_s'] * 1000:.2f}){pico}",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide las rutas de datos del panel a varias escalas.")
+    parser.add_argument("--escalas", type=_escala, nargs="+", default=list(ESCALAS_POR_DEFECTO),
+                        help="Pasajeros por base sembrada (admite notación 1e6)")
+    parser.add_argument("--casos", nargs="+", choices=sorted(CASOS), default=list(CASOS),
+                        help="Casos a medir (por defecto, todos)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--calentamiento", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir el pico de memoria (tracemalloc)")
+    parser.add_argument("--directorio", help="Dónde crear las bases (por defecto, uno temporal que se borra)")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto, stdout)")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "ACTUAL"),
+                        help="Compara dos JSON en lugar de medir; sale con 1 si hay regresiones")
+    parser.add_argument("--umbral", type=float, default=0.2,
+                        help="Cambio relativo de la mediana que cuenta como regresión (0.2 = +20%%)")
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        with open(args.comparar[0], encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.comparar[1], encoding="utf-8") as f:
+            actual = json.load(f)
+        tabla = comparar(base, actual, args.umbral)
+        print(tabla.to_string(index=False))
+        regresiones = int(tabla["regresion"].sum())
+        print(f"{regresiones} regresión(es) por encima de +{args.umbral:.0%}", file=sys.stderr)
+        return 1 if regresiones else 0
+
+    temporal = args.directorio is None
+    directorio = tempfile.mkdtemp(prefix="aeropuerto-benchmark-") if temporal else args.directorio
+    os.makedirs(directorio, exist_ok=True)
+    try:
+        resultados = ejecutar(
+            args.escalas, args.casos, directorio, args.repeticiones, args.calentamiento,
+            args.semilla, memoria=not args.sin_memoria, informar=_informar,
+        )
+    finally:
+        if temporal:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+    documento = {"meta": _metadatos(args), "resultados": resultados}
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(documento, f, indent=2, ensure_ascii=False)
+    else:
+        json.dump(documento, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+# ============================================================
+# BÚSQUEDA DE PASAJEROS (FTS5 + prefijo de ticket)
+# ============================================================
+# Índice de texto completo sobre pasajeros.nombre/ticket, sin
+# acentos ni mayúsculas ("sofia alv" encuentra "Sofía Álvarez"),
+# sincronizado por triggers en cada escritura. Los tickets se buscan
+# además por prefijo sobre el índice B-tree idx_pasajeros_ticket.
+# Si SQLite no trae FTS5 se recurre a LIKE sobre nombre/ticket.
+# ============================================================
+
+import re
+
+import pandas as pd
+
+from aeropuerto.conexion import get_pool
+from aeropuerto.consultas import Consulta, leer_sql
+
+TOPE_CONTEO = 10_000
+# Un texto sin ninguna palabra de al menos esta longitud no se busca en el índice:
+# FTS5 solo precalcula prefijos de 2 y 3 letras (prefix='2 3'), y uno de una letra
+# recorrería casi todos los términos. Acompañadas de una palabra más larga, las
+# cortas solo acotan el resultado.
+MIN_PREFIJO = 2
+
+FTS_SQL = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS pasajeros_fts USING fts5(
+        nombre, ticket,
+        content='pasajeros', content_rowid='id_pasajero',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+'''
+
+TRIGGERS_FTS_SQL = [
+    '''
+        CREATE TRIGGER IF NOT EXISTS trg_fts_pasajeros_ins AFTER INSERT ON pasajeros BEGIN
+            INSERT INTO pasajeros_fts(rowid, nombre, ticket) VALUES (NEW.id_pasajero, NEW.nombre, NEW.ticket);
+        END
+    ''',
+    '''
+        CREATE TRIGGER IF NOT EXISTS trg_fts_pasajeros_del AFTER DELETE ON pasajeros BEGIN
+            INSERT INTO pasajeros_fts(pasajeros_fts, rowid, nombre, ticket)
+            VALUES ('delete', OLD.id_pasajero, OLD.nombre, OLD.ticket);
+        END
+    ''',
+    '''
+        CREATE TRIGGER IF NOT EXISTS trg_fts_pasajeros_upd AFTER UPDATE ON pasajeros BEGIN
+            INSERT INTO pasajeros_fts(pasajeros_fts, rowid, nombre, ticket)
+            VALUES ('delete', OLD.id_pasajero, OLD.nombre, OLD.ticket);
+            INSERT INTO pasajeros_fts(rowid, nombre, ticket) VALUES (NEW.id_pasajero, NEW.nombre, NEW.ticket);
+        END
+    ''',
+]
+
+_fts5 = None
+
+
+def fts5_disponible(conn):
+    global _fts5
+    if _fts5 is None:
+        opciones = {fila[0] for fila in conn.execute("PRAGMA compile_options")}
+        _fts5 = "ENABLE_FTS5" in opciones
+    return _fts5
+
+
+def nombres_triggers(conn=None):
+    if conn is not None and not fts5_disponible(conn):
+        return []
+    return ["trg_fts_pasajeros_ins", "trg_fts_pasajeros_del", "trg_fts_pasajeros_upd"]
+
+
+def migracion_fts(c):
+    """Migración de esquema: crea el índice FTS5, sus triggers y lo rellena."""
+    if not fts5_disponible(c.connection):
+        return
+    c.execute(FTS_SQL)
+    for sql in TRIGGERS_FTS_SQL:
+        c.execute(sql)
+    # Con contenido externo, 'rebuild' re-indexa todo desde la tabla pasajeros.
+    c.execute("INSERT INTO pasajeros_fts(pasajeros_fts) VALUES ('rebuild')")
+
+
+# ------------------------------------------------------------
+# CONSULTAS
+# ------------------------------------------------------------
+_PALABRA = re.compile(r"\w+", re.UNICODE)
+
+
+def _usar_fts():
+    if _fts5 is None:
+        with get_pool().lectura() as conn:
+            fts5_disponible(conn)
+    return _fts5
+
+
+def _consulta_fts(texto):
+    """
+    'sofia alv' -> '"sofia"* AND "alv"*' (cada palabra como prefijo, sin sintaxis FTS
+    del usuario). Vacía si ninguna palabra llega a MIN_PREFIJO letras.
+    """
+    palabras = _PALABRA.findall(texto)
+    if not any(len(p) >= MIN_PREFIJO for p in palabras):
+        return ""
+    return " AND ".join(f'"{p}"*' for p in palabras)
+
+
+def _coincidencias_sql(texto, mejores=None):
+    """
+    SQL de (id, rango) para ``texto``; rangos más bajos = mejores. None si no hay nada que buscar.
+    Con ``mejores``, cada fuente aporta solo sus ``mejores`` primeras coincidencias (por rango e id):
+    basta para las primeras ``mejores`` filas del total y evita agrupar y cruzar todas las demás.
+    """
+    limite = "" if mejores is None else " LIMIT ?"
+    partes, params = [], []
+    consulta_fts = _consulta_fts(texto)
+    if consulta_fts:
+        orden = "" if mejores is None else " ORDER BY rank, rowid"
+        partes.append(
+            "SELECT * FROM (SELECT rowid AS id, rank AS rango FROM pasajeros_fts "
+            f"WHERE pasajeros_fts MATCH ?{orden}{limite})"
+        )
+        params += [consulta_fts] + ([] if mejores is None else [mejores])
+    ticket = texto.strip().upper()
+    if ticket:
+        # Prefijo de ticket: rango sobre el índice B-tree, siempre por delante del texto libre.
+        orden = "" if mejores is None else " ORDER BY id_pasajero"
+        partes.append(
+            "SELECT * FROM (SELECT id_pasajero AS id, -1e9 AS rango FROM pasajeros "
+            f"WHERE ticket >= ? AND ticket < ?{orden}{limite})"
+        )
+        params += [ticket, ticket + "\uffff"] + ([] if mejores is None else [mejores])
+    if not partes:
+        return None, ()
+    return (
+        f"SELECT id, MIN(rango) AS rango FROM ({' UNION ALL '.join(partes)}) GROUP BY id",
+        tuple(params),
+    )
+
+
+def _ids_sql(texto, limite=None):
+    """
+    SQL de los ids que coinciden con ``texto``, sin rango: el rowid del índice FTS
+    unido al rango de tickets, sin calcular bm25 ni agrupar. Con ``limite`` cada
+    fuente aporta como mucho ``limite`` ids, y el resultado también.
+    """
+    if not _usar_fts():
+        consulta = _consulta_like(texto, "id_pasajero AS id")
+        if limite is not None:
+            consulta.limite(limite)
+        return consulta.sql()
+    tope = "" if limite is None else " LIMIT ?"
+    partes, params = [], []
+    consulta_fts = _consulta_fts(texto)
+    if consulta_fts:
+        partes.append(f"SELECT id FROM (SELECT rowid AS id FROM pasajeros_fts WHERE pasajeros_fts MATCH ?{tope})")
+        params += [consulta_fts] + ([] if limite is None else [limite])
+    ticket = texto.strip().upper()
+    if ticket:
+        partes.append(f"SELECT id FROM (SELECT id_pasajero AS id FROM pasajeros WHERE ticket >= ? AND ticket < ?{tope})")
+        params += [ticket, ticket + "\uffff"] + ([] if limite is None else [limite])
+    if not partes:
+        return None, ()
+    return " UNION ".join(partes) + tope, tuple(params) + (() if limite is None else (limite,))
+
+
+def filtro_coincidencias(texto):
+    """
+    (condición, params) que restringe una consulta sobre pasajeros a los que
+    coinciden con ``texto``, sin ordenar por relevancia (para Consulta.donde()).
+    """
+    sql, params = _ids_sql(texto)
+    if sql is None:
+        return "0", ()
+    return f"id_pasajero IN ({sql})", params
+
+
+def _consulta_like(texto, columnas="*"):
+    # Respaldo sin FTS5: subcadena con LIKE (lineal, pero equivalente en resultados).
+    return Consulta("pasajeros", columnas).contiene(["nombre", "ticket"], texto)
+
+
+def buscar_pasajeros(texto, limite=50, desplazamiento=0):
+    """
+    Pasajeros que coinciden con ``texto`` por nombre (prefijos de palabra, sin
+    acentos) o por prefijo de ticket, ordenados por relevancia.
+    """
+    if not _usar_fts():
+        sql, params = _consulta_like(texto).ordenar("id_pasajero").limite(limite).sql()
+        return leer_sql(f"{sql} OFFSET ?", params + (int(desplazamiento),), ("pasajeros",))
+    # Solo hacen falta las limite + desplazamiento mejores de cada fuente.
+    sql, params = _coincidencias_sql(texto, int(limite) + int(desplazamiento))
+    if sql is None:
+        return pd.DataFrame(columns=["id_pasajero", "vuelo_id", "ticket", "nombre", "edad"])
+    return leer_sql(
+        f"SELECT p.* FROM ({sql}) r JOIN pasajeros p ON p.id_pasajero = r.id "
+        f"ORDER BY r.rango, p.id_pasajero LIMIT ? OFFSET ?",
+        params + (int(limite), int(desplazamiento)),
+        ("pasajeros",),
+    )
+
+
+def contar_coincidencias(texto, tope=TOPE_CONTEO):
+    """Número de coincidencias, acotado: devuelve ``tope + 1`` si hay más de ``tope``."""
+    # Cada fuente aporta como mucho tope + 1 ids: si alguna tiene más, el total también.
+    sql, params = _ids_sql(texto, tope + 1)
+    if sql is None:
+        return 0
+    return int(leer_sql(f"SELECT COUNT(*) FROM ({sql})", params, ("pasajeros",)).iat[0, 0])
+
+
+def ids_coincidentes(texto, tope=None):
+    """Ids de los pasajeros que coinciden (para combinar con otros filtros); como mucho ``tope``."""
+    sql, params = _ids_sql(texto, tope)
+    if sql is None:
+        return pd.Series(dtype="int64")
+    return leer_sql(sql, params, ("pasajeros",))["id"]
@@ -0,0 +1,161 @@
+# ============================================================
+# CACHÉ DE CONSULTAS (nivel de proceso)
+# ============================================================
+# Cada tabla tiene un número de versión que se incrementa en cada
+# escritura. Una entrada cacheada guarda las versiones de las tablas
+# de las que depende; si alguna cambió, la entrada deja de ser válida
+# y la siguiente lectura vuelve a SQLite.
+# ============================================================
+
+import re
+import threading
+from collections import OrderedDict
+
+TABLAS = ("vuelos", "pasajeros", "pasajeros_transito", "aeropuertos")
+
+_PATRON_ESCRITURA = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+
+def tablas_afectadas(query):
+    """
+    Devuelve las tablas que modifica una sentencia de escritura.
+    Si no se reconoce la sentencia, se asume que afecta a todas.
+    """
+    match = _PATRON_ESCRITURA.match(query)
+    if match:
+        return (match.group(1).lower(),)
+    return TABLAS
+
+
+def _tamano_estimado(valor):
+    """Tamaño aproximado en bytes de un valor cacheado (DataFrame u otro)."""
+    memory_usage = getattr(valor, "memory_usage", None)
+    if memory_usage is not None:
+        try:
+            return int(memory_usage(index=True, deep=True).sum())
+        except TypeError:
+            return int(memory_usage())
+    return 0
+
+
+class CacheConsultas:
+    """
+    Caché LRU acotada por número de entradas y por bytes, con claves
+    ligadas a la versión de datos de cada tabla.
+
+    Los valores cacheados se comparten entre reruns y sesiones: quien los
+    reciba debe tratarlos como de solo lectura (usar ``.copy()`` o
+    ``.assign()`` antes de modificarlos).
+    """
+
+    def __init__(self, max_entradas=32, max_bytes=512 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()  # clave -> (versiones, valor, bytes)
+        self._versiones = {tabla: 0 for tabla in TABLAS}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # --------------------------------------------------------
+    # Versiones de datos
+    # --------------------------------------------------------
+    def version(self, tabla):
+        with self._lock:
+            return self._versiones.get(tabla, 0)
+
+    def versiones(self, tablas):
+        with self._lock:
+            return tuple(self._versiones.get(t, 0) for t in tablas)
+
+    def invalidar(self, *tablas):
+        """Incrementa la versión de las tablas indicadas (todas si no se indica ninguna)."""
+        tablas = tablas or TABLAS
+        with self._lock:
+            for tabla in tablas:
+                self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+            # Las entradas que dependen de estas tablas ya no sirven: se liberan ahora
+            # en lugar de esperar a que el LRU las desaloje.
+            obsoletas = [
+                clave for clave, (deps, _, _) in self._entradas.items()
+                if any(tabla in dict(deps) for tabla in tablas)
+            ]
+            for clave in obsoletas:
+                self._eliminar(clave)
+
+    # --------------------------------------------------------
+    # Lectura
+    # --------------------------------------------------------
+    def obtener(self, clave, tablas, cargador):
+        """
+        Devuelve el valor cacheado para ``clave`` si las versiones de ``tablas``
+        no han cambiado; en otro caso llama a ``cargador()`` y guarda el resultado.
+        Las excepciones del cargador se propagan y no se cachean.
+        """
+        with self._lock:
+            deps = tuple(zip(tablas, self.versiones(tablas)))
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada[0] == deps:
+                self._entradas.move_to_end(clave)
+                self.hits += 1
+                return entrada[1]
+            self.misses += 1
+
+        # La carga se hace fuera del lock para no bloquear a otras sesiones.
+        valor = cargador()
+
+        with self._lock:
+            # Si hubo una escritura durante la carga, el resultado ya es viejo:
+            # se devuelve, pero no se guarda.
+            if deps != tuple(zip(tablas, self.versiones(tablas))):
+                return valor
+            if clave in self._entradas:
+                self._eliminar(clave)
+            tamano = _tamano_estimado(valor)
+            self._entradas[clave] = (deps, valor, tamano)
+            self._bytes += tamano
+            self._desalojar()
+        return valor
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "versiones": dict(self._versiones),
+            }
+
+    # --------------------------------------------------------
+    # Internos
+    # --------------------------------------------------------
+    def _eliminar(self, clave):
+        _, _, tamano = self._entradas.pop(clave)
+        self._bytes -= tamano
+
+    def _desalojar(self):
+        # Siempre se conserva la entrada más reciente, aunque exceda max_bytes.
+        while len(self._entradas) > 1 and (
+            len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes
+        ):
+            clave = next(iter(self._entradas))
+            self._eliminar(clave)
+            self.evictions += 1
+
+
+# Instancia compartida por todo el proceso (todas las sesiones de Streamlit).
+cache_consultas = CacheConsultas()
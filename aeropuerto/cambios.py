@@ -0,0 +1,224 @@
+# ============================================================
+# REGISTRO DE CAMBIOS (change data capture) Y DELTAS
+# ============================================================
+# Triggers sobre vuelos, pasajeros y pasajeros_transito anotan cada
+# INSERT/UPDATE/DELETE en la tabla de solo anexado ``cambios``
+# (tabla, operación, id de la fila), venga de donde venga la
+# escritura. El id_cambio (AUTOINCREMENT, nunca se reutiliza) es la
+# marca de agua: quien guardó la marca M solo necesita las filas
+# cuyos ids aparecen en cambios con id_cambio > M para ponerse al
+# día. Así las instantáneas de tablas (instantaneas.py) se refrescan
+# leyendo el cambio y no la tabla entera.
+#
+# Una restauración de copia (copias.py) anota 'R' por tabla: ningún
+# delta cruza una restauración. compactar() recorta el registro
+# (siempre conserva el último cambio); una marca más vieja que lo
+# conservado ya no admite delta y obliga a una recarga completa.
+# Quien escribe en volumen (cola de escritura, importador, generador)
+# llama a compactar_si_excede() en su transacción, así que el registro
+# no pasa de CAMBIOS_CONSERVADOS + HOLGURA_COMPACTAR filas.
+#
+#   python -m aeropuerto.cambios --desde 1200      # cambios tras la marca
+#   python -m aeropuerto.cambios --compactar 10000
+# ============================================================
+
+import argparse
+import sys
+
+import pandas as pd
+
+from aeropuerto.conexion import get_pool
+
+# Tabla de hechos -> clave primaria.
+CLAVES = {"vuelos": "id_vuelo", "pasajeros": "id_pasajero", "pasajeros_transito": "id_transito"}
+
+CAMBIOS_SQL = '''
+    CREATE TABLE IF NOT EXISTS cambios (
+        id_cambio INTEGER PRIMARY KEY AUTOINCREMENT,
+        tabla TEXT NOT NULL,
+        operacion TEXT NOT NULL,
+        id_fila INTEGER
+    )
+'''
+
+# Por encima de este número de cambios pendientes, recargar es más barato que aplicar el delta.
+MAX_CAMBIOS_DELTA = 50_000
+
+# Cambios que conserva compactar() por defecto.
+CAMBIOS_CONSERVADOS = 100_000
+
+# Exceso sobre CAMBIOS_CONSERVADOS tolerado antes de compactar: cada DELETE se amortiza en este número de cambios.
+HOLGURA_COMPACTAR = 10_000
+
+_OPERACIONES = {"ins": "INSERT", "del": "DELETE", "upd": "UPDATE"}
+
+
+def _anotar(tabla, operacion, fila):
+    return f"INSERT INTO cambios (tabla, operacion, id_fila) VALUES ('{tabla}', '{operacion}', {fila}.{CLAVES[tabla]});"
+
+
+def triggers_sql():
+    sentencias = []
+    for tabla, clave in CLAVES.items():
+        sentencias += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_cambios_{tabla}_ins AFTER INSERT ON {tabla} "
+            f"BEGIN {_anotar(tabla, 'I', 'NEW')} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_cambios_{tabla}_del AFTER DELETE ON {tabla} "
+            f"BEGIN {_anotar(tabla, 'D', 'OLD')} END",
+            # Si cambia la clave, la fila vieja desaparece: se anotan las dos.
+            f"CREATE TRIGGER IF NOT EXISTS trg_cambios_{tabla}_upd AFTER UPDATE ON {tabla} BEGIN "
+            f"INSERT INTO cambios (tabla, operacion, id_fila) SELECT '{tabla}', 'D', OLD.{clave} "
+            f"WHERE OLD.{clave} IS NOT NEW.{clave}; "
+            f"{_anotar(tabla, 'U', 'NEW')} END",
+        ]
+    return sentencias
+
+
+def nombres_triggers():
+    return [f"trg_cambios_{tabla}_{op}" for tabla in CLAVES for op in _OPERACIONES]
+
+
+def migracion_cambios(c):
+    """Migración de esquema: registro de cambios alimentado por triggers."""
+    c.execute(CAMBIOS_SQL)
+    for sql in triggers_sql():
+        c.execute(sql)
+
+
+# ------------------------------------------------------------
+# MARCAS DE AGUA
+# ------------------------------------------------------------
+def marca_actual(conn):
+    """Último id_cambio confirmado (0 si no hay ninguno)."""
+    return conn.execute("SELECT COALESCE(MAX(id_cambio), 0) FROM cambios").fetchone()[0]
+
+
+def marcar_restauracion(conn, marca_minima):
+    """
+    Tras restaurar una copia: los ids siguen por encima de ``marca_minima`` (la
+    marca previa a la restauración) y cada tabla recibe un cambio 'R'.
+    """
+    conn.execute(CAMBIOS_SQL)
+    siguiente = max(marca_minima, marca_actual(conn))
+    conn.execute("DELETE FROM sqlite_sequence WHERE name = 'cambios'")
+    conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('cambios', ?)", (siguiente,))
+    conn.executemany("INSERT INTO cambios (tabla, operacion) VALUES (?, 'R')", [(t,) for t in CLAVES])
+
+
+def compactar(conn, conservar=CAMBIOS_CONSERVADOS):
+    """Borra los cambios más viejos, dejando los ``conservar`` últimos (al menos uno). Devuelve los borrados."""
+    limite = marca_actual(conn) - max(int(conservar), 1)
+    return conn.execute("DELETE FROM cambios WHERE id_cambio <= ?", (limite,)).rowcount
+
+
+def compactar_si_excede(conn, conservar=None, holgura=None):
+    """
+    compactar() solo si el registro supera ``conservar + holgura`` filas (por
+    defecto CAMBIOS_CONSERVADOS y HOLGURA_COMPACTAR); si no, dos búsquedas por clave.
+    """
+    conservar = CAMBIOS_CONSERVADOS if conservar is None else conservar
+    holgura = HOLGURA_COMPACTAR if holgura is None else holgura
+    primera, ultima = conn.execute("SELECT MIN(id_cambio), MAX(id_cambio) FROM cambios").fetchone()
+    if primera is None or ultima - primera + 1 <= conservar + holgura:
+        return 0
+    return compactar(conn, conservar)
+
+
+# ------------------------------------------------------------
+# LECTURA
+# ------------------------------------------------------------
+def desde(marca, tablas=None, limite=MAX_CAMBIOS_DELTA, pool=None):
+    """
+    Cambios posteriores a ``marca`` (hasta ``limite``), para consumidores
+    externos. Devuelve un dict con ``cambios`` (DataFrame id_cambio, tabla,
+    operacion, id_fila), la ``marca`` a reenviar la próxima vez, ``completo``
+    (no quedan más) y ``recargar``: la marca ya no está en el registro
+    (compactado) o hay una restauración de por medio, y hay que releer las
+    tablas enteras.
+    """
+    pool = pool or get_pool()
+    tablas = list(tablas or CLAVES)
+    marcadores = ", ".join("?" for _ in tablas)
+    with pool.lectura() as conn:
+        conn.execute("BEGIN")
+        valida = _marca_valida(conn, marca)
+        df = pd.read_sql_query(
+            f"SELECT id_cambio, tabla, operacion, id_fila FROM cambios "
+            f"WHERE id_cambio > ? AND tabla IN ({marcadores}) ORDER BY id_cambio LIMIT ?",
+            conn, params=(int(marca), *tablas, int(limite)),
+        )
+    return {
+        "cambios": df,
+        "marca": int(df["id_cambio"].iloc[-1]) if len(df) else int(marca),
+        "completo": len(df) < limite,
+        "recargar": not valida or bool((df["operacion"] == "R").any()),
+    }
+
+
+def _marca_valida(conn, marca):
+    primera, ultima = conn.execute("SELECT MIN(id_cambio), MAX(id_cambio) FROM cambios").fetchone()
+    if primera is None:
+        return True
+    return primera - 1 <= marca <= ultima
+
+
+def leer_delta(conn, tabla, marca, columnas, limite=MAX_CAMBIOS_DELTA):
+    """
+    Filas de ``tabla`` que cambiaron después de ``marca``, leídas dentro de la
+    transacción de lectura de ``conn`` (la llamadora la abre con BEGIN).
+
+    Devuelve ``(nueva_marca, ids, filas)``: ``ids`` son todas las claves
+    afectadas (hay que quitarlas del frame) y ``filas`` el estado actual de
+    las que siguen existiendo (hay que añadirlas). Devuelve None si no hay
+    delta posible: marca fuera del registro, una restauración de por medio
+    o más de ``limite`` cambios pendientes.
+    """
+    clave = CLAVES[tabla]
+    nueva_marca = marca_actual(conn)
+    # Los ids de cambio son consecutivos: la diferencia acota el trabajo sin contar filas.
+    if not _marca_valida(conn, marca) or nueva_marca - marca > limite:
+        return None
+    pendientes = "SELECT id_fila FROM cambios WHERE id_cambio > ? AND tabla = ?"
+    if conn.execute(f"{pendientes} AND operacion = 'R' LIMIT 1", (marca, tabla)).fetchone():
+        return None
+    ids = [fila[0] for fila in conn.execute(f"SELECT DISTINCT id_fila FROM ({pendientes}) AS p", (marca, tabla))]
+    filas = pd.read_sql_query(
+        f"SELECT {', '.join(columnas)} FROM {tabla} WHERE {clave} IN ({pendientes}) ORDER BY {clave}",
+        conn, params=(marca, tabla),
+    )
+    return nueva_marca, ids, filas
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Registro de cambios de las tablas del aeropuerto.")
+    parser.add_argument("--db", help="Ruta de la base SQLite (por defecto AEROPUERTO_DB o aeropuerto.db)")
+    parser.add_argument("--desde", type=int, default=None, help="Muestra los cambios posteriores a esta marca")
+    parser.add_argument("--tabla", action="append", choices=list(CLAVES), help="Solo estas tablas (repetible)")
+    parser.add_argument("--compactar", type=int, metavar="CONSERVAR", default=None,
+                        help="Borra los cambios más viejos dejando CONSERVAR")
+    args = parser.parse_args(argv)
+
+    # Import local: esquema.py importa este módulo para sus migraciones.
+    from aeropuerto.esquema import crear_esquema
+
+    pool = get_pool(args.db)
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+        if args.compactar is not None:
+            print(f"{compactar(conn, args.compactar):,} cambios borrados")
+    if args.desde is not None:
+        pendientes = desde(args.desde, args.tabla, pool=pool)
+        if pendientes["recargar"]:
+            print(f"La marca {args.desde} no admite delta (registro compactado o restauración): "
+                  "hace falta una recarga completa", file=sys.stderr)
+        print(pendientes["cambios"].to_string(index=False))
+    with pool.lectura() as conn:
+        print(f"Marca actual: {marca_actual(conn)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# ============================================================
+# PRUEBA DE CARGA DE LA API
+# ============================================================
+# Lanza ``--conexiones`` clientes concurrentes (HTTP/1.1 con
+# keep-alive, sobre asyncio y sin dependencias) que recorren en
+# bucle una mezcla de endpoints de aeropuerto/api.py durante
+# ``--duracion`` segundos, y reporta peticiones por segundo y
+# latencias por endpoint. Con --condicional cada cliente reenvía el
+# último ETag recibido (If-None-Match), como haría un servicio que
+# sondea la API: mide el camino de 304 sin consultas a la base.
+#
+#   python -m aeropuerto.api --procesos 4 &
+#   python -m aeropuerto.carga_api --url http://127.0.0.1:8000 --conexiones 64 --duracion 20
+# ============================================================
+
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+MEZCLA = [
+    "/kpis",
+    "/vuelos?tamano=50",
+    "/vuelos?estado=Completado&orden=fecha&desc=1",
+    "/pasajeros?tamano=50",
+    "/pasajeros?texto=maria",
+    "/transito",
+    "/rutas?tamano=100",
+    "/ocupacion?min_vuelos=2",
+    "/edades?edad_min=18&edad_max=30",
+]
+
+
+async def _peticion(lector, escritor, host, ruta, etag=None):
+    cabeceras = [f"GET {ruta} HTTP/1.1", f"Host: {host}", "Accept-Encoding: gzip"]
+    if etag:
+        cabeceras.append(f"If-None-Match: {etag}")
+    escritor.write(("\r\n".join(cabeceras) + "\r\n\r\n").encode())
+    await escritor.drain()
+    estado = int((await lector.readline()).split()[1])
+    recibidas = {}
+    while (linea := await lector.readline()) not in (b"\r\n", b""):
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        recibidas[nombre.strip().lower()] = valor.strip()
+    cuerpo = await lector.readexactly(int(recibidas.get("content-length", 0)))
+    return estado, recibidas.get("etag"), len(cuerpo)
+
+
+async def _cliente(host, puerto, rutas, fin, condicional, registros):
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    etags = {}
+    try:
+        for ruta in rutas:
+            if time.perf_counter() >= fin:
+                break
+            inicio = time.perf_counter()
+            estado, etag, tamano = await _peticion(lector, escritor, host, ruta, etags.get(ruta) if condicional else None)
+            registros.append((ruta, estado, time.perf_counter() - inicio, tamano))
+            if etag:
+                etags[ruta] = etag
+    finally:
+        escritor.close()
+
+
+async def cargar(url, conexiones=32, duracion=10.0, mezcla=MEZCLA, condicional=False):
+    """Registros ``(ruta, estado, segundos, bytes)`` de todas las peticiones y el tiempo total."""
+    partes = urlsplit(url)
+    host, puerto = partes.hostname, partes.port or 80
+    registros = []
+    inicio = time.perf_counter()
+    fin = inicio + duracion
+    await asyncio.gather(*(
+        # Cada cliente empieza en un punto distinto de la mezcla.
+        _cliente(host, puerto, itertools.islice(itertools.cycle(mezcla), i % len(mezcla), None),
+                 fin, condicional, registros)
+        for i in range(conexiones)
+    ))
+    return registros, time.perf_counter() - inicio
+
+
+def resumir(registros, segundos):
+    df = pd.DataFrame(registros, columns=["ruta", "estado", "segundos", "bytes"])
+
+    def agregar(grupo):
+        tiempos = grupo["segundos"].to_numpy() * 1000
+        return pd.Series({
+            "peticiones": len(grupo),
+            "req_s": len(grupo) / segundos,
+            "p50_ms": np.percentile(tiempos, 50),
+            "p95_ms": np.percentile(tiempos, 95),
+            "p99_ms": np.percentile(tiempos, 99),
+            "304": int((grupo["estado"] == 304).sum()),
+            "errores": int((grupo["estado"] >= 400).sum()),
+            "bytes_medios": grupo["bytes"].mean(),
+        })
+
+    tabla = df.groupby("ruta").apply(agregar)
+    tabla.loc["TOTAL"] = agregar(df)
+    return tabla
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API del aeropuerto.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--conexiones", type=int, default=32)
+    parser.add_argument("--duracion", type=float, default=10.0, help="Segundos")
+    parser.add_argument("--condicional", action="store_true", help="Reenviar el ETag recibido (If-None-Match)")
+    parser.add_argument("--ruta", action="append", help="Ruta a probar (repetible; por defecto, la mezcla)")
+    args = parser.parse_args(argv)
+
+    registros, segundos = asyncio.run(
+        cargar(args.url, args.conexiones, args.duracion, args.ruta or MEZCLA, args.condicional)
+    )
+    if not registros:
+        print("Sin respuestas", file=sys.stderr)
+        return 1
+    tabla = resumir(registros, segundos)
+    with pd.option_context("display.float_format", "{:,.1f}".format, "display.width", 160):
+        print(tabla.to_string())
+    total = tabla.loc["TOTAL"]
+    print(f"\n{int(total['peticiones']):,} peticiones en {segundos:.1f}s: {total['req_s']:,.0f} req/s "
+          f"con {args.conexiones} conexiones", file=sys.stderr)
+    return 1 if total["errores"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
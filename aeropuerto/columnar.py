@@ -0,0 +1,179 @@
+# ============================================================
+# CARGA TIPADA DE TABLAS (DataFrames compactos)
+# ============================================================
+# Las tablas completas que la app mantiene en la caché se leen por
+# bloques y se convierten a tipos compactos: categorías para estados
+# y códigos de aeropuerto (con un único diccionario de categorías
+# para origen/destino/aeropuerto), fechas datetime64 parseadas una
+# sola vez, enteros de 32/16 bits y texto en Arrow cuando pyarrow
+# está disponible. reporte_memoria() compara cada tabla con lo que
+# ocuparía cargada con los tipos por defecto de pandas.
+# ============================================================
+
+import numpy as np
+import pandas as pd
+
+from aeropuerto.cambios import CLAVES
+from aeropuerto.conexion import get_pool
+from aeropuerto.instrumentacion import instrumentacion
+
+TAMANO_BLOQUE = 100_000
+
+# tabla -> {columna: tipo lógico}
+ESQUEMAS = {
+    "vuelos": {
+        "id_vuelo": "int32", "fecha": "fecha", "origen": "aeropuerto", "destino": "aeropuerto",
+        "num_pasajeros": "int32", "estado": "categoria",
+    },
+    "pasajeros": {
+        "id_pasajero": "int32", "vuelo_id": "int32", "ticket": "texto", "nombre": "texto", "edad": "int16",
+    },
+    "pasajeros_transito": {
+        "id_transito": "int32", "fecha": "fecha", "aeropuerto": "aeropuerto", "num_pasajeros": "int32",
+    },
+}
+
+_LIMITES = {"int16": np.iinfo(np.int16), "int32": np.iinfo(np.int32)}
+
+# Filas leídas con los tipos por defecto para estimar el tamaño "sin tipar".
+_FILAS_MUESTRA = 10_000
+
+
+def _entero(serie, tipo):
+    """Entero de ``tipo`` bits (nullable si hay NULL); int64 si algún valor no cabe."""
+    limites = _LIMITES[tipo]
+    if serie.notna().any() and (serie.min() < limites.min or serie.max() > limites.max):
+        return serie.astype("Int64") if serie.isna().any() else serie.astype(np.int64)
+    return serie.astype(tipo.capitalize()) if serie.isna().any() else serie.astype(tipo)
+
+
+def _texto(serie):
+    try:
+        return serie.astype("string[pyarrow]")
+    except (ImportError, TypeError):
+        return serie.astype(object)
+
+
+def _convertir(bloque, esquema):
+    columnas = {}
+    for columna, tipo in esquema.items():
+        serie = bloque[columna]
+        if tipo in _LIMITES:
+            columnas[columna] = _entero(serie, tipo)
+        elif tipo == "fecha":
+            columnas[columna] = pd.to_datetime(serie, format="ISO8601", errors="coerce")
+        elif tipo in ("categoria", "aeropuerto"):
+            columnas[columna] = serie.astype("category")
+        else:
+            columnas[columna] = _texto(serie)
+    return pd.DataFrame(columnas, index=bloque.index)
+
+
+def _unificar_categorias(bloques, esquema):
+    """
+    Da a cada columna categórica las mismas categorías en todos los bloques
+    (y a todas las columnas de aeropuerto un diccionario común), para que
+    pd.concat conserve el tipo category y origen == destino sea comparable.
+    """
+    grupos = {}
+    for columna, tipo in esquema.items():
+        if tipo in ("categoria", "aeropuerto"):
+            grupos.setdefault(tipo if tipo == "aeropuerto" else columna, []).append(columna)
+    for columnas in grupos.values():
+        categorias = sorted({c for b in bloques for col in columnas for c in b[col].cat.categories})
+        for b in bloques:
+            for col in columnas:
+                b[col] = b[col].cat.set_categories(categorias)
+
+
+def leer_tabla(tabla, pool=None, tamano_bloque=TAMANO_BLOQUE, columnas=None):
+    """
+    Lee ``tabla`` completa con tipos compactos, convirtiendo bloque a bloque.
+    Con ``columnas`` solo se leen (y convierten) esas columnas, en ese orden.
+    """
+    esquema = ESQUEMAS.get(tabla)
+    if columnas is not None and esquema is not None:
+        desconocidas = [c for c in columnas if c not in esquema]
+        if desconocidas:
+            raise ValueError(f"Columnas desconocidas en {tabla}: {', '.join(desconocidas)}")
+        esquema = {c: esquema[c] for c in columnas}
+    pool = pool or get_pool()
+    with instrumentacion.tramo(f"db.tabla.{tabla}"):
+        df = _leer_tabla(tabla, esquema, pool, tamano_bloque, columnas)
+    instrumentacion.contar("filas_leidas", len(df))
+    return df
+
+
+def _leer_tabla(tabla, esquema, pool, tamano_bloque, columnas):
+    with pool.lectura() as conn:
+        if esquema is None:
+            return pd.read_sql_query(f"SELECT {', '.join(columnas) if columnas else '*'} FROM {tabla}", conn)
+        # Por clave: en SQLite es el orden del recorrido (gratis); PostgreSQL no garantiza ninguno.
+        consulta = f"SELECT {', '.join(esquema)} FROM {tabla} ORDER BY {CLAVES[tabla]}"
+        # Cada bloque en tipos por defecto se descarta en cuanto se convierte.
+        bloques = [_convertir(b, esquema) for b in pd.read_sql_query(consulta, conn, chunksize=tamano_bloque)]
+    if not bloques:
+        with pool.lectura() as conn:
+            vacio = pd.read_sql_query(f"{consulta} LIMIT 0", conn)
+        bloques = [_convertir(vacio, esquema)]
+    _unificar_categorias(bloques, esquema)
+    return pd.concat(bloques, ignore_index=True) if len(bloques) > 1 else bloques[0].reset_index(drop=True)
+
+
+def aplicar_cambios(df, tabla, filas, ids, clave):
+    """
+    ``df`` (leído con leer_tabla) con las filas de clave en ``ids`` sustituidas
+    por ``filas`` (su estado actual, en tipos por defecto; las borradas no
+    vienen). Solo se convierten las filas cambiadas; el resultado queda
+    ordenado por ``clave``.
+    """
+    esquema = {c: ESQUEMAS[tabla][c] for c in df.columns}
+    nuevas = _convertir(filas, esquema)
+    base = df[~df[clave].isin(ids)] if len(ids) else df.copy(deep=False)
+    bloques = [base, nuevas]
+    _unificar_categorias(bloques, esquema)
+    resultado = pd.concat(bloques, ignore_index=True)
+    # Las altas llevan claves nuevas y quedan al final; solo una modificación obliga a reordenar.
+    if len(base) and len(nuevas) and nuevas[clave].min() < base[clave].max():
+        resultado = resultado.sort_values(clave, kind="stable", ignore_index=True)
+    instrumentacion.contar("filas_leidas", len(nuevas))
+    return resultado
+
+
+# ------------------------------------------------------------
+# REPORTE DE MEMORIA
+# ------------------------------------------------------------
+def memoria_columnas(df):
+    """Bytes por columna (incluye el contenido de los textos)."""
+    return df.memory_usage(index=False, deep=True)
+
+
+def reporte_memoria(tablas, pool=None):
+    """
+    ``tablas``: dict nombre -> DataFrame tipado. Devuelve una fila por tabla y
+    columna con el tipo, los bytes actuales y los estimados con los tipos por
+    defecto de pandas (extrapolados desde una muestra de filas).
+    """
+    pool = pool or get_pool()
+    filas = []
+    for tabla, df in tablas.items():
+        with pool.lectura() as conn:
+            muestra = pd.read_sql_query(f"SELECT * FROM {tabla} LIMIT {_FILAS_MUESTRA}", conn)
+        por_fila = memoria_columnas(muestra) / max(len(muestra), 1)
+        actuales = memoria_columnas(df)
+        for columna in df.columns:
+            filas.append({
+                "tabla": tabla,
+                "columna": columna,
+                "tipo": str(df[columna].dtype),
+                "bytes": int(actuales[columna]),
+                "bytes_sin_tipar": int(por_fila.get(columna, 0) * len(df)),
+            })
+    return pd.DataFrame(filas, columns=["tabla", "columna", "tipo", "bytes", "bytes_sin_tipar"])
+
+
+def resumen_memoria(reporte):
+    """Totales por tabla de un reporte_memoria(), con el ahorro relativo."""
+    resumen = reporte.groupby("tabla", sort=False)[["bytes", "bytes_sin_tipar"]].sum()
+    resumen["ahorro"] = 1 - resumen["bytes"] / resumen["bytes_sin_tipar"].where(resumen["bytes_sin_tipar"] > 0)
+    return resumen
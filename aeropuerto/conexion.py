@@ -0,0 +1,304 @@
+# ============================================================
+# POOL DE CONEXIONES SQLITE (modo WAL)
+# ============================================================
+# Una sola conexión de escritura (SQLite admite un escritor a la vez)
+# protegida por un lock, y un conjunto acotado de conexiones de solo
+# lectura que se reutilizan entre reruns y sesiones. En modo WAL los
+# lectores no bloquean al escritor ni el escritor a los lectores.
+#
+# El destino se indica con una ruta o una URL (AEROPUERTO_DB): una
+# ruta o "sqlite:///ruta" usa este pool; otros esquemas de URL se
+# resuelven con los backends registrados con registrar_backend().
+# Un backend es una clase de pool con la misma interfaz (ruta,
+# lectura(), escritura(), salud(), metricas(), cerrar(),
+# esperar_cambios(), que usa el canal de notificaciones, y Error, la
+# clase base de sus excepciones). "postgresql://" se resuelve con el
+# backend de aeropuerto/postgres.py, que se importa al pedirlo.
+# ============================================================
+
+import importlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+RUTA_DB_POR_DEFECTO = "aeropuerto.db"
+VARIABLE_RUTA_DB = "AEROPUERTO_DB"
+
+# Pragmas aplicados a cada conexión nueva. cache_size negativo = KiB.
+PRAGMAS = {
+    "synchronous": "NORMAL",      # seguro en WAL; fsync solo en checkpoints
+    "cache_size": -64000,         # ~64 MB de caché de páginas por conexión
+    "mmap_size": 268435456,       # 256 MB de E/S mapeada en memoria
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,         # ms a esperar si otro proceso tiene el lock
+}
+
+# Sentencias compiladas que cada conexión conserva (caché de sqlite3 por texto SQL):
+# las consultas de cada sección se repiten en cada rerun y no se vuelven a preparar.
+SENTENCIAS_PREPARADAS = 512
+
+
+def ruta_db_configurada():
+    """Ruta de la base de datos: variable de entorno AEROPUERTO_DB o 'aeropuerto.db'."""
+    return os.environ.get(VARIABLE_RUTA_DB, RUTA_DB_POR_DEFECTO)
+
+
+class PoolConexiones:
+    """
+    Pool de conexiones para un archivo SQLite.
+
+    Uso:
+        with pool.lectura() as conn:
+            df = pd.read_sql_query("SELECT ...", conn)
+        with pool.escritura() as conn:
+            conn.execute("INSERT ...")   # commit automático al salir
+    """
+
+    Error = sqlite3.Error
+
+    def __init__(self, ruta, max_lectores=8, timeout=30.0):
+        self.ruta = ruta
+        self.max_lectores = max_lectores
+        self.timeout = timeout
+        self._lectores_libres = queue.LifoQueue()
+        self._lectores_creados = 0
+        # Lectores prestados ahora mismo, y los que cerrar() encontró prestados:
+        # esos se cierran al devolverse en vez de volver a la cola.
+        self._prestados = set()
+        self._cerrar_al_devolver = set()
+        self._lock_creacion = threading.Lock()
+        self._lock_escritura = threading.Lock()
+        self._escritor = None
+        self._metricas = {
+            "lecturas": 0,
+            "escrituras": 0,
+            "rollbacks": 0,
+            "espera_lectura_s": 0.0,
+            "espera_escritura_s": 0.0,
+            "espera_escritura_max_s": 0.0,
+        }
+        self._lock_metricas = threading.Lock()
+        self.journal_mode = None
+
+    # --------------------------------------------------------
+    # Creación de conexiones
+    # --------------------------------------------------------
+    def _abrir(self, solo_lectura):
+        conn = sqlite3.connect(
+            self.ruta, check_same_thread=False, timeout=self.timeout, cached_statements=SENTENCIAS_PREPARADAS
+        )
+        # WAL es persistente en el archivo, pero se fija en cada conexión por si
+        # la base se recreó desde fuera del pool.
+        self.journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        for nombre, valor in PRAGMAS.items():
+            conn.execute(f"PRAGMA {nombre}={valor}")
+        if solo_lectura:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _tomar_lector(self):
+        try:
+            return self._lectores_libres.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock_creacion:
+            if self._lectores_creados < self.max_lectores:
+                self._lectores_creados += 1
+                crear = True
+            else:
+                crear = False
+        if crear:
+            try:
+                return self._abrir(solo_lectura=True)
+            except Exception:
+                with self._lock_creacion:
+                    self._lectores_creados -= 1
+                raise
+        try:
+            return self._lectores_libres.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"No hay conexiones de lectura libres tras {self.timeout}s"
+            ) from None
+
+    def _sumar(self, clave, valor):
+        with self._lock_metricas:
+            self._metricas[clave] += valor
+
+    # --------------------------------------------------------
+    # API pública
+    # --------------------------------------------------------
+    @contextmanager
+    def lectura(self):
+        inicio = time.perf_counter()
+        conn = self._tomar_lector()
+        with self._lock_creacion:
+            self._prestados.add(conn)
+        self._sumar("espera_lectura_s", time.perf_counter() - inicio)
+        self._sumar("lecturas", 1)
+        try:
+            yield conn
+        finally:
+            self._devolver(conn)
+
+    def _devolver(self, conn):
+        with self._lock_creacion:
+            self._prestados.discard(conn)
+            cerrar = conn in self._cerrar_al_devolver
+            if cerrar:
+                self._cerrar_al_devolver.discard(conn)
+                self._lectores_creados -= 1
+        if cerrar:
+            conn.close()
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._lectores_libres.put(conn)
+
+    @contextmanager
+    def escritura(self):
+        inicio = time.perf_counter()
+        if not self._lock_escritura.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError(
+                f"No se obtuvo la conexión de escritura tras {self.timeout}s"
+            )
+        espera = time.perf_counter() - inicio
+        with self._lock_metricas:
+            self._metricas["espera_escritura_s"] += espera
+            self._metricas["espera_escritura_max_s"] = max(self._metricas["espera_escritura_max_s"], espera)
+            self._metricas["escrituras"] += 1
+        try:
+            if self._escritor is None:
+                self._escritor = self._abrir(solo_lectura=False)
+            conn = self._escritor
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                self._sumar("rollbacks", 1)
+                raise
+        finally:
+            self._lock_escritura.release()
+
+    def esperar_cambios(self, parar, intervalo):
+        """
+        Genera un aviso cada vez que otra conexión (de este u otro proceso)
+        confirma cambios, hasta que se active el evento ``parar``. Usa una
+        conexión propia: PRAGMA data_version solo cambia por commits ajenos.
+        """
+        conn = self._abrir(solo_lectura=True)
+        try:
+            anterior = conn.execute("PRAGMA data_version").fetchone()[0]
+            while not parar.wait(intervalo):
+                actual = conn.execute("PRAGMA data_version").fetchone()[0]
+                if actual != anterior:
+                    anterior = actual
+                    yield
+        finally:
+            conn.close()
+
+    def salud(self):
+        """Comprueba que la base responde; devuelve (ok, mensaje)."""
+        try:
+            with self.lectura() as conn:
+                conn.execute("SELECT 1").fetchone()
+                modo = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            return True, f"OK ({modo})"
+        except sqlite3.Error as e:
+            return False, str(e)
+
+    def metricas(self):
+        with self._lock_metricas:
+            datos = dict(self._metricas)
+        datos.update({
+            "ruta": self.ruta,
+            "journal_mode": self.journal_mode,
+            "lectores_creados": self._lectores_creados,
+            "lectores_libres": self._lectores_libres.qsize(),
+            "max_lectores": self.max_lectores,
+            "escritor_ocupado": self._lock_escritura.locked(),
+        })
+        return datos
+
+    def cerrar(self):
+        """
+        Cierra el escritor y los lectores libres; los que están prestados se
+        cierran al devolverse. El pool sigue siendo usable: abre conexiones nuevas.
+        """
+        with self._lock_escritura:
+            if self._escritor is not None:
+                self._escritor.close()
+                self._escritor = None
+        with self._lock_creacion:
+            self._cerrar_al_devolver |= self._prestados
+        while True:
+            try:
+                self._lectores_libres.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock_creacion:
+                self._lectores_creados -= 1
+
+
+# ------------------------------------------------------------
+# BACKENDS
+# ------------------------------------------------------------
+# esquema de URL -> clase de pool (recibe la URL completa).
+BACKENDS = {}
+
+# Backends incluidos en el paquete: el módulo se importa (y se registra) al usarlos.
+BACKENDS_INCLUIDOS = {"postgresql": "aeropuerto.postgres", "postgres": "aeropuerto.postgres"}
+
+
+def registrar_backend(esquema, clase):
+    BACKENDS[esquema] = clase
+
+
+def resolver_destino(destino):
+    """
+    (clase de pool, ruta o URL normalizada). Sin esquema o con "sqlite://"
+    es un archivo SQLite; como en SQLAlchemy, "sqlite:///rel.db" es relativa
+    y "sqlite:////tmp/abs.db" absoluta.
+    """
+    esquema, separador, resto = destino.partition("://")
+    if not separador:
+        return PoolConexiones, os.path.abspath(destino)
+    if esquema == "sqlite":
+        return PoolConexiones, os.path.abspath(resto[1:] if resto.startswith("/") else resto)
+    if esquema not in BACKENDS and esquema in BACKENDS_INCLUIDOS:
+        importlib.import_module(BACKENDS_INCLUIDOS[esquema])
+    clase = BACKENDS.get(esquema)
+    if clase is None:
+        raise ValueError(
+            f"Backend de base de datos desconocido: {esquema!r} "
+            f"(disponibles: {', '.join(dict.fromkeys(['sqlite', *BACKENDS, *BACKENDS_INCLUIDOS]))})"
+        )
+    return clase, destino
+
+
+# ------------------------------------------------------------
+# POOL COMPARTIDO DEL PROCESO
+# ------------------------------------------------------------
+_pools = {}
+_lock_pools = threading.Lock()
+
+
+def get_pool(ruta=None):
+    """Devuelve el pool del proceso para ``ruta`` (ruta o URL; por defecto, la configurada)."""
+    clase, ruta = resolver_destino(ruta or ruta_db_configurada())
+    with _lock_pools:
+        pool = _pools.get(ruta)
+        if pool is None:
+            pool = _pools[ruta] = clase(ruta)
+        return pool
+
+
+def cerrar_pools():
+    with _lock_pools:
+        for pool in _pools.values():
+            pool.cerrar()
+        _pools.clear()
@@ -0,0 +1,173 @@
+# ============================================================
+# CONSTRUCTOR DE CONSULTAS
+# ============================================================
+# Traduce los filtros de cada sección a SQL parametrizado con
+# WHERE / GROUP BY, para que de la base solo salgan las filas y
+# agregados que la página va a mostrar. Los resultados pasan por
+# la caché de proceso, ligados a la versión de las tablas leídas.
+# ============================================================
+
+import pandas as pd
+
+from aeropuerto.cache import cache_consultas
+from aeropuerto.conexion import get_pool
+from aeropuerto.instrumentacion import instrumentacion
+
+
+def _escapar_like(texto):
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class Consulta:
+    """
+    Constructor encadenable de un SELECT sobre una tabla.
+
+        Consulta("vuelos").contiene(["origen", "destino"], "mex").igual("estado", "Completado")
+    """
+
+    def __init__(self, tabla, columnas="*"):
+        self.tabla = tabla
+        self.columnas = columnas if isinstance(columnas, str) else ", ".join(columnas)
+        self._where = []
+        self._params = []
+        self._group_by = []
+        self._having = []
+        self._params_having = []
+        self._order_by = []
+        self._limite = None
+
+    # --------------------------------------------------------
+    # Filtros (se combinan con AND)
+    # --------------------------------------------------------
+    def donde(self, condicion, *params):
+        self._where.append(condicion)
+        self._params.extend(params)
+        return self
+
+    def igual(self, columna, valor):
+        return self.donde(f"{columna} = ?", valor)
+
+    def en(self, columna, valores):
+        """IN (...) parametrizado. Una lista vacía no filtra (equivale a 'Todos')."""
+        valores = list(valores)
+        if not valores:
+            return self
+        marcadores = ", ".join("?" for _ in valores)
+        return self.donde(f"{columna} IN ({marcadores})", *valores)
+
+    def contiene(self, columnas, texto):
+        """Subcadena sin distinguir mayúsculas (LIKE) en cualquiera de las columnas."""
+        if not texto:
+            return self
+        patron = f"%{_escapar_like(texto)}%"
+        condicion = " OR ".join(f"{col} LIKE ? ESCAPE '\\'" for col in columnas)
+        return self.donde(f"({condicion})", *([patron] * len(columnas)))
+
+    def entre(self, columna, minimo, maximo):
+        return self.donde(f"{columna} BETWEEN ? AND ?", minimo, maximo)
+
+    # --------------------------------------------------------
+    # Agregación, orden y límite
+    # --------------------------------------------------------
+    def agrupar(self, *columnas):
+        self._group_by.extend(columnas)
+        return self
+
+    def teniendo(self, condicion, *params):
+        """Condición HAVING sobre los grupos (se combina con AND)."""
+        self._having.append(condicion)
+        self._params_having.extend(params)
+        return self
+
+    def ordenar(self, *expresiones):
+        self._order_by.extend(expresiones)
+        return self
+
+    def limite(self, n):
+        self._limite = int(n)
+        return self
+
+    def sql(self):
+        partes = [f"SELECT {self.columnas} FROM {self.tabla}"]
+        if self._where:
+            partes.append("WHERE " + " AND ".join(self._where))
+        if self._group_by:
+            partes.append("GROUP BY " + ", ".join(self._group_by))
+        if self._having:
+            partes.append("HAVING " + " AND ".join(self._having))
+        if self._order_by:
+            partes.append("ORDER BY " + ", ".join(self._order_by))
+        if self._limite is not None:
+            partes.append(f"LIMIT {self._limite}")
+        return " ".join(partes), tuple(self._params + self._params_having)
+
+    def copiar(self, columnas=None):
+        """Copia con los mismos filtros (y, opcionalmente, otras columnas)."""
+        nueva = Consulta(self.tabla, self.columnas if columnas is None else columnas)
+        nueva._where = list(self._where)
+        nueva._params = list(self._params)
+        nueva._group_by = list(self._group_by)
+        nueva._having = list(self._having)
+        nueva._params_having = list(self._params_having)
+        nueva._order_by = list(self._order_by)
+        nueva._limite = self._limite
+        return nueva
+
+    @property
+    def filtrada(self):
+        return bool(self._where)
+
+    # --------------------------------------------------------
+    # Ejecución
+    # --------------------------------------------------------
+    def leer(self):
+        """Ejecuta la consulta (o la sirve desde caché) y devuelve un DataFrame compartido."""
+        sql, params = self.sql()
+        return leer_sql(sql, params, (self.tabla,))
+
+    def escalar(self):
+        df = self.leer()
+        return df.iat[0, 0] if not df.empty else None
+
+
+def leer_sql(sql, params=(), tablas=()):
+    """SELECT arbitrario cacheado; ``tablas`` son las tablas de las que depende el resultado."""
+    def cargar():
+        with instrumentacion.tramo("db.consulta"), get_pool().lectura() as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+        instrumentacion.contar("filas_leidas", len(df))
+        return df
+    return cache_consultas.obtener(("sql", sql, params), tuple(tablas), cargar)
+
+
+# ------------------------------------------------------------
+# CONSULTAS POR SECCIÓN
+# ------------------------------------------------------------
+def estados_vuelo():
+    return Consulta("vuelos", "DISTINCT estado").ordenar("estado").leer()["estado"].tolist()
+
+
+def consulta_vuelos(texto=None, estado=None):
+    """Filtros de 'Gestión de Vuelos': búsqueda en origen/destino y estado exacto."""
+    consulta = Consulta("vuelos").contiene(["origen", "destino"], texto)
+    if estado and estado != "Todos":
+        consulta.igual("estado", estado)
+    return consulta
+
+
+def consulta_pasajeros(texto=None):
+    """Búsqueda simple de pasajeros por nombre o ticket."""
+    return Consulta("pasajeros").contiene(["nombre", "ticket"], texto)
+
+
+def consulta_transito(aeropuerto=None):
+    return Consulta("pasajeros_transito").contiene(["aeropuerto"], aeropuerto)
+
+
+def aeropuertos_en_vuelos():
+    df = leer_sql(
+        "SELECT origen AS aeropuerto FROM vuelos UNION SELECT destino FROM vuelos ORDER BY aeropuerto",
+        tablas=("vuelos",),
+    )
+    return df["aeropuerto"].tolist()
+
@@ -0,0 +1,248 @@
+# ============================================================
+# COPIAS DE LA BASE (plantilla de reinicio y copias con nombre)
+# ============================================================
+# Reiniciar la base ya no hace DROP + CREATE + generar fila a fila:
+# se restaura una plantilla (una base de ejemplo ya construida, con
+# índices, resúmenes e índice de búsqueda) copiándola página a página
+# con la API de backup de SQLite sobre la conexión de escritura del
+# pool. La copia avanza por bloques de PAGINAS_POR_PASO páginas; en
+# modo WAL los lectores siguen viendo la versión anterior hasta que
+# termina. Las mismas funciones guardan y restauran copias con nombre
+# para cambiar entre conjuntos de datos.
+#
+# Las copias viven en el directorio de AEROPUERTO_COPIAS o, si no se
+# define, en "<base>.copias/" junto al archivo de la base:
+#
+#   python -m aeropuerto.copias guardar carga-1m
+#   python -m aeropuerto.copias restaurar carga-1m
+# ============================================================
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import date
+
+from aeropuerto import cambios, generador
+from aeropuerto.aeropuertos import COLUMNAS, catalogo
+from aeropuerto.cache import TABLAS
+from aeropuerto.conexion import PoolConexiones, get_pool
+from aeropuerto.esquema import VERSION_ESQUEMA, crear_esquema, olvidar_esquema
+from aeropuerto.instantaneas import almacen_instantaneas
+
+VARIABLE_DIRECTORIO = "AEROPUERTO_COPIAS"
+
+# 1024 páginas de 4 KiB = 4 MiB por paso de la copia.
+PAGINAS_POR_PASO = 1024
+
+EXTENSION = ".db"
+PREFIJO_PLANTILLA = "_plantilla-"
+
+_NOMBRE_VALIDO = re.compile(r"^[\w.-]+$")
+
+
+def directorio(pool=None):
+    pool = pool or get_pool()
+    return os.environ.get(VARIABLE_DIRECTORIO) or f"{pool.ruta}.copias"
+
+
+def _ruta(nombre, pool):
+    if not _NOMBRE_VALIDO.match(nombre) or nombre.startswith((".", PREFIJO_PLANTILLA)):
+        raise ValueError(f"Nombre de copia no válido: {nombre!r} (letras, números, '.', '_' y '-')")
+    return os.path.join(directorio(pool), f"{nombre}{EXTENSION}")
+
+
+def _copiar(origen, destino, progreso):
+    """Copia la base de ``origen`` sobre ``destino`` por bloques de páginas."""
+    def aviso(_estado, restantes, total):
+        if progreso:
+            progreso(total - restantes, total)
+    origen.backup(destino, pages=PAGINAS_POR_PASO, progress=aviso)
+
+
+# ------------------------------------------------------------
+# COPIAS CON NOMBRE
+# ------------------------------------------------------------
+def listar(pool=None):
+    """Copias guardadas (sin la plantilla), de la más reciente a la más antigua."""
+    carpeta = directorio(pool)
+    if not os.path.isdir(carpeta):
+        return []
+    copias = []
+    for archivo in os.listdir(carpeta):
+        if not archivo.endswith(EXTENSION) or archivo.startswith(PREFIJO_PLANTILLA):
+            continue
+        estado = os.stat(os.path.join(carpeta, archivo))
+        copias.append({"nombre": archivo[:-len(EXTENSION)], "bytes": estado.st_size, "modificada": estado.st_mtime})
+    return sorted(copias, key=lambda c: c["modificada"], reverse=True)
+
+
+def guardar(nombre, pool=None, progreso=None):
+    """Guarda el estado actual de la base como la copia ``nombre`` (la reemplaza si existe)."""
+    pool = pool or get_pool()
+    ruta = _ruta(nombre, pool)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    _volcar(pool, ruta, progreso)
+    return ruta
+
+
+def _volcar(pool, ruta, progreso=None):
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    destino = sqlite3.connect(temporal)
+    try:
+        # Un lector del pool: en WAL la copia ve una versión consistente sin frenar al escritor.
+        with pool.lectura() as conn:
+            _copiar(conn, destino, progreso)
+        # Archivo autocontenido (sin -wal/-shm): se puede abrir en solo lectura y mover.
+        destino.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        destino.close()
+    os.replace(temporal, ruta)  # atómico: una restauración nunca lee un archivo a medias
+
+
+def restaurar(nombre, pool=None, progreso=None):
+    """Reemplaza el contenido de la base por la copia ``nombre``."""
+    pool = pool or get_pool()
+    ruta = _ruta(nombre, pool)
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No existe la copia {nombre!r} en {directorio(pool)}")
+    _restaurar_archivo(pool, ruta, progreso)
+
+
+def borrar(nombre, pool=None):
+    os.remove(_ruta(nombre, pool))
+
+
+def _restaurar_archivo(pool, ruta, progreso=None):
+    origen = sqlite3.connect(f"file:{ruta}?mode=ro", uri=True)
+    try:
+        with pool.escritura() as conn:
+            anteriores = _versiones(conn)
+            marca = _marca(conn)
+            _copiar(origen, conn, progreso)
+            # Una copia de un esquema anterior se pone al día aquí mismo.
+            crear_esquema(conn)
+            # Ningún delta del registro de cambios cruza la restauración.
+            cambios.marcar_restauracion(conn, marca)
+            # Las versiones de datos nunca retroceden: las instantáneas y la caché
+            # de cualquier proceso deben ver la restauración como un cambio.
+            restauradas = _versiones(conn)
+            conn.executemany(
+                "UPDATE versiones_datos SET version = ? WHERE tabla = ?",
+                [(max(anteriores.get(t, 0), restauradas.get(t, 0)) + 1, t) for t in TABLAS],
+            )
+    finally:
+        origen.close()
+    olvidar_esquema(pool)
+    almacen_instantaneas.sincronizar(pool)
+
+
+def _marca(conn):
+    try:
+        return cambios.marca_actual(conn)
+    except sqlite3.OperationalError:
+        return 0
+
+
+def _versiones(conn):
+    try:
+        return dict(conn.execute("SELECT tabla, version FROM versiones_datos").fetchall())
+    except sqlite3.OperationalError:
+        return {}
+
+
+# ------------------------------------------------------------
+# PLANTILLA DE REINICIO
+# ------------------------------------------------------------
+def _nombre_plantilla(pool):
+    # Se rehace si cambia el esquema, el día (las fechas de ejemplo son
+    # relativas a hoy) o el catálogo de aeropuertos de la base.
+    firma = hashlib.sha1(",".join(catalogo(pool).codigos).encode()).hexdigest()[:8]
+    return f"{PREFIJO_PLANTILLA}v{VERSION_ESQUEMA}-{date.today().isoformat()}-{firma}{EXTENSION}"
+
+
+def plantilla(pool=None):
+    """Ruta de la plantilla de datos de ejemplo; se construye si no existe."""
+    pool = pool or get_pool()
+    carpeta = directorio(pool)
+    ruta = os.path.join(carpeta, _nombre_plantilla(pool))
+    if os.path.exists(ruta):
+        return ruta
+    os.makedirs(carpeta, exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    nueva = PoolConexiones(temporal)
+    try:
+        with nueva.escritura() as conn:
+            crear_esquema(conn)
+        # El catálogo de la base se conserva al reiniciar (antes solo se reponían vuelos, tránsito y pasajeros).
+        with nueva.escritura() as conn:
+            conn.execute("DELETE FROM aeropuertos")
+            with pool.lectura() as actual:
+                filas = actual.execute(f"SELECT {', '.join(COLUMNAS)} FROM aeropuertos").fetchall()
+            conn.executemany(
+                f"INSERT INTO aeropuertos ({', '.join(COLUMNAS)}) VALUES ({', '.join('?' * len(COLUMNAS))})", filas
+            )
+        generador.generar(forzar=True, aeropuertos=catalogo(pool).codigos, pool=nueva)
+    finally:
+        nueva.cerrar()
+    # Sin otras conexiones abiertas ya se puede salir de WAL: un único archivo que mover.
+    conn = sqlite3.connect(temporal)
+    try:
+        conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        conn.close()
+    os.replace(temporal, ruta)
+    for archivo in os.listdir(carpeta):
+        if archivo.startswith(PREFIJO_PLANTILLA) and archivo != os.path.basename(ruta) and archivo.endswith(EXTENSION):
+            os.remove(os.path.join(carpeta, archivo))
+    return ruta
+
+
+def reiniciar(pool=None, progreso=None):
+    """Reinicia la base con los datos de ejemplo restaurando la plantilla."""
+    pool = pool or get_pool()
+    _restaurar_archivo(pool, plantilla(pool), progreso)
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Copias de la base del panel del aeropuerto.")
+    parser.add_argument("--db", help="Ruta de la base SQLite (por defecto AEROPUERTO_DB o aeropuerto.db)")
+    sub = parser.add_subparsers(dest="accion", required=True)
+    sub.add_parser("listar", help="Lista las copias guardadas")
+    for accion in ("guardar", "restaurar", "borrar"):
+        sub.add_parser(accion).add_argument("nombre")
+    sub.add_parser("reiniciar", help="Restaura los datos de ejemplo desde la plantilla")
+    args = parser.parse_args(argv)
+
+    pool = get_pool(args.db)
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+
+    def progreso(copiadas, total):
+        print(f"\rpáginas: {copiadas:,}/{total:,}", end="" if copiadas < total else "\n", file=sys.stderr)
+
+    inicio = time.perf_counter()
+    if args.accion == "listar":
+        for copia in listar(pool):
+            print(f"{copia['nombre']}\t{copia['bytes'] / 1e6:.1f} MB\t{time.ctime(copia['modificada'])}")
+        return 0
+    if args.accion == "guardar":
+        print(f"Copia guardada en {guardar(args.nombre, pool, progreso)}")
+    elif args.accion == "restaurar":
+        restaurar(args.nombre, pool, progreso)
+    elif args.accion == "borrar":
+        borrar(args.nombre, pool)
+    else:
+        reiniciar(pool, progreso)
+    print(f"{args.accion.capitalize()}: {time.perf_counter() - inicio:.2f}s ({pool.ruta})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
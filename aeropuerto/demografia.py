@@ -0,0 +1,206 @@
+# ============================================================
+# HISTOGRAMAS DE EDAD DE LOS PASAJEROS
+# ============================================================
+# La edad es un dominio entero pequeño (EDAD_MIN..EDAD_MAX), así que
+# la distribución de un grupo de pasajeros cabe en 121 contadores.
+# Los triggers de resúmenes los mantienen global, por vuelo y por ruta
+# (resumen_edades*); aquí se leen como un HistogramaEdades con sumas
+# acumuladas, del que salen sin recorrer pasajeros:
+#
+#   contar / promedio de cualquier rango   O(1)
+#   mediana                                O(log 121)
+#   moda, bandas, histograma               O(121)
+#
+#   python -m aeropuerto.demografia --origen MEX --edad-min 18 --edad-max 30
+# ============================================================
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from aeropuerto.cache import cache_consultas
+from aeropuerto.conexion import get_pool
+from aeropuerto.consultas import leer_sql
+from aeropuerto.esquema import crear_esquema
+from aeropuerto.fuzzy import EDAD_MAX, EDAD_MIN
+
+EDADES = np.arange(EDAD_MIN, EDAD_MAX + 1)
+
+# (etiqueta, edad mínima, edad máxima) de las bandas de "Análisis de Pasajeros".
+BANDAS_EDAD = [
+    ("0-17", 0, 17), ("18-24", 18, 24), ("25-34", 25, 34), ("35-44", 35, 44),
+    ("45-54", 45, 54), ("55-64", 55, 64), ("65+", 65, EDAD_MAX),
+]
+
+
+class HistogramaEdades:
+    """Pasajeros por edad con sumas acumuladas; los rangos son cerrados [edad_min, edad_max]."""
+
+    __slots__ = ("conteos", "_acumulado", "_acumulado_edades")
+
+    def __init__(self, conteos):
+        self.conteos = np.asarray(conteos, dtype=np.int64)
+        self._acumulado = np.concatenate(([0], np.cumsum(self.conteos)))
+        self._acumulado_edades = np.concatenate(([0], np.cumsum(self.conteos * EDADES)))
+
+    @classmethod
+    def de_edades(cls, edades):
+        """Histograma de un array de edades (las nulas o fuera del dominio no cuentan)."""
+        edades = pd.Series(edades).dropna().to_numpy(dtype=np.int64)
+        edades = edades[(edades >= EDAD_MIN) & (edades <= EDAD_MAX)]
+        return cls(np.bincount(edades - EDAD_MIN, minlength=len(EDADES)))
+
+    @classmethod
+    def de_filas(cls, df):
+        """Histograma desde filas (edad, total) de una tabla resumen_edades*."""
+        conteos = np.zeros(len(EDADES), dtype=np.int64)
+        edades = pd.to_numeric(df["edad"], errors="coerce")
+        validas = edades.between(EDAD_MIN, EDAD_MAX).to_numpy()
+        np.add.at(conteos, edades[validas].to_numpy(dtype=np.int64) - EDAD_MIN, df["total"].to_numpy()[validas])
+        return cls(conteos)
+
+    def _limites(self, edad_min, edad_max):
+        desde = min(max(int(edad_min), EDAD_MIN), EDAD_MAX + 1) - EDAD_MIN
+        hasta = min(max(int(edad_max), EDAD_MIN - 1), EDAD_MAX) - EDAD_MIN + 1
+        return desde, max(desde, hasta)
+
+    @property
+    def total(self):
+        return int(self._acumulado[-1])
+
+    def contar(self, edad_min=EDAD_MIN, edad_max=EDAD_MAX):
+        desde, hasta = self._limites(edad_min, edad_max)
+        return int(self._acumulado[hasta] - self._acumulado[desde])
+
+    def promedio(self, edad_min=EDAD_MIN, edad_max=EDAD_MAX):
+        desde, hasta = self._limites(edad_min, edad_max)
+        n = self._acumulado[hasta] - self._acumulado[desde]
+        if not n:
+            return None
+        return float((self._acumulado_edades[hasta] - self._acumulado_edades[desde]) / n)
+
+    def _edad_en(self, posicion):
+        # Edad del pasajero en ``posicion`` (0 = el más joven) del orden global.
+        return int(np.searchsorted(self._acumulado, posicion, side="right") - 1) + EDAD_MIN
+
+    def mediana(self, edad_min=EDAD_MIN, edad_max=EDAD_MAX):
+        """Como pandas: con un número par de pasajeros, media de los dos centrales."""
+        desde, hasta = self._limites(edad_min, edad_max)
+        base, n = self._acumulado[desde], self._acumulado[hasta] - self._acumulado[desde]
+        if not n:
+            return None
+        return (self._edad_en(base + (n - 1) // 2) + self._edad_en(base + n // 2)) / 2
+
+    def moda(self, edad_min=EDAD_MIN, edad_max=EDAD_MAX):
+        """Edad(es) más frecuentes del rango, de menor a mayor."""
+        desde, hasta = self._limites(edad_min, edad_max)
+        tramo = self.conteos[desde:hasta]
+        if not tramo.any():
+            return []
+        return (np.flatnonzero(tramo == tramo.max()) + desde + EDAD_MIN).tolist()
+
+    def extremos(self):
+        """(edad mínima, edad máxima) con pasajeros, o None si no hay ninguno."""
+        edades = np.flatnonzero(self.conteos)
+        if not len(edades):
+            return None
+        return int(edades[0]) + EDAD_MIN, int(edades[-1]) + EDAD_MIN
+
+    def serie(self, edad_min=EDAD_MIN, edad_max=EDAD_MAX):
+        """Pasajeros por edad del rango (solo edades presentes), como value_counts().sort_index()."""
+        desde, hasta = self._limites(edad_min, edad_max)
+        tramo = self.conteos[desde:hasta]
+        presentes = np.flatnonzero(tramo)
+        return pd.Series(tramo[presentes], index=pd.Index(presentes + desde + EDAD_MIN, name="edad"), name="count")
+
+    def por_bandas(self, bandas=BANDAS_EDAD):
+        """Pasajeros por banda de edad, en el orden de ``bandas``."""
+        etiquetas = [etiqueta for etiqueta, _, _ in bandas]
+        return pd.Series(
+            [self.contar(minimo, maximo) for _, minimo, maximo in bandas],
+            index=pd.CategoricalIndex(etiquetas, categories=etiquetas, ordered=True, name="rango_edad"),
+            name="pasajeros",
+        )
+
+    def estadisticas(self, edad_min=EDAD_MIN, edad_max=EDAD_MAX):
+        """Promedio, mediana, moda(s) e histograma del rango (mismas claves que filtros.estadisticas_edad)."""
+        return {
+            "pasajeros": self.contar(edad_min, edad_max),
+            "promedio": self.promedio(edad_min, edad_max),
+            "mediana": self.mediana(edad_min, edad_max),
+            "moda": self.moda(edad_min, edad_max),
+            "histograma": self.serie(edad_min, edad_max),
+        }
+
+
+# ------------------------------------------------------------
+# LECTURA DE LOS RESÚMENES
+# ------------------------------------------------------------
+def histograma(vuelo_id=None, origen=None, destino=None):
+    """
+    Histograma de todos los pasajeros, de los de un vuelo o de los de una ruta
+    (``origen`` y/o ``destino``). Se cachea ligado a las versiones de los datos.
+    """
+    if vuelo_id is not None:
+        sql, params, tablas = (
+            "SELECT edad, total FROM resumen_edades_vuelo WHERE vuelo_id = ? AND total > 0",
+            (int(vuelo_id),), ("pasajeros",),
+        )
+    elif origen or destino:
+        condiciones = [f"{columna} = ?" for columna, valor in (("origen", origen), ("destino", destino)) if valor]
+        sql, params, tablas = (
+            f"SELECT edad, SUM(total) AS total FROM resumen_edades_ruta WHERE {' AND '.join(condiciones)} "
+            f"GROUP BY edad HAVING SUM(total) > 0",
+            tuple(valor for valor in (origen, destino) if valor), ("pasajeros", "vuelos"),
+        )
+    else:
+        sql, params, tablas = "SELECT edad, total FROM resumen_edades WHERE total > 0", (), ("pasajeros",)
+
+    return cache_consultas.obtener(
+        ("edades", sql, params), tablas, lambda: HistogramaEdades.de_filas(leer_sql(sql, params, tablas))
+    )
+
+
+def rutas_con_pasajeros():
+    """(origen, destino) con al menos un pasajero registrado, ordenadas."""
+    df = leer_sql(
+        "SELECT origen, destino FROM resumen_edades_ruta WHERE origen != '' "
+        "GROUP BY origen, destino HAVING SUM(total) > 0 ORDER BY origen, destino",
+        tablas=("pasajeros", "vuelos"),
+    )
+    return list(df.itertuples(index=False, name=None))
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distribución de edades de los pasajeros.")
+    parser.add_argument("--db", help="Ruta de la base SQLite (por defecto AEROPUERTO_DB o aeropuerto.db)")
+    parser.add_argument("--vuelo", type=int, default=None)
+    parser.add_argument("--origen", default=None)
+    parser.add_argument("--destino", default=None)
+    parser.add_argument("--edad-min", type=int, default=EDAD_MIN)
+    parser.add_argument("--edad-max", type=int, default=EDAD_MAX)
+    args = parser.parse_args(argv)
+
+    pool = get_pool(args.db)
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+    h = histograma(args.vuelo, args.origen and args.origen.upper(), args.destino and args.destino.upper())
+    print(h.por_bandas().to_string())
+    n = h.contar(args.edad_min, args.edad_max)
+    if not n:
+        print(f"\nSin pasajeros de {args.edad_min} a {args.edad_max} años")
+        return 0
+    print(f"\n{n:,} pasajeros de {args.edad_min} a {args.edad_max} años · "
+          f"promedio {h.promedio(args.edad_min, args.edad_max):.1f} · "
+          f"mediana {h.mediana(args.edad_min, args.edad_max):g} · "
+          f"moda {', '.join(map(str, h.moda(args.edad_min, args.edad_max)))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# ============================================================
+# COLA DE ESCRITURA EN SEGUNDO PLANO (group commit)
+# ============================================================
+# Los formularios encolan sus INSERT/UPDATE/DELETE y reciben un
+# Future al instante. Un único hilo escritor por base toma todo lo
+# que haya en la cola (hasta max_lote sentencias, esperando como
+# mucho espera_lote segundos a que lleguen más) y lo confirma en
+# una sola transacción: un fsync por lote en lugar de uno por
+# formulario. Cada sentencia va en su propio SAVEPOINT, así que un
+# error de datos solo falla su Future. Si la base está ocupada
+# (SQLITE_BUSY, p. ej. por otro proceso; en PostgreSQL, un conflicto
+# de serialización o un interbloqueo) el lote se reintenta con
+# espera exponencial.
+# ============================================================
+
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from aeropuerto import cambios
+from aeropuerto.conexion import get_pool
+from aeropuerto.instantaneas import almacen_instantaneas
+from aeropuerto.instrumentacion import instrumentacion
+
+_FIN = object()
+
+# Códigos primarios de SQLite para "base ocupada/bloqueada".
+_SQLITE_BUSY = 5
+_SQLITE_LOCKED = 6
+
+# SQLSTATE de PostgreSQL reintentables: fallo de serialización, interbloqueo, lock no disponible.
+_SQLSTATE_REINTENTABLES = {"40001", "40P01", "55P03"}
+
+
+def base_ocupada(error):
+    """True si ``error`` es un SQLITE_BUSY/SQLITE_LOCKED o su equivalente en PostgreSQL (reintentable)."""
+    codigo = getattr(error, "sqlite_errorcode", None)
+    if codigo is not None:
+        return codigo & 0xFF in (_SQLITE_BUSY, _SQLITE_LOCKED)
+    estado = getattr(error, "sqlstate", None)
+    if estado is not None:
+        return estado in _SQLSTATE_REINTENTABLES
+    mensaje = str(error).lower()
+    return "locked" in mensaje or "busy" in mensaje
+
+
+class ColaEscritura:
+    """
+    Escritor en segundo plano para un pool.
+
+        futuro = cola.encolar("INSERT INTO vuelos (...) VALUES (?, ...)", params)
+        id_nuevo = futuro.result(timeout=5)   # lastrowid, o la excepción de la base
+    """
+
+    def __init__(self, pool=None, max_lote=500, espera_lote=0.005, reintentos=6, espera_reintento=0.05):
+        self.pool = pool or get_pool()
+        self.max_lote = max_lote
+        self.espera_lote = espera_lote
+        self.reintentos = reintentos
+        self.espera_reintento = espera_reintento
+        self._cola = queue.Queue()
+        self._lock_metricas = threading.Lock()
+        self._metricas = {
+            "encoladas": 0, "confirmadas": 0, "fallidas": 0, "lotes": 0,
+            "lote_max": 0, "reintentos": 0, "commit_s": 0.0,
+        }
+        self._hilo = threading.Thread(target=self._bucle, name=f"escritor-{self.pool.ruta}", daemon=True)
+        self._hilo.start()
+
+    # --------------------------------------------------------
+    # API pública
+    # --------------------------------------------------------
+    def encolar(self, sql, params=()):
+        """Encola una sentencia de escritura y devuelve su Future (resultado: lastrowid)."""
+        futuro = Future()
+        with self._lock_metricas:
+            self._metricas["encoladas"] += 1
+        self._cola.put((sql, tuple(params), futuro))
+        return futuro
+
+    def pendientes(self):
+        return self._cola.qsize()
+
+    def vaciar(self):
+        """Bloquea hasta que todo lo encolado hasta ahora se haya procesado."""
+        self._cola.join()
+
+    def cerrar(self, timeout=None):
+        """Procesa lo pendiente y detiene el hilo escritor."""
+        if self._hilo.is_alive():
+            self._cola.put(_FIN)
+            self._hilo.join(timeout)
+
+    def metricas(self):
+        with self._lock_metricas:
+            metricas = dict(self._metricas)
+        metricas["pendientes"] = self.pendientes()
+        metricas["lote_medio"] = metricas["confirmadas"] / metricas["lotes"] if metricas["lotes"] else 0.0
+        return metricas
+
+    # --------------------------------------------------------
+    # Hilo escritor
+    # --------------------------------------------------------
+    def _bucle(self):
+        terminar = False
+        while not terminar:
+            primero = self._cola.get()
+            if primero is _FIN:
+                self._cola.task_done()
+                break
+            lote = [primero]
+            # Group commit: se junta lo que llegue durante una ventana corta.
+            limite = time.monotonic() + self.espera_lote
+            while len(lote) < self.max_lote:
+                restante = limite - time.monotonic()
+                try:
+                    item = self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _FIN:
+                    self._cola.task_done()
+                    terminar = True
+                    break
+                lote.append(item)
+            try:
+                self._escribir(lote)
+            finally:
+                for _ in lote:
+                    self._cola.task_done()
+
+    def _escribir(self, lote):
+        inicio = time.perf_counter()
+        for intento in range(self.reintentos + 1):
+            try:
+                with instrumentacion.tramo("db.escritura_lote"):
+                    resultados = self._transaccion(lote)
+                break
+            except self.pool.Error as e:
+                if not base_ocupada(e) or intento == self.reintentos:
+                    self._resolver(lote, [e] * len(lote))
+                    return
+                with self._lock_metricas:
+                    self._metricas["reintentos"] += 1
+                time.sleep(self.espera_reintento * 2 ** intento)
+            except Exception as e:
+                self._resolver(lote, [e] * len(lote))
+                return
+
+        with self._lock_metricas:
+            self._metricas["lotes"] += 1
+            self._metricas["lote_max"] = max(self._metricas["lote_max"], len(lote))
+            self._metricas["commit_s"] += time.perf_counter() - inicio
+        try:
+            # Camino único de refresco: caché e instantáneas ven las nuevas versiones.
+            almacen_instantaneas.sincronizar(self.pool)
+        except self.pool.Error:
+            pass
+        self._resolver(lote, resultados)
+
+    def _transaccion(self, lote):
+        resultados = []
+        with self.pool.escritura() as conn:
+            # IMMEDIATE toma el bloqueo de escritura al inicio: si la base está
+            # ocupada falla aquí, antes de ejecutar nada, y el lote se reintenta entero.
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, params, _ in lote:
+                conn.execute("SAVEPOINT sentencia")
+                try:
+                    cursor = conn.execute(sql, params)
+                except self.pool.Error as e:
+                    if base_ocupada(e):
+                        raise
+                    conn.execute("ROLLBACK TO sentencia")
+                    resultados.append(e)
+                else:
+                    resultados.append(cursor.lastrowid)
+                conn.execute("RELEASE sentencia")
+            # Los triggers anotan cada fila escrita en el registro de cambios: se recorta aquí.
+            cambios.compactar_si_excede(conn)
+        return resultados
+
+    def _resolver(self, lote, resultados):
+        fallidas = 0
+        for (_, _, futuro), resultado in zip(lote, resultados):
+            if isinstance(resultado, BaseException):
+                futuro.set_exception(resultado)
+                fallidas += 1
+            else:
+                futuro.set_result(resultado)
+        with self._lock_metricas:
+            self._metricas["fallidas"] += fallidas
+            self._metricas["confirmadas"] += len(lote) - fallidas
+        instrumentacion.contar("filas_escritas", len(lote) - fallidas)
+
+
+_colas = {}
+_lock_colas = threading.Lock()
+
+
+def get_cola(pool=None):
+    """Cola de escritura del proceso para la base del pool (una por archivo)."""
+    pool = pool or get_pool()
+    with _lock_colas:
+        cola = _colas.get(pool.ruta)
+        if cola is None:
+            cola = _colas[pool.ruta] = ColaEscritura(pool)
+        return cola
+
+
+@atexit.register
+def cerrar_colas():
+    """Confirma lo pendiente antes de salir del proceso."""
+    with _lock_colas:
+        colas = list(_colas.values())
+        _colas.clear()
+    for cola in colas:
+        cola.cerrar(timeout=10)
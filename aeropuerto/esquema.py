@@ -0,0 +1,171 @@
+# ============================================================
+# ESQUEMA Y MIGRACIONES
+# ============================================================
+# La versión del esquema se guarda en PRAGMA user_version. Cada
+# migración es idempotente y se aplica solo si la base está en una
+# versión anterior. En PostgreSQL el esquema es otro (ver
+# aeropuerto/postgres.py) y se crea de una vez, sin migraciones.
+# ============================================================
+
+from aeropuerto import aeropuertos, busqueda, cambios, instantaneas, resumenes
+
+TABLAS_SQL = [
+    '''
+        CREATE TABLE IF NOT EXISTS vuelos (
+            id_vuelo INTEGER PRIMARY KEY AUTOINCREMENT,
+            fecha DATE,
+            origen TEXT,
+            destino TEXT,
+            num_pasajeros INTEGER,
+            estado TEXT
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS pasajeros_transito (
+            id_transito INTEGER PRIMARY KEY AUTOINCREMENT,
+            fecha DATE,
+            aeropuerto TEXT,
+            num_pasajeros INTEGER
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS pasajeros (
+            id_pasajero INTEGER PRIMARY KEY AUTOINCREMENT,
+            vuelo_id INTEGER,
+            ticket TEXT,
+            nombre TEXT,
+            edad INTEGER,
+            FOREIGN KEY (vuelo_id) REFERENCES vuelos(id_vuelo)
+        )
+    ''',
+]
+
+# Índices que usan los filtros y agregaciones de cada sección (ver consultas.py).
+INDICES_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_vuelos_fecha ON vuelos(fecha)",
+    "CREATE INDEX IF NOT EXISTS idx_vuelos_origen_destino ON vuelos(origen, destino)",
+    "CREATE INDEX IF NOT EXISTS idx_vuelos_destino ON vuelos(destino)",
+    "CREATE INDEX IF NOT EXISTS idx_vuelos_estado ON vuelos(estado)",
+    "CREATE INDEX IF NOT EXISTS idx_pasajeros_vuelo ON pasajeros(vuelo_id)",
+    "CREATE INDEX IF NOT EXISTS idx_pasajeros_ticket ON pasajeros(ticket)",
+    "CREATE INDEX IF NOT EXISTS idx_pasajeros_edad ON pasajeros(edad)",
+    "CREATE INDEX IF NOT EXISTS idx_transito_fecha_aeropuerto ON pasajeros_transito(fecha, aeropuerto)",
+    "CREATE INDEX IF NOT EXISTS idx_transito_aeropuerto ON pasajeros_transito(aeropuerto)",
+]
+
+
+def _migracion_1_indices(c):
+    for sql in INDICES_SQL:
+        c.execute(sql)
+    # Estadísticas para que el planificador elija bien entre los índices nuevos.
+    c.execute("ANALYZE")
+
+
+def _migracion_3_importaciones(c):
+    # Puntos de control de importaciones masivas (ver importacion.py).
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS importaciones (
+            id_archivo TEXT PRIMARY KEY,
+            tabla TEXT,
+            nombre_archivo TEXT,
+            filas_procesadas INTEGER NOT NULL DEFAULT 0,
+            insertadas INTEGER NOT NULL DEFAULT 0,
+            rechazadas INTEGER NOT NULL DEFAULT 0,
+            completada INTEGER NOT NULL DEFAULT 0,
+            actualizada TEXT
+        )
+    ''')
+
+
+# (versión destino, función). Se aplican en orden.
+MIGRACIONES = [
+    (1, _migracion_1_indices),
+    (2, resumenes.migracion_resumenes),
+    (3, _migracion_3_importaciones),
+    (4, busqueda.migracion_fts),
+    (5, aeropuertos.migracion_aeropuertos),
+    (6, resumenes.migracion_series),
+    (7, instantaneas.migracion_versiones),
+    (8, resumenes.migracion_ocupacion),
+    (9, resumenes.migracion_edades),
+    (10, cambios.migracion_cambios),
+]
+
+VERSION_ESQUEMA = MIGRACIONES[-1][0]
+
+
+def version_actual(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def crear_esquema(conn):
+    """
+    Crea las tablas si no existen y aplica las migraciones pendientes.
+    Se ejecuta dentro de la transacción de la conexión recibida.
+    """
+    if getattr(conn, "dialecto", "sqlite") == "postgresql":
+        from aeropuerto.postgres import crear_esquema_postgres
+
+        return crear_esquema_postgres(conn)
+    c = conn.cursor()
+    for sql in TABLAS_SQL:
+        c.execute(sql)
+
+    version = version_actual(conn)
+    completo = _objetos_presentes(c)
+    if version >= VERSION_ESQUEMA and completo:
+        return
+    # Si las tablas se recrearon (DROP + CREATE) user_version sigue intacto pero
+    # sus índices y triggers desaparecieron; como las migraciones son
+    # idempotentes, se reaplican todas.
+    if not completo:
+        version = 0
+    for destino, migracion in MIGRACIONES:
+        if destino > version:
+            migracion(c)
+    c.execute(f"PRAGMA user_version = {max(version_actual(conn), VERSION_ESQUEMA)}")
+
+
+def _objetos_presentes(c):
+    """True si existen todos los índices y triggers que crean las migraciones."""
+    nombres = {fila[0] for fila in c.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+    esperados = {sql.split(" IF NOT EXISTS ")[1].split(" ")[0] for sql in INDICES_SQL}
+    esperados.update(resumenes.nombres_triggers())
+    esperados.update(aeropuertos.nombres_triggers())
+    esperados.update(busqueda.nombres_triggers(c.connection))
+    esperados.update(instantaneas.nombres_triggers())
+    esperados.update(cambios.nombres_triggers())
+    return esperados <= nombres
+
+
+# ------------------------------------------------------------
+# MARCA DE ESQUEMA VERIFICADO
+# ------------------------------------------------------------
+# PRAGMA schema_version (la "cookie" de esquema de SQLite) cambia con
+# cada CREATE/DROP/ALTER y con cada restauración por backup, venga de
+# donde venga. Si coincide con la anotada tras la última verificación
+# de este proceso, el arranque de cada rerun se salta crear_esquema()
+# y la revisión de tablas vacías: una sola lectura de cabecera.
+_verificados = {}  # ruta de la base -> schema_version verificado
+
+
+def marca_esquema(conn):
+    return conn.execute("PRAGMA schema_version").fetchone()[0]
+
+
+def esquema_vigente(pool):
+    """True si el esquema no cambió desde la última llamada a recordar_esquema() para este pool."""
+    anotada = _verificados.get(pool.ruta)
+    if anotada is None:
+        return False
+    with pool.lectura() as conn:
+        return marca_esquema(conn) == anotada
+
+
+def recordar_esquema(pool):
+    with pool.lectura() as conn:
+        _verificados[pool.ruta] = marca_esquema(conn)
+
+
+def olvidar_esquema(pool):
+    _verificados.pop(pool.ruta, None)
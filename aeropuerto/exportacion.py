@@ -0,0 +1,148 @@
+# ============================================================
+# EXPORTACIÓN POR STREAMING (CSV, CSV.GZ, PARQUET)
+# ============================================================
+# Las filas se leen de SQLite con fetchmany en lotes y se escriben
+# directamente al destino, así que la memoria usada depende del
+# tamaño del lote y no del tamaño del historial. La lectura ocurre
+# en una sola conexión de lectura: en modo WAL el export ve una
+# instantánea consistente aunque otras sesiones sigan escribiendo.
+#
+#   python -m aeropuerto.exportacion vuelos --formato csv.gz --salida vuelos.csv.gz
+# ============================================================
+
+import argparse
+import csv
+import gzip
+import io
+import sys
+import tempfile
+
+from aeropuerto.conexion import get_pool
+
+TAMANO_LOTE = 10_000
+
+# formato -> (extensión, tipo MIME)
+FORMATOS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+# Consultas de exportación predefinidas (las mismas que usaban los botones de descarga).
+EXPORTACIONES = {
+    "vuelos": "SELECT *, strftime('%Y-%m', fecha) AS mes FROM vuelos ORDER BY id_vuelo",
+    "pasajeros": "SELECT * FROM pasajeros ORDER BY id_pasajero",
+    "pasajeros_transito": "SELECT * FROM pasajeros_transito ORDER BY id_transito",
+}
+
+
+def iterar_lotes(sql, params=(), tamano_lote=TAMANO_LOTE, pool=None):
+    """Genera ``(columnas, filas)`` por cada lote de hasta ``tamano_lote`` filas."""
+    pool = pool or get_pool()
+    with pool.lectura() as conn:
+        cursor = conn.execute(sql, params)
+        columnas = [d[0] for d in cursor.description]
+        # El primer lote se entrega aunque esté vacío, para poder escribir el encabezado.
+        filas = cursor.fetchmany(tamano_lote)
+        yield columnas, filas
+        while filas:
+            filas = cursor.fetchmany(tamano_lote)
+            if filas:
+                yield columnas, filas
+        cursor.close()
+
+
+def _escribir_csv(salida_binaria, lotes):
+    texto = io.TextIOWrapper(salida_binaria, encoding="utf-8", newline="")
+    escritor = csv.writer(texto)
+    total = 0
+    encabezado = False
+    for columnas, filas in lotes:
+        if not encabezado:
+            escritor.writerow(columnas)
+            encabezado = True
+        escritor.writerows(filas)
+        total += len(filas)
+    texto.flush()
+    texto.detach()  # no cerrar el archivo binario subyacente
+    return total
+
+
+def _escribir_parquet(salida_binaria, lotes):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("La exportación a Parquet requiere el paquete 'pyarrow'.") from e
+
+    escritor = None
+    total = 0
+    try:
+        for columnas, filas in lotes:
+            datos = {col: [fila[i] for fila in filas] for i, col in enumerate(columnas)}
+            if escritor is None:
+                tabla = pa.Table.from_pydict(datos)
+                escritor = pq.ParquetWriter(salida_binaria, tabla.schema, compression="snappy")
+            else:
+                tabla = pa.Table.from_pydict(datos).cast(escritor.schema)
+            escritor.write_table(tabla)  # un row group por lote
+            total += len(filas)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return total
+
+
+def exportar(salida, sql, params=(), formato="csv", tamano_lote=TAMANO_LOTE, pool=None):
+    """
+    Escribe el resultado de ``sql`` en ``salida`` (ruta o archivo binario abierto)
+    en el formato indicado. Devuelve el número de filas exportadas.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato} (opciones: {', '.join(FORMATOS)})")
+    if isinstance(salida, (str, bytes)) or hasattr(salida, "__fspath__"):
+        with open(salida, "wb") as archivo:
+            return exportar(archivo, sql, params, formato, tamano_lote, pool)
+
+    lotes = iterar_lotes(sql, params, tamano_lote, pool)
+    if formato == "parquet":
+        return _escribir_parquet(salida, lotes)
+    if formato == "csv.gz":
+        with gzip.GzipFile(fileobj=salida, mode="wb") as comprimido:
+            return _escribir_csv(comprimido, lotes)
+    return _escribir_csv(salida, lotes)
+
+
+def exportar_a_temporal(sql, params=(), formato="csv", tamano_lote=TAMANO_LOTE, pool=None):
+    """
+    Exporta a un archivo temporal (en memoria hasta 8 MB, luego en disco) y lo
+    devuelve abierto y rebobinado, listo para entregarlo como descarga.
+    """
+    temporal = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    exportar(temporal, sql, params, formato, tamano_lote, pool)
+    temporal.seek(0)
+    return temporal
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta tablas del aeropuerto por streaming.")
+    parser.add_argument("tabla", choices=sorted(EXPORTACIONES))
+    parser.add_argument("--db", help="Ruta de la base SQLite (por defecto AEROPUERTO_DB o aeropuerto.db)")
+    parser.add_argument("--formato", choices=sorted(FORMATOS), default="csv")
+    parser.add_argument("--salida", help="Archivo de salida (por defecto <tabla><extensión>; '-' = stdout)")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="Filas por lote de lectura")
+    args = parser.parse_args(argv)
+
+    salida = args.salida or args.tabla + FORMATOS[args.formato][0]
+    destino = sys.stdout.buffer if salida == "-" else salida
+    filas = exportar(destino, EXPORTACIONES[args.tabla], formato=args.formato,
+                     tamano_lote=args.lote, pool=get_pool(args.db))
+    print(f"{filas:,} filas exportadas a {salida}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# ============================================================
+# FILTROS DE PASAJEROS (Búsqueda Avanzada por Edad)
+# ============================================================
+# La sección pagina el filtro en SQL (consulta_avanzada) y saca las
+# estadísticas del grupo de un GROUP BY edad de, como mucho, 121
+# filas. Las versiones en memoria operan sobre un DataFrame de
+# pasajeros: nunca lo modifican, solo seleccionan filas con una
+# máscara y añaden columnas con assign(). Viven fuera de app.py para
+# poder medirlas y reutilizarlas sin levantar Streamlit.
+# ============================================================
+
+import numpy as np
+
+from aeropuerto import busqueda
+from aeropuerto.consultas import Consulta
+from aeropuerto.demografia import HistogramaEdades
+from aeropuerto.fuzzy import pertenencias
+from aeropuerto.instrumentacion import instrumentado
+
+# Columna de pertenencia que se muestra para cada grupo etario.
+COLUMNAS_FUZZY = {
+    "Jóvenes (18-30)": ("Joven", "Pertenencia (17-30)"),
+    "Adultos (31-60)": ("Adulto", "Pertenencia Adulto (25-65)"),
+    "Seniors (61+)": ("Senior", "Pertenencia Senior (55+)"),
+}
+
+
+def consulta_avanzada(edad_min, edad_max, texto=None):
+    """`Consulta` de pasajeros con edad en [edad_min, edad_max] y, si hay ``texto``, que coinciden en nombre/ticket."""
+    consulta = Consulta("pasajeros").entre("edad", edad_min, edad_max)
+    if texto:
+        condicion, params = busqueda.filtro_coincidencias(texto)
+        consulta.donde(condicion, *params)
+    return consulta
+
+
+@instrumentado("transformacion.estadisticas_consulta")
+def estadisticas_consulta(consulta):
+    """Como estadisticas_edad, pero de los pasajeros de ``consulta``: la base devuelve solo los conteos por edad."""
+    conteos = consulta.copiar("edad, COUNT(*) AS total").agrupar("edad").leer()
+    return HistogramaEdades.de_filas(conteos).estadisticas()
+
+
+@instrumentado("transformacion.filtrar_pasajeros")
+def filtrar_pasajeros(pasajeros_df, edad_min, edad_max, texto=None):
+    """Pasajeros con edad en [edad_min, edad_max] y, si hay ``texto``, que coinciden en nombre/ticket."""
+    # Los filtros se combinan en una sola máscara: solo se copian las filas seleccionadas.
+    mascara = pasajeros_df["edad"].between(edad_min, edad_max)
+    if texto:
+        mascara &= pasajeros_df["id_pasajero"].isin(busqueda.ids_coincidentes(texto))
+    return pasajeros_df[mascara.fillna(False).to_numpy(dtype=bool)]
+
+
+@instrumentado("transformacion.pertenencias")
+def con_pertenencias(pasajeros_df, conjuntos):
+    """
+    Añade al frente una columna de pertenencia por cada conjunto de edad
+    indicado (nombres de columna de COLUMNAS_FUZZY), evaluados en una sola pasada.
+    """
+    if not conjuntos:
+        return pasajeros_df
+    grados = pertenencias(pasajeros_df["edad"].to_numpy(dtype=float, na_value=np.nan), conjuntos)
+    nombres_columnas = {conjunto: columna for conjunto, columna in COLUMNAS_FUZZY.values()}
+    columnas_fuzzy = {nombres_columnas[conjunto]: grados[conjunto].round(4) for conjunto in conjuntos}
+    df = pasajeros_df.assign(**columnas_fuzzy)
+    return df[list(columnas_fuzzy) + [col for col in df.columns if col not in columnas_fuzzy]]
+
+
+@instrumentado("transformacion.estadisticas_edad")
+def estadisticas_edad(pasajeros_df):
+    """
+    Promedio, mediana, moda(s) e histograma (edad -> pasajeros) del grupo: un
+    bincount de sus edades y el resto sale de los 121 contadores. Si el grupo es
+    solo un rango de edad, demografia.histograma() ya lo tiene precalculado.
+    """
+    return HistogramaEdades.de_edades(pasajeros_df["edad"]).estadisticas()
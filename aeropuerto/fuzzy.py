@@ -0,0 +1,101 @@
+# ============================================================
+# MOTOR DE LÓGICA FUZZY (vectorizado, basado en Fuzzy.py)
+# ============================================================
+# Las funciones de pertenencia aceptan escalares o arrays de NumPy.
+# Como la edad es un dominio entero pequeño (0-120), cada conjunto
+# se evalúa una sola vez sobre todo el dominio y se guarda como tabla
+# de consulta; clasificar millones de pasajeros es entonces un solo
+# indexado de arrays.
+# ============================================================
+
+from functools import lru_cache
+
+import numpy as np
+
+EDAD_MIN = 0
+EDAD_MAX = 120
+
+
+def _resultado(valor, x):
+    return float(valor) if np.ndim(x) == 0 else valor
+
+
+def triangular(x, a=17, b=28, c=30):
+    """
+    Calcula el grado de pertenencia para una función triangular.
+    Por defecto, define el conjunto "Joven" (17-30) con pico en 28.
+    Valores fuera de [a, c] (o NaN) tienen pertenencia 0.
+    """
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mu = np.select(
+            [(x <= a) | (x >= c), x < b, x >= b],
+            [0.0, (x - a) / (b - a), (c - x) / (c - b)],
+            default=0.0,  # NaN
+        )
+    return _resultado(mu, x)
+
+
+def trapezoidal(x, a, b, c, d):
+    """
+    Pertenencia trapezoidal: sube de a a b, vale 1 entre b y c y baja de c a d.
+    Con a == b (o c == d) el lado correspondiente es un "hombro" vertical.
+    """
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        subida = np.where(b > a, (x - a) / (b - a), 1.0)
+        bajada = np.where(d > c, (d - x) / (d - c), 1.0)
+    mu = np.minimum(np.minimum(subida, bajada), 1.0)
+    mu = np.where((x < a) | (x > d), 0.0, np.clip(mu, 0.0, 1.0))
+    return _resultado(np.nan_to_num(mu, nan=0.0), x)
+
+
+FUNCIONES = {"triangular": triangular, "trapezoidal": trapezoidal}
+
+# Conjuntos lingüísticos de edad: nombre -> (función, parámetros).
+CONJUNTOS_EDAD = {
+    "Joven": ("triangular", (17, 28, 30)),
+    "Adulto": ("trapezoidal", (25, 35, 55, 65)),
+    "Senior": ("trapezoidal", (55, 65, EDAD_MAX, EDAD_MAX)),
+}
+
+
+@lru_cache(maxsize=64)
+def tabla_pertenencia(funcion, parametros, minimo=EDAD_MIN, maximo=EDAD_MAX):
+    """Pertenencia precalculada para cada entero de [minimo, maximo] (solo lectura)."""
+    dominio = np.arange(minimo, maximo + 1)
+    tabla = np.asarray(FUNCIONES[funcion](dominio, *parametros), dtype=np.float64)
+    tabla.setflags(write=False)
+    return tabla
+
+
+def pertenencia(edades, conjunto="Joven", conjuntos=CONJUNTOS_EDAD):
+    """Grado de pertenencia de un array de edades enteras a un conjunto."""
+    return pertenencias(edades, [conjunto], conjuntos)[conjunto]
+
+
+def pertenencias(edades, nombres=None, conjuntos=CONJUNTOS_EDAD):
+    """
+    Evalúa varios conjuntos en una sola pasada sobre ``edades``.
+    Devuelve un dict nombre -> array de pertenencias (float64).
+    """
+    nombres = list(nombres or conjuntos)
+    edades = np.asarray(edades)
+    matriz = np.stack([tabla_pertenencia(*conjuntos[n]) for n in nombres])
+    # Las edades fuera del dominio (o NaN) no indexan la tabla: se calculan directamente.
+    if np.issubdtype(edades.dtype, np.integer):
+        validas = (edades >= EDAD_MIN) & (edades <= EDAD_MAX)
+    else:
+        validas = np.isfinite(edades) & (edades >= EDAD_MIN) & (edades <= EDAD_MAX)
+    todas_validas = bool(validas.all())
+    if todas_validas:
+        indices = edades.astype(np.intp, copy=False) - EDAD_MIN
+    else:
+        indices = np.where(validas, edades, EDAD_MIN).astype(np.intp) - EDAD_MIN
+    resultado = matriz.take(indices, axis=1)
+    if not todas_validas:
+        fuera = ~validas
+        for i, nombre in enumerate(nombres):
+            funcion, parametros = conjuntos[nombre]
+            resultado[i, fuera] = FUNCIONES[funcion](edades[fuera].astype(float), *parametros)
+    return dict(zip(nombres, resultado))
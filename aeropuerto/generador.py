@@ -0,0 +1,211 @@
+# ============================================================
+# GENERADOR DE DATOS DE EJEMPLO (escalable)
+# ============================================================
+# Genera vuelos, conteos de tránsito y pasajeros con NumPy por
+# lotes y los inserta con executemany dentro de una sola
+# transacción. Sirve tanto para los 100/40/200 registros de la
+# demo como para bases de millones de pasajeros en pruebas de carga:
+#
+#   python -m aeropuerto.generador --db carga.db --pasajeros 10000000 --semilla 42
+# ============================================================
+
+import argparse
+import sys
+import time
+from contextlib import nullcontext
+from datetime import date, timedelta
+
+import numpy as np
+
+from aeropuerto import cambios, resumenes
+from aeropuerto.aeropuertos import catalogo
+from aeropuerto.cache import cache_consultas
+from aeropuerto.conexion import get_pool
+from aeropuerto.esquema import crear_esquema
+
+ESTADOS = ["Programado", "En curso", "Completado", "Cancelado"]
+NOMBRES = ["Juan", "María", "Carlos", "Ana", "Luis", "Fernanda", "Jorge", "Sofía", "Andrés", "Elena"]
+APELLIDOS = ["García", "Pérez", "López", "Martínez", "Hernández", "Díaz", "Moreno", "Álvarez"]
+
+TAMANO_LOTE = 50_000
+# Filas a partir de las cuales se suspenden los triggers de resumen durante la carga.
+UMBRAL_CARGA_MASIVA = 20_000
+
+
+def _fechas(fecha_base, dias):
+    return np.array([(fecha_base - timedelta(days=i)).isoformat() for i in range(dias)], dtype=object)
+
+
+def _filas_vuelos(rng, n, aeropuertos, fechas):
+    if len(aeropuertos) < 2:
+        raise ValueError(
+            f"Se necesitan al menos 2 aeropuertos para generar vuelos (origen y destino distintos); "
+            f"hay {len(aeropuertos)}. Cargue un catálogo con python -m aeropuerto.aeropuertos"
+        )
+    origen = rng.integers(0, len(aeropuertos), size=n)
+    # Destino distinto del origen: se sortea entre los n-1 restantes y se salta el origen.
+    destino = rng.integers(0, len(aeropuertos) - 1, size=n)
+    destino += destino >= origen
+    aeropuertos = np.asarray(aeropuertos, dtype=object)
+    return zip(
+        fechas[rng.integers(0, len(fechas), size=n)].tolist(),
+        aeropuertos[origen].tolist(),
+        aeropuertos[destino].tolist(),
+        rng.integers(50, 301, size=n).tolist(),
+        np.asarray(ESTADOS, dtype=object)[rng.integers(0, len(ESTADOS), size=n)].tolist(),
+    )
+
+
+def _filas_transito(rng, n, aeropuertos, fechas):
+    if not len(aeropuertos):
+        raise ValueError("Se necesita al menos 1 aeropuerto para generar pasajeros en tránsito")
+    return zip(
+        fechas[rng.integers(0, len(fechas), size=n)].tolist(),
+        np.asarray(aeropuertos, dtype=object)[rng.integers(0, len(aeropuertos), size=n)].tolist(),
+        rng.integers(100, 1001, size=n).tolist(),
+    )
+
+
+_NOMBRES_COMPLETOS = np.array([f"{n} {a}" for n in NOMBRES for a in APELLIDOS], dtype=object)
+
+
+def _filas_pasajeros(rng, n, ids_vuelo):
+    tickets = rng.integers(10000, 100000, size=n)
+    return zip(
+        ids_vuelo[rng.integers(0, len(ids_vuelo), size=n)].tolist(),
+        [f"TCK-{t}" for t in tickets.tolist()],
+        _NOMBRES_COMPLETOS[rng.integers(0, len(_NOMBRES_COMPLETOS), size=n)].tolist(),
+        rng.integers(18, 81, size=n).tolist(),
+    )
+
+
+def _insertar_por_lotes(conn, sql, total, hacer_filas, tabla, progreso, tamano_lote):
+    hechas = 0
+    while hechas < total:
+        n = min(tamano_lote, total - hechas)
+        conn.executemany(sql, hacer_filas(n))
+        hechas += n
+        if progreso:
+            progreso(tabla, hechas, total)
+
+
+def _tablas_vacias(conn):
+    # EXISTS se detiene en la primera fila: O(1) frente al COUNT(*) de toda la tabla.
+    return {
+        tabla for tabla in ("vuelos", "pasajeros_transito", "pasajeros")
+        if not conn.execute(f"SELECT EXISTS(SELECT 1 FROM {tabla})").fetchone()[0]
+    }
+
+
+def generar(vuelos=100, transito=40, pasajeros=200, semilla=None, forzar=False,
+            fecha_base=None, dias=90, aeropuertos=None, progreso=None,
+            tamano_lote=TAMANO_LOTE, pool=None):
+    """
+    Inserta datos de ejemplo y devuelve el conjunto de tablas modificadas.
+
+    Sin ``forzar`` solo se rellenan las tablas vacías (comportamiento de
+    arranque de la app). ``progreso(tabla, hechas, total)`` se llama tras
+    cada lote. Toda la carga ocurre en una única transacción. Sin
+    ``aeropuertos`` se usan todos los códigos del catálogo de la base.
+    """
+    pool = pool or get_pool()
+    if aeropuertos is None:
+        aeropuertos = catalogo(pool).codigos
+    if not forzar:
+        with pool.lectura() as conn:
+            pendientes = _tablas_vacias(conn)
+        if not pendientes:
+            return set()
+
+    rng = np.random.default_rng(semilla)
+    fechas = _fechas(fecha_base or date.today(), dias)
+    modificadas = set()
+
+    with pool.escritura() as conn:
+        # Se revisa de nuevo con el lock de escritura tomado, por si otra sesión ya sembró.
+        pendientes = {"vuelos", "pasajeros_transito", "pasajeros"} if forzar else _tablas_vacias(conn)
+
+        filas = {"vuelos": vuelos, "pasajeros_transito": transito, "pasajeros": pasajeros}
+        masiva = sum(n for tabla, n in filas.items() if tabla in pendientes) >= UMBRAL_CARGA_MASIVA
+        # En una carga masiva los resúmenes se reconstruyen una vez al final en lugar de fila a fila.
+        with resumenes.triggers_suspendidos(conn) if masiva else nullcontext():
+            if "vuelos" in pendientes and vuelos:
+                _insertar_por_lotes(
+                    conn,
+                    "INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) VALUES (?, ?, ?, ?, ?)",
+                    vuelos, lambda n: _filas_vuelos(rng, n, aeropuertos, fechas),
+                    "vuelos", progreso, tamano_lote,
+                )
+                modificadas.add("vuelos")
+
+            if "pasajeros_transito" in pendientes and transito:
+                _insertar_por_lotes(
+                    conn,
+                    "INSERT INTO pasajeros_transito (fecha, aeropuerto, num_pasajeros) VALUES (?, ?, ?)",
+                    transito, lambda n: _filas_transito(rng, n, aeropuertos, fechas),
+                    "pasajeros_transito", progreso, tamano_lote,
+                )
+                modificadas.add("pasajeros_transito")
+
+            if "pasajeros" in pendientes and pasajeros:
+                ids_vuelo = np.fromiter((fila[0] for fila in conn.execute("SELECT id_vuelo FROM vuelos")), dtype=np.int64)
+                if len(ids_vuelo):
+                    _insertar_por_lotes(
+                        conn,
+                        "INSERT INTO pasajeros (vuelo_id, ticket, nombre, edad) VALUES (?, ?, ?, ?)",
+                        pasajeros, lambda n: _filas_pasajeros(rng, n, ids_vuelo),
+                        "pasajeros", progreso, tamano_lote,
+                    )
+                    modificadas.add("pasajeros")
+
+        if modificadas:
+            # Una carga masiva no se sirve como delta (se recarga la tabla): su rastro en el registro sobra.
+            cambios.compactar(conn)
+
+    if modificadas:
+        cache_consultas.invalidar(*modificadas)
+    return modificadas
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera datos de ejemplo para el panel del aeropuerto.")
+    parser.add_argument("--db", help="Ruta de la base SQLite (por defecto AEROPUERTO_DB o aeropuerto.db)")
+    parser.add_argument("--vuelos", type=int, default=100)
+    parser.add_argument("--transito", type=int, default=40)
+    parser.add_argument("--pasajeros", type=int, default=200)
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla para resultados reproducibles")
+    parser.add_argument("--fecha-base", type=date.fromisoformat, default=None,
+                        help="Fecha más reciente (AAAA-MM-DD); por defecto hoy")
+    parser.add_argument("--dias", type=int, default=90, help="Días hacia atrás a partir de la fecha base")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="Filas por executemany")
+    parser.add_argument("--solo-vacias", action="store_true",
+                        help="Rellenar solo las tablas vacías en lugar de añadir siempre")
+    args = parser.parse_args(argv)
+
+    pool = get_pool(args.db)
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+
+    def progreso(tabla, hechas, total):
+        print(f"\r{tabla}: {hechas:,}/{total:,}", end="" if hechas < total else "\n", file=sys.stderr)
+
+    inicio = time.perf_counter()
+    try:
+        modificadas = generar(
+            vuelos=args.vuelos, transito=args.transito, pasajeros=args.pasajeros,
+            semilla=args.semilla, forzar=not args.solo_vacias, fecha_base=args.fecha_base,
+            dias=args.dias, progreso=progreso, tamano_lote=args.lote, pool=pool,
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Tablas generadas: {', '.join(sorted(modificadas)) or 'ninguna'} "
+          f"en {time.perf_counter() - inicio:.1f}s ({pool.ruta})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+# ============================================================
+# GRAFO DE RUTAS (distancias, agregados y conexiones)
+# ============================================================
+# Los aeropuertos vienen del catálogo (arrays de NumPy con código,
+# lat y lon) y las distancias de gran círculo (haversine) se calculan en bloque.
+# Los agregados por ruta (vuelos, pasajeros, km volados) salen de un
+# único GROUP BY y se cachean ligados a la versión de vuelos/pasajeros;
+# sobre ellos se construyen las capas de arcos del mapa y las
+# búsquedas de conexión más corta entre dos aeropuertos.
+# ============================================================
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from aeropuerto.cache import cache_consultas
+from aeropuerto.consultas import Consulta, leer_sql
+from aeropuerto.instrumentacion import instrumentacion
+
+RADIO_TIERRA_KM = 6371.0088
+
+# Hasta este número de aeropuertos la matriz N x N completa (float32) se
+# precalcula; por encima, las distancias se calculan solo para los pares pedidos.
+MAX_AEROPUERTOS_MATRIZ = 4096
+
+# Arcos dibujados como máximo (las rutas con más vuelos); el JSON del mapa crece
+# linealmente con los arcos y el navegador no gana nada con cientos de miles.
+MAX_ARCOS = 2000
+
+CRITERIOS = {"distancia": "Menor distancia", "escalas": "Menos escalas"}
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Distancia de gran círculo en km; acepta escalares o arrays (con broadcasting)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GrafoRutas:
+    """Aeropuertos del catálogo indexados por posición, con sus distancias haversine."""
+
+    def __init__(self, catalogo):
+        self.huella = catalogo.huella
+        self.codigos = catalogo.codigos
+        self.lat = catalogo.lat
+        self.lon = catalogo.lon
+        self.indices = catalogo.indices
+        self._matriz = None
+
+    def __len__(self):
+        return len(self.codigos)
+
+    @property
+    def matriz_distancias(self):
+        if self._matriz is None:
+            matriz = haversine(
+                self.lat[:, None], self.lon[:, None], self.lat[None, :], self.lon[None, :]
+            ).astype(np.float32)
+            matriz.setflags(write=False)
+            self._matriz = matriz
+        return self._matriz
+
+    def distancias(self, i, j):
+        """Distancias en km entre los pares de posiciones (i[k], j[k])."""
+        i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+        if len(self) <= MAX_AEROPUERTOS_MATRIZ:
+            return self.matriz_distancias[i, j].astype(np.float64)
+        return haversine(self.lat[i], self.lon[i], self.lat[j], self.lon[j])
+
+
+_grafos = {}
+
+
+def obtener_grafo(catalogo):
+    """Grafo del catálogo de aeropuertos; se reutiliza mientras el catálogo no cambie."""
+    grafo = _grafos.get(catalogo.huella)
+    if grafo is None:
+        _grafos.clear()  # solo interesa el catálogo vigente
+        grafo = _grafos[catalogo.huella] = GrafoRutas(catalogo)
+    return grafo
+
+
+# ------------------------------------------------------------
+# AGREGADOS POR RUTA
+# ------------------------------------------------------------
+_COLUMNAS_RUTAS = [
+    "origen", "destino", "vuelos", "pasajeros", "distancia_km", "km_volados",
+    "i_origen", "i_destino",
+]
+
+
+def agregados_rutas(grafo, origenes=(), destinos=(), estados=()):
+    """
+    Vuelos, pasajeros, distancia y km volados por (origen, destino), con los
+    filtros del mapa. Solo incluye rutas con ambos extremos en el grafo.
+    """
+    clave = ("rutas", grafo.huella, tuple(origenes), tuple(destinos), tuple(estados))
+
+    def cargar():
+        sql, params = (
+            # Pasajeros por vuelo desde el resumen que mantienen los triggers (como en
+            # ocupacion.py): un join por clave, sin agrupar la tabla de pasajeros.
+            Consulta(
+                "vuelos v LEFT JOIN resumen_pasajeros_vuelo r ON r.vuelo_id = v.id_vuelo",
+                "v.origen, v.destino, COUNT(*) AS vuelos, COALESCE(SUM(r.registrados), 0) AS pasajeros",
+            )
+            .en("v.origen", origenes).en("v.destino", destinos).en("v.estado", estados)
+            .agrupar("v.origen", "v.destino")
+            .sql()
+        )
+        df = leer_sql(sql, params, ("vuelos", "pasajeros"))
+        with instrumentacion.tramo("transformacion.rutas"):
+            i, j = grafo.indices(df["origen"]), grafo.indices(df["destino"])
+            validas = (i >= 0) & (j >= 0)
+            df = df.loc[validas].assign(i_origen=i[validas], i_destino=j[validas])
+            distancia = grafo.distancias(df["i_origen"].to_numpy(), df["i_destino"].to_numpy())
+            df = df.assign(distancia_km=distancia.round(1), km_volados=(distancia * df["vuelos"]).round(1))
+            return (
+                df[_COLUMNAS_RUTAS]
+                .sort_values(["vuelos", "origen", "destino"], ascending=[False, True, True])
+                .reset_index(drop=True)
+            )
+
+    return cache_consultas.obtener(clave, ("vuelos", "pasajeros"), cargar)
+
+
+def rutas_en_zona(grafo, rutas_df, posiciones):
+    """Rutas con origen o destino entre las ``posiciones`` de aeropuerto indicadas."""
+    en_zona = np.zeros(len(grafo), dtype=bool)
+    en_zona[np.asarray(posiciones, dtype=np.intp)] = True
+    mascara = en_zona[rutas_df["i_origen"].to_numpy()] | en_zona[rutas_df["i_destino"].to_numpy()]
+    return rutas_df[mascara].reset_index(drop=True)
+
+
+def aeropuertos_activos(grafo, rutas_df):
+    """Aeropuertos que aparecen en ``rutas_df``, con coordenadas y vuelos salientes/entrantes."""
+    n = len(grafo)
+    salidas = np.bincount(rutas_df["i_origen"], weights=rutas_df["vuelos"], minlength=n)
+    llegadas = np.bincount(rutas_df["i_destino"], weights=rutas_df["vuelos"], minlength=n)
+    activos = np.flatnonzero((salidas + llegadas) > 0)
+    return pd.DataFrame({
+        "aeropuerto": grafo.codigos[activos],
+        "lat": grafo.lat[activos],
+        "lon": grafo.lon[activos],
+        "salidas": salidas[activos].astype(np.int64),
+        "llegadas": llegadas[activos].astype(np.int64),
+    })
+
+
+# ------------------------------------------------------------
+# CONEXIONES (camino más corto)
+# ------------------------------------------------------------
+def ruta_mas_corta(grafo, rutas_df, origen, destino, criterio="distancia"):
+    """
+    Conexión más corta de ``origen`` a ``destino`` siguiendo las rutas con
+    vuelos (dirigidas). ``criterio``: 'distancia' (km) o 'escalas' (tramos).
+    Devuelve un DataFrame con un tramo por fila, o None si no hay conexión.
+    """
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Criterio no soportado: {criterio} (opciones: {', '.join(CRITERIOS)})")
+    inicio, fin = grafo.indices([origen, destino])
+    if inicio < 0 or fin < 0 or rutas_df.empty:
+        return None
+
+    # Listas de adyacencia en formato CSR: aristas ordenadas por origen.
+    orden = np.argsort(rutas_df["i_origen"].to_numpy(), kind="stable")
+    fuente = rutas_df["i_origen"].to_numpy()[orden]
+    vecinos = rutas_df["i_destino"].to_numpy()[orden]
+    if criterio == "distancia":
+        pesos = rutas_df["distancia_km"].to_numpy(dtype=np.float64)[orden]
+    else:
+        pesos = np.ones(len(orden))
+    punteros = np.searchsorted(fuente, np.arange(len(grafo) + 1))
+
+    # Dijkstra con montículo binario.
+    costo = {inicio: 0.0}
+    previo = {}
+    visitados = set()
+    pendientes = [(0.0, inicio)]
+    while pendientes:
+        c, u = heapq.heappop(pendientes)
+        if u in visitados:
+            continue
+        if u == fin:
+            break
+        visitados.add(u)
+        for k in range(punteros[u], punteros[u + 1]):
+            v = vecinos[k]
+            nuevo = c + pesos[k]
+            if nuevo < costo.get(v, np.inf):
+                costo[v] = nuevo
+                previo[v] = (u, orden[k])
+                heapq.heappush(pendientes, (nuevo, v))
+    if fin not in costo or inicio == fin:
+        return None
+
+    filas = []
+    nodo = fin
+    while nodo != inicio:
+        nodo, fila = previo[nodo]
+        filas.append(fila)
+    return rutas_df.iloc[filas[::-1]][["origen", "destino", "distancia_km", "vuelos"]].reset_index(drop=True)
+
+
+# ------------------------------------------------------------
+# CAPAS DEL MAPA
+# ------------------------------------------------------------
+def mapa_rutas(grafo, rutas_df, resaltar=None, vista=None, max_arcos=MAX_ARCOS):
+    """
+    Mapa pydeck con un arco por ruta (ancho según vuelos, solo las ``max_arcos``
+    más frecuentes) y los aeropuertos activos; ``resaltar`` es un DataFrame de
+    tramos que se dibuja encima y ``vista`` un (lat, lon, zoom) inicial.
+    """
+    import pydeck as pdk
+
+    aeropuertos = aeropuertos_activos(grafo, rutas_df)
+    rutas_df = rutas_df.head(max_arcos)  # ya viene ordenado por vuelos
+
+    i, j = rutas_df["i_origen"].to_numpy(), rutas_df["i_destino"].to_numpy()
+    vuelos = rutas_df["vuelos"].to_numpy(dtype=np.float64)
+    arcos = pd.DataFrame({
+        "origen": rutas_df["origen"], "destino": rutas_df["destino"], "vuelos": rutas_df["vuelos"],
+        "distancia_km": rutas_df["distancia_km"],
+        "lon_o": grafo.lon[i], "lat_o": grafo.lat[i], "lon_d": grafo.lon[j], "lat_d": grafo.lat[j],
+        "ancho": 1 + 7 * vuelos / vuelos.max() if len(vuelos) else vuelos,
+    })
+    capas = [
+        pdk.Layer(
+            "ArcLayer", arcos,
+            get_source_position=["lon_o", "lat_o"], get_target_position=["lon_d", "lat_d"],
+            get_source_color=[0, 128, 255, 160], get_target_color=[255, 64, 64, 160],
+            get_width="ancho", pickable=True,
+        ),
+        pdk.Layer(
+            "ScatterplotLayer", aeropuertos,
+            get_position=["lon", "lat"], get_radius=60000, radius_min_pixels=3,
+            get_fill_color=[255, 140, 0, 220],
+        ),
+    ]
+    if resaltar is not None and not resaltar.empty:
+        ir, jr = grafo.indices(resaltar["origen"]), grafo.indices(resaltar["destino"])
+        tramos = pd.DataFrame({
+            "lon_o": grafo.lon[ir], "lat_o": grafo.lat[ir], "lon_d": grafo.lon[jr], "lat_d": grafo.lat[jr],
+        })
+        capas.append(pdk.Layer(
+            "ArcLayer", tramos,
+            get_source_position=["lon_o", "lat_o"], get_target_position=["lon_d", "lat_d"],
+            get_source_color=[0, 200, 0, 255], get_target_color=[0, 200, 0, 255], get_width=6,
+        ))
+
+    if vista is not None:
+        vista = pdk.ViewState(latitude=vista[0], longitude=vista[1], zoom=vista[2])
+    elif len(aeropuertos):
+        vista = pdk.ViewState(
+            latitude=float(aeropuertos["lat"].mean()), longitude=float(aeropuertos["lon"].mean()), zoom=1
+        )
+    else:
+        vista = pdk.ViewState(latitude=0, longitude=0, zoom=1)
+    return pdk.Deck(
+        layers=capas, initial_view_state=vista,
+        tooltip={"text": "{origen} → {destino}: {vuelos} vuelos, {distancia_km} km"},
+    )
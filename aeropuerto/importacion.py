@@ -0,0 +1,334 @@
+# ============================================================
+# IMPORTACIÓN MASIVA (manifiestos CSV / JSON-lines)
+# ============================================================
+# Lee el archivo por bloques con pandas, valida cada bloque de forma
+# vectorizada (aeropuertos, fechas, estados, edades, vuelos existentes)
+# e inserta las filas válidas con executemany. Cada bloque se confirma
+# en su propia transacción junto con el punto de control en la tabla
+# `importaciones`, así que una importación interrumpida se reanuda
+# exactamente donde quedó al volver a importar el mismo archivo
+# (identificado por el hash de su contenido).
+#
+#   python -m aeropuerto.importacion pasajeros manifiesto.csv --rechazos rechazos.csv
+# ============================================================
+
+import argparse
+import hashlib
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from aeropuerto import cambios
+from aeropuerto.aeropuertos import catalogo
+from aeropuerto.cache import cache_consultas
+from aeropuerto.conexion import get_pool
+from aeropuerto.esquema import crear_esquema
+from aeropuerto.generador import ESTADOS
+
+TAMANO_BLOQUE = 10_000
+MAX_RECHAZOS_GUARDADOS = 1_000
+
+# tabla -> columnas requeridas en el archivo (en el orden del INSERT)
+COLUMNAS = {
+    "vuelos": ["fecha", "origen", "destino", "num_pasajeros", "estado"],
+    "pasajeros": ["vuelo_id", "ticket", "nombre", "edad"],
+    "pasajeros_transito": ["fecha", "aeropuerto", "num_pasajeros"],
+}
+
+
+class ResultadoImportacion:
+    """Resumen de una importación: contadores y una muestra de filas rechazadas."""
+
+    def __init__(self, tabla, nombre_archivo):
+        self.tabla = tabla
+        self.nombre_archivo = nombre_archivo
+        self.insertadas = 0
+        self.rechazadas = 0
+        self.reanudada_desde = 0
+        self.ya_completada = False
+        self.rechazos = []  # (fila del archivo, motivo, datos originales)
+
+    def rechazos_df(self):
+        return pd.DataFrame(
+            [{"fila": fila, "motivo": motivo, **datos} for fila, motivo, datos in self.rechazos]
+        )
+
+    def __repr__(self):
+        return (f"ResultadoImportacion({self.tabla}: {self.insertadas} insertadas, "
+                f"{self.rechazadas} rechazadas, reanudada desde {self.reanudada_desde})")
+
+
+# ------------------------------------------------------------
+# VALIDACIÓN VECTORIZADA
+# ------------------------------------------------------------
+class _Motivos:
+    """Acumula el primer motivo de rechazo de cada fila del bloque."""
+
+    def __init__(self, indice):
+        self.serie = pd.Series("", index=indice, dtype=object)
+
+    def marcar(self, mascara, motivo):
+        mascara = np.asarray(mascara, dtype=bool) & (self.serie.to_numpy() == "")
+        self.serie[mascara] = motivo
+
+    @property
+    def validas(self):
+        return (self.serie == "").to_numpy()
+
+
+def _texto(df, columna, mayusculas=False):
+    serie = df[columna].fillna("").astype(str).str.strip()
+    return serie.str.upper() if mayusculas else serie
+
+
+def _entero(df, columna):
+    return pd.to_numeric(df[columna], errors="coerce")
+
+
+def _fecha(df, columna):
+    return pd.to_datetime(df[columna], errors="coerce", format="ISO8601")
+
+
+def _validar_vuelos(df, motivos, ctx):
+    fecha = _fecha(df, "fecha")
+    origen = _texto(df, "origen", mayusculas=True)
+    destino = _texto(df, "destino", mayusculas=True)
+    num = _entero(df, "num_pasajeros")
+    estado = _texto(df, "estado").str.lower().map(ctx["estados"])
+
+    motivos.marcar(fecha.isna(), "fecha inválida")
+    motivos.marcar((origen == "") | (destino == ""), "origen y destino son obligatorios")
+    if ctx["aeropuertos"] is not None:
+        motivos.marcar(~origen.isin(ctx["aeropuertos"]), "aeropuerto de origen desconocido")
+        motivos.marcar(~destino.isin(ctx["aeropuertos"]), "aeropuerto de destino desconocido")
+    motivos.marcar(origen == destino, "origen y destino iguales")
+    motivos.marcar(num.isna() | (num < 0) | (num % 1 != 0), "num_pasajeros inválido")
+    motivos.marcar(estado.isna(), "estado desconocido")
+
+    v = motivos.validas
+    return zip(
+        fecha[v].dt.strftime("%Y-%m-%d").tolist(), origen[v].tolist(), destino[v].tolist(),
+        num[v].astype(np.int64).tolist(), estado[v].tolist(),
+    )
+
+
+def _validar_pasajeros(df, motivos, ctx):
+    vuelo_id = _entero(df, "vuelo_id")
+    ticket = _texto(df, "ticket", mayusculas=True)
+    nombre = _texto(df, "nombre")
+    edad = _entero(df, "edad")
+
+    motivos.marcar(vuelo_id.isna() | (vuelo_id % 1 != 0), "vuelo_id inválido")
+    existe = np.isin(vuelo_id.fillna(-1).to_numpy(dtype=np.int64), ctx["ids_vuelo"])
+    motivos.marcar(~existe, "vuelo_id inexistente")
+    motivos.marcar((ticket == "") | (nombre == ""), "nombre y ticket son obligatorios")
+    motivos.marcar(edad.isna() | (edad < 0) | (edad > 120) | (edad % 1 != 0), "edad inválida")
+
+    v = motivos.validas
+    return zip(
+        vuelo_id[v].astype(np.int64).tolist(), ticket[v].tolist(), nombre[v].tolist(),
+        edad[v].astype(np.int64).tolist(),
+    )
+
+
+def _validar_transito(df, motivos, ctx):
+    fecha = _fecha(df, "fecha")
+    aeropuerto = _texto(df, "aeropuerto", mayusculas=True)
+    num = _entero(df, "num_pasajeros")
+
+    motivos.marcar(fecha.isna(), "fecha inválida")
+    motivos.marcar(aeropuerto == "", "el aeropuerto es obligatorio")
+    if ctx["aeropuertos"] is not None:
+        motivos.marcar(~aeropuerto.isin(ctx["aeropuertos"]), "aeropuerto desconocido")
+    motivos.marcar(num.isna() | (num < 0) | (num % 1 != 0), "num_pasajeros inválido")
+
+    v = motivos.validas
+    return zip(fecha[v].dt.strftime("%Y-%m-%d").tolist(), aeropuerto[v].tolist(), num[v].astype(np.int64).tolist())
+
+
+VALIDADORES = {
+    "vuelos": _validar_vuelos,
+    "pasajeros": _validar_pasajeros,
+    "pasajeros_transito": _validar_transito,
+}
+
+
+# ------------------------------------------------------------
+# LECTURA POR BLOQUES
+# ------------------------------------------------------------
+def detectar_formato(nombre_archivo):
+    nombre = nombre_archivo.lower()
+    if nombre.endswith((".jsonl", ".ndjson", ".jsonl.gz", ".ndjson.gz")):
+        return "jsonl"
+    return "csv"
+
+
+def _huella(archivo):
+    """SHA-256 del contenido: identifica el archivo para poder reanudarlo."""
+    h = hashlib.sha256()
+    for bloque in iter(lambda: archivo.read(1024 * 1024), b""):
+        h.update(bloque)
+    archivo.seek(0)
+    return h.hexdigest()
+
+
+def _bloques(archivo, formato, tamano_bloque, saltar, compresion):
+    """Genera DataFrames de texto a partir de la fila ``saltar`` (0 = primera fila de datos)."""
+    if formato == "csv":
+        lector = pd.read_csv(
+            archivo, dtype=str, keep_default_na=False, chunksize=tamano_bloque,
+            skiprows=range(1, saltar + 1), compression=compresion,
+        )
+        yield from lector
+        return
+    lector = pd.read_json(archivo, lines=True, dtype=False, chunksize=tamano_bloque, compression=compresion)
+    vistas = 0
+    for bloque in lector:
+        if vistas + len(bloque) <= saltar:
+            vistas += len(bloque)
+            continue
+        bloque = bloque.iloc[max(0, saltar - vistas):]
+        vistas = saltar
+        yield bloque
+
+
+# ------------------------------------------------------------
+# IMPORTACIÓN
+# ------------------------------------------------------------
+def importar(archivo, tabla, formato=None, nombre_archivo=None, aeropuertos=True,
+             tamano_bloque=TAMANO_BLOQUE, progreso=None, pool=None):
+    """
+    Importa ``archivo`` (ruta o archivo binario) en ``tabla``.
+
+    Los códigos IATA se validan contra el catálogo de aeropuertos de la base
+    (``aeropuertos=True``), contra una lista dada, o no se validan (``None``). ``progreso(filas_procesadas, insertadas, rechazadas)`` se llama
+    tras cada bloque. Devuelve un ``ResultadoImportacion``.
+    """
+    if tabla not in COLUMNAS:
+        raise ValueError(f"Tabla no importable: {tabla}")
+    if isinstance(archivo, (str, os.PathLike)):
+        nombre_archivo = nombre_archivo or os.fspath(archivo)
+        with open(archivo, "rb") as f:
+            return importar(f, tabla, formato, nombre_archivo, aeropuertos, tamano_bloque, progreso, pool)
+
+    nombre_archivo = nombre_archivo or getattr(archivo, "name", "archivo")
+    formato = formato or detectar_formato(nombre_archivo)
+    compresion = "gzip" if nombre_archivo.lower().endswith(".gz") else None
+    pool = pool or get_pool()
+    resultado = ResultadoImportacion(tabla, nombre_archivo)
+    id_archivo = f"{tabla}:{_huella(archivo)}"
+
+    with pool.escritura() as conn:
+        fila = conn.execute(
+            "SELECT filas_procesadas, insertadas, rechazadas, completada FROM importaciones WHERE id_archivo = ?",
+            (id_archivo,),
+        ).fetchone()
+        if fila is None:
+            conn.execute(
+                "INSERT INTO importaciones (id_archivo, tabla, nombre_archivo, actualizada) VALUES (?, ?, ?, ?)",
+                (id_archivo, tabla, nombre_archivo, datetime.now().isoformat(timespec="seconds")),
+            )
+            procesadas = 0
+        else:
+            procesadas, resultado.insertadas, resultado.rechazadas, completada = fila
+            if completada:
+                resultado.ya_completada = True
+                return resultado
+        resultado.reanudada_desde = procesadas
+
+    ctx = {
+        "aeropuertos": (
+            None if aeropuertos is None
+            else set(catalogo(pool).codigos) if aeropuertos is True
+            else set(aeropuertos)
+        ),
+        "estados": {e.lower(): e for e in ESTADOS},
+    }
+    if tabla == "pasajeros":
+        with pool.lectura() as conn:
+            ids = conn.execute("SELECT id_vuelo FROM vuelos")
+            ctx["ids_vuelo"] = np.fromiter((f[0] for f in ids), dtype=np.int64)
+
+    columnas = COLUMNAS[tabla]
+    insert = f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join('?' for _ in columnas)})"
+
+    for bloque in _bloques(archivo, formato, tamano_bloque, procesadas, compresion):
+        faltantes = [c for c in columnas if c not in bloque.columns]
+        if faltantes:
+            raise ValueError(f"Faltan columnas requeridas en {nombre_archivo}: {', '.join(faltantes)}")
+
+        bloque = bloque.reset_index(drop=True)
+        motivos = _Motivos(bloque.index)
+        filas = list(VALIDADORES[tabla](bloque, motivos, ctx))
+        rechazadas = ~motivos.validas
+
+        with pool.escritura() as conn:
+            conn.executemany(insert, filas)
+            cambios.compactar_si_excede(conn)
+            procesadas += len(bloque)
+            conn.execute(
+                "UPDATE importaciones SET filas_procesadas = ?, insertadas = insertadas + ?, "
+                "rechazadas = rechazadas + ?, actualizada = ? WHERE id_archivo = ?",
+                (procesadas, len(filas), int(rechazadas.sum()),
+                 datetime.now().isoformat(timespec="seconds"), id_archivo),
+            )
+        cache_consultas.invalidar(tabla)
+
+        resultado.insertadas += len(filas)
+        resultado.rechazadas += int(rechazadas.sum())
+        primera_fila = procesadas - len(bloque) + 1
+        for i in np.flatnonzero(rechazadas):
+            if len(resultado.rechazos) >= MAX_RECHAZOS_GUARDADOS:
+                break
+            resultado.rechazos.append(
+                (primera_fila + int(i), motivos.serie.iat[i], bloque.iloc[i][columnas].to_dict())
+            )
+        if progreso:
+            progreso(procesadas, resultado.insertadas, resultado.rechazadas)
+
+    with pool.escritura() as conn:
+        conn.execute("UPDATE importaciones SET completada = 1 WHERE id_archivo = ?", (id_archivo,))
+    return resultado
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa manifiestos CSV/JSON-lines en la base del aeropuerto.")
+    parser.add_argument("tabla", choices=sorted(COLUMNAS))
+    parser.add_argument("archivo")
+    parser.add_argument("--db", help="Ruta de la base SQLite (por defecto AEROPUERTO_DB o aeropuerto.db)")
+    parser.add_argument("--formato", choices=["csv", "jsonl"], help="Por defecto se deduce de la extensión")
+    parser.add_argument("--lote", type=int, default=TAMANO_BLOQUE, help="Filas por bloque/transacción")
+    parser.add_argument("--rechazos", help="Archivo CSV donde escribir las filas rechazadas")
+    parser.add_argument("--aceptar-aeropuertos-desconocidos", action="store_true",
+                        help="No validar los códigos IATA contra el catálogo de aeropuertos")
+    args = parser.parse_args(argv)
+
+    def progreso(procesadas, insertadas, rechazadas):
+        print(f"\r{procesadas:,} filas procesadas ({insertadas:,} insertadas, {rechazadas:,} rechazadas)",
+              end="", file=sys.stderr)
+
+    pool = get_pool(args.db)
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+    resultado = importar(
+        args.archivo, args.tabla, formato=args.formato, tamano_bloque=args.lote,
+        aeropuertos=None if args.aceptar_aeropuertos_desconocidos else True,
+        progreso=progreso, pool=pool,
+    )
+    print(file=sys.stderr)
+    if resultado.ya_completada:
+        print(f"{args.archivo} ya había sido importado por completo.", file=sys.stderr)
+    print(resultado)
+    if args.rechazos and resultado.rechazos:
+        resultado.rechazos_df().to_csv(args.rechazos, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+# ============================================================
+# INSTANTÁNEAS COMPARTIDAS DE TABLAS (entre sesiones y procesos)
+# ============================================================
+# Todas las sesiones de Streamlit de un proceso comparten una única
+# instantánea de solo lectura de cada tabla completa (vuelos,
+# pasajeros, tránsito), fuera del LRU de la caché de consultas. La
+# base lleva un contador por tabla (versiones_datos) que incrementan
+# triggers en cada escritura, venga de donde venga; sincronizar() lo
+# lee una vez por ejecución del script y es el único camino por el
+# que se detectan cambios: invalida la caché de consultas y marca
+# las instantáneas como viejas. La recarga ocurre una sola vez por
+# versión aunque muchas sesiones la pidan a la vez.
+#
+# Con la variable de entorno AEROPUERTO_INSTANTANEAS apuntando a un
+# directorio (p. ej. /dev/shm/aeropuerto), cada instantánea se
+# publica además como archivo Arrow IPC y se lee con memory-map: los
+# procesos del servidor que usan la misma base comparten una sola
+# copia en la caché de páginas del sistema operativo.
+#
+# Cada sección de la app pide solo las columnas que usa: una
+# instantánea se identifica por (base, tabla, columnas). Si ya hay
+# una de la tabla completa vigente, los subconjuntos se sirven como
+# proyecciones de ella sin volver a leer la base.
+#
+# Una instantánea vieja no se recarga entera: guarda la marca del
+# registro de cambios (cambios.py) con la que se leyó y se pone al
+# día leyendo solo las filas cambiadas desde esa marca. Si el delta
+# no es posible (restauración, registro compactado, demasiados
+# cambios) o hay respaldo memory-map, se recarga completa.
+# ============================================================
+
+import hashlib
+import os
+import threading
+import time
+
+from aeropuerto import cambios
+from aeropuerto.aeropuertos import VERSIONES_SQL
+from aeropuerto.cache import TABLAS, cache_consultas
+from aeropuerto.columnar import aplicar_cambios, leer_tabla
+from aeropuerto.conexion import get_pool
+
+VARIABLE_DIRECTORIO = "AEROPUERTO_INSTANTANEAS"
+
+_OPERACIONES = {"ins": "INSERT", "del": "DELETE", "upd": "UPDATE"}
+
+
+def triggers_sql():
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_version_{tabla}_{op} AFTER {evento} ON {tabla} "
+        f"BEGIN UPDATE versiones_datos SET version = version + 1 WHERE tabla = '{tabla}'; END"
+        for tabla in TABLAS for op, evento in _OPERACIONES.items()
+    ]
+
+
+def nombres_triggers():
+    return [f"trg_version_{tabla}_{op}" for tabla in TABLAS for op in _OPERACIONES]
+
+
+def migracion_versiones(c):
+    """
+    Migración de esquema: contador de versión por tabla, mantenido por triggers.
+    Extiende a todas las tablas cacheadas el que ya tenía aeropuertos.
+    """
+    c.execute(VERSIONES_SQL)
+    c.executemany("INSERT OR IGNORE INTO versiones_datos (tabla) VALUES (?)", [(t,) for t in TABLAS])
+    for sql in triggers_sql():
+        c.execute(sql)
+    # Si la migración se reaplica es porque se recrearon tablas (DROP no dispara
+    # triggers): todo lo que se haya leído antes ya no vale.
+    c.execute("UPDATE versiones_datos SET version = version + 1")
+
+
+def directorio_configurado():
+    return os.environ.get(VARIABLE_DIRECTORIO) or None
+
+
+def _firma_columnas(columnas):
+    """Parte del nombre de archivo que distingue el conjunto de columnas."""
+    if columnas is None:
+        return "todas"
+    return hashlib.sha1(",".join(columnas).encode()).hexdigest()[:8]
+
+
+class Instantanea:
+    __slots__ = ("tabla", "columnas", "version", "df", "origen", "bytes", "cargada", "marca")
+
+    def __init__(self, tabla, columnas, version, df, origen, marca=None):
+        self.tabla = tabla
+        self.columnas = columnas
+        self.version = version
+        self.df = df
+        self.origen = origen
+        self.marca = marca  # id_cambio del registro de cambios ya incluido en df (None: sin delta)
+        self.bytes = int(df.memory_usage(index=True, deep=True).sum())
+        self.cargada = time.time()
+
+
+class AlmacenInstantaneas:
+    """Instantáneas por (base, tabla), cargadas una vez por versión de datos."""
+
+    def __init__(self, cargador=leer_tabla, directorio=None):
+        self._cargador = cargador
+        self._directorio = directorio
+        self._instantaneas = {}  # (ruta, tabla, columnas o None) -> Instantanea
+        self._versiones = {}  # ruta de la base -> {tabla: versión}
+        self._lock = threading.Lock()
+        self._locks_carga = {}
+        self.hits = 0
+        self.cargas = 0
+        self.cargas_compartidas = 0
+        self.deltas = 0
+        self.filas_delta = 0
+
+    @property
+    def directorio(self):
+        return self._directorio or directorio_configurado()
+
+    # --------------------------------------------------------
+    # Versiones
+    # --------------------------------------------------------
+    def sincronizar(self, pool=None):
+        """
+        Lee las versiones de la base e invalida la caché de consultas para las
+        tablas que cambiaron desde la última vez (en este u otro proceso).
+        Devuelve las tablas cambiadas.
+        """
+        pool = pool or get_pool()
+        with pool.lectura() as conn:
+            versiones = dict(conn.execute("SELECT tabla, version FROM versiones_datos").fetchall())
+        with self._lock:
+            anteriores = self._versiones.get(pool.ruta)
+            self._versiones[pool.ruta] = versiones
+        if anteriores is None:
+            return []
+        cambiadas = [t for t, v in versiones.items() if anteriores.get(t) != v]
+        if cambiadas:
+            # Las instantáneas viejas se conservan: son la base sobre la que obtener() aplica el delta.
+            cache_consultas.invalidar(*cambiadas)
+        return cambiadas
+
+    def _version(self, pool, tabla):
+        versiones = self._versiones.get(pool.ruta)
+        if versiones is None:
+            self.sincronizar(pool)
+            versiones = self._versiones[pool.ruta]
+        return versiones.get(tabla, 0)
+
+    def versiones(self, tablas, pool=None):
+        """Versiones de la base (las de la última sincronización) de ``tablas``, en ese orden."""
+        pool = pool or get_pool()
+        return tuple(self._version(pool, tabla) for tabla in tablas)
+
+    # --------------------------------------------------------
+    # Lectura
+    # --------------------------------------------------------
+    def obtener(self, tabla, pool=None, columnas=None):
+        """
+        DataFrame compartido y de solo lectura de ``tabla`` en su versión actual;
+        con ``columnas``, solo esas columnas (en ese orden).
+        """
+        pool = pool or get_pool()
+        columnas = None if columnas is None else tuple(columnas)
+        version = self._version(pool, tabla)
+        completa = self._instantaneas.get((pool.ruta, tabla, None))
+        if completa is not None and completa.version >= version:
+            self.hits += 1
+            return completa.df if columnas is None else completa.df[list(columnas)]
+
+        clave = (pool.ruta, tabla, columnas)
+        instantanea = self._instantaneas.get(clave)
+        if instantanea is not None and instantanea.version >= version:
+            self.hits += 1
+            return instantanea.df
+
+        with self._lock:
+            lock_carga = self._locks_carga.setdefault(clave, threading.Lock())
+        # Una sola carga por tabla: las demás sesiones esperan y reutilizan el resultado.
+        with lock_carga:
+            instantanea = self._instantaneas.get(clave)
+            if instantanea is not None and instantanea.version >= version:
+                self.hits += 1
+                return instantanea.df
+            actualizada = self._actualizar(pool, instantanea) if instantanea is not None else None
+            instantanea = actualizada or self._cargar(pool, tabla, columnas, version)
+            self._instantaneas[clave] = instantanea
+        return instantanea.df
+
+    def _actualizar(self, pool, vieja):
+        """
+        Nueva instantánea con el delta del registro de cambios aplicado a
+        ``vieja``, o None si hay que recargar la tabla completa.
+        """
+        clave = cambios.CLAVES.get(vieja.tabla)
+        if vieja.marca is None or clave is None or clave not in vieja.df.columns or self.directorio:
+            return None
+        columnas = list(vieja.df.columns)
+        with pool.lectura() as conn:
+            # Una sola transacción: marca, filas y versión corresponden al mismo estado de la base.
+            conn.execute("BEGIN")
+            delta = cambios.leer_delta(conn, vieja.tabla, vieja.marca, columnas)
+            if delta is None:
+                return None
+            version = conn.execute(
+                "SELECT version FROM versiones_datos WHERE tabla = ?", (vieja.tabla,)
+            ).fetchone()[0]
+        marca, ids, filas = delta
+        self.deltas += 1
+        self.filas_delta += len(ids)
+        df = aplicar_cambios(vieja.df, vieja.tabla, filas, ids, clave)
+        return Instantanea(vieja.tabla, vieja.columnas, version, df, "delta", marca)
+
+    def _cargar(self, pool, tabla, columnas, version):
+        directorio = self.directorio
+        if directorio is None:
+            self.cargas += 1
+            # La marca se lee antes que la tabla: un cambio entre medias se reaplica en el delta siguiente.
+            with pool.lectura() as conn:
+                marca = cambios.marca_actual(conn) if tabla in cambios.CLAVES else None
+            df = self._cargador(tabla, pool, columnas=columnas)
+            return Instantanea(tabla, columnas, version, df, "proceso", marca)
+
+        prefijo = f"{hashlib.sha1(pool.ruta.encode()).hexdigest()[:12]}-{tabla}-{_firma_columnas(columnas)}-"
+        ruta = os.path.join(directorio, f"{prefijo}{version}.arrow")
+        if os.path.exists(ruta):
+            self.cargas_compartidas += 1
+        else:
+            self.cargas += 1
+            os.makedirs(directorio, exist_ok=True)
+            _publicar(self._cargador(tabla, pool, columnas=columnas), ruta)
+            _borrar_anteriores(directorio, prefijo, version)
+        try:
+            return Instantanea(tabla, columnas, version, _mapear(ruta), f"mmap ({ruta})")
+        except FileNotFoundError:
+            # Otro proceso publicó una versión más nueva y borró esta entre medias.
+            return Instantanea(tabla, columnas, version, self._cargador(tabla, pool, columnas=columnas), "proceso")
+
+    def invalidar(self):
+        """Descarta todas las instantáneas (se recargan en el siguiente acceso)."""
+        with self._lock:
+            self._instantaneas.clear()
+
+    def cargadas(self, pool=None):
+        """(tabla, columnas) de las instantáneas en memoria de la base del pool."""
+        pool = pool or get_pool()
+        return [(clave[1], clave[2]) for clave in list(self._instantaneas) if clave[0] == pool.ruta]
+
+    def en_memoria(self):
+        """{tabla: DataFrame} con la instantánea de más columnas de cada tabla cargada."""
+        tablas = {}
+        for instantanea in list(self._instantaneas.values()):
+            actual = tablas.get(instantanea.tabla)
+            if actual is None or instantanea.df.shape[1] > actual.shape[1]:
+                tablas[instantanea.tabla] = instantanea.df
+        return tablas
+
+    def estadisticas(self):
+        ahora = time.time()
+        filas = [
+            {
+                "tabla": i.tabla, "columnas": "todas" if i.columnas is None else ", ".join(i.columnas),
+                "version": i.version, "marca": i.marca, "filas": len(i.df),
+                "bytes": i.bytes, "origen": i.origen, "edad_s": round(ahora - i.cargada, 1),
+            }
+            for i in list(self._instantaneas.values())
+        ]
+        return {
+            "hits": self.hits, "cargas": self.cargas, "cargas_compartidas": self.cargas_compartidas,
+            "deltas": self.deltas, "filas_delta": self.filas_delta,
+            "instantaneas": filas,
+        }
+
+
+# ------------------------------------------------------------
+# RESPALDO EN ARROW IPC (memory-map)
+# ------------------------------------------------------------
+def _publicar(df, ruta):
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with pa.OSFile(temporal, "wb") as archivo:
+        with ipc.new_file(archivo, tabla.schema) as escritor:
+            escritor.write_table(tabla)
+    os.replace(temporal, ruta)  # atómico: otro proceso nunca ve un archivo a medias
+
+
+def _mapear(ruta):
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    # Las columnas numéricas y de texto quedan respaldadas por el archivo mapeado
+    # (solo lectura); no se copian a memoria privada del proceso.
+    return ipc.open_file(pa.memory_map(ruta)).read_all().to_pandas(split_blocks=True)
+
+
+def _borrar_anteriores(directorio, prefijo, version):
+    """Borra las versiones anteriores a ``version`` (otro proceso pudo publicar una más nueva)."""
+    for nombre in os.listdir(directorio):
+        if not (nombre.startswith(prefijo) and nombre.endswith(".arrow")):
+            continue
+        numero = nombre[len(prefijo):-len(".arrow")]
+        if numero.isdigit() and int(numero) < version:
+            try:
+                os.remove(os.path.join(directorio, nombre))  # quien lo tenga mapeado conserva su copia
+            except OSError:
+                pass
+
+
+almacen_instantaneas = AlmacenInstantaneas()
@@ -0,0 +1,291 @@
+# ============================================================
+# INSTRUMENTACIÓN DE RERUNS (tramos de tiempo y contadores)
+# ============================================================
+# Cada ejecución del script de Streamlit se registra como una
+# "ejecución" con sus tramos (consultas a la base, cargas de
+# tablas, transformaciones de DataFrames, renderizado) y sus
+# contadores (filas leídas, bytes enviados al navegador). Las fases
+# del script (inicialización, carga, sección) son tramos de primer
+# nivel; los demás tramos cuelgan de la fase en curso. Además de las
+# últimas ejecuciones se guardan totales por tramo para exportarlos
+# en formato de texto de Prometheus o como registro JSON Lines.
+#
+# Desactivada (por defecto) cada punto de medida cuesta una lectura
+# de atributo: tramo() devuelve un context manager nulo compartido y
+# contar() retorna de inmediato. Se activa con la variable de entorno
+# AEROPUERTO_INSTRUMENTACION=1 o desde la pestaña de diagnóstico de
+# Configuración (visible con ?diagnostico=1 en la URL).
+# ============================================================
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+VARIABLE_ACTIVA = "AEROPUERTO_INSTRUMENTACION"
+
+MAX_EJECUCIONES = 50
+MAX_TRAMOS_POR_EJECUCION = 2000
+
+PREFIJO_METRICAS = "aeropuerto"
+
+
+class _TramoNulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+_NULO = _TramoNulo()
+
+
+class _Tramo:
+    __slots__ = ("_registro", "nombre", "inicio", "profundidad")
+
+    def __init__(self, registro, nombre):
+        self._registro = registro
+        self.nombre = nombre
+
+    def __enter__(self):
+        local = self._registro._local
+        self.profundidad = getattr(local, "profundidad", 0)
+        local.profundidad = self.profundidad + 1
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, *excepcion):
+        fin = time.perf_counter()
+        self._registro._local.profundidad = self.profundidad
+        self._registro._cerrar(self.nombre, self.profundidad, self.inicio, fin, tipo is not None)
+        return False
+
+
+class Ejecucion:
+    """Un rerun del script: sus tramos, contadores y duración total."""
+
+    __slots__ = ("etiqueta", "hora", "inicio", "duracion_s", "tramos", "contadores", "fase", "interrumpida")
+
+    def __init__(self, etiqueta):
+        self.etiqueta = etiqueta
+        self.hora = time.time()
+        self.inicio = time.perf_counter()
+        self.duracion_s = None
+        self.tramos = []  # (nombre, profundidad, inicio relativo s, duración s, error)
+        self.contadores = {}
+        self.fase = None  # (nombre, inicio) de la fase abierta
+        self.interrumpida = False
+
+    def como_dict(self):
+        return {
+            "etiqueta": self.etiqueta,
+            "hora": self.hora,
+            "duracion_s": self.duracion_s,
+            "interrumpida": self.interrumpida,
+            "contadores": dict(self.contadores),
+            "tramos": [
+                {"tramo": n, "profundidad": p, "inicio_s": round(i, 6), "duracion_s": round(d, 6), "error": e}
+                for n, p, i, d, e in self.tramos
+            ],
+        }
+
+
+class Instrumentacion:
+    def __init__(self, activa=False, max_ejecuciones=MAX_EJECUCIONES):
+        self.activa = activa
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._totales = {}  # tramo -> [veces, segundos, máximo, errores]
+        self._contadores = {}
+        self._ejecuciones = deque(maxlen=max_ejecuciones)
+        self.total_ejecuciones = 0
+
+    # --------------------------------------------------------
+    # Puntos de medida
+    # --------------------------------------------------------
+    def tramo(self, nombre):
+        """Context manager que mide ``nombre``; nulo (sin costo) si está desactivada."""
+        if not self.activa:
+            return _NULO
+        return _Tramo(self, nombre)
+
+    def contar(self, nombre, valor=1):
+        if not self.activa:
+            return
+        with self._lock:
+            self._contadores[nombre] = self._contadores.get(nombre, 0) + valor
+        ejecucion = getattr(self._local, "ejecucion", None)
+        if ejecucion is not None:
+            ejecucion.contadores[nombre] = ejecucion.contadores.get(nombre, 0) + valor
+
+    def contar_df(self, nombre, df):
+        """Suma los bytes en memoria de ``df`` (aproximación de lo que se serializa)."""
+        if not self.activa:
+            return
+        self.contar(nombre, int(df.memory_usage(index=True, deep=True).sum()))
+
+    def _cerrar(self, nombre, profundidad, inicio, fin, error):
+        duracion = fin - inicio
+        with self._lock:
+            total = self._totales.get(nombre)
+            if total is None:
+                total = self._totales[nombre] = [0, 0.0, 0.0, 0]
+            total[0] += 1
+            total[1] += duracion
+            total[2] = max(total[2], duracion)
+            total[3] += error
+        ejecucion = getattr(self._local, "ejecucion", None)
+        if ejecucion is not None and len(ejecucion.tramos) < MAX_TRAMOS_POR_EJECUCION:
+            ejecucion.tramos.append((nombre, profundidad, inicio - ejecucion.inicio, duracion, error))
+
+    # --------------------------------------------------------
+    # Ejecuciones y fases
+    # --------------------------------------------------------
+    def iniciar_ejecucion(self, etiqueta=""):
+        """Abre la ejecución del hilo actual; una anterior sin terminar (st.rerun/st.stop) se cierra como interrumpida."""
+        anterior = getattr(self._local, "ejecucion", None)
+        if anterior is not None:
+            anterior.interrumpida = True
+            self._terminar(anterior)
+        self._local.ejecucion = Ejecucion(etiqueta) if self.activa else None
+        self._local.profundidad = 0
+
+    def etiquetar(self, etiqueta):
+        ejecucion = getattr(self._local, "ejecucion", None)
+        if ejecucion is not None:
+            ejecucion.etiqueta = etiqueta
+
+    def fase(self, nombre):
+        """Cierra la fase en curso y abre ``nombre`` como tramo de primer nivel."""
+        ejecucion = getattr(self._local, "ejecucion", None)
+        if ejecucion is None:
+            return
+        ahora = time.perf_counter()
+        self._cerrar_fase(ejecucion, ahora)
+        ejecucion.fase = (nombre, ahora)
+        self._local.profundidad = 1
+
+    def _cerrar_fase(self, ejecucion, ahora):
+        if ejecucion.fase is not None:
+            nombre, inicio = ejecucion.fase
+            ejecucion.fase = None
+            self._cerrar(nombre, 0, inicio, ahora, False)
+
+    def terminar_ejecucion(self):
+        ejecucion = getattr(self._local, "ejecucion", None)
+        self._local.ejecucion = None
+        self._local.profundidad = 0
+        if ejecucion is not None:
+            self._terminar(ejecucion)
+
+    def _terminar(self, ejecucion):
+        ahora = time.perf_counter()
+        # La ejecución sigue siendo la del hilo mientras se cierra su última fase.
+        self._local.ejecucion = ejecucion
+        self._cerrar_fase(ejecucion, ahora)
+        self._local.ejecucion = None
+        ejecucion.duracion_s = ahora - ejecucion.inicio
+        # Las fases se registran al cerrarse: se ordenan por inicio para la vista en cascada.
+        ejecucion.tramos.sort(key=lambda t: (t[2], t[1]))
+        with self._lock:
+            self._ejecuciones.append(ejecucion)
+            self.total_ejecuciones += 1
+
+    # --------------------------------------------------------
+    # Consulta y exportación
+    # --------------------------------------------------------
+    def ejecuciones(self):
+        """Últimas ejecuciones terminadas, de la más reciente a la más antigua."""
+        with self._lock:
+            return list(reversed(self._ejecuciones))
+
+    def totales(self):
+        """{tramo: {veces, segundos, medio_s, max_s, errores}} acumulado desde el último reinicio."""
+        with self._lock:
+            return {
+                nombre: {
+                    "veces": veces, "segundos": segundos, "medio_s": segundos / veces if veces else 0.0,
+                    "max_s": maximo, "errores": errores,
+                }
+                for nombre, (veces, segundos, maximo, errores) in self._totales.items()
+            }
+
+    def contadores(self):
+        with self._lock:
+            return dict(self._contadores)
+
+    def reiniciar(self):
+        with self._lock:
+            self._totales.clear()
+            self._contadores.clear()
+            self._ejecuciones.clear()
+            self.total_ejecuciones = 0
+
+    def texto_prometheus(self):
+        """Totales en formato de exposición de texto de Prometheus."""
+        totales, contadores = self.totales(), self.contadores()
+        p = PREFIJO_METRICAS
+        lineas = [
+            f"# HELP {p}_tramo_segundos Tiempo acumulado en cada tramo instrumentado.",
+            f"# TYPE {p}_tramo_segundos summary",
+        ]
+        for nombre, t in sorted(totales.items()):
+            etiqueta = f'{{tramo="{_escapar(nombre)}"}}'
+            lineas.append(f"{p}_tramo_segundos_sum{etiqueta} {t['segundos']:.6f}")
+            lineas.append(f"{p}_tramo_segundos_count{etiqueta} {t['veces']}")
+        lineas += [
+            f"# HELP {p}_tramo_max_segundos Duración máxima observada de cada tramo.",
+            f"# TYPE {p}_tramo_max_segundos gauge",
+        ]
+        lineas += [
+            f'{p}_tramo_max_segundos{{tramo="{_escapar(n)}"}} {t["max_s"]:.6f}' for n, t in sorted(totales.items())
+        ]
+        lineas += [
+            f"# HELP {p}_tramo_errores_total Tramos que terminaron con una excepción.",
+            f"# TYPE {p}_tramo_errores_total counter",
+        ]
+        lineas += [f'{p}_tramo_errores_total{{tramo="{_escapar(n)}"}} {t["errores"]}' for n, t in sorted(totales.items())]
+        for nombre, valor in sorted(contadores.items()):
+            lineas += [f"# TYPE {p}_{nombre}_total counter", f"{p}_{nombre}_total {valor}"]
+        lineas += [f"# TYPE {p}_ejecuciones_total counter", f"{p}_ejecuciones_total {self.total_ejecuciones}"]
+        return "\n".join(lineas) + "\n"
+
+    def registro_jsonl(self):
+        """Últimas ejecuciones como JSON Lines (una por línea, de la más antigua a la más reciente)."""
+        return "".join(
+            json.dumps(e.como_dict(), ensure_ascii=False) + "\n" for e in reversed(self.ejecuciones())
+        )
+
+
+def _escapar(valor):
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Instancia compartida por todo el proceso (todas las sesiones de Streamlit).
+instrumentacion = Instrumentacion(activa=os.environ.get(VARIABLE_ACTIVA, "") not in ("", "0"))
+
+
+def tramo(nombre):
+    return instrumentacion.tramo(nombre)
+
+
+def contar(nombre, valor=1):
+    instrumentacion.contar(nombre, valor)
+
+
+def instrumentado(nombre):
+    """Decorador: mide cada llamada a la función como el tramo ``nombre``."""
+    def decorar(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not instrumentacion.activa:
+                return funcion(*args, **kwargs)
+            with _Tramo(instrumentacion, nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorar
@@ -0,0 +1,127 @@
+# ============================================================
+# CANAL DE CAMBIOS ENTRE PROCESOS
+# ============================================================
+# Con varios procesos del servidor detrás de un balanceador, cada uno
+# tiene su caché de consultas y sus instantáneas. Un hilo por base
+# espera los commits de cualquier proceso (el pool los señala con
+# esperar_cambios(): en SQLite, PRAGMA data_version sobre una conexión
+# propia; en PostgreSQL, LISTEN/NOTIFY) y en cuanto llega uno
+# sincroniza las versiones por tabla: solo se invalidan las tablas
+# que cambiaron y, con recargar=True, las instantáneas que ya estaban
+# en memoria se vuelven a leer en segundo plano, así que ninguna
+# sesión paga la recarga.
+#
+# Mientras el canal está activo el script no necesita consultar las
+# versiones en cada rerun. El intervalo de sondeo se ajusta con
+# AEROPUERTO_CANAL_INTERVALO (segundos; 0 lo desactiva).
+# ============================================================
+
+import os
+import threading
+import time
+
+from aeropuerto.conexion import get_pool
+from aeropuerto.instantaneas import almacen_instantaneas
+
+VARIABLE_INTERVALO = "AEROPUERTO_CANAL_INTERVALO"
+INTERVALO = 0.1
+
+
+def intervalo_configurado():
+    return float(os.environ.get(VARIABLE_INTERVALO, INTERVALO))
+
+
+class CanalCambios:
+    """
+    Hilo que escucha los cambios de la base del pool.
+
+        canal = CanalCambios(pool).iniciar()
+        canal.suscribir(lambda tablas: print("cambiaron", tablas))
+    """
+
+    def __init__(self, pool=None, intervalo=INTERVALO, recargar=True):
+        self.pool = pool or get_pool()
+        self.intervalo = intervalo
+        self.recargar = recargar
+        self._suscriptores = []
+        self._parar = threading.Event()
+        self._hilo = None
+        self._metricas = {"avisos": 0, "tablas_cambiadas": 0, "recargas": 0, "errores": 0}
+        self.ultimo_aviso = None
+        self.ultimo_error = None
+
+    @property
+    def activo(self):
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def suscribir(self, funcion):
+        """``funcion(tablas)`` se llama desde el hilo del canal tras cada cambio."""
+        self._suscriptores.append(funcion)
+
+    def iniciar(self):
+        if not self.activo:
+            self._parar.clear()
+            self._hilo = threading.Thread(target=self._bucle, name=f"canal-{self.pool.ruta}", daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self, timeout=None):
+        self._parar.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+
+    def metricas(self):
+        metricas = dict(self._metricas)
+        metricas["activo"] = self.activo
+        metricas["intervalo_s"] = self.intervalo
+        metricas["ultimo_aviso"] = self.ultimo_aviso
+        metricas["ultimo_error"] = self.ultimo_error
+        return metricas
+
+    # --------------------------------------------------------
+    # Hilo del canal
+    # --------------------------------------------------------
+    def _bucle(self):
+        # Versiones de partida: los avisos posteriores se comparan contra ellas.
+        almacen_instantaneas.sincronizar(self.pool)
+        while not self._parar.is_set():
+            try:
+                for _ in self.pool.esperar_cambios(self._parar, self.intervalo):
+                    self._al_cambiar()
+            except self.pool.Error as e:
+                # La base pudo desaparecer o estar bloqueada: se reintenta tras una pausa.
+                self._metricas["errores"] += 1
+                self.ultimo_error = str(e)
+                self._parar.wait(max(self.intervalo, 1.0))
+
+    def _al_cambiar(self):
+        self._metricas["avisos"] += 1
+        self.ultimo_aviso = time.time()
+        cargadas = almacen_instantaneas.cargadas(self.pool)
+        cambiadas = almacen_instantaneas.sincronizar(self.pool)
+        if not cambiadas:
+            return
+        self._metricas["tablas_cambiadas"] += len(cambiadas)
+        if self.recargar:
+            for tabla, columnas in cargadas:
+                if tabla in cambiadas:
+                    almacen_instantaneas.obtener(tabla, self.pool, columnas)
+                    self._metricas["recargas"] += 1
+        for funcion in list(self._suscriptores):
+            funcion(cambiadas)
+
+
+_canales = {}
+_lock_canales = threading.Lock()
+
+
+def get_canal(pool=None):
+    """Canal del proceso para la base del pool (uno por base), iniciado si el intervalo no es 0."""
+    pool = pool or get_pool()
+    with _lock_canales:
+        canal = _canales.get(pool.ruta)
+        if canal is None:
+            canal = _canales[pool.ruta] = CanalCambios(pool, intervalo_configurado())
+        if canal.intervalo > 0:
+            canal.iniciar()
+        return canal
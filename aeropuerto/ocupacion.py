@@ -0,0 +1,167 @@
+# ============================================================
+# OCUPACIÓN Y FACTOR DE CARGA DE LOS VUELOS
+# ============================================================
+# Relaciona la capacidad declarada de cada vuelo (num_pasajeros)
+# con los pasajeros registrados en él (pasajeros.vuelo_id). El
+# conteo por vuelo lo mantienen los triggers de resúmenes
+# (resumen_pasajeros_vuelo), así que cada lectura es un recorrido de
+# los vuelos filtrados con un join por clave primaria: el costo no
+# depende del número de pasajeros. Los resultados pasan por la caché
+# de consultas ligados a las versiones de vuelos y pasajeros.
+#
+#   factor_carga = registrados / capacidad
+#   sobreventa   = registrados por encima de la capacidad (0 si no la supera)
+#
+#   python -m aeropuerto.ocupacion --por ruta --desde 2025-01-01
+# ============================================================
+
+import argparse
+import sys
+from datetime import date
+
+import pandas as pd
+
+from aeropuerto.conexion import get_pool
+from aeropuerto.consultas import Consulta, leer_sql
+from aeropuerto.esquema import crear_esquema
+from aeropuerto.resumenes import RESOLUCIONES
+
+_ORIGEN = "vuelos v LEFT JOIN resumen_pasajeros_vuelo r ON r.vuelo_id = v.id_vuelo"
+_DEPENDENCIAS = ("vuelos", "pasajeros")
+
+_REGISTRADOS = "COALESCE(r.registrados, 0)"
+_CAPACIDAD = "COALESCE(v.num_pasajeros, 0)"
+_SOBREVENTA = f"MAX({_REGISTRADOS} - {_CAPACIDAD}, 0)"
+
+# Agregados de un grupo de vuelos (ruta, periodo o el total).
+_AGREGADOS = [
+    "COUNT(*) AS vuelos",
+    f"SUM({_CAPACIDAD}) AS capacidad",
+    f"SUM({_REGISTRADOS}) AS registrados",
+    f"1.0 * SUM({_REGISTRADOS}) / NULLIF(SUM({_CAPACIDAD}), 0) AS factor_carga",
+    f"SUM({_REGISTRADOS} > {_CAPACIDAD}) AS vuelos_sobrevendidos",
+    f"SUM({_SOBREVENTA}) AS plazas_sobrevendidas",
+    f"SUM({_REGISTRADOS} = 0) AS vuelos_sin_pasajeros",
+]
+
+# Órdenes admitidos por por_vuelo().
+ORDENES = {
+    "sobreventa": "sobreventa DESC, factor_carga DESC, v.id_vuelo",
+    "factor_carga": "factor_carga DESC, v.id_vuelo",
+    "factor_carga_asc": "factor_carga ASC, v.id_vuelo",
+    "fecha": "v.fecha DESC, v.id_vuelo",
+}
+
+
+def _consulta(columnas, desde, hasta, aeropuertos, estados):
+    consulta = Consulta(_ORIGEN, columnas)
+    if desde is not None:
+        consulta.donde("v.fecha >= ?", desde.isoformat())
+    if hasta is not None:
+        consulta.donde("v.fecha <= ?", hasta.isoformat())
+    aeropuertos = list(aeropuertos)
+    if aeropuertos:
+        marcadores = ", ".join("?" for _ in aeropuertos)
+        consulta.donde(f"(v.origen IN ({marcadores}) OR v.destino IN ({marcadores}))", *aeropuertos, *aeropuertos)
+    return consulta.en("v.estado", estados)
+
+
+def _leer(consulta):
+    sql, params = consulta.sql()
+    return leer_sql(sql, params, _DEPENDENCIAS)
+
+
+def por_vuelo(desde=None, hasta=None, aeropuertos=(), estados=(), solo_sobrevendidos=False,
+              orden="sobreventa", limite=None):
+    """
+    Una fila por vuelo: capacidad, registrados, factor_carga y sobreventa.
+    ``orden`` es una clave de ORDENES; ``limite`` acota las filas devueltas.
+    """
+    consulta = _consulta(
+        [
+            "v.id_vuelo", "v.fecha", "v.origen", "v.destino", "v.estado",
+            f"{_CAPACIDAD} AS capacidad", f"{_REGISTRADOS} AS registrados",
+            f"1.0 * {_REGISTRADOS} / NULLIF({_CAPACIDAD}, 0) AS factor_carga",
+            f"{_SOBREVENTA} AS sobreventa",
+        ],
+        desde, hasta, aeropuertos, estados,
+    )
+    if solo_sobrevendidos:
+        consulta.donde(f"{_REGISTRADOS} > {_CAPACIDAD}")
+    consulta.ordenar(ORDENES[orden])
+    if limite is not None:
+        consulta.limite(limite)
+    return _leer(consulta)
+
+
+def por_ruta(desde=None, hasta=None, aeropuertos=(), estados=(), min_vuelos=1):
+    """Agregados por (origen, destino), de mayor a menor factor de carga."""
+    consulta = (
+        _consulta(["v.origen", "v.destino"] + _AGREGADOS, desde, hasta, aeropuertos, estados)
+        .agrupar("v.origen", "v.destino")
+        .teniendo("COUNT(*) >= ?", int(min_vuelos))
+        .ordenar("factor_carga DESC", "v.origen", "v.destino")
+    )
+    return _leer(consulta)
+
+
+def por_periodo(desde=None, hasta=None, aeropuertos=(), estados=(), resolucion="D"):
+    """Agregados por día ('D'), semana ('W') o mes ('M'), indexados por periodo."""
+    expresion = RESOLUCIONES[resolucion][0].format(fecha="v.fecha")
+    consulta = (
+        _consulta([f"{expresion} AS periodo"] + _AGREGADOS, desde, hasta, aeropuertos, estados)
+        .donde("v.fecha IS NOT NULL")
+        .agrupar("periodo")
+        .ordenar("periodo")
+    )
+    df = _leer(consulta)
+    return df.set_index(df["periodo"].astype("datetime64[ns]")).drop(columns="periodo")
+
+
+def resumen(desde=None, hasta=None, aeropuertos=(), estados=()):
+    """
+    Totales del conjunto filtrado como dict. factor_carga es None sin capacidad;
+    sin vuelos (las sumas vienen NULL) los contadores son 0.
+    """
+    fila = _leer(_consulta(_AGREGADOS, desde, hasta, aeropuertos, estados)).iloc[0]
+    return {
+        columna: (None if pd.isna(valor) else float(valor)) if columna == "factor_carga"
+        else 0 if pd.isna(valor) else int(valor)
+        for columna, valor in fila.items()
+    }
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Factor de carga y sobreventa de los vuelos.")
+    parser.add_argument("--db", help="Ruta de la base SQLite (por defecto AEROPUERTO_DB o aeropuerto.db)")
+    parser.add_argument("--por", choices=["vuelo", "ruta", "dia", "semana", "mes"], default="ruta")
+    parser.add_argument("--desde", type=date.fromisoformat, default=None, help="AAAA-MM-DD")
+    parser.add_argument("--hasta", type=date.fromisoformat, default=None, help="AAAA-MM-DD")
+    parser.add_argument("--aeropuerto", action="append", default=[], help="Origen o destino (repetible)")
+    parser.add_argument("--sobrevendidos", action="store_true", help="Solo vuelos sobrevendidos (--por vuelo)")
+    parser.add_argument("--limite", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    pool = get_pool(args.db)
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+    filtros = {"desde": args.desde, "hasta": args.hasta, "aeropuertos": [a.upper() for a in args.aeropuerto]}
+    if args.por == "vuelo":
+        df = por_vuelo(solo_sobrevendidos=args.sobrevendidos, limite=args.limite, **filtros)
+    elif args.por == "ruta":
+        df = por_ruta(**filtros).head(args.limite)
+    else:
+        df = por_periodo(resolucion={"dia": "D", "semana": "W", "mes": "M"}[args.por], **filtros).tail(args.limite)
+    print(df.to_string())
+    totales = resumen(**filtros)
+    factor = "-" if totales["factor_carga"] is None else f"{totales['factor_carga']:.1%}"
+    print(f"\nFactor de carga: {factor} · {totales['vuelos_sobrevendidos']:,} vuelos sobrevendidos "
+          f"({totales['plazas_sobrevendidas']:,} plazas) de {totales['vuelos']:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# ============================================================
+# PAGINACIÓN POR CLAVE (KEYSET / SEEK)
+# ============================================================
+# En lugar de OFFSET (que obliga a SQLite a recorrer y descartar
+# todas las filas anteriores), cada página continúa desde la última
+# fila vista:  WHERE (orden, clave) > (?, ?) ORDER BY orden, clave
+# LIMIT n. El costo de cualquier página es el de leer n filas por
+# índice, sin importar lo profundo que esté.
+#
+# Los NULL van antes que cualquier valor (al final en orden
+# descendente), como los ordena SQLite; se pide explícitamente con
+# NULLS FIRST/LAST para que PostgreSQL, que los ordena al revés, dé
+# las mismas páginas. Una comparación con NULL nunca es verdadera,
+# así que las filas con ``orden`` nulo se tratan aparte: forman su
+# propio tramo, recorrido solo por la clave.
+# ============================================================
+
+import pandas as pd
+
+from aeropuerto.consultas import leer_sql
+
+TOPE_CONTEO = 10_000
+
+
+def pagina_keyset(consulta, clave, orden=None, descendente=False, tamano=50, cursor=None):
+    """
+    Lee una página de ``consulta`` (una ``Consulta`` con sus filtros).
+
+    ``clave`` es la columna única que desempata (id_vuelo, id_pasajero...),
+    ``orden`` la columna de ordenamiento elegida (por defecto la clave) y
+    ``cursor`` el valor devuelto por la página anterior (None = primera página).
+
+    Devuelve ``(df, cursor_siguiente)``; ``cursor_siguiente`` es None en la última página.
+    """
+    orden = orden or clave
+    direccion = "DESC" if descendente else "ASC"
+    comparador = "<" if descendente else ">"
+
+    pagina = consulta.copiar()
+    if cursor is not None:
+        if orden == clave:
+            pagina.donde(f"{clave} {comparador} ?", cursor[-1])
+        elif cursor[0] is None:
+            # Dentro del tramo de nulos; en orden ascendente los no nulos vienen después.
+            despues = "" if descendente else f" OR {orden} IS NOT NULL"
+            pagina.donde(f"(({orden} IS NULL AND {clave} {comparador} ?){despues})", cursor[1])
+        else:
+            # En orden descendente los nulos van al final, tras todos los valores.
+            despues = f" OR {orden} IS NULL" if descendente else ""
+            pagina.donde(f"(({orden}, {clave}) {comparador} (?, ?){despues})", *cursor)
+    if orden == clave:
+        pagina.ordenar(f"{clave} {direccion}")
+    else:
+        nulos = "NULLS LAST" if descendente else "NULLS FIRST"
+        pagina.ordenar(f"{orden} {direccion} {nulos}", f"{clave} {direccion}")
+    # Se pide una fila de más solo para saber si existe una página siguiente.
+    df = pagina.limite(tamano + 1).leer()
+
+    if len(df) <= tamano:
+        return df, None
+    df = df.iloc[:tamano]
+    ultima = df.iloc[-1]
+    siguiente = (ultima[orden], ultima[clave]) if orden != clave else (ultima[clave],)
+    # Los escalares de numpy no son parámetros válidos para sqlite3; los nulos de pandas pasan a None.
+    siguiente = tuple(None if pd.isna(v) else v.item() if hasattr(v, "item") else v for v in siguiente)
+    return df, siguiente
+
+
+def contar_estimado(consulta, clave, tope=TOPE_CONTEO):
+    """
+    Total de filas de la consulta, acotado en costo.
+
+    Sin filtros se usa MAX(clave), que en tablas AUTOINCREMENT es una
+    lectura del índice primario (exacto salvo filas borradas). Con filtros
+    se cuenta hasta ``tope`` filas.
+
+    Devuelve ``(total, texto)``, donde ``texto`` es el total listo para
+    mostrar: "1,234" (exacto), "≈ 1,234" (estimado) o "10,000+" (acotado).
+    """
+    if not consulta.filtrada:
+        total = int(consulta.copiar(f"COALESCE(MAX({clave}), 0)").escalar() or 0)
+        return total, f"≈ {total:,}"
+    sql, params = consulta.copiar("1").limite(tope + 1).sql()
+    total = int(leer_sql(f"SELECT COUNT(*) FROM ({sql})", params, (consulta.tabla,)).iat[0, 0])
+    if total > tope:
+        return tope, f"{tope:,}+"
+    return total, f"{total:,}"
@@ -0,0 +1,70 @@
+# ============================================================
+# ALTAS DE VUELOS, PASAJEROS Y TRÁNSITO
+# ============================================================
+# Las sentencias de alta que antes vivían en los formularios de las
+# secciones, para que la interfaz y la API (aeropuerto/api.py) las
+# compartan. Cada función valida y normaliza los campos, encola el
+# INSERT en la cola de escritura del pool y devuelve su Future: quien
+# llama decide si espera la confirmación o la notifica después.
+# ============================================================
+
+from datetime import date
+
+from aeropuerto.escritura import get_cola
+
+ESTADOS_VUELO = ["Programado", "En curso", "Completado", "Cancelado"]
+
+EDAD_MAXIMA = 120
+
+
+def _fecha(valor):
+    """Fecha como texto ISO (acepta ``date`` o 'AAAA-MM-DD')."""
+    if isinstance(valor, date):
+        return valor.isoformat()
+    return date.fromisoformat(str(valor)).isoformat()
+
+
+def _entero(valor, campo, minimo=0, maximo=None):
+    try:
+        numero = int(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"{campo} debe ser un número entero") from None
+    if numero < minimo or (maximo is not None and numero > maximo):
+        raise ValueError(f"{campo} fuera de rango: {numero}")
+    return numero
+
+
+def _texto(valor, campo):
+    texto = (valor or "").strip()
+    if not texto:
+        raise ValueError(f"{campo} es obligatorio")
+    return texto
+
+
+def registrar_vuelo(fecha, origen, destino, num_pasajeros=0, estado="Programado", pool=None):
+    if estado not in ESTADOS_VUELO:
+        raise ValueError(f"Estado no válido: {estado!r} ({', '.join(ESTADOS_VUELO)})")
+    return get_cola(pool).encolar(
+        "INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) VALUES (?, ?, ?, ?, ?)",
+        (
+            _fecha(fecha), _texto(origen, "Origen").upper(), _texto(destino, "Destino").upper(),
+            _entero(num_pasajeros, "Número de pasajeros"), estado,
+        ),
+    )
+
+
+def registrar_pasajero(vuelo_id, ticket, nombre, edad, pool=None):
+    return get_cola(pool).encolar(
+        "INSERT INTO pasajeros (vuelo_id, ticket, nombre, edad) VALUES (?, ?, ?, ?)",
+        (
+            _entero(vuelo_id, "Vuelo", minimo=1), _texto(ticket, "Ticket").upper(),
+            _texto(nombre, "Nombre"), _entero(edad, "Edad", maximo=EDAD_MAXIMA),
+        ),
+    )
+
+
+def registrar_transito(fecha, aeropuerto, num_pasajeros, pool=None):
+    return get_cola(pool).encolar(
+        "INSERT INTO pasajeros_transito (fecha, aeropuerto, num_pasajeros) VALUES (?, ?, ?)",
+        (_fecha(fecha), _texto(aeropuerto, "Aeropuerto").upper(), _entero(num_pasajeros, "Número de pasajeros")),
+    )
@@ -0,0 +1,449 @@
+# ============================================================
+# TABLAS DE RESUMEN (KPIs y agregados del Dashboard)
+# ============================================================
+# Contadores por estado, origen y aeropuerto que los triggers de
+# SQLite mantienen al día en cada INSERT/UPDATE/DELETE sobre las
+# tablas de hechos, sin importar quién escriba (formularios, el
+# generador o un proceso externo). El Dashboard lee O(#grupos) filas
+# en lugar de recorrer todos los vuelos y registros de tránsito.
+#
+# Las series temporales (serie_vuelos, serie_transito) guardan los
+# mismos contadores por día, semana y mes, por aeropuerto (y estado);
+# cada gráfico elige la resolución según el rango pedido, así que un
+# historial de varios años se lee en un número acotado de cubetas.
+#
+# resumen_pasajeros_vuelo cuenta los pasajeros registrados de cada
+# vuelo: la ocupación (aeropuerto/ocupacion.py) se calcula con un
+# join por clave contra vuelos, sin agrupar la tabla de pasajeros.
+#
+# resumen_edades* son histogramas de edad (un contador por edad, un
+# dominio de 0 a 120) global, por vuelo y por ruta: cualquier rango,
+# banda, promedio, mediana o moda se responde desde ellos
+# (aeropuerto/demografia.py). La ruta de un pasajero es la de su
+# vuelo; si el vuelo cambia de ruta, se borra o aparece después, los
+# triggers de vuelos traspasan su histograma entre rutas ('' = sin
+# vuelo).
+#
+# Las cargas masivas (el generador) suspenden los triggers con
+# triggers_suspendidos() y reconstruyen los resúmenes una sola vez.
+#
+#   python -m aeropuerto.resumenes --db aeropuerto.db   # reconstruir
+# ============================================================
+
+import argparse
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pandas as pd
+
+from aeropuerto.cache import cache_consultas
+from aeropuerto.conexion import get_pool
+from aeropuerto.consultas import Consulta, leer_sql
+
+TABLAS_RESUMEN_SQL = [
+    '''
+        CREATE TABLE IF NOT EXISTS resumen_vuelos_estado (
+            estado TEXT PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS resumen_vuelos_origen (
+            origen TEXT PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS resumen_transito_aeropuerto (
+            aeropuerto TEXT PRIMARY KEY,
+            registros INTEGER NOT NULL DEFAULT 0,
+            num_pasajeros INTEGER NOT NULL DEFAULT 0
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS resumen_totales (
+            clave TEXT PRIMARY KEY,
+            valor INTEGER NOT NULL DEFAULT 0
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS resumen_pasajeros_vuelo (
+            vuelo_id INTEGER,
+            registrados INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (vuelo_id)
+        ) WITHOUT ROWID
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS resumen_edades (
+            edad INTEGER,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (edad)
+        ) WITHOUT ROWID
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS resumen_edades_vuelo (
+            vuelo_id INTEGER,
+            edad INTEGER,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (vuelo_id, edad)
+        ) WITHOUT ROWID
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS resumen_edades_ruta (
+            origen TEXT,
+            destino TEXT,
+            edad INTEGER,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (origen, destino, edad)
+        ) WITHOUT ROWID
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS serie_vuelos (
+            resolucion TEXT,
+            periodo DATE,
+            aeropuerto TEXT,
+            estado TEXT,
+            total INTEGER NOT NULL DEFAULT 0,
+            num_pasajeros INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (resolucion, periodo, aeropuerto, estado)
+        ) WITHOUT ROWID
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS serie_transito (
+            resolucion TEXT,
+            periodo DATE,
+            aeropuerto TEXT,
+            registros INTEGER NOT NULL DEFAULT 0,
+            num_pasajeros INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (resolucion, periodo, aeropuerto)
+        ) WITHOUT ROWID
+    ''',
+]
+
+# Resolución -> (expresión SQL del inicio de la cubeta, frecuencia de pandas).
+# Las semanas empiezan en lunes.
+RESOLUCIONES = {
+    "D": ("date({fecha})", "D"),
+    "W": ("date({fecha}, '-6 days', 'weekday 1')", "W-MON"),
+    "M": ("strftime('%Y-%m-01', {fecha})", "MS"),
+}
+
+# Máximo de puntos por serie al elegir la resolución automáticamente.
+MAX_PUNTOS_SERIE = 200
+
+
+def _series(resumen, fila_fecha, claves, contadores):
+    return [
+        (resumen, {"resolucion": f"'{r}'", "periodo": expr.format(fecha=fila_fecha), **claves}, contadores)
+        for r, (expr, _) in RESOLUCIONES.items()
+    ]
+
+# Ruta del vuelo de un pasajero (NULL si el vuelo no existe).
+_RUTA_PASAJERO = {
+    columna: f"(SELECT {columna} FROM vuelos WHERE id_vuelo = {{f}}.vuelo_id)" for columna in ("origen", "destino")
+}
+
+# tabla de hechos -> [(tabla resumen, {columna clave: expresión}, {columna contador: expresión})]
+# Las expresiones usan {f} como alias de la fila (NEW u OLD). Las claves NULL se
+# guardan con un centinela del tipo de la columna (CLAVES_NULAS: -1 en las enteras,
+# '' en las de texto) porque una PRIMARY KEY admite varios NULL y el UPSERT no los
+# uniría.
+RESUMENES = {
+    "vuelos": [
+        ("resumen_vuelos_estado", {"estado": "{f}.estado"}, {"total": "1"}),
+        ("resumen_vuelos_origen", {"origen": "{f}.origen"}, {"total": "1"}),
+        *_series("serie_vuelos", "{f}.fecha", {"aeropuerto": "{f}.origen", "estado": "{f}.estado"},
+                 {"total": "1", "num_pasajeros": "COALESCE({f}.num_pasajeros, 0)"}),
+    ],
+    "pasajeros_transito": [
+        ("resumen_transito_aeropuerto", {"aeropuerto": "{f}.aeropuerto"},
+         {"registros": "1", "num_pasajeros": "COALESCE({f}.num_pasajeros, 0)"}),
+        *_series("serie_transito", "{f}.fecha", {"aeropuerto": "{f}.aeropuerto"},
+                 {"registros": "1", "num_pasajeros": "COALESCE({f}.num_pasajeros, 0)"}),
+    ],
+    "pasajeros": [
+        ("resumen_totales", {"clave": "'pasajeros'"}, {"valor": "1"}),
+        ("resumen_pasajeros_vuelo", {"vuelo_id": "{f}.vuelo_id"}, {"registrados": "1"}),
+        ("resumen_edades", {"edad": "{f}.edad"}, {"total": "1"}),
+        ("resumen_edades_vuelo", {"vuelo_id": "{f}.vuelo_id", "edad": "{f}.edad"}, {"total": "1"}),
+        ("resumen_edades_ruta", {**_RUTA_PASAJERO, "edad": "{f}.edad"}, {"total": "1"}),
+    ],
+}
+
+
+# Centinela de las claves enteras NULL (ni edad ni los ids llegan a ser negativos).
+CLAVES_NULAS = {"vuelo_id": "-1", "edad": "-1"}
+
+
+def _clave(columna, expresion):
+    nulo = CLAVES_NULAS.get(columna, "''")
+    return f"COALESCE({expresion}, {nulo})"
+
+
+def _upsert(resumen, claves, contadores, fila, signo):
+    columnas = list(claves) + list(contadores)
+    valores = [_clave(col, expr.format(f=fila)) for col, expr in claves.items()]
+    valores += [f"{signo}({expr.format(f=fila)})" for expr in contadores.values()]
+    actualizacion = ", ".join(f"{col} = {col} + excluded.{col}" for col in contadores)
+    return (
+        f"INSERT INTO {resumen} ({', '.join(columnas)}) VALUES ({', '.join(valores)}) "
+        f"ON CONFLICT({', '.join(claves)}) DO UPDATE SET {actualizacion};"
+    )
+
+
+def _traspaso_edades(fila, signo, condicion="1"):
+    """
+    Suma (``signo`` '+') o resta ('-') el histograma del vuelo ``fila`` en su
+    ruta y lo contrario en la ruta '' (pasajeros sin vuelo).
+    """
+    sentencias = []
+    for origen, destino, signo_ruta in ((f"{fila}.origen", f"{fila}.destino", signo),
+                                        ("NULL", "NULL", "-" if signo == "+" else "+")):
+        sentencias.append(
+            "INSERT INTO resumen_edades_ruta (origen, destino, edad, total) "
+            f"SELECT COALESCE({origen}, ''), COALESCE({destino}, ''), edad, {signo_ruta}total "
+            f"FROM resumen_edades_vuelo WHERE vuelo_id = {fila}.id_vuelo AND {condicion} "
+            "ON CONFLICT(origen, destino, edad) DO UPDATE SET total = total + excluded.total;"
+        )
+    return " ".join(sentencias)
+
+
+# Sentencias extra de los triggers de cada tabla: (al insertar, al borrar, al actualizar).
+_CAMBIO_RUTA = "(OLD.id_vuelo IS NOT NEW.id_vuelo OR OLD.origen IS NOT NEW.origen OR OLD.destino IS NOT NEW.destino)"
+TRASPASOS = {
+    "vuelos": (
+        _traspaso_edades("NEW", "+"),
+        _traspaso_edades("OLD", "-"),
+        f"{_traspaso_edades('OLD', '-', _CAMBIO_RUTA)} {_traspaso_edades('NEW', '+', _CAMBIO_RUTA)}",
+    ),
+}
+
+
+def triggers_sql():
+    """Sentencias CREATE TRIGGER (insert/delete/update) para cada tabla de hechos."""
+    sentencias = []
+    for tabla, resumenes in RESUMENES.items():
+        al_insertar = " ".join(_upsert(r, k, c, "NEW", "+") for r, k, c in resumenes)
+        al_borrar = " ".join(_upsert(r, k, c, "OLD", "-") for r, k, c in resumenes)
+        traspaso_ins, traspaso_del, traspaso_upd = TRASPASOS.get(tabla, ("", "", ""))
+        sentencias += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_resumen_{tabla}_ins AFTER INSERT ON {tabla} "
+            f"BEGIN {al_insertar} {traspaso_ins} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_resumen_{tabla}_del AFTER DELETE ON {tabla} "
+            f"BEGIN {al_borrar} {traspaso_del} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_resumen_{tabla}_upd AFTER UPDATE ON {tabla} "
+            f"BEGIN {al_borrar} {al_insertar} {traspaso_upd} END",
+        ]
+    return sentencias
+
+
+def nombres_triggers():
+    return [f"trg_resumen_{tabla}_{op}" for tabla in RESUMENES for op in ("ins", "del", "upd")]
+
+
+def reconstruir(conn):
+    """Re-deriva todas las tablas de resumen desde las tablas de hechos."""
+    # Cada tabla se vacía una sola vez: las series rellenan la misma tabla con una
+    # entrada por resolución, y vaciarla en cada una dejaría solo la última.
+    for resumen in dict.fromkeys(r for resumenes in RESUMENES.values() for r, _, _ in resumenes):
+        conn.execute(f"DELETE FROM {resumen}")
+    for tabla, resumenes in RESUMENES.items():
+        for resumen, claves, contadores in resumenes:
+            columnas = list(claves) + list(contadores)
+            expresiones = [_clave(col, expr.format(f=tabla)) for col, expr in claves.items()]
+            expresiones += [f"SUM({expr.format(f=tabla)})" for expr in contadores.values()]
+            grupos = ", ".join(str(i + 1) for i in range(len(claves)))
+            conn.execute(
+                f"INSERT INTO {resumen} ({', '.join(columnas)}) "
+                f"SELECT {', '.join(expresiones)} FROM {tabla} GROUP BY {grupos}"
+            )
+
+
+@contextmanager
+def triggers_suspendidos(conn):
+    """
+    Para cargas masivas: quita los triggers de resumen dentro de la transacción
+    de ``conn`` y, al terminar el bloque, los recrea y reconstruye los resúmenes
+    con un GROUP BY por tabla en lugar de una veintena de UPSERT por fila. Si el
+    bloque falla, el rollback de la transacción devuelve los triggers.
+    """
+    if not conn.in_transaction:
+        # sqlite3 no abre la transacción antes de un DDL: sin ella, el DROP sería definitivo.
+        conn.execute("BEGIN")
+    for nombre in nombres_triggers():
+        conn.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+    yield
+    for sql in triggers_sql():
+        conn.execute(sql)
+    reconstruir(conn)
+
+
+def migracion_resumenes(c):
+    """
+    Migración de esquema: crea tablas de resumen y triggers, y las rellena.
+    Los triggers se recrean siempre, por si la especificación RESUMENES cambió.
+    """
+    for sql in TABLAS_RESUMEN_SQL:
+        c.execute(sql)
+    for nombre in nombres_triggers():
+        c.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+    for sql in triggers_sql():
+        c.execute(sql)
+    reconstruir(c.connection)
+
+
+def migracion_series(c):
+    """Migración de esquema: series temporales por día/semana/mes en lugar de resumen_*_dia."""
+    for nombre in nombres_triggers():
+        c.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+    c.execute("DROP TABLE IF EXISTS resumen_vuelos_dia")
+    c.execute("DROP TABLE IF EXISTS resumen_transito_dia")
+    migracion_resumenes(c)
+
+
+def migracion_ocupacion(c):
+    """Migración de esquema: pasajeros registrados por vuelo (resumen_pasajeros_vuelo)."""
+    migracion_resumenes(c)
+
+
+def migracion_edades(c):
+    """Migración de esquema: histogramas de edad global, por vuelo y por ruta (resumen_edades*)."""
+    migracion_resumenes(c)
+
+
+# ------------------------------------------------------------
+# LECTURAS PARA EL DASHBOARD
+# ------------------------------------------------------------
+def kpis_dashboard():
+    df = leer_sql(
+        '''
+        SELECT
+            (SELECT COALESCE(SUM(total), 0) FROM resumen_vuelos_estado) AS total_vuelos,
+            (SELECT COALESCE(SUM(total), 0) FROM resumen_vuelos_estado WHERE estado = 'Completado') AS vuelos_completados,
+            (SELECT COALESCE(SUM(valor), 0) FROM resumen_totales WHERE clave = 'pasajeros') AS total_pasajeros_reg,
+            (SELECT COALESCE(SUM(num_pasajeros), 0) FROM resumen_transito_aeropuerto) AS total_pasajeros_trans
+        ''',
+        tablas=("vuelos", "pasajeros", "pasajeros_transito"),
+    )
+    return {columna: int(df.at[0, columna]) for columna in df.columns}
+
+
+def vuelos_por_estado():
+    df = leer_sql(
+        "SELECT estado, total AS id_vuelo FROM resumen_vuelos_estado WHERE total > 0 ORDER BY estado",
+        tablas=("vuelos",),
+    )
+    return df.set_index("estado")["id_vuelo"]
+
+
+def top_origenes(n=5):
+    df = leer_sql(
+        "SELECT origen, total AS id_vuelo FROM resumen_vuelos_origen WHERE total > 0 "
+        "ORDER BY total DESC, origen LIMIT ?",
+        (int(n),), tablas=("vuelos",),
+    )
+    return df.set_index("origen")["id_vuelo"]
+
+
+# ------------------------------------------------------------
+# SERIES TEMPORALES
+# ------------------------------------------------------------
+def elegir_resolucion(desde, hasta, max_puntos=MAX_PUNTOS_SERIE):
+    """La resolución más fina que no supera ``max_puntos`` cubetas entre ``desde`` y ``hasta``."""
+    dias = (hasta - desde).days + 1
+    if dias <= max_puntos:
+        return "D"
+    if dias / 7 <= max_puntos:
+        return "W"
+    return "M"
+
+
+def inicio_cubeta(fecha, resolucion):
+    if resolucion == "W":
+        return fecha - timedelta(days=fecha.weekday())
+    if resolucion == "M":
+        return fecha.replace(day=1)
+    return fecha
+
+
+def rango_series():
+    """(primera, última) fecha con datos en las series, o None si están vacías."""
+    df = leer_sql(
+        "SELECT MIN(periodo) AS desde, MAX(periodo) AS hasta FROM ("
+        "SELECT periodo FROM serie_vuelos WHERE resolucion = 'D' AND total > 0 AND periodo != '' "
+        "UNION ALL "
+        "SELECT periodo FROM serie_transito WHERE resolucion = 'D' AND registros > 0 AND periodo != '')",
+        tablas=("vuelos", "pasajeros_transito"),
+    )
+    if df.empty or pd.isna(df.at[0, "desde"]):
+        return None
+    return date.fromisoformat(df.at[0, "desde"]), date.fromisoformat(df.at[0, "hasta"])
+
+
+def _serie(tabla, dependencia, contadores, desde, hasta, resolucion, filtros, por):
+    resolucion = resolucion or elegir_resolucion(desde, hasta)
+    inicio = inicio_cubeta(desde, resolucion)
+    columnas = ["periodo"] + ([por] if por else [])
+    consulta = (
+        Consulta(tabla, ", ".join(columnas + [f"SUM({c}) AS {c}" for c in contadores]))
+        .igual("resolucion", resolucion)
+        .entre("periodo", inicio.isoformat(), hasta.isoformat())
+    )
+    for columna, valores in filtros.items():
+        consulta.en(columna, valores)
+    sql, params = consulta.agrupar(*columnas).ordenar(*columnas).sql()
+    df = leer_sql(sql, params, (dependencia,))
+
+    # Cubetas sin datos como 0, para que el eje temporal sea continuo.
+    indice = pd.date_range(inicio, hasta, freq=RESOLUCIONES[resolucion][1], name="periodo")
+    df = df.assign(periodo=pd.to_datetime(df["periodo"]))
+    if por:
+        serie = df.pivot_table(index="periodo", columns=por, values=contadores[0], aggfunc="sum")
+        return serie.reindex(indice, fill_value=0).fillna(0).astype("int64"), resolucion
+    return df.set_index("periodo")[contadores].reindex(indice, fill_value=0).astype("int64"), resolucion
+
+
+def serie_vuelos(desde, hasta, aeropuertos=(), estados=(), resolucion=None, por=None):
+    """
+    Vuelos y pasajeros por cubeta entre ``desde`` y ``hasta`` (fechas). Sin
+    ``resolucion`` se elige según el rango. Con ``por`` ('estado' o
+    'aeropuerto') devuelve una columna de vuelos por valor. Devuelve
+    (DataFrame indexado por periodo, resolución usada).
+    """
+    return _serie(
+        "serie_vuelos", "vuelos", ["total", "num_pasajeros"], desde, hasta, resolucion,
+        {"aeropuerto": aeropuertos, "estado": estados}, por,
+    )
+
+
+def serie_transito(desde, hasta, aeropuertos=(), resolucion=None, por=None):
+    """Registros y pasajeros en tránsito por cubeta; mismos parámetros que serie_vuelos."""
+    return _serie(
+        "serie_transito", "pasajeros_transito", ["num_pasajeros", "registros"], desde, hasta, resolucion,
+        {"aeropuerto": aeropuertos}, por,
+    )
+
+
+# ------------------------------------------------------------
+# LÍNEA DE COMANDOS
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconstruye las tablas de resumen del Dashboard.")
+    parser.add_argument("--db", help="Ruta de la base SQLite (por defecto AEROPUERTO_DB o aeropuerto.db)")
+    args = parser.parse_args(argv)
+
+    # Import local: esquema.py importa este módulo para sus migraciones.
+    from aeropuerto.esquema import crear_esquema
+
+    pool = get_pool(args.db)
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+        reconstruir(conn)
+    cache_consultas.invalidar()
+    print(f"Resúmenes reconstruidos ({pool.ruta})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
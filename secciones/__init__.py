@@ -0,0 +1,28 @@
+# ============================================================
+# SECCIONES DEL PANEL
+# ============================================================
+# Cada sección es un módulo con:
+#   DATOS: dict tabla -> lista de columnas (o None para todas) de
+#          las tablas que usa en memoria; {} si solo consulta SQLite.
+#   mostrar(datos): dibuja la sección; ``datos[tabla]`` carga la
+#          tabla declarada la primera vez que se pide (comun.Datos).
+# app.py importa solo la sección elegida, así que abrir el panel no
+# importa ni carga lo que usan las demás.
+# ============================================================
+
+import importlib
+
+# Etiqueta del menú -> módulo de la sección (en el orden del menú).
+SECCIONES = {
+    "📊 Dashboard": "dashboard",
+    "✈️ Gestión de Vuelos": "vuelos",
+    "👤 Gestión de Pasajeros": "pasajeros",
+    "🗺️ Mapa de Rutas": "mapa",
+    "📈 Análisis y Reportes": "analisis",
+    "⚙️ Configuración": "configuracion",
+}
+
+
+def cargar(opcion):
+    """Módulo de la sección ``opcion`` (se importa la primera vez que se abre)."""
+    return importlib.import_module(f"{__name__}.{SECCIONES[opcion]}")
@@ -0,0 +1,137 @@
+# ============================================================
+# SECCIÓN: ANÁLISIS Y REPORTES
+# ============================================================
+# El historial usa las series pre-agregadas; la distribución de
+# edades, los histogramas de aeropuerto/demografia.py; la ocupación,
+# los conteos por vuelo de aeropuerto/ocupacion.py. Ninguna pestaña
+# carga tablas completas.
+# ============================================================
+
+import streamlit as st
+from datetime import date, timedelta
+
+from aeropuerto import demografia, resumenes, ocupacion
+from aeropuerto.exportacion import EXPORTACIONES
+from aeropuerto.instrumentacion import tramo
+from secciones.comun import NOMBRES_RESOLUCION, mostrar_df
+from secciones.componentes import boton_exportacion
+
+DATOS = {}
+
+
+def mostrar(datos):
+    st.title("📈 Análisis y Reportes")
+    
+    tab1, tab2, tab3 = st.tabs(["Historial de Vuelos", "Análisis de Pasajeros", "Ocupación de Vuelos"])
+
+    with tab1:
+        st.subheader("Historial de Operaciones de Vuelos")
+        if resumenes.kpis_dashboard()["total_vuelos"]:
+            # Series pre-agregadas (serie_vuelos): el costo depende del número de
+            # cubetas del rango, no del número de vuelos.
+            primera_fecha, ultima_fecha = resumenes.rango_series() or (date.today(), date.today())
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                rango_historial = st.date_input(
+                    "Rango de fechas",
+                    value=(max(primera_fecha, ultima_fecha - timedelta(days=89)), ultima_fecha),
+                    min_value=primera_fecha, max_value=ultima_fecha, key="rango_historial"
+                )
+            with col2:
+                resolucion_elegida = st.selectbox(
+                    "Resolución", ["Automática"] + list(NOMBRES_RESOLUCION),
+                    format_func=lambda r: NOMBRES_RESOLUCION.get(r, r), key="resolucion_historial"
+                )
+            with col3:
+                desglose = st.selectbox("Desglosar por", ["Ninguno", "estado"], key="desglose_historial")
+
+            if len(rango_historial) == 2:
+                historial, resolucion = resumenes.serie_vuelos(
+                    *rango_historial,
+                    resolucion=None if resolucion_elegida == "Automática" else resolucion_elegida,
+                    por=None if desglose == "Ninguno" else desglose
+                )
+                st.write(f"Vuelos por {NOMBRES_RESOLUCION[resolucion]}")
+                if desglose == "Ninguno":
+                    st.line_chart(historial["total"], color="#003366")
+                else:
+                    st.line_chart(historial)
+
+            st.write("Vuelos por Mes (Historial Completo)")
+            historial_mensual, _ = resumenes.serie_vuelos(primera_fecha, ultima_fecha, resolucion="M")
+            historial_mensual.index = historial_mensual.index.strftime("%Y-%m")
+            st.bar_chart(historial_mensual["total"], color="#00AAB2")
+
+            boton_exportacion(
+                "📥 Descargar Historial Completo de Vuelos", EXPORTACIONES["vuelos"], (),
+                "historial_vuelos_completo", key="export_historial_vuelos"
+            )
+        else:
+            st.warning("No hay datos de vuelos para generar reportes.")
+
+    with tab2:
+        st.subheader("Análisis Demográfico de Pasajeros")
+        # Histogramas de edad mantenidos por triggers (aeropuerto/demografia.py): bandas y
+        # estadísticas salen de 121 contadores, sin leer la tabla de pasajeros.
+        rutas = demografia.rutas_con_pasajeros()
+        ruta = st.selectbox(
+            "Ruta", [None] + rutas, format_func=lambda r: "Todas" if r is None else f"{r[0]} → {r[1]}",
+            key="ruta_edades"
+        )
+        with tramo("transformacion.rangos_edad"):
+            edades = demografia.histograma() if ruta is None else demografia.histograma(origen=ruta[0], destino=ruta[1])
+        if edades.total:
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Pasajeros", f"{edades.total:,}")
+            col2.metric("Edad Promedio", f"{edades.promedio():.1f} años")
+            col3.metric("Edad Mediana", f"{edades.mediana():.0f} años")
+            col4.metric("Edad(es) Moda", f"{', '.join(map(str, edades.moda()))} años")
+            st.write("Distribución de Edades General" if ruta is None else "Distribución de Edades de la Ruta")
+            st.bar_chart(edades.por_bandas(), color="#00AAB2")
+        else:
+            st.warning("No hay datos de pasajeros para analizar.")
+
+    with tab3:
+        st.subheader("Factor de Carga y Sobreventa")
+        st.caption("Pasajeros registrados frente a la capacidad declarada de cada vuelo.")
+        rango_ocupacion = resumenes.rango_series()
+        if rango_ocupacion:
+            primera_fecha, ultima_fecha = rango_ocupacion
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                fechas_ocupacion = st.date_input(
+                    "Rango de fechas", value=(primera_fecha, ultima_fecha),
+                    min_value=primera_fecha, max_value=ultima_fecha, key="rango_ocupacion"
+                )
+            with col2:
+                resolucion_ocupacion = st.selectbox(
+                    "Resolución", list(NOMBRES_RESOLUCION),
+                    format_func=NOMBRES_RESOLUCION.get, key="resolucion_ocupacion"
+                )
+
+            if len(fechas_ocupacion) == 2:
+                totales = ocupacion.resumen(*fechas_ocupacion)
+                col1, col2, col3, col4 = st.columns(4)
+                factor = totales["factor_carga"]
+                col1.metric("Factor de Carga", "-" if factor is None else f"{factor:.1%}")
+                col2.metric("Pasajeros / Capacidad", f"{totales['registrados']:,} / {totales['capacidad']:,}")
+                col3.metric("Vuelos Sobrevendidos", f"{totales['vuelos_sobrevendidos']:,}")
+                col4.metric("Plazas Sobrevendidas", f"{totales['plazas_sobrevendidas']:,}")
+
+                por_periodo = ocupacion.por_periodo(*fechas_ocupacion, resolucion=resolucion_ocupacion)
+                st.write(f"Factor de Carga por {NOMBRES_RESOLUCION[resolucion_ocupacion]}")
+                st.line_chart(por_periodo["factor_carga"], color="#003366")
+
+                st.write("Rutas por Factor de Carga")
+                min_vuelos = st.number_input("Mínimo de vuelos por ruta", min_value=1, value=3, step=1, key="min_vuelos_ruta")
+                mostrar_df(ocupacion.por_ruta(*fechas_ocupacion, min_vuelos=min_vuelos).head(50),
+                           use_container_width=True, hide_index=True)
+
+                st.write("Vuelos Sobrevendidos")
+                sobrevendidos = ocupacion.por_vuelo(*fechas_ocupacion, solo_sobrevendidos=True, limite=100)
+                if sobrevendidos.empty:
+                    st.info("No hay vuelos sobrevendidos en el rango.")
+                else:
+                    mostrar_df(sobrevendidos, use_container_width=True, hide_index=True)
+        else:
+            st.warning("No hay datos de vuelos para calcular la ocupación.")
@@ -0,0 +1,89 @@
+# ============================================================
+# SECCIONES - Componentes de interfaz reutilizables
+# ============================================================
+# Tablas paginadas por clave, resultados de búsqueda y botones de
+# exportación diferida que usan varias secciones.
+# ============================================================
+
+import streamlit as st
+
+from aeropuerto import busqueda
+from aeropuerto.paginacion import pagina_keyset, contar_estimado
+from aeropuerto.exportacion import FORMATOS, exportar_a_temporal
+from secciones.comun import mostrar_df
+
+
+def tabla_paginada(consulta, clave, columnas_orden, key, mensaje_vacio="No hay registros para mostrar.",
+                   transformar=None):
+    """
+    Muestra una tabla paginada por clave (keyset) sobre una `Consulta` filtrada.
+    Solo la página visible se lee de la base y se envía al navegador;
+    ``transformar`` (opcional) recibe esa página y devuelve la que se muestra.
+    Devuelve el DataFrame de la página mostrada.
+    """
+    col_orden, col_dir, col_tam = st.columns([2, 1, 1])
+    with col_orden:
+        orden = st.selectbox("Ordenar por", columnas_orden, key=f"{key}_orden")
+    with col_dir:
+        descendente = st.selectbox("Dirección", ["Ascendente", "Descendente"], key=f"{key}_dir") == "Descendente"
+    with col_tam:
+        tamano = st.selectbox("Filas por página", [25, 50, 100, 250], index=1, key=f"{key}_tam")
+
+    # Cursores de las páginas visitadas; se reinician si cambian filtros u orden.
+    firma = (consulta.sql(), orden, descendente, tamano)
+    estado = st.session_state.setdefault(f"{key}_paginacion", {"firma": None, "cursores": [None]})
+    if estado["firma"] != firma:
+        estado["firma"] = firma
+        estado["cursores"] = [None]
+    cursores = estado["cursores"]
+
+    pagina, siguiente = pagina_keyset(consulta, clave, orden, descendente, tamano, cursores[-1])
+    if pagina.empty and len(cursores) == 1:
+        st.warning(mensaje_vacio)
+        return pagina
+
+    if transformar is not None:
+        pagina = transformar(pagina)
+    mostrar_df(pagina, use_container_width=True, hide_index=True)
+    _, texto_total = contar_estimado(consulta, clave)
+    col_prev, col_info, col_next = st.columns([1, 3, 1])
+    col_prev.button("◀ Anterior", key=f"{key}_prev", disabled=len(cursores) == 1,
+                    on_click=cursores.pop)
+    col_info.caption(f"Página {len(cursores)} · {texto_total} registros")
+    col_next.button("Siguiente ▶", key=f"{key}_next", disabled=siguiente is None,
+                    on_click=cursores.append, args=(siguiente,))
+    return pagina
+
+
+def resultados_busqueda(texto, key, tamano=50):
+    """
+    Resultados de la búsqueda de pasajeros (índice FTS5 + prefijo de ticket),
+    ordenados por relevancia y paginados.
+    """
+    total = busqueda.contar_coincidencias(texto)
+    if total == 0:
+        st.warning("No se encontraron pasajeros que coincidan con la búsqueda.")
+        return
+    paginas = max(1, -(-min(total, busqueda.TOPE_CONTEO) // tamano))
+    pagina = st.number_input("Página", min_value=1, max_value=paginas, value=1, step=1, key=f"{key}_pagina")
+    resultados = busqueda.buscar_pasajeros(texto, limite=tamano, desplazamiento=(pagina - 1) * tamano)
+    mostrar_df(resultados, use_container_width=True, hide_index=True)
+    texto_total = f"{busqueda.TOPE_CONTEO:,}+" if total > busqueda.TOPE_CONTEO else f"{total:,}"
+    st.caption(f"Página {pagina} de {paginas} · {texto_total} coincidencias, ordenadas por relevancia")
+
+
+def boton_exportacion(etiqueta, sql, params, nombre_base, key):
+    """
+    Botón de descarga con exportación diferida: el archivo se genera por
+    streaming desde SQLite solo cuando el usuario hace clic, no en cada rerun.
+    """
+    formato = st.selectbox("Formato de exportación", list(FORMATOS), key=f"{key}_formato")
+    extension, mime = FORMATOS[formato]
+    st.download_button(
+        etiqueta,
+        data=lambda: exportar_a_temporal(sql, params, formato),
+        file_name=f"{nombre_base}{extension}",
+        mime=mime,
+        type="primary",
+        key=key
+    )
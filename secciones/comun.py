@@ -0,0 +1,156 @@
+# ============================================================
+# SECCIONES - Utilidades comunes (base de datos y datos perezosos)
+# ============================================================
+# Lo que comparten app.py y las secciones: inicialización de la
+# base, cola de escritura de los formularios, regeneración de datos
+# y el cargador perezoso de las tablas que declara cada sección.
+# ============================================================
+
+import streamlit as st
+import pandas as pd
+from concurrent.futures import wait
+
+from aeropuerto.conexion import get_pool
+from aeropuerto.instrumentacion import instrumentacion, tramo
+from aeropuerto.instantaneas import almacen_instantaneas
+from aeropuerto.esquema import crear_esquema, esquema_vigente, recordar_esquema
+from aeropuerto import copias, generador
+
+# Resoluciones de las series temporales (aeropuerto/resumenes.py).
+NOMBRES_RESOLUCION = {"D": "Día", "W": "Semana", "M": "Mes"}
+
+
+# ------------------------------------------------------------
+# BASE DE DATOS
+# ------------------------------------------------------------
+# Las conexiones vienen del pool del proceso (aeropuerto/conexion.py): una de
+# escritura y varias de solo lectura, en modo WAL. La ruta de la base se
+# configura con la variable de entorno AEROPUERTO_DB.
+
+def init_db():
+    """
+    Deja la base con su esquema al día y datos de ejemplo si está vacía. Tras
+    la primera verificación del proceso, cada rerun solo compara la marca de
+    esquema (aeropuerto/esquema.py) y no toca las tablas.
+    """
+    pool = get_pool()
+    if esquema_vigente(pool):
+        return
+    # Tablas + índices; las migraciones pendientes se aplican según PRAGMA user_version.
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+    generar_datos_ejemplo(force_run=False) # Solo genera si está vacío
+    recordar_esquema(pool)
+
+# ------------------------------------------------------------
+# FUNCIONES AUXILIARES DE DB
+# ------------------------------------------------------------
+# Los formularios no escriben directamente: las altas de aeropuerto/registros.py
+# encolan la sentencia en el hilo escritor (aeropuerto/escritura.py), que confirma
+# por lotes y refresca caché e instantáneas. El resultado se muestra cuando el
+# Future termina.
+ESPERA_CONFIRMACION_S = 0.5
+
+def encolar_escritura(alta, mensaje):
+    """``alta`` es una función de aeropuerto/registros.py ya con sus argumentos (functools.partial)."""
+    try:
+        futuro = alta()
+    except ValueError as e:
+        st.error(str(e))
+        return
+    st.session_state.setdefault("escrituras_pendientes", []).append((futuro, mensaje))
+    # Casi siempre el lote se confirma en milisegundos: se recarga la página ya
+    # con el dato; si la base está ocupada, el formulario no se queda esperando.
+    if wait([futuro], timeout=ESPERA_CONFIRMACION_S).done:
+        st.rerun()
+    st.info(f"⏳ {mensaje}: en cola, se confirmará en segundo plano.")
+
+def revisar_escrituras():
+    """Notifica las escrituras de esta sesión que ya terminaron y devuelve cuántas siguen en cola."""
+    pendientes = st.session_state.get("escrituras_pendientes", [])
+    siguen = []
+    for futuro, mensaje in pendientes:
+        if not futuro.done():
+            siguen.append((futuro, mensaje))
+        elif futuro.exception() is not None:
+            st.toast(f"❌ {mensaje}: error en la base de datos: {futuro.exception()}")
+        else:
+            st.toast(f"✅ {mensaje} correctamente")
+    st.session_state["escrituras_pendientes"] = siguen
+    return len(siguen)
+
+def cargar_datos(tabla, columnas=None):
+    """
+    Devuelve la tabla (o solo ``columnas``) como DataFrame tipado (ver aeropuerto/columnar.py).
+    Es la instantánea compartida por todas las sesiones (aeropuerto/instantaneas.py):
+    no debe modificarse en el lugar; se filtra con máscaras.
+    """
+    try:
+        with tramo(f"datos.{tabla}"):
+            return almacen_instantaneas.obtener(tabla, columnas=columnas)
+    except Exception as e:
+        st.error(f"Error al cargar datos de {tabla}: {e}")
+        return pd.DataFrame(columns=columnas)
+
+# ------------------------------------------------------------
+# DATOS PEREZOSOS POR SECCIÓN
+# ------------------------------------------------------------
+class Datos:
+    """
+    Tablas declaradas por una sección (su diccionario DATOS: tabla -> columnas,
+    o None para todas). Cada tabla se lee la primera vez que se pide:
+
+        datos = Datos({"pasajeros": ["id_pasajero", "edad"]})
+        datos["pasajeros"]   # carga solo esas dos columnas
+    """
+
+    def __init__(self, declaracion):
+        self._declaracion = declaracion
+        self._cargadas = {}
+
+    def __getitem__(self, tabla):
+        if tabla not in self._declaracion:
+            raise KeyError(f"La sección no declara la tabla {tabla!r} en DATOS")
+        if tabla not in self._cargadas:
+            self._cargadas[tabla] = cargar_datos(tabla, self._declaracion[tabla])
+        return self._cargadas[tabla]
+
+# ------------------------------------------------------------
+# GENERAR/REINICIAR DATOS
+# ------------------------------------------------------------
+def generar_datos_ejemplo(force_run=False, progreso=None, **escala):
+    """
+    Siembra datos de ejemplo (ver aeropuerto/generador.py). Sin force_run
+    solo rellena las tablas vacías; `escala` admite vuelos, transito,
+    pasajeros y semilla para generar volúmenes de prueba de carga.
+    """
+    try:
+        generador.generar(
+            forzar=force_run, progreso=progreso, **escala
+        )
+        if force_run:
+            st.toast("✅ Base de datos reiniciada con nuevos datos.", icon="🔄")
+    except Exception as e:
+        st.error(f"Error generando datos: {e}")
+
+def reiniciar_base_de_datos(progreso=None):
+    """
+    Vuelve a los datos de ejemplo restaurando la plantilla con la API de backup
+    (aeropuerto/copias.py): sin DROP/CREATE ni reconstruir índices y resúmenes.
+    ``progreso(copiadas, total)`` recibe las páginas copiadas.
+    """
+    try:
+        copias.reiniciar(progreso=progreso)
+    except Exception as e:
+        st.error(f"Error reiniciando la DB: {e}")
+        return
+    st.success("Base de datos reiniciada exitosamente.")
+
+# ------------------------------------------------------------
+# COMPONENTES DE INTERFAZ
+# ------------------------------------------------------------
+def mostrar_df(df, **opciones):
+    """st.dataframe instrumentado: tiempo de serialización y bytes (aprox.) enviados al navegador."""
+    with tramo("render.dataframe"):
+        instrumentacion.contar_df("bytes_enviados", df)
+        st.dataframe(df, **opciones)
@@ -0,0 +1,301 @@
+# ============================================================
+# SECCIÓN: CONFIGURACIÓN
+# ============================================================
+# Regeneración e importación de datos, estado de la caché, de las
+# instantáneas, del pool y de la cola de escritura, y el panel de
+# diagnóstico oculto (?diagnostico=1).
+# ============================================================
+
+import streamlit as st
+import sqlite3
+import pandas as pd
+
+from aeropuerto.cache import cache_consultas, TABLAS
+from aeropuerto.conexion import get_pool
+from aeropuerto.escritura import get_cola
+from aeropuerto.instrumentacion import instrumentacion
+from aeropuerto.instantaneas import almacen_instantaneas
+from aeropuerto.notificaciones import get_canal
+from aeropuerto import resumenes, importacion, columnar, copias
+from secciones.comun import generar_datos_ejemplo, reiniciar_base_de_datos, mostrar_df
+
+DATOS = {}
+
+
+def mostrar(datos):
+    st.title("⚙️ Configuración del Sistema")
+    st.subheader("Gestión de la Base de Datos")
+
+    st.info("Utiliza estos controles para manejar los datos de la aplicación.")
+
+    if st.button("Forzar Generación de Datos de Ejemplo", type="primary"):
+        with st.spinner("Generando nuevos datos..."):
+            generar_datos_ejemplo(force_run=True)
+
+    with st.expander("🧪 Generación a escala (pruebas de carga)"):
+        with st.form("form_generacion"):
+            col1, col2, col3, col4 = st.columns(4)
+            n_vuelos = col1.number_input("Vuelos", min_value=0, value=1000, step=1000)
+            n_transito = col2.number_input("Registros de tránsito", min_value=0, value=400, step=100)
+            n_pasajeros = col3.number_input("Pasajeros", min_value=0, value=100000, step=10000)
+            semilla = col4.number_input("Semilla", min_value=0, value=42, step=1)
+            if st.form_submit_button("Generar"):
+                barra = st.progress(0.0)
+                def _progreso(tabla, hechas, total):
+                    barra.progress(hechas / total, text=f"{tabla}: {hechas:,}/{total:,}")
+                generar_datos_ejemplo(
+                    force_run=True, progreso=_progreso, vuelos=int(n_vuelos),
+                    transito=int(n_transito), pasajeros=int(n_pasajeros), semilla=int(semilla)
+                )
+    
+    st.markdown("---")
+
+    st.subheader("Importación Masiva")
+    st.caption(
+        "Carga manifiestos CSV o JSON-lines por bloques validados. Si una importación se "
+        "interrumpe, volver a subir el mismo archivo la reanuda donde quedó."
+    )
+    with st.form("form_importacion"):
+        tabla_importar = st.selectbox(
+            "Tabla de destino", list(importacion.COLUMNAS),
+            format_func=lambda t: f"{t} ({', '.join(importacion.COLUMNAS[t])})"
+        )
+        archivo_importar = st.file_uploader("Archivo", type=["csv", "jsonl", "ndjson", "gz"])
+        aceptar_desconocidos = st.checkbox("Aceptar aeropuertos sin coordenadas definidas")
+        if st.form_submit_button("Importar", type="primary"):
+            if archivo_importar is None:
+                st.error("Seleccione un archivo para importar.")
+            else:
+                barra = st.progress(0.0, text="Importando...")
+                tamano_archivo = max(archivo_importar.size, 1)
+                def _progreso_importacion(procesadas, insertadas, rechazadas):
+                    barra.progress(
+                        min(archivo_importar.tell() / tamano_archivo, 1.0),
+                        text=f"{procesadas:,} filas ({insertadas:,} insertadas, {rechazadas:,} rechazadas)"
+                    )
+                try:
+                    resultado = importacion.importar(
+                        archivo_importar, tabla_importar, nombre_archivo=archivo_importar.name,
+                        aeropuertos=None if aceptar_desconocidos else True,
+                        progreso=_progreso_importacion
+                    )
+                except (ValueError, sqlite3.Error) as e:
+                    st.error(f"Error en la importación: {e}")
+                else:
+                    barra.progress(1.0, text="Importación terminada")
+                    if resultado.ya_completada:
+                        st.info("Este archivo ya había sido importado por completo.")
+                    st.success(
+                        f"✅ {resultado.insertadas:,} filas insertadas, {resultado.rechazadas:,} rechazadas"
+                        + (f" (reanudada desde la fila {resultado.reanudada_desde:,})" if resultado.reanudada_desde else "")
+                    )
+                    if resultado.rechazos:
+                        st.write("Filas rechazadas (muestra)")
+                        mostrar_df(resultado.rechazos_df(), use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+
+    st.subheader("Tablas de Resumen")
+    st.caption("Los KPIs del Dashboard se leen de tablas de resumen que los triggers mantienen al día en cada escritura.")
+    if st.button("Reconstruir Resúmenes del Dashboard"):
+        with st.spinner("Recalculando resúmenes..."):
+            with get_pool().escritura() as conn:
+                resumenes.reconstruir(conn)
+            cache_consultas.invalidar(*TABLAS)
+        st.success("Resúmenes reconstruidos.")
+
+    st.markdown("---")
+
+    st.subheader("Caché de Consultas")
+    stats_cache = cache_consultas.estadisticas()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Aciertos (hits)", f"{stats_cache['hits']}")
+    col2.metric("Fallos (misses)", f"{stats_cache['misses']}")
+    col3.metric("Tasa de Aciertos", f"{stats_cache['hit_ratio']:.0%}")
+    col4.metric("Entradas / MB", f"{stats_cache['entradas']} / {stats_cache['bytes'] / 1e6:.1f}")
+    if st.button("Vaciar Caché"):
+        cache_consultas.limpiar()
+
+    st.subheader("Instantáneas Compartidas")
+    st.write("Una sola copia de solo lectura de cada tabla para todas las sesiones del proceso.")
+    stats_inst = almacen_instantaneas.estadisticas()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Lecturas Compartidas", f"{stats_inst['hits']}")
+    col2.metric("Cargas desde SQLite", f"{stats_inst['cargas']}")
+    col3.metric("Cargas desde Memoria Compartida", f"{stats_inst['cargas_compartidas']}")
+    col4.metric("Refrescos Incrementales", f"{stats_inst['deltas']}",
+                help=f"{stats_inst['filas_delta']:,} filas releídas desde el registro de cambios en lugar de "
+                     "recargar las tablas completas.")
+    if stats_inst["instantaneas"]:
+        mostrar_df(pd.DataFrame(stats_inst["instantaneas"]), use_container_width=True, hide_index=True)
+    if almacen_instantaneas.directorio:
+        st.caption(f"Respaldo memory-map en {almacen_instantaneas.directorio}")
+    else:
+        st.caption("Sin respaldo compartido entre procesos (definir AEROPUERTO_INSTANTANEAS para activarlo).")
+
+    st.subheader("Memoria de las Tablas Cargadas")
+    st.write("Tablas en memoria (tipos compactos) frente a su tamaño con los tipos por defecto de pandas. "
+             "Cada sección carga solo las columnas que usa, al abrirla.")
+    tablas_en_memoria = almacen_instantaneas.en_memoria()
+    if tablas_en_memoria:
+        reporte = columnar.reporte_memoria(tablas_en_memoria)
+        resumen = columnar.resumen_memoria(reporte)
+        columnas_memoria = st.columns(len(resumen))
+        for col, (tabla, fila) in zip(columnas_memoria, resumen.iterrows()):
+            ahorro = f"-{fila['ahorro']:.0%}" if pd.notna(fila["ahorro"]) else None
+            col.metric(tabla, f"{fila['bytes'] / 1e6:.2f} MB", ahorro, delta_color="inverse",
+                       help=f"Sin tipar: {fila['bytes_sin_tipar'] / 1e6:.2f} MB ({fila['bytes']:,} / {fila['bytes_sin_tipar']:,} bytes)")
+        with st.expander("Detalle por columna"):
+            mostrar_df(reporte, use_container_width=True, hide_index=True)
+    else:
+        st.info("Todavía no hay tablas en memoria: se cargan al abrir las secciones que las usan.")
+
+    st.subheader("Conexiones a la Base de Datos")
+    pool = get_pool()
+    db_ok, db_mensaje = pool.salud()
+    (st.success if db_ok else st.error)(f"Estado de la base ({pool.ruta}): {db_mensaje}")
+    metricas_pool = pool.metricas()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Lecturas", f"{metricas_pool['lecturas']}")
+    col2.metric("Escrituras", f"{metricas_pool['escrituras']}")
+    col3.metric("Lectores (libres/creados)", f"{metricas_pool['lectores_libres']}/{metricas_pool['lectores_creados']}")
+    col4.metric("Espera Máx. Escritura", f"{metricas_pool['espera_escritura_max_s'] * 1000:.1f} ms")
+
+    metricas_cola = get_cola().metricas()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Escrituras en Cola", f"{metricas_cola['pendientes']}")
+    col2.metric("Confirmadas / Fallidas", f"{metricas_cola['confirmadas']} / {metricas_cola['fallidas']}")
+    col3.metric("Lotes (medio / máx.)", f"{metricas_cola['lotes']} ({metricas_cola['lote_medio']:.1f} / {metricas_cola['lote_max']})")
+    col4.metric("Reintentos por Base Ocupada", f"{metricas_cola['reintentos']}")
+
+    metricas_canal = get_canal().metricas()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Canal de Cambios", "Activo" if metricas_canal["activo"] else "Inactivo",
+                help=f"Sondeo cada {metricas_canal['intervalo_s'] * 1000:.0f} ms de los commits de cualquier proceso "
+                     "(AEROPUERTO_CANAL_INTERVALO=0 lo desactiva).")
+    col2.metric("Avisos Recibidos", f"{metricas_canal['avisos']}")
+    col3.metric("Tablas Invalidadas", f"{metricas_canal['tablas_cambiadas']}")
+    col4.metric("Recargas en Segundo Plano", f"{metricas_canal['recargas']}")
+    if metricas_canal["ultimo_error"]:
+        st.caption(f"Último error del canal: {metricas_canal['ultimo_error']}")
+
+    # Pestaña oculta: aparece con ?diagnostico=1 en la URL o con la instrumentación activa.
+    if instrumentacion.activa or "diagnostico" in st.query_params:
+        st.markdown("---")
+        st.subheader("🩺 Diagnóstico de Rendimiento")
+        tab_ejecuciones, tab_totales = st.tabs(["⏱️ Ejecuciones", "Σ Totales por Tramo"])
+        with tab_ejecuciones:
+            instrumentacion.activa = st.toggle(
+                "Instrumentación activa", value=instrumentacion.activa,
+                help="Mide tramos y contadores en cada rerun de todas las sesiones. Desactivada no tiene costo apreciable."
+            )
+            ejecuciones = instrumentacion.ejecuciones()
+            if not ejecuciones:
+                st.info("Aún no hay ejecuciones registradas: navega por el panel con la instrumentación activa.")
+            else:
+                resumen_ejecuciones = pd.DataFrame([
+                    {
+                        "hora": pd.Timestamp(e.hora, unit="s").strftime("%H:%M:%S"),
+                        "sección": e.etiqueta,
+                        "duración_ms": round(e.duracion_s * 1000, 1),
+                        "tramos": len(e.tramos),
+                        "filas_leidas": e.contadores.get("filas_leidas", 0),
+                        "bytes_enviados": e.contadores.get("bytes_enviados", 0),
+                        "interrumpida": e.interrumpida,
+                    }
+                    for e in ejecuciones
+                ])
+                mostrar_df(resumen_ejecuciones, use_container_width=True, hide_index=True)
+                elegida = st.selectbox(
+                    "Detalle de la ejecución", range(len(ejecuciones)),
+                    format_func=lambda i: (f"{resumen_ejecuciones.at[i, 'hora']} · {resumen_ejecuciones.at[i, 'sección']}"
+                                           f" · {resumen_ejecuciones.at[i, 'duración_ms']:.0f} ms")
+                )
+                tramos_ejecucion = pd.DataFrame(
+                    ejecuciones[elegida].tramos, columns=["tramo", "nivel", "inicio_s", "duración_s", "error"]
+                )
+                fases = tramos_ejecucion[tramos_ejecucion["nivel"] == 0]
+                st.bar_chart(fases.set_index("tramo")["duración_s"] * 1000, horizontal=True, color="#003366")
+                tramos_ejecucion = tramos_ejecucion.assign(
+                    tramo=tramos_ejecucion["nivel"].map(lambda nivel: "· " * nivel) + tramos_ejecucion["tramo"],
+                    inicio_ms=(tramos_ejecucion["inicio_s"] * 1000).round(2),
+                    duración_ms=(tramos_ejecucion["duración_s"] * 1000).round(2),
+                )[["tramo", "inicio_ms", "duración_ms", "error"]]
+                mostrar_df(tramos_ejecucion, use_container_width=True, hide_index=True)
+        with tab_totales:
+            totales = pd.DataFrame.from_dict(instrumentacion.totales(), orient="index")
+            if not totales.empty:
+                mostrar_df(totales.sort_values("segundos", ascending=False), use_container_width=True)
+            contadores = instrumentacion.contadores()
+            if contadores:
+                columnas_contadores = st.columns(len(contadores))
+                for col, (nombre, valor) in zip(columnas_contadores, sorted(contadores.items())):
+                    col.metric(nombre.replace("_", " ").capitalize(), f"{valor:,}")
+        col1, col2, col3 = st.columns(3)
+        col1.download_button(
+            "Descargar registro (.jsonl)", data=lambda: instrumentacion.registro_jsonl(),
+            file_name="instrumentacion.jsonl", mime="application/x-ndjson", key="descarga_registro"
+        )
+        col2.download_button(
+            "Exportar métricas Prometheus", data=lambda: instrumentacion.texto_prometheus(),
+            file_name="aeropuerto.prom", mime="text/plain", key="descarga_prometheus"
+        )
+        if col3.button("Reiniciar métricas"):
+            instrumentacion.reiniciar()
+
+    st.markdown("---")
+    
+    st.subheader("Copias de la Base de Datos")
+    st.caption(
+        "Guarda el estado actual con un nombre y vuelve a él cuando quieras: la copia y la "
+        "restauración usan la API de backup de SQLite, página a página."
+    )
+    copias_guardadas = copias.listar()
+    col1, col2 = st.columns(2)
+    with col1:
+        with st.form("form_guardar_copia"):
+            nombre_copia = st.text_input("Nombre de la copia", placeholder="Ej: carga-1m")
+            if st.form_submit_button("Guardar copia", type="primary"):
+                barra = st.progress(0.0, text="Copiando...")
+                try:
+                    ruta_copia = copias.guardar(
+                        nombre_copia.strip(), progreso=lambda hechas, total: barra.progress(hechas / total)
+                    )
+                except (ValueError, OSError, sqlite3.Error) as e:
+                    st.error(f"No se pudo guardar la copia: {e}")
+                else:
+                    st.success(f"Copia guardada en {ruta_copia}")
+                    copias_guardadas = copias.listar()
+    with col2:
+        if copias_guardadas:
+            nombre_elegido = st.selectbox("Copia", [c["nombre"] for c in copias_guardadas], key="copia_elegida")
+            col_restaurar, col_borrar = st.columns(2)
+            if col_restaurar.button("Restaurar", type="primary", key="restaurar_copia"):
+                barra = st.progress(0.0, text="Restaurando...")
+                try:
+                    copias.restaurar(nombre_elegido, progreso=lambda hechas, total: barra.progress(hechas / total))
+                except (OSError, sqlite3.Error) as e:
+                    st.error(f"No se pudo restaurar la copia: {e}")
+                else:
+                    st.success(f"Base restaurada desde «{nombre_elegido}».")
+            if col_borrar.button("Borrar copia", key="borrar_copia"):
+                copias.borrar(nombre_elegido)
+                st.rerun()
+        else:
+            st.info("Todavía no hay copias guardadas.")
+    if copias_guardadas:
+        tabla_copias = pd.DataFrame(copias_guardadas)
+        tabla_copias["MB"] = (tabla_copias.pop("bytes") / 1e6).round(1)
+        tabla_copias["modificada"] = pd.to_datetime(tabla_copias["modificada"], unit="s").dt.floor("s")
+        mostrar_df(tabla_copias, use_container_width=True, hide_index=True)
+    st.caption(f"Directorio de copias: {copias.directorio()}")
+
+    st.markdown("---")
+
+    st.subheader("Zona de Peligro")
+    st.warning("⚠️ **Atención:** Esta acción es irreversible. Se borrarán todos los vuelos, pasajeros y registros de tránsito existentes "
+               "y se restaurarán los datos de ejemplo (guarde antes una copia si quiere conservarlos).")
+    
+    if st.button("Reiniciar y Borrar TODA la Base de Datos"):
+        barra = st.progress(0.0, text="Reiniciando base de datos...")
+        reiniciar_base_de_datos(progreso=lambda hechas, total: barra.progress(hechas / total))
@@ -0,0 +1,59 @@
+# ============================================================
+# SECCIÓN: DASHBOARD
+# ============================================================
+# KPIs y gráficos sobre los resúmenes precalculados: no lee
+# ninguna tabla completa.
+# ============================================================
+
+import streamlit as st
+
+from aeropuerto import resumenes
+from secciones.comun import NOMBRES_RESOLUCION
+
+DATOS = {}
+
+
+def mostrar(datos):
+    st.title("📊 Dashboard: Monitor General")
+    st.markdown("Visión general de las operaciones del aeropuerto.")
+
+    kpis = resumenes.kpis_dashboard()
+    total_vuelos = kpis["total_vuelos"]
+    total_pasajeros_reg = kpis["total_pasajeros_reg"]
+    total_pasajeros_trans = kpis["total_pasajeros_trans"]
+    vuelos_completados = kpis["vuelos_completados"]
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total de Vuelos", f"{total_vuelos}")
+    col2.metric("Vuelos Completados", f"{vuelos_completados}")
+    col3.metric("Pasajeros Registrados", f"{total_pasajeros_reg}")
+    col4.metric("Total Pasajeros Tránsito", f"{total_pasajeros_trans:,.0f}")
+
+    st.markdown("---")
+
+    tab1, tab2 = st.tabs(["Análisis de Vuelos", "Análisis de Tránsito"])
+
+    with tab1:
+        st.subheader("Rendimiento de Vuelos")
+        if total_vuelos:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("Vuelos por Estado")
+                estado_counts = resumenes.vuelos_por_estado()
+                st.bar_chart(estado_counts, color="#00AAB2")
+            with col2:
+                st.write("Vuelos por Origen (Top 5)")
+                origen_counts = resumenes.top_origenes(5)
+                st.bar_chart(origen_counts, color="#003366")
+        else:
+            st.info("No hay datos de vuelos para mostrar.")
+
+    with tab2:
+        st.subheader("Volumen de Pasajeros en Tránsito")
+        rango_historial = resumenes.rango_series()
+        if kpis["total_pasajeros_trans"] and rango_historial:
+            transito_serie, resolucion = resumenes.serie_transito(*rango_historial)
+            st.write(f"Tránsito de Pasajeros por {NOMBRES_RESOLUCION[resolucion]}")
+            st.area_chart(transito_serie["num_pasajeros"], color="#00AAB2")
+        else:
+            st.info("No hay datos de tránsito para mostrar.")
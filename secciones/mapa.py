@@ -0,0 +1,100 @@
+# ============================================================
+# SECCIÓN: MAPA DE RUTAS
+# ============================================================
+# Aeropuertos, rutas agregadas y distancias salen del catálogo y del
+# grafo de rutas (aeropuerto/grafo.py), no de las tablas completas.
+# ============================================================
+
+import streamlit as st
+
+from aeropuerto import consultas, grafo, aeropuertos
+from secciones.comun import mostrar_df
+
+DATOS = {}
+
+
+def mostrar(datos):
+    catalogo_aeropuertos = aeropuertos.catalogo()
+    st.title("🗺️ Mapa de Rutas de Vuelos")
+    st.markdown("Visualización de los aeropuertos de origen y destino de los vuelos filtrados.")
+
+    st.subheader("Filtros de Visualización")
+    aeropuertos_en_vuelos = consultas.aeropuertos_en_vuelos()
+    aeropuertos_validos = [a for a in aeropuertos_en_vuelos if a in catalogo_aeropuertos]
+    estados_validos = consultas.estados_vuelo()
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        filtro_origen = st.multiselect("Origen(es)", options=aeropuertos_validos, placeholder="Todos")
+    with col2:
+        filtro_destino = st.multiselect("Destino(s)", options=aeropuertos_validos, placeholder="Todos")
+    with col3:
+        filtro_estado = st.multiselect("Estado(s) del Vuelo", options=estados_validos, placeholder="Todos")
+    
+    # Agregados por ruta (vuelos, pasajeros, km) en un solo GROUP BY, cacheados por versión;
+    # las distancias salen de la matriz haversine del grafo de aeropuertos.
+    grafo_rutas = grafo.obtener_grafo(catalogo_aeropuertos)
+    rutas_mapa = grafo.agregados_rutas(grafo_rutas, filtro_origen, filtro_destino, filtro_estado)
+
+    # Zona del mapa: aeropuertos a cierta distancia de uno dado (índice espacial del catálogo).
+    vista_mapa = None
+    with st.expander("📍 Filtrar por zona"):
+        col1, col2 = st.columns(2)
+        with col1:
+            centro_zona = st.selectbox(
+                "Centro", options=["Ninguno"] + list(catalogo_aeropuertos.codigos), key="centro_zona"
+            )
+        with col2:
+            radio_zona = st.slider("Radio (km)", min_value=100, max_value=5000, value=1500, step=100)
+        if centro_zona != "Ninguno":
+            lat_zona, lon_zona = catalogo_aeropuertos.coordenadas(centro_zona)
+            en_zona = catalogo_aeropuertos.en_radio(lat_zona, lon_zona, radio_zona)
+            rutas_mapa = grafo.rutas_en_zona(grafo_rutas, rutas_mapa, en_zona)
+            vista_mapa = (lat_zona, lon_zona, 3)
+            st.caption(f"{len(en_zona)} aeropuertos a menos de {radio_zona:,} km de {centro_zona}")
+            mostrar_df(catalogo_aeropuertos.tabla(en_zona), use_container_width=True, hide_index=True)
+
+    # El mapa se dibuja arriba pero después de calcular la conexión, para resaltarla.
+    contenedor_mapa = st.container()
+
+    st.subheader("Buscar Conexión")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        conexion_origen = st.selectbox("Desde", options=aeropuertos_validos, key="conexion_origen")
+    with col2:
+        conexion_destino = st.selectbox("Hasta", options=aeropuertos_validos, index=1 if len(aeropuertos_validos) > 1 else 0, key="conexion_destino")
+    with col3:
+        criterio = st.selectbox("Criterio", options=list(grafo.CRITERIOS), format_func=grafo.CRITERIOS.get)
+
+    tramos = None
+    if conexion_origen and conexion_destino and conexion_origen != conexion_destino:
+        tramos = grafo.ruta_mas_corta(grafo_rutas, rutas_mapa, conexion_origen, conexion_destino, criterio)
+        if tramos is None:
+            st.info(f"No hay conexión de {conexion_origen} a {conexion_destino} con los vuelos filtrados.")
+        else:
+            escalas = " → ".join([tramos.at[0, "origen"]] + tramos["destino"].tolist())
+            st.success(f"{escalas} · {len(tramos) - 1} escala(s) · {tramos['distancia_km'].sum():,.0f} km")
+            mostrar_df(tramos, use_container_width=True, hide_index=True)
+
+    with contenedor_mapa:
+        col_mapa, col_stats_mapa = st.columns([3, 1])
+
+        with col_mapa:
+            st.subheader("Rutas y Aeropuertos Activos (Según Filtro)")
+            if not rutas_mapa.empty:
+                st.pydeck_chart(grafo.mapa_rutas(grafo_rutas, rutas_mapa, resaltar=tramos, vista=vista_mapa))
+                if len(rutas_mapa) > grafo.MAX_ARCOS:
+                    st.caption(f"Se dibujan las {grafo.MAX_ARCOS:,} rutas más frecuentes de {len(rutas_mapa):,}.")
+            else:
+                st.warning("No se encontraron vuelos o aeropuertos que coincidan con los filtros y tengan coordenadas definidas.")
+
+        with col_stats_mapa:
+            st.subheader("Rutas Más Frecuentes")
+            st.write("(Basado en los vuelos filtrados)")
+            if not rutas_mapa.empty:
+                rutas_frecuentes = rutas_mapa.head(10)[["origen", "destino", "vuelos", "pasajeros", "distancia_km"]]
+                rutas_frecuentes.index += 1
+                mostrar_df(rutas_frecuentes, use_container_width=True)
+                st.metric("Km Volados", f"{rutas_mapa['km_volados'].sum():,.0f}")
+            else:
+                st.info("No hay datos de rutas para mostrar.")
@@ -0,0 +1,185 @@
+# ============================================================
+# SECCIÓN: GESTIÓN DE PASAJEROS (CON LÓGICA FUZZY)
+# ============================================================
+# La búsqueda avanzada por edad se pagina en SQL como la simple y sus
+# estadísticas salen de los conteos por edad; el formulario de alta
+# solo necesita la clave y la ruta de cada vuelo.
+# ============================================================
+
+import streamlit as st
+from datetime import date
+from functools import partial
+
+from aeropuerto import consultas, demografia, filtros, registros
+from aeropuerto.fuzzy import CONJUNTOS_EDAD
+from aeropuerto.filtros import COLUMNAS_FUZZY
+from secciones.comun import encolar_escritura
+from secciones.componentes import tabla_paginada, resultados_busqueda
+
+DATOS = {
+    "vuelos": ["id_vuelo", "origen", "destino"],
+}
+
+
+def mostrar(datos):
+    st.title("👤 Gestión de Pasajeros")
+
+    tab1, tab2 = st.tabs(["👥 Pasajeros de Vuelo", "🚶 Pasajeros en Tránsito"])
+
+    with tab1:
+        st.subheader("Pasajeros de Vuelo")
+        
+        sub_tab1, sub_tab2 = st.tabs(["📋 Búsqueda Simple", "🔍 Búsqueda Avanzada por Edad"])
+
+        with sub_tab1:
+            buscar_pasajero = st.text_input("Buscar por Nombre o Ticket", placeholder="Ej: Juan Pérez, TCK-12345...", key="busqueda_simple")
+            if buscar_pasajero:
+                resultados_busqueda(buscar_pasajero, key="resultados_pasajeros")
+            else:
+                tabla_paginada(
+                    consultas.consulta_pasajeros(), "id_pasajero",
+                    ["id_pasajero", "vuelo_id", "ticket", "nombre", "edad"],
+                    key="tabla_pasajeros"
+                )
+
+        with sub_tab2:
+            st.subheader("Filtros Avanzados de Pasajeros")
+            
+            col1, col2 = st.columns([1, 2])
+            with col1:
+                buscar_avanzado = st.text_input("Buscar por Nombre/Ticket (Opcional)", key="busqueda_avanzada")
+                grupo_etario = st.selectbox(
+                    "Grupo Etario (Pre-selección)",
+                    ["Personalizado", "Jóvenes (18-30)", "Adultos (31-60)", "Seniors (61+)"]
+                )
+            
+            with col2:
+                # Límites del deslizador desde el histograma de edades (121 contadores), sin recorrer pasajeros.
+                min_edad_db, max_edad_db = demografia.histograma().extremos() or (18, 100)
+                
+                if grupo_etario == "Jóvenes (18-30)":
+                    default_range = (18, 30)
+                elif grupo_etario == "Adultos (31-60)":
+                    default_range = (31, 60)
+                elif grupo_etario == "Seniors (61+)":
+                    default_range = (61, int(max_edad_db))
+                else:
+                    default_range = (int(min_edad_db), int(max_edad_db))
+                
+                edad_range = st.slider(
+                    "Seleccionar rango de edad",
+                    min_value=int(min_edad_db),
+                    max_value=int(max_edad_db),
+                    value=default_range
+                )
+            
+            min_edad, max_edad = edad_range
+            consulta_avanzada = filtros.consulta_avanzada(min_edad, max_edad, buscar_avanzado)
+
+            mostrar_todos_conjuntos = st.checkbox(
+                "Mostrar pertenencia a todos los conjuntos (Joven, Adulto, Senior)", key="fuzzy_todos"
+            )
+            if grupo_etario == "Jóvenes (18-30)":
+                st.info(
+                    "💡 **Lógica Fuzzy Aplicada:** La columna 'Pertenencia (17-30)' muestra el "
+                    "grado de membresía (de 0 a 1) a la función triangular 'Joven Ideal' (Pico en 28 años), "
+                    "basado en la función de `Fuzzy.py`."
+                )
+
+            # Todos los conjuntos pedidos se evalúan en una sola pasada sobre las edades.
+            conjuntos_mostrados = list(CONJUNTOS_EDAD) if mostrar_todos_conjuntos else []
+            if grupo_etario in COLUMNAS_FUZZY and COLUMNAS_FUZZY[grupo_etario][0] not in conjuntos_mostrados:
+                conjuntos_mostrados.insert(0, COLUMNAS_FUZZY[grupo_etario][0])
+
+            st.subheader("Resultados del Filtro Avanzado")
+
+            if buscar_avanzado:
+                estadisticas = filtros.estadisticas_consulta(consulta_avanzada)
+            else:
+                # Sin texto el grupo es solo un rango de edad: sale del histograma precalculado.
+                estadisticas = demografia.histograma().estadisticas(min_edad, max_edad)
+
+            if estadisticas["pasajeros"]:
+                # Solo la página visible se lee y recibe las columnas de pertenencia.
+                tabla_paginada(
+                    consulta_avanzada, "id_pasajero",
+                    ["id_pasajero", "vuelo_id", "ticket", "nombre", "edad"],
+                    key="tabla_avanzada",
+                    transformar=partial(filtros.con_pertenencias, conjuntos=conjuntos_mostrados)
+                )
+                
+                st.markdown("---")
+                st.subheader("Estadísticas y Distribución del Grupo")
+                
+                col_stats, col_chart = st.columns([1, 2])
+                
+                with col_stats:
+                    st.metric("Pasajeros Encontrados", f"{estadisticas['pasajeros']:,}")
+                    st.metric("Edad Promedio", f"{estadisticas['promedio']:.1f} años")
+                    st.metric("Edad Mediana", f"{estadisticas['mediana']:.0f} años")
+                    st.metric("Edad(es) Moda", f"{', '.join(map(str, estadisticas['moda']))} años")
+
+                with col_chart:
+                    st.write("Distribución de Edades (Histograma)")
+                    st.bar_chart(estadisticas["histograma"], color="#00AAB2")
+            else:
+                st.info("No se encontraron pasajeros que coincidan con todos los filtros.")
+
+        with st.expander("➕ Registrar nuevo pasajero de vuelo"):
+            with st.form("form_pasajero"):
+                vuelos_df = datos["vuelos"]
+                if vuelos_df.empty:
+                    st.warning("Debe registrar al menos un vuelo antes de añadir pasajeros.")
+                else:
+                    vuelos_opciones = {f"{row.id_vuelo} ({row.origen} > {row.destino})": row.id_vuelo for row in vuelos_df.itertuples()}
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        vuelo_seleccionado = st.selectbox("Vuelo asignado", options=vuelos_opciones.keys())
+                        vuelo_id = vuelos_opciones[vuelo_seleccionado]
+                        nombre = st.text_input("Nombre del pasajero")
+                    with col2:
+                        ticket = st.text_input("Ticket (Ej: TCK-12345)")
+                        edad = st.number_input("Edad", min_value=0, max_value=120, step=1)
+                    
+                    submit = st.form_submit_button("Registrar pasajero")
+
+                    if submit:
+                        if not nombre or not ticket:
+                            st.error("Nombre y Ticket son obligatorios.")
+                        else:
+                            encolar_escritura(
+                                partial(registros.registrar_pasajero, vuelo_id, ticket, nombre, edad),
+                                "Pasajero registrado"
+                            )
+
+    with tab2:
+        st.subheader("Pasajeros en Tránsito")
+        buscar_aeropuerto = st.text_input("Buscar por Aeropuerto", placeholder="Ej: PTY, MAD...", key="busqueda_transito")
+        tabla_paginada(
+            consultas.consulta_transito(buscar_aeropuerto), "id_transito",
+            ["id_transito", "fecha", "aeropuerto", "num_pasajeros"],
+            key="tabla_transito",
+            mensaje_vacio="No se encontraron registros de tránsito para ese aeropuerto."
+        )
+
+        with st.expander("➕ Registrar nuevo conteo de tránsito"):
+            with st.form("form_transito"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    fecha_transito = st.date_input("Fecha", value=date.today(), key="transito_fecha")
+                with col2:
+                    aeropuerto_transito = st.text_input("Aeropuerto (Ej: PTY)", key="transito_aero")
+                
+                num_pasajeros_transito = st.number_input("Número de pasajeros", min_value=0, step=1, key="transito_num")
+                
+                submit = st.form_submit_button("Registrar tránsito")
+
+                if submit:
+                    if not aeropuerto_transito:
+                        st.error("El aeropuerto es obligatorio.")
+                    else:
+                        encolar_escritura(
+                            partial(registros.registrar_transito, fecha_transito, aeropuerto_transito, num_pasajeros_transito),
+                            "Registro de tránsito añadido"
+                        )
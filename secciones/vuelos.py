@@ -0,0 +1,75 @@
+# ============================================================
+# SECCIÓN: GESTIÓN DE VUELOS
+# ============================================================
+# Listado paginado por clave, exportación y alta de vuelos: todo
+# se consulta en SQLite página a página.
+# ============================================================
+
+import streamlit as st
+from datetime import date
+from functools import partial
+
+from aeropuerto import consultas, aeropuertos, registros
+from secciones.comun import encolar_escritura
+from secciones.componentes import tabla_paginada, boton_exportacion
+
+DATOS = {}
+
+
+def mostrar(datos):
+    st.title("✈️ Gestión de Vuelos")
+
+    tab1, tab2 = st.tabs(["📋 Visualizar y Filtrar Vuelos", "➕ Registrar Nuevo Vuelo"])
+
+    with tab1:
+        st.subheader("Filtros y Búsqueda")
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            buscar_origen_destino = st.text_input("Buscar por Origen o Destino", placeholder="Ej: MEX, JFK...")
+        with col2:
+            estados_disponibles = ["Todos"] + consultas.estados_vuelo()
+            filtrar_estado = st.selectbox("Filtrar por Estado", options=estados_disponibles)
+        
+        # El filtrado se hace en SQLite (WHERE ... LIKE / = ?), no en pandas.
+        consulta_vuelos = consultas.consulta_vuelos(buscar_origen_destino, filtrar_estado)
+
+        st.subheader("Lista de Vuelos Registrados")
+        pagina_vuelos = tabla_paginada(
+            consulta_vuelos, "id_vuelo",
+            ["id_vuelo", "fecha", "origen", "destino", "num_pasajeros", "estado"],
+            key="tabla_vuelos",
+            mensaje_vacio="No se encontraron vuelos que coincidan con los filtros."
+        )
+        if not pagina_vuelos.empty:
+            sql_export, params_export = consulta_vuelos.copiar().ordenar("id_vuelo").sql()
+            boton_exportacion(
+                "📥 Descargar Lista Filtrada", sql_export, params_export,
+                "lista_vuelos_filtrada", key="export_vuelos_filtrados"
+            )
+
+    with tab2:
+        st.subheader("Formulario de Registro")
+        with st.form("form_vuelo"):
+            col1, col2 = st.columns(2)
+            with col1:
+                fecha = st.date_input("Fecha del vuelo", value=date.today())
+                origen = st.text_input("Aeropuerto de origen", placeholder="Ej: MEX")
+                estado = st.selectbox("Estado del vuelo", registros.ESTADOS_VUELO)
+            with col2:
+                destino = st.text_input("Aeropuerto de destino", placeholder="Ej: JFK")
+                num_pasajeros = st.number_input("Número de pasajeros", min_value=0, step=1)
+            
+            submit = st.form_submit_button("Registrar vuelo")
+
+            if submit:
+                if not origen or not destino:
+                    st.error("Los campos Origen y Destino son obligatorios.")
+                else:
+                    catalogo_aeropuertos = aeropuertos.catalogo()
+                    if origen.upper() not in catalogo_aeropuertos or destino.upper() not in catalogo_aeropuertos:
+                        st.warning(f"Advertencia: Uno de los aeropuertos ({origen}, {destino}) no tiene coordenadas GPS definidas. Se registrará, pero no aparecerá en el mapa.")
+                    
+                    encolar_escritura(
+                        partial(registros.registrar_vuelo, fecha, origen, destino, num_pasajeros, estado),
+                        "Vuelo registrado"
+                    )
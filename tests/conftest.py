@@ -0,0 +1,46 @@
+# ============================================================
+# FIXTURES COMUNES DE LAS PRUEBAS
+# ============================================================
+# Cada prueba trabaja sobre una base SQLite propia en un directorio
+# temporal, apuntada con AEROPUERTO_DB para que las funciones que
+# usan el pool por defecto lean y escriban en ella.
+# ============================================================
+
+from datetime import date
+
+import pytest
+
+from aeropuerto import generador
+from aeropuerto.cache import cache_consultas
+from aeropuerto.conexion import VARIABLE_RUTA_DB, cerrar_pools, get_pool
+from aeropuerto.escritura import cerrar_colas
+from aeropuerto.esquema import crear_esquema
+from aeropuerto.instantaneas import almacen_instantaneas
+from aeropuerto.notificaciones import VARIABLE_INTERVALO
+
+FECHA_BASE = date(2025, 1, 1)
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    """Pool de una base vacía con el esquema al día."""
+    monkeypatch.setenv(VARIABLE_RUTA_DB, str(tmp_path / "prueba.db"))
+    monkeypatch.setenv(VARIABLE_INTERVALO, "0")
+    cache_consultas.limpiar()
+    cache_consultas.invalidar()
+    almacen_instantaneas.invalidar()
+    pool = get_pool()
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+    yield pool
+    cerrar_colas()
+    almacen_instantaneas.invalidar()
+    cerrar_pools()
+
+
+@pytest.fixture
+def sembrado(pool):
+    """La misma base con datos de ejemplo reproducibles (algo más de un año de historia)."""
+    generador.generar(vuelos=400, transito=150, pasajeros=1500, semilla=7, forzar=True,
+                      fecha_base=FECHA_BASE, dias=400, pool=pool)
+    return pool
@@ -0,0 +1,98 @@
+import io
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aeropuerto import aeropuertos
+from aeropuerto.aeropuertos import Catalogo, catalogo, leer_archivo
+from aeropuerto.grafo import haversine
+from aeropuerto.importacion import importar
+
+
+def _alta_externa(pool, iata):
+    # Conexión propia, como la de otro proceso: no pasa por la caché de este.
+    conn = sqlite3.connect(pool.ruta)
+    try:
+        with conn:
+            conn.execute("INSERT INTO aeropuertos (iata, nombre, ciudad, pais, lat, lon) "
+                         "VALUES (?, 'Prueba', 'Prueba', 'MX', 19.5, -99.1)", (iata,))
+    finally:
+        conn.close()
+
+
+def _catalogo(puntos):
+    return Catalogo(pd.DataFrame(
+        [{"iata": c, "nombre": c, "ciudad": c, "pais": "XX", "lat": lat, "lon": lon} for c, (lat, lon) in puntos.items()]
+    ))
+
+
+def test_migracion_carga_el_archivo_incluido(pool):
+    cat = catalogo(pool)
+    assert len(cat) == len(leer_archivo())
+    assert list(cat.codigos) == sorted(cat.codigos)
+    assert cat.coordenadas("MEX") == pytest.approx((19.4363, -99.0721))
+    assert cat.coordenadas("XXX") is None
+    assert cat.indices(["BOG", "XXX"]).tolist() == [cat.posicion("BOG"), -1]
+
+
+def test_catalogo_ve_cambios_de_otro_proceso(pool):
+    antes = catalogo(pool)
+    assert catalogo(pool) is antes
+    assert "ZZQ" not in antes.codigos
+    _alta_externa(pool, "ZZQ")
+    despues = catalogo(pool)
+    assert despues is not antes
+    assert "ZZQ" in despues.codigos
+
+
+def test_en_radio_coincide_con_fuerza_bruta():
+    rng = np.random.default_rng(3)
+    lat, lon = rng.uniform(-85, 85, 3000), rng.uniform(-180, 180, 3000)
+    cat = _catalogo({f"{i:03d}": (a, o) for i, (a, o) in enumerate(zip(lat, lon))})
+    for centro in [(19.4, -99.1), (60.0, 179.5), (-33.9, 151.2), (84.0, 0.0)]:
+        distancias = haversine(centro[0], centro[1], cat.lat, cat.lon)
+        esperado = np.flatnonzero(distancias <= 1500)
+        encontrado = cat.en_radio(*centro, 1500)
+        assert sorted(encontrado.tolist()) == esperado.tolist()
+        assert np.all(np.diff(distancias[encontrado]) >= 0)
+
+
+def test_en_caja_cruza_el_antimeridiano():
+    cat = _catalogo({"AAA": (10, 179), "BBB": (10, -179), "CCC": (10, 0), "DDD": (40, 179)})
+    assert cat.codigos[cat.en_caja(0, 20, 170, -170)].tolist() == ["AAA", "BBB"]
+    assert cat.codigos[cat.en_caja(0, 20, -10, 10)].tolist() == ["CCC"]
+
+
+def test_leer_archivo_normaliza_ourairports(tmp_path):
+    ruta = tmp_path / "airports.csv"
+    ruta.write_text(
+        "iata_code,name,municipality,iso_country,latitude_deg,longitude_deg,type\n"
+        " mex ,Benito Juárez,Ciudad de México,MX,19.4363,-99.0721,large_airport\n"
+        ",Sin código,X,XX,1,1,heliport\n"
+        "BAD,Sin coordenadas,X,XX,,1,small_airport\n"
+        "MEX,Duplicado,X,MX,0,0,large_airport\n",
+        encoding="utf-8",
+    )
+    df = leer_archivo(ruta)
+    assert df["iata"].tolist() == ["MEX"]
+    assert df.at[0, "nombre"] == "Benito Juárez"
+    (tmp_path / "malo.csv").write_text("iata,lat\nMEX,1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Faltan columnas"):
+        leer_archivo(tmp_path / "malo.csv")
+
+
+def test_importador_valida_contra_el_catalogo(pool):
+    _alta_externa(pool, "ZZQ")
+    csv = "fecha,origen,destino,num_pasajeros,estado\n2025-01-01,MEX,ZZQ,10,Programado\n2025-01-01,MEX,QQQ,10,Programado\n"
+    resultado = importar(io.BytesIO(csv.encode()), "vuelos", formato="csv", pool=pool)
+    assert (resultado.insertadas, resultado.rechazadas) == (1, 1)
+
+
+def test_cli_reemplaza_el_catalogo(pool, tmp_path, capsys):
+    ruta = tmp_path / "propio.csv"
+    ruta.write_text("iata,nombre,ciudad,pais,lat,lon\nAAA,A,A,XX,1,2\nBBB,B,B,XX,3,4\n", encoding="utf-8")
+    assert aeropuertos.main([str(ruta), "--db", pool.ruta, "--reemplazar"]) == 0
+    assert "2 aeropuertos cargados" in capsys.readouterr().out
+    assert catalogo(pool).codigos.tolist() == ["AAA", "BBB"]
@@ -0,0 +1,179 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("starlette")
+
+from aeropuerto import api  # noqa: E402
+
+
+def _llamar(metodo, ruta, cuerpo=None, cabeceras=None):
+    """Llama a la app ASGI sin servidor; devuelve (estado, cabeceras, cuerpo decodificado o None)."""
+    ruta, _, consulta = ruta.partition("?")
+    datos = b"" if cuerpo is None else (cuerpo if isinstance(cuerpo, bytes) else json.dumps(cuerpo).encode())
+    alcance = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": metodo,
+        "scheme": "http", "path": ruta, "raw_path": ruta.encode(), "query_string": consulta.encode(),
+        "root_path": "", "server": ("prueba", 80), "client": ("prueba", 1234),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (cabeceras or {}).items()],
+    }
+    enviados = []
+
+    async def recibir():
+        return {"type": "http.request", "body": datos, "more_body": False}
+
+    async def enviar(mensaje):
+        enviados.append(mensaje)
+
+    asyncio.run(api.app(alcance, recibir, enviar))
+    inicio = enviados[0]
+    salida = {k.decode(): v.decode() for k, v in inicio["headers"]}
+    contenido = b"".join(m.get("body", b"") for m in enviados[1:])
+    if salida.get("content-encoding") == "gzip":
+        contenido = gzip.decompress(contenido)
+    return inicio["status"], salida, json.loads(contenido) if contenido else None
+
+
+def test_listado_paginado_recorre_todo(sembrado):
+    vistos, cursor = [], None
+    while True:
+        estado, _, cuerpo = _llamar("GET", "/vuelos?tamano=70&orden=fecha&desc=1"
+                                           + (f"&cursor={cursor}" if cursor else ""))
+        assert estado == 200
+        vistos += [(v["fecha"], v["id_vuelo"]) for v in cuerpo["datos"]]
+        cursor = cuerpo["siguiente"]
+        if cursor is None:
+            break
+    assert len(vistos) == 400 == len(set(vistos))
+    assert vistos == sorted(vistos, reverse=True)
+
+
+def test_etag_y_304(sembrado):
+    estado, cabeceras, _ = _llamar("GET", "/kpis")
+    etag = cabeceras["etag"]
+    assert estado == 200 and etag.startswith('W/"')
+    estado, cabeceras, cuerpo = _llamar("GET", "/kpis", cabeceras={"If-None-Match": etag})
+    assert (estado, cuerpo, cabeceras["etag"]) == (304, None, etag)
+    # Otros parámetros, otra huella.
+    assert _llamar("GET", "/kpis?top=3")[1]["etag"] != etag
+    # Un cambio en una tabla de la que depende invalida el ETag.
+    with sembrado.escritura() as conn:
+        conn.execute("DELETE FROM pasajeros_transito WHERE id_transito = 1")
+    estado, cabeceras, _ = _llamar("GET", "/kpis", cabeceras={"If-None-Match": etag})
+    assert estado == 200 and cabeceras["etag"] != etag
+
+
+def test_etag_solo_depende_de_sus_tablas(sembrado):
+    etag = _llamar("GET", "/transito")[1]["etag"]
+    with sembrado.escritura() as conn:
+        conn.execute("DELETE FROM pasajeros WHERE id_pasajero = 1")
+    assert _llamar("GET", "/transito", cabeceras={"If-None-Match": etag})[0] == 304
+
+
+def test_gzip(sembrado):
+    _, cabeceras, cuerpo = _llamar("GET", "/pasajeros?tamano=200", cabeceras={"Accept-Encoding": "gzip"})
+    assert cabeceras["content-encoding"] == "gzip"
+    assert len(cuerpo["datos"]) == 200
+
+
+def test_ver_vuelo(sembrado):
+    with sembrado.lectura() as conn:
+        id_vuelo, registrados = conn.execute(
+            "SELECT vuelo_id, COUNT(*) FROM pasajeros GROUP BY vuelo_id ORDER BY vuelo_id LIMIT 1"
+        ).fetchone()
+    estado, _, cuerpo = _llamar("GET", f"/vuelos/{id_vuelo}")
+    assert estado == 200
+    assert cuerpo["vuelo"]["id_vuelo"] == id_vuelo
+    assert cuerpo["vuelo"]["registrados"] == registrados
+    assert _llamar("GET", "/vuelos/999999")[0] == 404
+
+
+def test_pasajeros_por_texto_y_vuelo(sembrado):
+    estado, _, cuerpo = _llamar("GET", "/pasajeros?vuelo_id=1&tamano=1000")
+    assert estado == 200 and all(p["vuelo_id"] == 1 for p in cuerpo["datos"])
+    assert _llamar("GET", "/pasajeros?texto=a&vuelo_id=1")[0] == 400
+
+
+def test_rutas_y_ocupacion(sembrado):
+    estado, _, cuerpo = _llamar("GET", "/rutas?tamano=5")
+    assert estado == 200 and len(cuerpo["datos"]) == 5 and cuerpo["total"] > 5
+    siguiente = _llamar("GET", f"/rutas?tamano=5&cursor={cuerpo['siguiente']}")[2]
+    assert siguiente["datos"][0] != cuerpo["datos"][0]
+    estado, _, cuerpo = _llamar("GET", "/ocupacion?desde=2024-06-01")
+    assert estado == 200 and cuerpo["resumen"]["vuelos"] > 0
+    # Un rango sin vuelos no es un error.
+    estado, _, cuerpo = _llamar("GET", "/ocupacion?desde=2100-01-01")
+    assert estado == 200 and cuerpo["resumen"]["vuelos"] == 0 and cuerpo["resumen"]["factor_carga"] is None
+
+
+@pytest.mark.parametrize("ruta", [
+    "/vuelos?tamano=0", "/vuelos?orden=nombre", "/vuelos?cursor=%%%", "/ocupacion?desde=ayer",
+    "/rutas?cursor=WyJhIl0", "/vuelos?cursor=WyJhIl0",
+    # Cursor de otro orden, de más o de menos posiciones, o con la clave nula.
+    f"/vuelos?orden=num_pasajeros&cursor={api._codificar_cursor(('2025-01-01', 3))}",
+    f"/vuelos?cursor={api._codificar_cursor((3, 4))}",
+    f"/transito?orden=fecha&cursor={api._codificar_cursor((3,))}",
+    f"/transito?orden=fecha&cursor={api._codificar_cursor(('2025-01-01', None))}",
+    f"/pasajeros?texto=ana&cursor={api._codificar_cursor((-5,))}",
+])
+def test_parametros_invalidos(pool, ruta):
+    estado, _, cuerpo = _llamar("GET", ruta)
+    assert estado == 400 and cuerpo["error"]
+
+
+def test_cursor_en_el_tramo_de_nulos(pool):
+    with pool.escritura() as conn:
+        conn.executemany("INSERT INTO pasajeros_transito (fecha, aeropuerto, num_pasajeros) VALUES (?, 'MEX', 1)",
+                         [(None,), (None,), ("2025-01-01",)])
+    estado, _, cuerpo = _llamar("GET", "/transito?orden=fecha&tamano=1")
+    assert estado == 200 and cuerpo["datos"][0]["fecha"] is None
+    estado, _, cuerpo = _llamar("GET", f"/transito?orden=fecha&tamano=1&cursor={cuerpo['siguiente']}")
+    assert estado == 200 and cuerpo["datos"][0]["fecha"] is None
+
+
+def test_altas(pool):
+    estado, _, cuerpo = _llamar("POST", "/vuelos", {
+        "fecha": "2025-02-01", "origen": "mex", "destino": "BOG", "num_pasajeros": 120, "estado": "Programado",
+    })
+    assert estado == 201
+    id_vuelo = cuerpo["id"]
+    estado, _, cuerpo = _llamar("POST", "/pasajeros", {"vuelo_id": id_vuelo, "ticket": "t-1", "nombre": "Ana",
+                                                       "edad": 30})
+    assert estado == 201
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT origen FROM vuelos WHERE id_vuelo = ?", (id_vuelo,)).fetchone() == ("MEX",)
+        assert conn.execute("SELECT ticket FROM pasajeros WHERE id_pasajero = ?", (cuerpo["id"],)).fetchone() == ("T-1",)
+
+
+def test_alta_de_pasajero_en_vuelo_inexistente(pool):
+    estado, _, cuerpo = _llamar("POST", "/pasajeros", {"vuelo_id": 999, "ticket": "t-1", "nombre": "Ana", "edad": 30})
+    assert estado == 404 and "999" in cuerpo["error"]
+    assert _llamar("POST", "/pasajeros", {"vuelo_id": "x", "ticket": "t-1", "nombre": "Ana", "edad": 30})[0] == 400
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM pasajeros").fetchone() == (0,)
+
+
+@pytest.mark.parametrize("cuerpo", [
+    b"no es json", b"[1, 2]", {"fecha": "2025-02-01"},
+    {"fecha": "2025-02-01", "aeropuerto": "MEX", "num_pasajeros": -1},
+    {"fecha": "mañana", "aeropuerto": "MEX", "num_pasajeros": 3},
+])
+def test_altas_invalidas(pool, cuerpo):
+    estado, _, respuesta = _llamar("POST", "/transito", cuerpo)
+    assert estado == 400 and respuesta["error"]
+
+
+def test_salud(pool):
+    estado, _, cuerpo = _llamar("GET", "/salud")
+    assert estado == 200 and cuerpo["ok"]
+
+
+def test_edades(sembrado):
+    estado, _, cuerpo = _llamar("GET", "/edades?edad_min=18&edad_max=30")
+    assert estado == 200
+    with sembrado.lectura() as conn:
+        (n,) = conn.execute("SELECT COUNT(*) FROM pasajeros WHERE edad BETWEEN 18 AND 30").fetchone()
+    assert cuerpo["pasajeros"] == n == sum(cuerpo["histograma"].values())
+    assert sum(cuerpo["bandas"].values()) == 1500
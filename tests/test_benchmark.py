@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from aeropuerto import benchmark
+
+
+def test_ejecutar_mide_cada_caso(tmp_path):
+    casos = ["cargar_datos", "dashboard"]
+    resultados = benchmark.ejecutar([1_000, 2_000], casos, str(tmp_path), repeticiones=1, calentamiento=0,
+                                    memoria=False)
+    medidos = [(r["caso"], r["escala"]) for r in resultados if r["caso"] != benchmark.CASO_GENERAR]
+    assert medidos == [(caso, escala) for escala in (1_000, 2_000) for caso in casos]
+    assert all(r["filas"] > 0 for r in resultados)
+
+
+def test_todos_los_casos_corren(tmp_path):
+    resultados = benchmark.ejecutar([500], list(benchmark.CASOS), str(tmp_path), repeticiones=1,
+                                    calentamiento=0, memoria=True)
+    assert {r["caso"] for r in resultados} >= set(benchmark.CASOS)
+    assert all(r["pico_mb"] is not None for r in resultados if r["caso"] != benchmark.CASO_GENERAR)
+
+
+def test_medir():
+    llamadas = []
+    tiempos, filas, pico = benchmark.medir(lambda: llamadas.append(1) or len(llamadas), repeticiones=3,
+                                           calentamiento=2, memoria=False)
+    assert len(tiempos) == 3 and filas == 5 and pico is None
+    assert len(llamadas) == 5
+
+
+def _documento(mediana):
+    return {"resultados": [{"caso": "dashboard", "escala": 1000, "mediana_s": mediana}]}
+
+
+def test_comparar_detecta_regresiones(tmp_path, capsys):
+    tabla = benchmark.comparar(_documento(1.0), _documento(1.5), umbral=0.2)
+    assert tabla["regresion"].tolist() == [True]
+    assert tabla["cambio"].tolist() == [pytest.approx(0.5)]
+    base, actual = tmp_path / "base.json", tmp_path / "actual.json"
+    base.write_text(json.dumps(_documento(1.0)))
+    actual.write_text(json.dumps(_documento(1.1)))
+    assert benchmark.main(["--comparar", str(base), str(actual)]) == 0
+    assert benchmark.main(["--comparar", str(base), str(actual), "--umbral", "0.05"]) == 1
+    capsys.readouterr()
@@ -0,0 +1,109 @@
+import pytest
+
+from aeropuerto import busqueda
+from aeropuerto.cache import cache_consultas
+from aeropuerto.consultas import leer_sql
+
+
+def _alta(pool, ticket, nombre):
+    with pool.escritura() as conn:
+        return conn.execute(
+            "INSERT INTO pasajeros (vuelo_id, ticket, nombre, edad) VALUES (1, ?, ?, 30)", (ticket, nombre)
+        ).lastrowid
+
+
+@pytest.fixture
+def pasajeros(pool):
+    return {
+        "luis": _alta(pool, "SOF-1", "Luis Pérez"),
+        "sofia": _alta(pool, "X-2", "Sofía Álvarez"),
+        "ana": _alta(pool, "SOFT-3", "Ana Ruiz"),
+        "maria": _alta(pool, "M-4", "María José Pérez"),
+    }
+
+
+def _buscar(texto, **opciones):
+    return busqueda.buscar_pasajeros(texto, **opciones)["id_pasajero"].tolist()
+
+
+def test_prefijos_sin_acentos_ni_mayusculas(pasajeros):
+    assert _buscar("sofia alv") == [pasajeros["sofia"]]
+    assert _buscar("ÁLVAREZ") == [pasajeros["sofia"]]
+    assert sorted(_buscar("perez")) == sorted([pasajeros["luis"], pasajeros["maria"]])
+    assert _buscar("jose mar") == [pasajeros["maria"]]
+    assert _buscar("zzz") == []
+    assert _buscar("  ") == []
+
+
+def test_ticket_por_delante_del_nombre(pasajeros):
+    # "soft" es prefijo del ticket SOFT-3 y no de ningún nombre; "sof" además coincide con Sofía.
+    assert _buscar("soft") == [pasajeros["ana"]]
+    encontrados = _buscar("sof")
+    assert encontrados[:2] == [pasajeros["luis"], pasajeros["ana"]]
+    assert encontrados[2:] == [pasajeros["sofia"]]
+
+
+def test_paginas_y_conteo(pasajeros):
+    assert _buscar("sof", limite=2) + _buscar("sof", limite=2, desplazamiento=2) == _buscar("sof")
+    assert busqueda.contar_coincidencias("sof") == 3
+    assert busqueda.contar_coincidencias("sof", tope=1) == 2
+    assert sorted(busqueda.ids_coincidentes("perez")) == sorted([pasajeros["luis"], pasajeros["maria"]])
+
+
+def test_prefijo_minimo(pasajeros):
+    # Una sola letra no se busca en el índice (solo como prefijo de ticket)...
+    assert _buscar("a") == []
+    assert busqueda.contar_coincidencias("a") == 0
+    assert _buscar("x") == [pasajeros["sofia"]]
+    # ...pero junto a una palabra más larga sí acota el resultado.
+    assert _buscar("perez j") == [pasajeros["maria"]]
+
+
+def test_indice_sigue_a_las_escrituras(pool, pasajeros):
+    with pool.escritura() as conn:
+        conn.execute("UPDATE pasajeros SET nombre = 'Sofía Núñez' WHERE id_pasajero = ?", (pasajeros["sofia"],))
+        conn.execute("DELETE FROM pasajeros WHERE id_pasajero = ?", (pasajeros["maria"],))
+    cache_consultas.invalidar("pasajeros")
+    assert _buscar("alvarez") == []
+    assert _buscar("nunez") == [pasajeros["sofia"]]
+    assert _buscar("perez") == [pasajeros["luis"]]
+
+
+def test_sintaxis_fts_del_usuario_no_rompe_la_consulta(pasajeros):
+    assert _buscar('perez" OR "ana') == []
+    assert sorted(_buscar("pérez*")) == sorted([pasajeros["luis"], pasajeros["maria"]])
+
+
+def _referencia(texto, limite, desplazamiento):
+    # Orden exacto: todas las coincidencias agrupadas y ordenadas, sin acotar cada fuente.
+    sql, params = busqueda._coincidencias_sql(texto)
+    return leer_sql(
+        f"SELECT p.* FROM ({sql}) r JOIN pasajeros p ON p.id_pasajero = r.id "
+        f"ORDER BY r.rango, p.id_pasajero LIMIT ? OFFSET ?",
+        params + (limite, desplazamiento), ("pasajeros",),
+    )
+
+
+@pytest.mark.parametrize("texto", ["a", "ma", "maria", "garcia mar", "TCK-1", "tck", "zzz"])
+@pytest.mark.parametrize("desplazamiento", [0, 30, 400])
+def test_paginas_iguales_al_orden_exacto(sembrado, texto, desplazamiento):
+    obtenido = busqueda.buscar_pasajeros(texto, limite=25, desplazamiento=desplazamiento)
+    esperado = _referencia(texto, 25, desplazamiento)
+    assert obtenido["id_pasajero"].tolist() == esperado["id_pasajero"].tolist()
+
+
+def test_paginas_consecutivas_sin_huecos(sembrado):
+    ids = busqueda.ids_coincidentes("ma")
+    paginas = [busqueda.buscar_pasajeros("ma", limite=40, desplazamiento=d)["id_pasajero"]
+               for d in range(0, len(ids) + 40, 40)]
+    vistos = [i for pagina in paginas for i in pagina]
+    assert len(vistos) == len(set(vistos)) == len(ids)
+
+
+@pytest.mark.parametrize("texto", ["a", "ma", "maria", "garcia mar", "TCK-1", "tck", "zzz"])
+def test_conteo_e_ids_sin_rango(sembrado, texto):
+    exactos = set(_referencia(texto, 10**6, 0)["id_pasajero"])
+    assert set(busqueda.ids_coincidentes(texto)) == exactos
+    assert busqueda.contar_coincidencias(texto) == len(exactos)
+    assert busqueda.contar_coincidencias(texto, tope=20) == min(len(exactos), 21)
+    assert len(busqueda.ids_coincidentes(texto, tope=20)) == min(len(exactos), 20)
@@ -0,0 +1,95 @@
+import pandas as pd
+
+from aeropuerto.cache import TABLAS, CacheConsultas, tablas_afectadas
+
+
+class Cargador:
+    def __init__(self, valor="valor"):
+        self.valor = valor
+        self.llamadas = 0
+
+    def __call__(self):
+        self.llamadas += 1
+        return self.valor
+
+
+def test_tablas_afectadas():
+    assert tablas_afectadas("INSERT INTO vuelos (fecha) VALUES (?)") == ("vuelos",)
+    assert tablas_afectadas("insert or replace into Pasajeros VALUES (?)") == ("pasajeros",)
+    assert tablas_afectadas("UPDATE pasajeros_transito SET num_pasajeros = 1") == ("pasajeros_transito",)
+    assert tablas_afectadas('DELETE FROM "vuelos"') == ("vuelos",)
+    # Lo que no se reconoce invalida todo.
+    assert tablas_afectadas("VACUUM") == TABLAS
+
+
+def test_reutiliza_mientras_no_cambie_la_version():
+    cache = CacheConsultas()
+    cargador = Cargador()
+    assert cache.obtener("clave", ("vuelos",), cargador) == "valor"
+    assert cache.obtener("clave", ("vuelos",), cargador) == "valor"
+    assert cargador.llamadas == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_invalidar_solo_afecta_a_las_tablas_escritas():
+    cache = CacheConsultas()
+    de_vuelos, de_pasajeros = Cargador(), Cargador()
+    cache.obtener("vuelos", ("vuelos",), de_vuelos)
+    cache.obtener("pasajeros", ("pasajeros",), de_pasajeros)
+
+    cache.invalidar("vuelos")
+    cache.obtener("vuelos", ("vuelos",), de_vuelos)
+    cache.obtener("pasajeros", ("pasajeros",), de_pasajeros)
+    assert (de_vuelos.llamadas, de_pasajeros.llamadas) == (2, 1)
+    assert cache.version("vuelos") == 1
+
+    cache.invalidar()
+    assert cache.versiones(("vuelos", "pasajeros", "pasajeros_transito")) == (2, 1, 1)
+
+
+def test_escritura_durante_la_carga_no_se_guarda():
+    cache = CacheConsultas()
+
+    def cargador():
+        cache.invalidar("vuelos")
+        return "viejo"
+
+    assert cache.obtener("clave", ("vuelos",), cargador) == "viejo"
+    assert cache.estadisticas()["entradas"] == 0
+
+
+def test_desaloja_la_entrada_menos_usada():
+    cache = CacheConsultas(max_entradas=2)
+    for clave in ("a", "b"):
+        cache.obtener(clave, ("vuelos",), Cargador(clave))
+    cache.obtener("a", ("vuelos",), Cargador())  # "a" pasa a ser la más reciente
+    cache.obtener("c", ("vuelos",), Cargador("c"))
+    assert cache.evictions == 1
+    conservada, desalojada = Cargador(), Cargador()
+    assert cache.obtener("a", ("vuelos",), conservada) == "a"
+    cache.obtener("b", ("vuelos",), desalojada)
+    assert (conservada.llamadas, desalojada.llamadas) == (0, 1)
+
+
+def test_limite_de_bytes_conserva_la_ultima_entrada():
+    df = pd.DataFrame({"x": range(1000)})
+    cache = CacheConsultas(max_bytes=1)
+    cache.obtener("a", ("vuelos",), Cargador(df))
+    cache.obtener("b", ("vuelos",), Cargador(df))
+    estadisticas = cache.estadisticas()
+    assert estadisticas["entradas"] == 1
+    assert estadisticas["bytes"] > 1
+
+
+def test_excepciones_del_cargador_no_se_cachean():
+    cache = CacheConsultas()
+
+    def falla():
+        raise RuntimeError("sin base")
+
+    try:
+        cache.obtener("clave", ("vuelos",), falla)
+    except RuntimeError:
+        pass
+    assert cache.estadisticas()["entradas"] == 0
+    assert cache.obtener("clave", ("vuelos",), Cargador()) == "valor"
@@ -0,0 +1,108 @@
+import io
+
+import pytest
+
+from aeropuerto import cambios, importacion, registros
+from aeropuerto.columnar import leer_tabla
+from aeropuerto.instantaneas import AlmacenInstantaneas
+
+ESPERA_S = 10
+CONSERVAR = 40
+HOLGURA = 20
+
+
+@pytest.fixture
+def registro_corto(monkeypatch):
+    """Umbrales de compactación pequeños para verlos actuar con pocas escrituras."""
+    monkeypatch.setattr(cambios, "CAMBIOS_CONSERVADOS", CONSERVAR)
+    monkeypatch.setattr(cambios, "HOLGURA_COMPACTAR", HOLGURA)
+
+
+def _extension(pool):
+    with pool.lectura() as conn:
+        primera, ultima = conn.execute("SELECT MIN(id_cambio), MAX(id_cambio) FROM cambios").fetchone()
+        total = conn.execute("SELECT COUNT(*) FROM cambios").fetchone()[0]
+    return primera, ultima, total
+
+
+def _vuelos_csv(n, lote):
+    filas = "".join(f"2025-01-{1 + i % 28:02d},MEX,GDL,{lote * 1000 + i},Programado\n" for i in range(n))
+    return io.BytesIO(f"fecha,origen,destino,num_pasajeros,estado\n{filas}".encode())
+
+
+def test_importaciones_mantienen_acotado_el_registro(pool, registro_corto):
+    for lote in range(5):
+        resultado = importacion.importar(_vuelos_csv(30, lote), "vuelos", nombre_archivo=f"vuelos{lote}.csv",
+                                         tamano_bloque=10, pool=pool)
+        assert resultado.insertadas == 30
+    primera, ultima, total = _extension(pool)
+    assert ultima == 150
+    assert total <= CONSERVAR + HOLGURA
+    assert primera > 1
+
+
+def test_cola_de_escritura_mantiene_acotado_el_registro(pool, registro_corto):
+    for i in range(150):
+        registros.registrar_vuelo("2025-01-01", "MEX", "GDL", i, pool=pool).result(ESPERA_S)
+    _, ultima, total = _extension(pool)
+    assert ultima == 150
+    assert total <= CONSERVAR + HOLGURA
+
+
+def test_sin_exceso_no_se_compacta(pool):
+    for lote in range(3):
+        importacion.importar(_vuelos_csv(30, lote), "vuelos", nombre_archivo=f"vuelos{lote}.csv", pool=pool)
+    assert _extension(pool) == (1, 90, 90)
+
+
+def test_marca_compactada_obliga_a_recargar(pool, registro_corto):
+    importacion.importar(_vuelos_csv(100, 0), "vuelos", nombre_archivo="vuelos.csv", tamano_bloque=10, pool=pool)
+    primera, ultima, _ = _extension(pool)
+    assert primera > 1
+
+    vieja = cambios.desde(0, pool=pool)
+    assert vieja["recargar"]
+
+    # Justo antes del primer cambio conservado el delta sigue completo.
+    vigente = cambios.desde(primera - 1, pool=pool)
+    assert not vigente["recargar"]
+    assert vigente["completo"]
+    assert vigente["marca"] == ultima
+    assert vigente["cambios"]["id_cambio"].tolist() == list(range(primera, ultima + 1))
+
+    # Una marca al día no trae cambios y conserva la marca.
+    al_dia = cambios.desde(ultima, pool=pool)
+    assert (len(al_dia["cambios"]), al_dia["marca"], al_dia["recargar"]) == (0, ultima, False)
+
+
+def test_restauracion_obliga_a_recargar(pool):
+    id_vuelo = registros.registrar_vuelo("2025-01-01", "MEX", "GDL", 10, pool=pool).result(ESPERA_S)
+    with pool.escritura() as conn:
+        marca = cambios.marca_actual(conn)
+        cambios.marcar_restauracion(conn, marca)
+    pendientes = cambios.desde(marca, pool=pool)
+    assert pendientes["recargar"]
+    assert set(pendientes["cambios"]["operacion"]) == {"R"}
+    assert id_vuelo not in pendientes["cambios"]["id_fila"].tolist()
+
+
+def test_delta_paginado(pool):
+    importacion.importar(_vuelos_csv(25, 0), "vuelos", nombre_archivo="vuelos.csv", pool=pool)
+    pagina = cambios.desde(0, limite=10, pool=pool)
+    assert (len(pagina["cambios"]), pagina["marca"], pagina["completo"]) == (10, 10, False)
+    resto = cambios.desde(pagina["marca"], limite=100, pool=pool)
+    assert (len(resto["cambios"]), resto["marca"], resto["completo"]) == (15, 25, True)
+
+
+def test_instantanea_recarga_si_su_marca_se_compacta(pool, registro_corto):
+    almacen = AlmacenInstantaneas()
+    almacen.obtener("vuelos", pool)
+    importacion.importar(_vuelos_csv(10, 0), "vuelos", nombre_archivo="vuelos0.csv", pool=pool)
+    almacen.sincronizar(pool)
+    assert almacen.obtener("vuelos", pool).equals(leer_tabla("vuelos", pool=pool))
+    assert almacen.deltas == 1
+
+    importacion.importar(_vuelos_csv(100, 1), "vuelos", nombre_archivo="vuelos1.csv", tamano_bloque=10, pool=pool)
+    almacen.sincronizar(pool)
+    assert almacen.obtener("vuelos", pool).equals(leer_tabla("vuelos", pool=pool))
+    assert (almacen.deltas, almacen.cargas) == (1, 2)
@@ -0,0 +1,63 @@
+import pandas as pd
+
+from aeropuerto import columnar
+from aeropuerto.columnar import leer_tabla, reporte_memoria, resumen_memoria
+
+
+def _sin_tipar(pool, tabla):
+    with pool.lectura() as conn:
+        return pd.read_sql_query(f"SELECT * FROM {tabla}", conn)
+
+
+def test_tipos_compactos(sembrado):
+    vuelos = leer_tabla("vuelos", sembrado)
+    assert str(vuelos["id_vuelo"].dtype) == "int32"
+    assert str(vuelos["estado"].dtype) == "category"
+    assert str(vuelos["fecha"].dtype).startswith("datetime64")
+    # Origen y destino comparten categorías: se pueden comparar entre sí.
+    assert list(vuelos["origen"].cat.categories) == list(vuelos["destino"].cat.categories)
+    assert (vuelos["origen"] != vuelos["destino"]).all()
+    pasajeros = leer_tabla("pasajeros", sembrado)
+    assert str(pasajeros["edad"].dtype) == "int16"
+
+
+def test_bloques_equivalen_a_una_lectura(sembrado):
+    # Bloques pequeños: cada uno trae un subconjunto distinto de categorías.
+    for tabla in columnar.ESQUEMAS:
+        por_bloques = leer_tabla(tabla, sembrado, tamano_bloque=37)
+        esperado = _sin_tipar(sembrado, tabla)
+        assert len(por_bloques) == len(esperado)
+        for columna in esperado.columns:
+            if columna == "fecha":
+                assert (por_bloques[columna].dt.strftime("%Y-%m-%d") == esperado[columna]).all()
+            else:
+                assert por_bloques[columna].astype(object).tolist() == esperado[columna].tolist(), columna
+
+
+def test_nulos_y_desbordes(pool):
+    with pool.escritura() as conn:
+        conn.execute("INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) "
+                     "VALUES ('2025-01-01', 'MEX', 'BOG', NULL, 'Programado')")
+        conn.execute("INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) "
+                     "VALUES ('2025-01-02', 'BOG', 'MEX', 5000000000, NULL)")
+    vuelos = leer_tabla("vuelos", pool)
+    # No cabe en int32 y hay NULL: entero nullable de 64 bits.
+    assert str(vuelos["num_pasajeros"].dtype) == "Int64"
+    assert vuelos["num_pasajeros"].isna().tolist() == [True, False]
+    assert vuelos["estado"].isna().tolist() == [False, True]
+
+
+def test_tabla_vacia_conserva_tipos(pool):
+    vuelos = leer_tabla("vuelos", pool)
+    assert vuelos.empty
+    assert list(vuelos.columns) == list(columnar.ESQUEMAS["vuelos"])
+    assert str(vuelos["id_vuelo"].dtype) == "int32"
+
+
+def test_reporte_memoria(sembrado):
+    tablas = {t: leer_tabla(t, sembrado) for t in ("vuelos", "pasajeros_transito")}
+    reporte = reporte_memoria(tablas, sembrado)
+    assert set(reporte["tabla"]) == set(tablas)
+    assert len(reporte) == sum(len(df.columns) for df in tablas.values())
+    resumen = resumen_memoria(reporte)
+    assert (resumen["ahorro"] > 0).all()
@@ -0,0 +1,199 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from aeropuerto import conexion
+from aeropuerto.conexion import PoolConexiones, get_pool, registrar_backend, resolver_destino
+from aeropuerto.instantaneas import almacen_instantaneas
+from aeropuerto.notificaciones import CanalCambios
+
+
+def _crear_tabla(pool):
+    with pool.escritura() as conn:
+        conn.execute("CREATE TABLE prueba (id INTEGER PRIMARY KEY, origen TEXT)")
+
+
+def test_get_pool_comparte_un_pool_por_ruta(pool, tmp_path):
+    assert get_pool() is pool
+    assert get_pool(str(tmp_path / "prueba.db")) is pool
+    assert get_pool(str(tmp_path / "otra.db")) is not pool
+
+
+def test_modo_wal_y_lectores_de_solo_lectura(pool):
+    _crear_tabla(pool)
+    assert pool.journal_mode == "wal"
+    with pool.lectura() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO prueba (origen) VALUES ('MEX')")
+
+
+def test_escritura_confirma_o_deshace(pool):
+    _crear_tabla(pool)
+    with pool.escritura() as conn:
+        conn.execute("INSERT INTO prueba (origen) VALUES ('MEX')")
+    with pytest.raises(RuntimeError):
+        with pool.escritura() as conn:
+            conn.execute("INSERT INTO prueba (origen) VALUES ('GDL')")
+            raise RuntimeError("fallo a mitad")
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT origen FROM prueba").fetchall() == [("MEX",)]
+    assert pool.metricas()["rollbacks"] == 1
+
+
+def test_lector_no_bloquea_al_escritor(pool):
+    _crear_tabla(pool)
+    with pool.lectura() as conn:
+        conn.execute("BEGIN")
+        assert conn.execute("SELECT COUNT(*) FROM prueba").fetchone() == (0,)
+        with pool.escritura() as escritor:
+            escritor.execute("INSERT INTO prueba (origen) VALUES ('MEX')")
+        # La transacción de lectura sigue viendo su instantánea.
+        assert conn.execute("SELECT COUNT(*) FROM prueba").fetchone() == (0,)
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM prueba").fetchone() == (1,)
+
+
+def test_lectores_acotados(tmp_path):
+    pool = PoolConexiones(str(tmp_path / "acotado.db"), max_lectores=2, timeout=0.2)
+    try:
+        with pool.lectura(), pool.lectura():
+            with pytest.raises(sqlite3.OperationalError):
+                with pool.lectura():
+                    pass
+        assert pool.metricas()["lectores_creados"] == 2
+        # Los lectores devueltos se reutilizan.
+        with pool.lectura():
+            pass
+        assert pool.metricas()["lectores_creados"] == 2
+    finally:
+        pool.cerrar()
+
+
+def test_cerrar_cierra_tambien_los_lectores_prestados(tmp_path):
+    pool = PoolConexiones(str(tmp_path / "cierre.db"))
+    with pool.lectura() as libre:
+        pass
+    with pool.lectura() as prestado:
+        pool.cerrar()
+        # El lector prestado sigue sirviendo hasta que se devuelve.
+        assert prestado.execute("SELECT 1").fetchone() == (1,)
+    for conn in (libre, prestado):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert pool.metricas()["lectores_creados"] == 0
+    # Tras cerrar, el pool abre conexiones nuevas.
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    pool.cerrar()
+
+
+def test_lecturas_concurrentes(pool):
+    _crear_tabla(pool)
+    errores = []
+
+    def leer():
+        try:
+            for _ in range(50):
+                with pool.lectura() as conn:
+                    conn.execute("SELECT COUNT(*) FROM prueba").fetchone()
+        except Exception as e:
+            errores.append(e)
+
+    hilos = [threading.Thread(target=leer) for _ in range(12)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert not errores
+    assert pool.metricas()["lectores_creados"] <= pool.max_lectores
+
+
+def test_sin_claves_foraneas_como_la_conexion_original(pool):
+    # Como get_connection(), el pool no activa foreign_keys: pasajeros.vuelo_id no se impone.
+    with pool.escritura() as conn:
+        conn.execute("CREATE TABLE padre (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TABLE hijo (id INTEGER PRIMARY KEY, padre_id INTEGER REFERENCES padre(id))")
+        conn.execute("INSERT INTO hijo (padre_id) VALUES (999)")
+    with pool.lectura() as conn:
+        assert conn.execute("PRAGMA foreign_keys").fetchone() == (0,)
+        assert conn.execute("SELECT padre_id FROM hijo").fetchall() == [(999,)]
+
+
+def test_salud(pool):
+    assert pool.salud() == (True, "OK (wal)")
+
+
+def test_resolver_destino(tmp_path):
+    ruta = str(tmp_path / "a.db")
+    assert resolver_destino(ruta) == (PoolConexiones, ruta)
+    assert resolver_destino(f"sqlite:///{ruta}") == (PoolConexiones, ruta)
+    assert resolver_destino("sqlite:///rel.db") == (PoolConexiones, os.path.abspath("rel.db"))
+    with pytest.raises(ValueError, match="desconocido"):
+        resolver_destino("oracle://localhost/aeropuerto")
+
+
+def test_backend_registrado(monkeypatch):
+    class PoolFalso:
+        def __init__(self, url):
+            self.ruta = url
+
+        def cerrar(self):
+            pass
+
+    monkeypatch.setattr(conexion, "BACKENDS", {})
+    registrar_backend("falso", PoolFalso)
+    pool = get_pool("falso://servidor/base")
+    assert isinstance(pool, PoolFalso) and pool.ruta == "falso://servidor/base"
+    assert get_pool("falso://servidor/base") is pool
+
+
+def test_ruta_y_url_comparten_pool(pool):
+    assert get_pool(f"sqlite:///{pool.ruta}") is pool
+
+
+def _insertar_hasta_aviso(pool, recibido):
+    externa = sqlite3.connect(pool.ruta)
+    try:
+        # Se escribe hasta recibir el aviso: el canal pudo no estar escuchando aún en el primer commit.
+        for _ in range(100):
+            with externa:
+                externa.execute("INSERT INTO pasajeros_transito (fecha, aeropuerto, num_pasajeros) "
+                                "VALUES ('2025-01-01', 'MEX', 3)")
+            if recibido.wait(0.05):
+                break
+    finally:
+        externa.close()
+
+
+def test_canal_avisa_de_commits_de_otro_proceso(pool):
+    canal = CanalCambios(pool, intervalo=0.01, recargar=False)
+    avisos = []
+    recibido = threading.Event()
+    canal.suscribir(lambda tablas: (avisos.append(tablas), recibido.set()))
+    canal.iniciar()
+    try:
+        _insertar_hasta_aviso(pool, recibido)
+        assert recibido.is_set()
+    finally:
+        canal.detener(5)
+    assert "pasajeros_transito" in avisos[0]
+    assert not canal.activo
+
+
+def test_canal_recarga_las_instantaneas_cargadas(pool):
+    antes = almacen_instantaneas.obtener("pasajeros_transito", pool)
+    canal = CanalCambios(pool, intervalo=0.01)
+    recibido = threading.Event()
+    canal.suscribir(lambda tablas: recibido.set())
+    canal.iniciar()
+    try:
+        _insertar_hasta_aviso(pool, recibido)
+    finally:
+        canal.detener(5)
+    assert canal.metricas()["recargas"] >= 1
+    # La recarga ya ocurrió en el hilo del canal: leer ahora no vuelve a la base.
+    cargas = almacen_instantaneas.cargas
+    assert len(almacen_instantaneas.obtener("pasajeros_transito", pool)) > len(antes)
+    assert almacen_instantaneas.cargas == cargas
@@ -0,0 +1,73 @@
+import pytest
+
+from aeropuerto import consultas
+from aeropuerto.cache import cache_consultas
+from aeropuerto.consultas import Consulta
+
+VUELOS = [
+    ("2025-01-01", "MEX", "GDL", 120, "Completado"),
+    ("2025-01-01", "MEX", "BOG", 90, "Programado"),
+    ("2025-01-02", "GDL", "MEX", 80, "Completado"),
+    ("2025-01-03", "BOG", "MEX", 100, "Cancelado"),
+    ("2025-01-03", "MEX", "GDL", 110, "Completado"),
+]
+
+
+@pytest.fixture
+def datos(pool):
+    with pool.escritura() as conn:
+        conn.executemany(
+            "INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) VALUES (?, ?, ?, ?, ?)", VUELOS
+        )
+        conn.executemany(
+            "INSERT INTO pasajeros (vuelo_id, ticket, nombre, edad) VALUES (?, ?, ?, ?)",
+            [(1, "T-1", "Ana", 30), (1, "T-2", "Luis", 45), (3, "T-3", "Eva", 70)],
+        )
+        conn.executemany(
+            "INSERT INTO pasajeros_transito (fecha, aeropuerto, num_pasajeros) VALUES (?, ?, ?)",
+            [("2025-01-01", "MEX", 300), ("2025-01-01", "GDL", 50), ("2025-01-02", "MEX", 200)],
+        )
+    return pool
+
+
+def test_sql_parametrizado():
+    consulta = (
+        Consulta("vuelos", ["origen", "COUNT(*) AS n"])
+        .igual("estado", "Completado").en("destino", ["GDL", "MEX"]).entre("fecha", "2025-01-01", "2025-01-31")
+        .agrupar("origen").ordenar("n DESC").limite(3)
+    )
+    assert consulta.sql() == (
+        "SELECT origen, COUNT(*) AS n FROM vuelos WHERE estado = ? AND destino IN (?, ?) "
+        "AND fecha BETWEEN ? AND ? GROUP BY origen ORDER BY n DESC LIMIT 3",
+        ("Completado", "GDL", "MEX", "2025-01-01", "2025-01-31"),
+    )
+
+
+def test_lista_vacia_no_filtra():
+    assert Consulta("vuelos").en("estado", []).sql() == ("SELECT * FROM vuelos", ())
+
+
+def test_contiene_escapa_comodines(datos):
+    assert len(Consulta("vuelos").contiene(["origen", "destino"], "mex").leer()) == 5
+    assert Consulta("vuelos").contiene(["origen"], "%").leer().empty
+    assert Consulta("vuelos").contiene(["origen"], "M_X").leer().empty
+
+
+def test_agregados_por_seccion(datos):
+    assert consultas.estados_vuelo() == ["Cancelado", "Completado", "Programado"]
+    assert consultas.aeropuertos_en_vuelos() == ["BOG", "GDL", "MEX"]
+    assert consultas.consulta_vuelos("gdl", "Completado").ordenar("id_vuelo").leer()["id_vuelo"].tolist() == [1, 3, 5]
+
+
+def test_resultados_cacheados_hasta_que_se_escribe(datos):
+    completados = Consulta("vuelos", "COUNT(*)").igual("estado", "Completado")
+    assert completados.escalar() == 3
+    hits = cache_consultas.hits
+    assert completados.escalar() == 3
+    assert cache_consultas.hits == hits + 1
+
+    with datos.escritura() as conn:
+        conn.execute("INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) "
+                     "VALUES ('2025-01-04', 'MEX', 'GDL', 1, 'Completado')")
+    cache_consultas.invalidar("vuelos")
+    assert completados.escalar() == 4
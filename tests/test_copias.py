@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+from aeropuerto import copias
+from aeropuerto.cache import TABLAS
+from aeropuerto.esquema import esquema_vigente, recordar_esquema
+from aeropuerto.instantaneas import almacen_instantaneas
+
+
+@pytest.fixture(autouse=True)
+def directorio_copias(tmp_path, monkeypatch):
+    monkeypatch.setenv(copias.VARIABLE_DIRECTORIO, str(tmp_path / "copias"))
+    return tmp_path / "copias"
+
+
+def _contar(pool):
+    with pool.lectura() as conn:
+        return tuple(conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                     for t in ("vuelos", "pasajeros_transito", "pasajeros"))
+
+
+def _versiones(pool):
+    with pool.lectura() as conn:
+        return dict(conn.execute("SELECT tabla, version FROM versiones_datos").fetchall())
+
+
+def test_guardar_y_restaurar(sembrado):
+    antes = _contar(sembrado)
+    ruta = copias.guardar("semana1", sembrado)
+    assert os.path.exists(ruta)
+    assert [c["nombre"] for c in copias.listar(sembrado)] == ["semana1"]
+
+    with sembrado.escritura() as conn:
+        conn.execute("DELETE FROM pasajeros")
+        conn.execute("DELETE FROM vuelos WHERE id_vuelo > 10")
+    copias.restaurar("semana1", sembrado)
+    assert _contar(sembrado) == antes
+    # Los resúmenes y el índice de búsqueda vuelven con los datos.
+    with sembrado.lectura() as conn:
+        assert conn.execute("SELECT SUM(total) FROM resumen_vuelos_estado").fetchone() == (antes[0],)
+        assert conn.execute("SELECT COUNT(*) FROM pasajeros_fts").fetchone() == (antes[2],)
+
+    copias.borrar("semana1", sembrado)
+    assert copias.listar(sembrado) == []
+
+
+def test_restaurar_sube_las_versiones(sembrado):
+    copias.guardar("base", sembrado)
+    almacen_instantaneas.sincronizar(sembrado)
+    df = almacen_instantaneas.obtener("vuelos", sembrado)
+    with sembrado.escritura() as conn:
+        conn.execute("DELETE FROM vuelos WHERE id_vuelo <= 5")
+    almacen_instantaneas.sincronizar(sembrado)
+    anteriores = _versiones(sembrado)
+    copias.restaurar("base", sembrado)
+    # La copia tiene versiones más bajas, pero ninguna retrocede.
+    posteriores = _versiones(sembrado)
+    assert all(posteriores[t] > anteriores[t] for t in TABLAS)
+    assert len(almacen_instantaneas.obtener("vuelos", sembrado)) == len(df)
+
+
+def test_restaurar_invalida_la_marca_de_esquema(sembrado):
+    copias.guardar("base", sembrado)
+    recordar_esquema(sembrado)
+    assert esquema_vigente(sembrado)
+    copias.restaurar("base", sembrado)
+    assert not esquema_vigente(sembrado)
+
+
+def test_nombres_no_validos(pool):
+    for nombre in ("../fuera", "", ".oculta", f"{copias.PREFIJO_PLANTILLA}x", "con espacio"):
+        with pytest.raises(ValueError):
+            copias.guardar(nombre, pool)
+    with pytest.raises(FileNotFoundError):
+        copias.restaurar("no-existe", pool)
+
+
+def test_reiniciar_desde_la_plantilla(pool, directorio_copias):
+    with pool.escritura() as conn:
+        conn.execute("INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) "
+                     "VALUES ('2025-01-01', 'MEX', 'BOG', 1, 'Programado')")
+    copias.reiniciar(pool)
+    assert _contar(pool) == (100, 40, 200)
+    plantillas = [a for a in os.listdir(directorio_copias) if a.startswith(copias.PREFIJO_PLANTILLA)]
+    assert len(plantillas) == 1
+    # La segunda vez reutiliza la plantilla ya construida.
+    modificada = os.path.getmtime(directorio_copias / plantillas[0])
+    copias.reiniciar(pool)
+    assert os.path.getmtime(directorio_copias / plantillas[0]) == modificada
+    assert _contar(pool) == (100, 40, 200)
+    # Las copias con nombre no listan la plantilla.
+    assert copias.listar(pool) == []
+
+
+def test_plantilla_conserva_el_catalogo(pool):
+    with pool.escritura() as conn:
+        conn.execute("INSERT INTO aeropuertos (iata, nombre, ciudad, pais, lat, lon) "
+                     "VALUES ('ZZQ', 'Prueba', 'Prueba', 'MX', 19.5, -99.1)")
+    copias.reiniciar(pool)
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM aeropuertos WHERE iata = 'ZZQ'").fetchone() == (1,)
+
+
+def test_linea_de_comandos(sembrado, capsys):
+    assert copias.main(["--db", sembrado.ruta, "guardar", "cli"]) == 0
+    assert copias.main(["--db", sembrado.ruta, "listar"]) == 0
+    assert capsys.readouterr().out.splitlines()[-1].startswith("cli\t")
+    assert copias.main(["--db", sembrado.ruta, "restaurar", "cli"]) == 0
+    assert "Restaurar:" in capsys.readouterr().out
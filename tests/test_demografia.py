@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aeropuerto import demografia, resumenes
+from aeropuerto.cache import cache_consultas
+from aeropuerto.demografia import HistogramaEdades
+
+
+def _pasajeros(pool):
+    with pool.lectura() as conn:
+        return pd.read_sql_query(
+            "SELECT p.edad, p.vuelo_id, v.origen, v.destino FROM pasajeros p "
+            "LEFT JOIN vuelos v ON v.id_vuelo = p.vuelo_id", conn
+        )
+
+
+@pytest.mark.parametrize("rango", [(0, 120), (18, 30), (31, 31), (40, 20), (-5, 500)])
+def test_histograma_equivale_a_pandas(rango):
+    edades = pd.Series(np.random.default_rng(5).integers(0, 121, 2001))
+    h = HistogramaEdades.de_edades(edades)
+    sel = edades[edades.between(*rango)]
+    assert h.contar(*rango) == len(sel)
+    if len(sel):
+        assert h.promedio(*rango) == pytest.approx(sel.mean())
+        assert h.mediana(*rango) == sel.median()
+        assert h.moda(*rango) == sel.mode().tolist()
+        assert h.serie(*rango).to_dict() == sel.value_counts().sort_index().to_dict()
+    else:
+        assert (h.promedio(*rango), h.mediana(*rango), h.moda(*rango)) == (None, None, [])
+
+
+def test_histograma_vacio_y_extremos():
+    assert HistogramaEdades.de_edades([]).extremos() is None
+    h = HistogramaEdades.de_edades([None, 30, 200, 45, -1])
+    assert h.total == 2 and h.extremos() == (30, 45)
+    assert h.por_bandas().to_dict() == {"0-17": 0, "18-24": 0, "25-34": 1, "35-44": 0, "45-54": 1,
+                                        "55-64": 0, "65+": 0}
+
+
+def test_histogramas_mantenidos(sembrado):
+    pasajeros = _pasajeros(sembrado)
+    assert demografia.histograma().serie().to_dict() == pasajeros["edad"].value_counts().sort_index().to_dict()
+    vuelo = int(pasajeros["vuelo_id"].iloc[0])
+    del_vuelo = pasajeros[pasajeros["vuelo_id"] == vuelo]["edad"]
+    assert demografia.histograma(vuelo_id=vuelo).total == len(del_vuelo)
+    origen, destino = demografia.rutas_con_pasajeros()[0]
+    de_ruta = pasajeros[(pasajeros["origen"] == origen) & (pasajeros["destino"] == destino)]["edad"]
+    assert demografia.histograma(origen=origen, destino=destino).mediana() == de_ruta.median()
+    assert demografia.histograma(origen=origen).total == (pasajeros["origen"] == origen).sum()
+
+
+def test_triggers_mueven_el_vuelo_entre_rutas(pool):
+    with pool.escritura() as conn:
+        # Pasajeros que llegan antes que su vuelo, y un vuelo que cambia de ruta y de id.
+        conn.executemany("INSERT INTO pasajeros (vuelo_id, ticket, nombre, edad) VALUES (50, 'T', 'N', ?)",
+                         [(20,), (30,), (30,)])
+        conn.execute("INSERT INTO vuelos (id_vuelo, fecha, origen, destino, num_pasajeros, estado) "
+                     "VALUES (50, '2025-01-01', 'MEX', 'BOG', 10, 'Programado')")
+    cache_consultas.invalidar()
+    assert demografia.histograma(origen="MEX", destino="BOG").total == 3
+    with pool.escritura() as conn:
+        conn.execute("UPDATE vuelos SET destino = 'LIM', id_vuelo = 51 WHERE id_vuelo = 50")
+    cache_consultas.invalidar()
+    assert demografia.histograma(origen="MEX", destino="BOG").total == 0
+    # Con el nuevo id, los pasajeros (aún en el vuelo 50) quedan sin ruta.
+    assert demografia.histograma(origen="MEX", destino="LIM").total == 0
+    with pool.escritura() as conn:
+        conn.execute("UPDATE pasajeros SET vuelo_id = 51")
+    cache_consultas.invalidar()
+    assert demografia.histograma(origen="MEX", destino="LIM").moda() == [30]
+    tablas = ("resumen_edades", "resumen_edades_vuelo", "resumen_edades_ruta")
+    with pool.lectura() as conn:
+        mantenidas = {t: sorted(r for r in conn.execute(f"SELECT * FROM {t} WHERE total != 0")) for t in tablas}
+    with pool.escritura() as conn:
+        resumenes.reconstruir(conn)
+    with pool.lectura() as conn:
+        assert {t: sorted(conn.execute(f"SELECT * FROM {t} WHERE total != 0")) for t in tablas} == mantenidas
+
+
+def test_linea_de_comandos(sembrado, capsys):
+    assert demografia.main(["--db", sembrado.ruta, "--edad-min", "18", "--edad-max", "30"]) == 0
+    assert "pasajeros de 18 a 30 años" in capsys.readouterr().out
@@ -0,0 +1,102 @@
+import sqlite3
+import threading
+
+import pytest
+
+from aeropuerto.cache import cache_consultas
+from aeropuerto.escritura import ColaEscritura, base_ocupada, get_cola
+from aeropuerto.instantaneas import almacen_instantaneas
+
+INSERT_VUELO = ("INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) "
+                "VALUES ('2025-01-01', 'MEX', 'BOG', ?, 'Programado')")
+
+
+def _contar(pool, tabla="vuelos"):
+    with pool.lectura() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+
+
+def test_group_commit(pool):
+    cola = ColaEscritura(pool, espera_lote=0.05)
+    try:
+        futuros = [cola.encolar(INSERT_VUELO, (i,)) for i in range(50)]
+        ids = [f.result(timeout=5) for f in futuros]
+        cola.vaciar()
+        metricas = cola.metricas()
+    finally:
+        cola.cerrar()
+    assert ids == sorted(ids) and len(set(ids)) == 50
+    assert _contar(pool) == 50
+    # Las 50 sentencias entran en muy pocas transacciones.
+    assert metricas["confirmadas"] == 50
+    assert metricas["lotes"] < 10
+    assert metricas["lote_max"] > 1
+
+
+def test_error_de_una_sentencia_solo_falla_su_futuro(pool):
+    with pool.escritura() as conn:
+        conn.execute("CREATE TABLE prueba (clave TEXT UNIQUE)")
+    cola = ColaEscritura(pool, espera_lote=0.05)
+    try:
+        futuros = [cola.encolar("INSERT INTO prueba VALUES (?)", (c,)) for c in ("a", "b", "a", "c")]
+        cola.vaciar()
+    finally:
+        cola.cerrar()
+    with pytest.raises(sqlite3.IntegrityError):
+        futuros[2].result()
+    assert all(f.exception() is None for i, f in enumerate(futuros) if i != 2)
+    with pool.lectura() as conn:
+        assert [c for (c,) in conn.execute("SELECT clave FROM prueba ORDER BY clave")] == ["a", "b", "c"]
+    assert cola.metricas()["fallidas"] == 1
+
+
+def test_reintenta_si_la_base_esta_ocupada(pool):
+    with pool.escritura() as conn:
+        conn.execute("PRAGMA busy_timeout = 0")  # que el bloqueo falle al instante
+    # Otro proceso tiene el bloqueo de escritura durante un rato.
+    otro = sqlite3.connect(pool.ruta, check_same_thread=False, isolation_level=None)
+    otro.execute("BEGIN IMMEDIATE")
+    liberar = threading.Timer(0.2, otro.execute, ("COMMIT",))
+    liberar.start()
+    cola = ColaEscritura(pool, espera_reintento=0.02)
+    try:
+        assert cola.encolar(INSERT_VUELO, (1,)).result(timeout=5) > 0
+        metricas = cola.metricas()
+    finally:
+        liberar.join()
+        otro.close()
+        cola.cerrar()
+    assert metricas["reintentos"] > 0
+    assert _contar(pool) == 1
+
+
+def test_agota_los_reintentos(pool):
+    with pool.escritura() as conn:
+        conn.execute("PRAGMA busy_timeout = 0")
+    otro = sqlite3.connect(pool.ruta, isolation_level=None)
+    otro.execute("BEGIN IMMEDIATE")
+    cola = ColaEscritura(pool, reintentos=2, espera_reintento=0.001)
+    try:
+        with pytest.raises(sqlite3.OperationalError) as error:
+            cola.encolar(INSERT_VUELO, (1,)).result(timeout=5)
+        assert base_ocupada(error.value)
+    finally:
+        otro.execute("ROLLBACK")
+        otro.close()
+        cola.cerrar()
+    assert cola.metricas()["reintentos"] == 2
+
+
+def test_invalida_la_cache_tras_el_lote(pool):
+    almacen_instantaneas.sincronizar(pool)  # como al inicio de cada ejecución de la app
+    version = cache_consultas.version("vuelos")
+    get_cola(pool).encolar(INSERT_VUELO, (3,)).result(timeout=5)
+    assert cache_consultas.version("vuelos") != version
+
+
+def test_cerrar_confirma_lo_pendiente(pool):
+    cola = ColaEscritura(pool, espera_lote=0.2)
+    futuros = [cola.encolar(INSERT_VUELO, (i,)) for i in range(5)]
+    cola.cerrar(timeout=5)
+    assert all(f.done() for f in futuros)
+    assert _contar(pool) == 5
@@ -0,0 +1,33 @@
+from aeropuerto.esquema import INDICES_SQL, VERSION_ESQUEMA, crear_esquema, version_actual
+
+
+def _indices(conn):
+    return {fila[0] for fila in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_esquema_al_dia(pool):
+    with pool.lectura() as conn:
+        assert version_actual(conn) == VERSION_ESQUEMA
+        assert {sql.split(" IF NOT EXISTS ")[1].split(" ")[0] for sql in INDICES_SQL} <= _indices(conn)
+
+
+def test_crear_esquema_es_idempotente(pool):
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+        crear_esquema(conn)
+        assert version_actual(conn) == VERSION_ESQUEMA
+
+
+def test_tablas_recreadas_recuperan_los_indices(pool):
+    with pool.escritura() as conn:
+        conn.execute("DROP TABLE vuelos")
+        crear_esquema(conn)
+        assert "idx_vuelos_fecha" in _indices(conn)
+
+
+def test_filtros_usan_indices(pool):
+    with pool.lectura() as conn:
+        plan = " ".join(fila[-1] for fila in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM pasajeros WHERE vuelo_id = ?", (1,)
+        ))
+    assert "idx_pasajeros_vuelo" in plan
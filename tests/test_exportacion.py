@@ -0,0 +1,61 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from aeropuerto import exportacion
+
+
+def _esperado(pool, tabla):
+    with pool.lectura() as conn:
+        return pd.read_sql_query(exportacion.EXPORTACIONES[tabla], conn)
+
+
+@pytest.mark.parametrize("tabla", sorted(exportacion.EXPORTACIONES))
+def test_csv_por_lotes_igual_a_la_tabla(sembrado, tabla):
+    salida = io.BytesIO()
+    filas = exportacion.exportar(salida, exportacion.EXPORTACIONES[tabla], tamano_lote=64, pool=sembrado)
+    esperado = _esperado(sembrado, tabla)
+    assert filas == len(esperado)
+    pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(salida.getvalue())), esperado, check_dtype=False)
+
+
+def test_lotes_acotados(sembrado):
+    lotes = list(exportacion.iterar_lotes("SELECT * FROM vuelos", tamano_lote=150, pool=sembrado))
+    assert [len(filas) for _, filas in lotes] == [150, 150, 100]
+
+
+def test_resultado_vacio_conserva_el_encabezado(pool):
+    salida = io.BytesIO()
+    assert exportacion.exportar(salida, exportacion.EXPORTACIONES["vuelos"], pool=pool) == 0
+    assert salida.getvalue().decode().strip() == "id_vuelo,fecha,origen,destino,num_pasajeros,estado,mes"
+
+
+def test_csv_comprimido(sembrado):
+    temporal = exportacion.exportar_a_temporal(exportacion.EXPORTACIONES["vuelos"], formato="csv.gz",
+                                               pool=sembrado)
+    df = pd.read_csv(io.BytesIO(gzip.decompress(temporal.read())))
+    assert len(df) == 400
+    assert (df["mes"] == df["fecha"].str[:7]).all()
+
+
+def test_parquet_un_grupo_por_lote(sembrado, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    ruta = tmp_path / "vuelos.parquet"
+    exportacion.exportar(ruta, exportacion.EXPORTACIONES["vuelos"], formato="parquet", tamano_lote=100,
+                         pool=sembrado)
+    assert pq.ParquetFile(ruta).num_row_groups == 4
+    pd.testing.assert_frame_equal(pd.read_parquet(ruta), _esperado(sembrado, "vuelos"), check_dtype=False)
+
+
+def test_formato_desconocido(pool):
+    with pytest.raises(ValueError):
+        exportacion.exportar(io.BytesIO(), "SELECT 1", formato="xlsx", pool=pool)
+
+
+def test_linea_de_comandos(sembrado, tmp_path, capsys):
+    salida = tmp_path / "transito.csv"
+    assert exportacion.main(["pasajeros_transito", "--db", sembrado.ruta, "--salida", str(salida)]) == 0
+    assert "150 filas exportadas" in capsys.readouterr().err
+    assert len(pd.read_csv(salida)) == 150
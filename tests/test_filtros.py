@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from aeropuerto import filtros
+from aeropuerto.columnar import leer_tabla
+
+
+@pytest.fixture
+def pasajeros():
+    return pd.DataFrame({
+        "id_pasajero": [1, 2, 3, 4],
+        "vuelo_id": [1, 1, 2, 2],
+        "ticket": ["T1", "T2", "T3", "T4"],
+        "nombre": ["Ana", "Luis", "Sofía", "Pedro"],
+        "edad": pd.array([20, 35, 70, None], dtype="Int16"),
+    })
+
+
+def test_filtrar_por_edad_sin_modificar_el_original(pasajeros):
+    copia = pasajeros.copy()
+    assert filtros.filtrar_pasajeros(pasajeros, 18, 40)["id_pasajero"].tolist() == [1, 2]
+    pd.testing.assert_frame_equal(pasajeros, copia)
+
+
+def test_filtrar_por_texto(pasajeros, monkeypatch):
+    monkeypatch.setattr(filtros.busqueda, "ids_coincidentes", lambda texto: [2, 3])
+    assert filtros.filtrar_pasajeros(pasajeros, 18, 80, "x")["id_pasajero"].tolist() == [2, 3]
+
+
+def test_con_pertenencias(pasajeros):
+    df = filtros.con_pertenencias(pasajeros, ["Joven", "Senior"])
+    assert list(df.columns[:2]) == ["Pertenencia (17-30)", "Pertenencia Senior (55+)"]
+    assert df["Pertenencia (17-30)"].between(0, 1).all()
+    assert df.at[2, "Pertenencia Senior (55+)"] == 1
+    assert filtros.con_pertenencias(pasajeros, []) is pasajeros
+
+
+def test_estadisticas_edad(pasajeros):
+    stats = filtros.estadisticas_edad(pasajeros.iloc[:3])
+    assert stats["promedio"] == pytest.approx(125 / 3)
+    assert stats["mediana"] == 35
+    assert stats["histograma"].to_dict() == {20: 1, 35: 1, 70: 1}
+
+
+@pytest.mark.parametrize("texto", [None, "ma", "maria garcia", "TCK-1"])
+def test_consulta_avanzada_equivale_al_filtro_en_memoria(sembrado, texto):
+    todos = leer_tabla("pasajeros", sembrado)
+    esperado = filtros.filtrar_pasajeros(todos, 25, 60, texto)
+    consulta = filtros.consulta_avanzada(25, 60, texto)
+    assert sorted(consulta.leer()["id_pasajero"]) == sorted(esperado["id_pasajero"])
+    obtenidas, esperadas = filtros.estadisticas_consulta(consulta), filtros.estadisticas_edad(esperado)
+    assert obtenidas["histograma"].to_dict() == esperadas["histograma"].to_dict()
+    assert obtenidas["mediana"] == esperadas["mediana"]
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from aeropuerto import fuzzy
+
+
+def test_triangular_escalar():
+    assert fuzzy.triangular(17) == 0.0
+    assert fuzzy.triangular(28) == 1.0
+    assert fuzzy.triangular(29) == pytest.approx(0.5)
+    assert fuzzy.triangular(22.5) == pytest.approx(0.5)
+    assert fuzzy.triangular(40) == 0.0
+    assert fuzzy.triangular(float("nan")) == 0.0
+    assert isinstance(fuzzy.triangular(20), float)
+
+
+def test_trapezoidal_con_hombros():
+    x = np.array([20, 25, 30, 35, 45, 55, 60, 65, 70])
+    np.testing.assert_allclose(fuzzy.trapezoidal(x, 25, 35, 55, 65), [0, 0, 0.5, 1, 1, 1, 0.5, 0, 0])
+    # a == b: el lado izquierdo es vertical y vale 1 desde a.
+    np.testing.assert_allclose(fuzzy.trapezoidal(np.array([9, 10, 15]), 10, 10, 20, 30), [0, 1, 1])
+    assert fuzzy.trapezoidal(float("nan"), 0, 1, 2, 3) == 0.0
+
+
+def test_pertenencias_coinciden_con_las_funciones():
+    edades = np.array([-5, 0, 17, 18, 28, 29, 30, 40, 56, 64, 65, 90, 120, 150])
+    resultado = fuzzy.pertenencias(edades)
+    assert list(resultado) == ["Joven", "Adulto", "Senior"]
+    for nombre, (funcion, parametros) in fuzzy.CONJUNTOS_EDAD.items():
+        np.testing.assert_allclose(resultado[nombre], fuzzy.FUNCIONES[funcion](edades, *parametros))
+
+
+def test_pertenencia_con_nan():
+    np.testing.assert_allclose(fuzzy.pertenencia(np.array([28.0, np.nan]), "Joven"), [1.0, 0.0])
+
+
+def test_tabla_de_solo_lectura():
+    tabla = fuzzy.tabla_pertenencia(*fuzzy.CONJUNTOS_EDAD["Adulto"])
+    assert len(tabla) == fuzzy.EDAD_MAX - fuzzy.EDAD_MIN + 1
+    with pytest.raises(ValueError):
+        tabla[0] = 1.0
@@ -0,0 +1,125 @@
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from aeropuerto import generador, resumenes
+from aeropuerto.aeropuertos import catalogo
+from aeropuerto.cache import cache_consultas
+from aeropuerto.conexion import get_pool
+from aeropuerto.esquema import crear_esquema
+
+
+def _tabla(pool, tabla):
+    with pool.lectura() as conn:
+        return pd.read_sql_query(f"SELECT * FROM {tabla}", conn)
+
+
+def _contar(pool):
+    with pool.lectura() as conn:
+        return tuple(conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                     for t in ("vuelos", "pasajeros_transito", "pasajeros"))
+
+
+def test_genera_las_cantidades_pedidas(sembrado):
+    assert _contar(sembrado) == (400, 150, 1500)
+
+
+def test_filas_validas(sembrado):
+    vuelos = _tabla(sembrado, "vuelos")
+    assert (vuelos["origen"] != vuelos["destino"]).all()
+    assert set(vuelos["origen"]) | set(vuelos["destino"]) <= set(catalogo(sembrado).codigos)
+    assert set(vuelos["estado"]) <= set(generador.ESTADOS)
+    primera = (date(2025, 1, 1) - timedelta(days=399)).isoformat()
+    assert vuelos["fecha"].between(primera, "2025-01-01").all()
+    pasajeros = _tabla(sembrado, "pasajeros")
+    assert pasajeros["vuelo_id"].isin(vuelos["id_vuelo"]).all()
+    assert pasajeros["edad"].between(18, 80).all()
+
+
+def test_semilla_reproducible(pool, tmp_path):
+    otra = get_pool(str(tmp_path / "otra.db"))
+    with otra.escritura() as conn:
+        crear_esquema(conn)
+    for destino in (pool, otra):
+        generador.generar(vuelos=50, transito=20, pasajeros=80, semilla=11, forzar=True,
+                          fecha_base=date(2025, 1, 1), pool=destino)
+    for tabla in ("vuelos", "pasajeros_transito", "pasajeros"):
+        pd.testing.assert_frame_equal(_tabla(pool, tabla), _tabla(otra, tabla))
+
+
+def test_sin_forzar_solo_rellena_tablas_vacias(pool):
+    assert generador.generar(vuelos=10, transito=0, pasajeros=0, pool=pool) == {"vuelos"}
+    assert generador.generar(vuelos=10, transito=5, pasajeros=5, pool=pool) == {"pasajeros_transito", "pasajeros"}
+    assert generador.generar(pool=pool) == set()
+    assert _contar(pool) == (10, 5, 5)
+
+
+def test_progreso_por_lote_e_invalidacion(pool):
+    avisos = []
+    version = cache_consultas.version("vuelos")
+    generador.generar(vuelos=25, transito=0, pasajeros=0, forzar=True, tamano_lote=10,
+                      progreso=lambda *a: avisos.append(a), pool=pool)
+    assert avisos == [("vuelos", 10, 25), ("vuelos", 20, 25), ("vuelos", 25, 25)]
+    assert cache_consultas.version("vuelos") == version + 1
+
+
+def test_linea_de_comandos(tmp_path, capsys):
+    ruta = tmp_path / "cli.db"
+    assert generador.main(["--db", str(ruta), "--vuelos", "5", "--transito", "2", "--pasajeros", "7",
+                           "--semilla", "1"]) == 0
+    assert "Tablas generadas: pasajeros, pasajeros_transito, vuelos" in capsys.readouterr().out
+    assert _contar(get_pool(str(ruta))) == (5, 2, 7)
+
+
+def test_sin_aeropuertos_suficientes_no_escribe_nada(pool, capsys):
+    with pytest.raises(ValueError, match="al menos 2 aeropuertos"):
+        generador.generar(vuelos=10, transito=5, pasajeros=20, forzar=True, aeropuertos=["MEX"], pool=pool)
+    with pytest.raises(ValueError, match="al menos 1 aeropuerto"):
+        generador.generar(vuelos=0, transito=5, pasajeros=0, forzar=True, aeropuertos=[], pool=pool)
+    assert _contar(pool) == (0, 0, 0)
+    with pool.escritura() as conn:
+        conn.execute("DELETE FROM aeropuertos WHERE iata != 'MEX'")
+    assert generador.main(["--db", pool.ruta, "--vuelos", "5"]) == 1
+    assert "al menos 2 aeropuertos" in capsys.readouterr().err
+
+
+TABLAS_RESUMEN = list(dict.fromkeys(r for lista in resumenes.RESUMENES.values() for r, _, _ in lista))
+
+
+def _resumenes(pool):
+    return {tabla: _tabla(pool, tabla).pipe(lambda df: df.sort_values(list(df.columns)).reset_index(drop=True))
+            for tabla in TABLAS_RESUMEN}
+
+
+def test_carga_masiva_reconstruye_los_resumenes_al_final(pool, tmp_path, monkeypatch):
+    otra = get_pool(str(tmp_path / "otra.db"))
+    with otra.escritura() as conn:
+        crear_esquema(conn)
+    generador.generar(vuelos=60, transito=20, pasajeros=300, semilla=5, forzar=True, pool=pool)
+    monkeypatch.setattr(generador, "UMBRAL_CARGA_MASIVA", 1)
+    generador.generar(vuelos=60, transito=20, pasajeros=300, semilla=5, forzar=True, pool=otra)
+    # Con triggers fila a fila o reconstruidos al final, los resúmenes son los mismos.
+    fila_a_fila, masiva = _resumenes(pool), _resumenes(otra)
+    for tabla in TABLAS_RESUMEN:
+        pd.testing.assert_frame_equal(masiva[tabla], fila_a_fila[tabla], obj=tabla)
+    # Los triggers vuelven y siguen manteniendo los resúmenes.
+    with otra.escritura() as conn:
+        conn.execute("INSERT INTO pasajeros (vuelo_id, ticket, nombre, edad) VALUES (1, 'T-X', 'Ana', 33)")
+    with otra.lectura() as conn:
+        assert conn.execute("SELECT valor FROM resumen_totales WHERE clave = 'pasajeros'").fetchone() == (301,)
+
+
+def test_carga_masiva_fallida_conserva_los_triggers(pool, monkeypatch):
+    monkeypatch.setattr(generador, "UMBRAL_CARGA_MASIVA", 1)
+
+    def fallar(*args):
+        raise RuntimeError("fallo a mitad de carga")
+
+    monkeypatch.setattr(generador, "_filas_pasajeros", fallar)
+    with pytest.raises(RuntimeError):
+        generador.generar(vuelos=10, transito=0, pasajeros=10, forzar=True, pool=pool)
+    assert _contar(pool) == (0, 0, 0)
+    with pool.lectura() as conn:
+        nombres = {fila[0] for fila in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    assert set(resumenes.nombres_triggers()) <= nombres
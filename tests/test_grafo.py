@@ -0,0 +1,114 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aeropuerto import grafo
+from aeropuerto.aeropuertos import Catalogo, catalogo
+
+COORDS = {
+    "MEX": {"lat": 19.4363, "lon": -99.0721},
+    "BOG": {"lat": 4.7016, "lon": -74.1469},
+    "JFK": {"lat": 40.6413, "lon": -73.7781},
+    "LIM": {"lat": -12.0219, "lon": -77.1143},
+    "MAD": {"lat": 40.4983, "lon": -3.5676},
+}
+CATALOGO = Catalogo(
+    pd.DataFrame([{"iata": c, "nombre": c, "ciudad": c, "pais": "XX", **p} for c, p in COORDS.items()]),
+    huella="prueba",
+)
+
+
+def _vuelos(pool, rutas):
+    with pool.escritura() as conn:
+        for origen, destino, estado, pasajeros in rutas:
+            id_vuelo = conn.execute(
+                "INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) "
+                "VALUES ('2025-01-01', ?, ?, 100, ?)", (origen, destino, estado)
+            ).lastrowid
+            conn.executemany("INSERT INTO pasajeros (vuelo_id, ticket, nombre, edad) VALUES (?, 'T', 'N', 30)",
+                             [(id_vuelo,)] * pasajeros)
+
+
+def test_haversine():
+    assert grafo.haversine(0, 0, 0, 0) == 0
+    assert grafo.haversine(0, 0, 90, 0) == pytest.approx(math.pi / 2 * grafo.RADIO_TIERRA_KM)
+    assert grafo.haversine(19.4363, -99.0721, 40.6413, -73.7781) == pytest.approx(3361, abs=5)
+    lat = np.array([0.0, 10.0])
+    np.testing.assert_allclose(grafo.haversine(lat, 0, 0, 0), grafo.haversine(0, 0, lat, 0))
+
+
+def test_distancias_sin_matriz_coinciden(monkeypatch):
+    red = grafo.GrafoRutas(CATALOGO)
+    i, j = red.indices(["MEX", "JFK", "LIM"]), red.indices(["MAD", "BOG", "LIM"])
+    con_matriz = red.distancias(i, j)
+    monkeypatch.setattr(grafo, "MAX_AEROPUERTOS_MATRIZ", 1)
+    np.testing.assert_allclose(red.distancias(i, j), con_matriz, rtol=1e-6)
+    assert red.indices(["XXX"]).tolist() == [-1]
+
+
+def test_agregados_rutas(pool):
+    _vuelos(pool, [("MEX", "BOG", "Completado", 3), ("MEX", "BOG", "Cancelado", 0),
+                   ("BOG", "LIM", "Completado", 2), ("MEX", "XXX", "Completado", 1)])
+    red = grafo.obtener_grafo(CATALOGO)
+    rutas = grafo.agregados_rutas(red)
+    # XXX no tiene coordenadas: la ruta queda fuera.
+    assert rutas[["origen", "destino", "vuelos", "pasajeros"]].values.tolist() == [
+        ["MEX", "BOG", 2, 3], ["BOG", "LIM", 1, 2],
+    ]
+    mex_bog = grafo.haversine(COORDS["MEX"]["lat"], COORDS["MEX"]["lon"], COORDS["BOG"]["lat"], COORDS["BOG"]["lon"])
+    assert rutas.at[0, "distancia_km"] == pytest.approx(mex_bog, abs=0.1)
+    assert rutas.at[0, "km_volados"] == pytest.approx(2 * mex_bog, abs=0.2)
+
+    completados = grafo.agregados_rutas(red, estados=["Completado"])
+    assert completados["vuelos"].tolist() == [1, 1]
+    activos = grafo.aeropuertos_activos(red, rutas)
+    assert activos.set_index("aeropuerto")[["salidas", "llegadas"]].to_dict("index") == {
+        "BOG": {"salidas": 1, "llegadas": 2}, "LIM": {"salidas": 0, "llegadas": 1},
+        "MEX": {"salidas": 2, "llegadas": 0},
+    }
+
+
+def test_agregados_rutas_coinciden_con_los_pasajeros(sembrado):
+    red = grafo.obtener_grafo(catalogo(sembrado))
+    with sembrado.escritura() as conn:
+        conn.execute("DELETE FROM pasajeros WHERE vuelo_id % 3 = 0")
+    with sembrado.lectura() as conn:
+        esperado = pd.read_sql_query(
+            "SELECT v.origen, v.destino, COUNT(p.id_pasajero) AS pasajeros FROM vuelos v "
+            "LEFT JOIN pasajeros p ON p.vuelo_id = v.id_vuelo GROUP BY v.origen, v.destino", conn
+        )
+    rutas = grafo.agregados_rutas(red)
+    obtenido = rutas.set_index(["origen", "destino"])["pasajeros"].to_dict()
+    assert obtenido == esperado.set_index(["origen", "destino"])["pasajeros"].to_dict()
+
+
+def test_ruta_mas_corta(pool):
+    _vuelos(pool, [("MEX", "JFK", "Completado", 0), ("JFK", "MAD", "Completado", 0),
+                   ("MEX", "BOG", "Completado", 0), ("BOG", "LIM", "Completado", 0),
+                   ("LIM", "MAD", "Completado", 0), ("MEX", "LIM", "Completado", 0)])
+    red = grafo.obtener_grafo(CATALOGO)
+    rutas = grafo.agregados_rutas(red)
+
+    por_distancia = grafo.ruta_mas_corta(red, rutas, "MEX", "MAD")
+    assert por_distancia[["origen", "destino"]].values.tolist() == [["MEX", "JFK"], ["JFK", "MAD"]]
+    por_escalas = grafo.ruta_mas_corta(red, rutas, "MEX", "LIM", criterio="escalas")
+    assert por_escalas[["origen", "destino"]].values.tolist() == [["MEX", "LIM"]]
+    # Las rutas son dirigidas.
+    assert grafo.ruta_mas_corta(red, rutas, "MAD", "MEX") is None
+    assert grafo.ruta_mas_corta(red, rutas, "MEX", "MEX") is None
+    with pytest.raises(ValueError):
+        grafo.ruta_mas_corta(red, rutas, "MEX", "MAD", criterio="precio")
+
+
+def test_mapa_limita_los_arcos():
+    pytest.importorskip("pydeck")
+    red = grafo.GrafoRutas(CATALOGO)
+    rutas = pd.DataFrame({
+        "origen": ["MEX", "BOG"], "destino": ["BOG", "LIM"], "vuelos": [5, 1], "pasajeros": [0, 0],
+        "distancia_km": [1.0, 2.0], "km_volados": [5.0, 2.0],
+        "i_origen": red.indices(["MEX", "BOG"]), "i_destino": red.indices(["BOG", "LIM"]),
+    })
+    mapa = grafo.mapa_rutas(red, rutas, max_arcos=1)
+    assert len(mapa.layers[0].data) == 1
@@ -0,0 +1,121 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from aeropuerto import importacion
+
+
+class Interrupcion(Exception):
+    pass
+
+
+def _csv(encabezado, filas):
+    return io.BytesIO((encabezado + "\n" + "".join(f"{f}\n" for f in filas)).encode())
+
+
+def _vuelos(n, inicio=0):
+    return [f"2025-01-{1 + (inicio + i) % 28:02d},mex,BOG,{inicio + i},completado" for i in range(n)]
+
+
+def _contar(pool, tabla):
+    with pool.lectura() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+
+
+def test_valida_y_normaliza_vuelos(pool):
+    archivo = _csv("fecha,origen,destino,num_pasajeros,estado", [
+        "2025-01-01,mex,bog,10,completado",
+        "no es fecha,MEX,BOG,10,Completado",
+        "2025-01-01,MEX,XXX,10,Completado",
+        "2025-01-01,MEX,MEX,10,Completado",
+        "2025-01-01,MEX,BOG,-3,Completado",
+        "2025-01-01,MEX,BOG,10,Aterrizando",
+    ])
+    resultado = importacion.importar(archivo, "vuelos", nombre_archivo="vuelos.csv", pool=pool)
+    assert (resultado.insertadas, resultado.rechazadas) == (1, 5)
+    assert [(fila, motivo) for fila, motivo, _ in resultado.rechazos] == [
+        (2, "fecha inválida"),
+        (3, "aeropuerto de destino desconocido"),
+        (4, "origen y destino iguales"),
+        (5, "num_pasajeros inválido"),
+        (6, "estado desconocido"),
+    ]
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT fecha, origen, destino, num_pasajeros, estado FROM vuelos").fetchall() == [
+            ("2025-01-01", "MEX", "BOG", 10, "Completado"),
+        ]
+
+
+def test_pasajeros_de_vuelos_inexistentes(pool):
+    importacion.importar(_csv("fecha,origen,destino,num_pasajeros,estado", _vuelos(1)), "vuelos",
+                         nombre_archivo="vuelos.csv", pool=pool)
+    archivo = _csv("vuelo_id,ticket,nombre,edad", ["1,t-010,Ana Pérez,30", "999,T-011,Luis Gómez,41",
+                                                  "1,T-012,Eva Díaz,130"])
+    resultado = importacion.importar(archivo, "pasajeros", nombre_archivo="pasajeros.csv", pool=pool)
+    assert (resultado.insertadas, resultado.rechazadas) == (1, 2)
+    assert [r[:2] for r in resultado.rechazos] == [(2, "vuelo_id inexistente"), (3, "edad inválida")]
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT ticket FROM pasajeros").fetchall() == [("T-010",)]
+
+
+def test_reanuda_tras_una_interrupcion(pool):
+    contenido = _csv("fecha,origen,destino,num_pasajeros,estado", _vuelos(45)).getvalue()
+
+    def cortar(procesadas, insertadas, rechazadas):
+        if procesadas >= 20:
+            raise Interrupcion
+
+    with pytest.raises(Interrupcion):
+        importacion.importar(io.BytesIO(contenido), "vuelos", nombre_archivo="vuelos.csv",
+                             tamano_bloque=10, progreso=cortar, pool=pool)
+    # Los bloques confirmados quedan, con su punto de control.
+    assert _contar(pool, "vuelos") == 20
+
+    resultado = importacion.importar(io.BytesIO(contenido), "vuelos", nombre_archivo="vuelos.csv",
+                                     tamano_bloque=10, pool=pool)
+    assert resultado.reanudada_desde == 20
+    assert resultado.insertadas == 45
+    with pool.lectura() as conn:
+        assert [f[0] for f in conn.execute("SELECT num_pasajeros FROM vuelos ORDER BY id_vuelo")] == list(range(45))
+
+    repetida = importacion.importar(io.BytesIO(contenido), "vuelos", nombre_archivo="otro_nombre.csv", pool=pool)
+    assert repetida.ya_completada
+    assert _contar(pool, "vuelos") == 45
+
+
+def test_jsonl_comprimido_y_reanudacion(pool):
+    filas = [{"fecha": "2025-02-01", "aeropuerto": "lim", "num_pasajeros": i} for i in range(25)]
+    contenido = gzip.compress("".join(json.dumps(f) + "\n" for f in filas).encode())
+
+    def cortar(procesadas, insertadas, rechazadas):
+        if procesadas >= 10:
+            raise Interrupcion
+
+    with pytest.raises(Interrupcion):
+        importacion.importar(io.BytesIO(contenido), "pasajeros_transito", nombre_archivo="t.jsonl.gz",
+                             tamano_bloque=10, progreso=cortar, pool=pool)
+    resultado = importacion.importar(io.BytesIO(contenido), "pasajeros_transito", nombre_archivo="t.jsonl.gz",
+                                     tamano_bloque=10, pool=pool)
+    assert (resultado.reanudada_desde, resultado.insertadas) == (10, 25)
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT COUNT(DISTINCT num_pasajeros), MIN(aeropuerto) "
+                            "FROM pasajeros_transito").fetchone() == (25, "LIM")
+
+
+def test_columnas_faltantes(pool):
+    with pytest.raises(ValueError, match="Faltan columnas"):
+        importacion.importar(_csv("fecha,origen", ["2025-01-01,MEX"]), "vuelos", nombre_archivo="v.csv", pool=pool)
+    with pytest.raises(ValueError):
+        importacion.importar(io.BytesIO(b""), "aeropuertos", pool=pool)
+
+
+def test_linea_de_comandos_con_rechazos(pool, tmp_path):
+    archivo = tmp_path / "vuelos.csv"
+    archivo.write_bytes(_csv("fecha,origen,destino,num_pasajeros,estado",
+                             _vuelos(3) + ["2025-01-01,MEX,ZZZ,1,Completado"]).getvalue())
+    rechazos = tmp_path / "rechazos.csv"
+    assert importacion.main(["vuelos", str(archivo), "--db", pool.ruta, "--rechazos", str(rechazos)]) == 0
+    assert _contar(pool, "vuelos") == 3
+    assert "aeropuerto de destino desconocido" in rechazos.read_text()
@@ -0,0 +1,129 @@
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from aeropuerto.cache import TABLAS, cache_consultas
+from aeropuerto.columnar import leer_tabla
+from aeropuerto.instantaneas import AlmacenInstantaneas
+
+
+def _escritura_externa(pool, sql):
+    # Conexión propia, como la de otro proceso: no pasa por este almacén.
+    conn = sqlite3.connect(pool.ruta)
+    try:
+        with conn:
+            conn.execute(sql)
+    finally:
+        conn.close()
+
+
+def test_versiones_por_tabla(pool):
+    with pool.lectura() as conn:
+        tablas = {t for (t,) in conn.execute("SELECT tabla FROM versiones_datos")}
+    assert tablas == set(TABLAS)
+
+
+def test_instantanea_compartida_hasta_que_cambia(sembrado):
+    almacen = AlmacenInstantaneas()
+    df = almacen.obtener("vuelos", sembrado)
+    assert almacen.obtener("vuelos", sembrado) is df
+    assert (almacen.cargas, almacen.hits) == (1, 1)
+
+    _escritura_externa(sembrado, "DELETE FROM vuelos WHERE id_vuelo = 1")
+    # Sin sincronizar sigue sirviendo la versión leída.
+    assert almacen.obtener("vuelos", sembrado) is df
+    assert almacen.sincronizar(sembrado) == ["vuelos"]
+    nuevo = almacen.obtener("vuelos", sembrado)
+    assert len(nuevo) == len(df) - 1
+    # El registro de cambios permite aplicar solo el delta en vez de recargar.
+    assert (almacen.cargas, almacen.deltas, almacen.filas_delta) == (1, 1, 1)
+
+
+def test_sincronizar_invalida_la_cache_de_consultas(sembrado):
+    almacen = AlmacenInstantaneas()
+    assert almacen.sincronizar(sembrado) == []
+    version = cache_consultas.version("pasajeros_transito")
+    _escritura_externa(sembrado, "UPDATE pasajeros_transito SET num_pasajeros = 1 WHERE id_transito = 1")
+    assert almacen.sincronizar(sembrado) == ["pasajeros_transito"]
+    assert cache_consultas.version("pasajeros_transito") != version
+    assert almacen.sincronizar(sembrado) == []
+
+
+def test_version_de_aeropuertos_persistida(pool):
+    almacen = AlmacenInstantaneas()
+    almacen.sincronizar(pool)
+    _escritura_externa(pool, "INSERT INTO aeropuertos (iata, nombre, ciudad, pais, lat, lon) "
+                             "VALUES ('ZZR', 'Prueba', 'Prueba', 'MX', 19.5, -99.1)")
+    assert almacen.sincronizar(pool) == ["aeropuertos"]
+
+
+def test_una_carga_por_version_con_sesiones_concurrentes(sembrado):
+    def lento(tabla, pool, columnas=None):
+        time.sleep(0.1)
+        return leer_tabla(tabla, pool, columnas=columnas)
+
+    almacen = AlmacenInstantaneas(cargador=lento)
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(almacen.obtener("pasajeros", sembrado)))
+             for _ in range(6)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert almacen.cargas == 1
+    assert all(df is resultados[0] for df in resultados)
+
+
+def test_respaldo_arrow_entre_procesos(sembrado, tmp_path):
+    pytest.importorskip("pyarrow")
+    directorio = tmp_path / "instantaneas"
+    primero = AlmacenInstantaneas(directorio=str(directorio))
+    df = primero.obtener("vuelos", sembrado)
+    assert primero.cargas == 1
+    # Otro "proceso" mapea el archivo publicado en lugar de leer SQLite.
+    segundo = AlmacenInstantaneas(directorio=str(directorio))
+    mapeado = segundo.obtener("vuelos", sembrado)
+    assert (segundo.cargas, segundo.cargas_compartidas) == (0, 1)
+    assert mapeado["id_vuelo"].tolist() == df["id_vuelo"].tolist()
+    assert mapeado["estado"].astype(object).tolist() == df["estado"].astype(object).tolist()
+
+    _escritura_externa(sembrado, "DELETE FROM vuelos WHERE id_vuelo = 2")
+    segundo.sincronizar(sembrado)
+    segundo.obtener("vuelos", sembrado)
+    # La versión anterior se borra al publicar la nueva.
+    assert len(list(directorio.glob("*-vuelos-*.arrow"))) == 1
+
+
+def test_subconjuntos_de_columnas(sembrado):
+    almacen = AlmacenInstantaneas()
+    parcial = almacen.obtener("pasajeros", sembrado, columnas=["id_pasajero", "edad"])
+    assert list(parcial.columns) == ["id_pasajero", "edad"]
+    assert almacen.obtener("pasajeros", sembrado, columnas=("id_pasajero", "edad")) is parcial
+    assert almacen.cargas == 1
+    # Con la tabla completa vigente, los subconjuntos son proyecciones suyas.
+    completa = almacen.obtener("pasajeros", sembrado)
+    proyeccion = almacen.obtener("pasajeros", sembrado, columnas=["nombre"])
+    assert almacen.cargas == 2
+    assert proyeccion["nombre"].tolist() == completa["nombre"].tolist()
+    assert set(almacen.en_memoria()) == {"pasajeros"}
+    assert almacen.en_memoria()["pasajeros"] is completa
+
+
+def test_sincronizar_conserva_la_base_del_delta(sembrado):
+    almacen = AlmacenInstantaneas()
+    almacen.sincronizar(sembrado)
+    vieja = almacen.obtener("vuelos", sembrado)
+    _escritura_externa(sembrado, "UPDATE vuelos SET estado = 'Cancelado' WHERE id_vuelo = 2")
+    _escritura_externa(sembrado, "DELETE FROM vuelos WHERE id_vuelo = 1")
+    almacen.sincronizar(sembrado)
+    # La instantánea vieja sigue en memoria: es la base sobre la que se aplica el delta.
+    assert almacen.en_memoria()["vuelos"] is vieja
+    nueva = almacen.obtener("vuelos", sembrado)
+    assert almacen.cargas == 1 and almacen.deltas == 1
+    completa = leer_tabla("vuelos", sembrado)
+    pd.testing.assert_frame_equal(
+        nueva.sort_values("id_vuelo").reset_index(drop=True), completa.reset_index(drop=True), check_categorical=False
+    )
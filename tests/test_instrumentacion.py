@@ -0,0 +1,87 @@
+import json
+
+import pandas as pd
+import pytest
+
+from aeropuerto.columnar import leer_tabla
+from aeropuerto.instrumentacion import Instrumentacion, instrumentacion
+
+
+def test_desactivada_no_registra_nada():
+    registro = Instrumentacion()
+    assert registro.tramo("a") is registro.tramo("b")  # el mismo context manager nulo
+    registro.iniciar_ejecucion()
+    with registro.tramo("a"):
+        registro.contar("filas", 10)
+    registro.terminar_ejecucion()
+    assert (registro.totales(), registro.contadores(), registro.ejecuciones()) == ({}, {}, [])
+
+
+def test_ejecucion_con_fases_y_tramos_anidados():
+    registro = Instrumentacion(activa=True)
+    registro.iniciar_ejecucion("Dashboard")
+    registro.fase("carga")
+    with registro.tramo("leer_sql"):
+        with registro.tramo("interno"):
+            pass
+        registro.contar("filas_leidas", 5)
+    registro.fase("seccion")
+    with pytest.raises(ValueError):
+        with registro.tramo("falla"):
+            raise ValueError
+    registro.terminar_ejecucion()
+
+    (ejecucion,) = registro.ejecuciones()
+    assert ejecucion.etiqueta == "Dashboard" and not ejecucion.interrumpida
+    tramos = [(n, p, e) for n, p, _, _, e in ejecucion.tramos]
+    assert tramos == [("carga", 0, False), ("leer_sql", 1, False), ("interno", 2, False),
+                      ("seccion", 0, False), ("falla", 1, True)]
+    assert ejecucion.contadores == {"filas_leidas": 5}
+    assert registro.totales()["falla"]["errores"] == 1
+
+
+def test_ejecucion_interrumpida_y_limite():
+    registro = Instrumentacion(activa=True, max_ejecuciones=3)
+    for i in range(5):
+        registro.iniciar_ejecucion(str(i))  # sin terminar: como tras st.rerun()
+    registro.terminar_ejecucion()
+    ejecuciones = registro.ejecuciones()
+    assert [e.etiqueta for e in ejecuciones] == ["4", "3", "2"]
+    assert [e.interrumpida for e in ejecuciones] == [False, True, True]
+    assert registro.total_ejecuciones == 5
+
+
+def test_exportaciones():
+    registro = Instrumentacion(activa=True)
+    registro.iniciar_ejecucion("a")
+    with registro.tramo('con "comillas"'):
+        registro.contar("filas_escritas", 2)
+    registro.terminar_ejecucion()
+    texto = registro.texto_prometheus()
+    assert 'aeropuerto_tramo_segundos_count{tramo="con \\"comillas\\""} 1' in texto
+    assert "aeropuerto_filas_escritas_total 2" in texto
+    assert "aeropuerto_ejecuciones_total 1" in texto
+    (linea,) = registro.registro_jsonl().splitlines()
+    assert json.loads(linea)["tramos"][0]["tramo"] == 'con "comillas"'
+    registro.reiniciar()
+    assert registro.totales() == {} and registro.total_ejecuciones == 0
+
+
+def test_contar_df():
+    registro = Instrumentacion(activa=True)
+    df = pd.DataFrame({"x": range(100)})
+    registro.contar_df("bytes_enviados", df)
+    assert registro.contadores()["bytes_enviados"] == int(df.memory_usage(deep=True).sum())
+
+
+def test_rutas_de_datos_instrumentadas(sembrado, monkeypatch):
+    registro = instrumentacion
+    monkeypatch.setattr(registro, "activa", True)
+    registro.reiniciar()
+    registro.iniciar_ejecucion()
+    leer_tabla("vuelos", sembrado)
+    registro.terminar_ejecucion()
+    registro.activa = False
+    assert registro.totales()["db.tabla.vuelos"]["veces"] == 1
+    assert registro.contadores()["filas_leidas"] == 400
+    registro.reiniciar()
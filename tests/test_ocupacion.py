@@ -0,0 +1,88 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from aeropuerto import ocupacion
+from aeropuerto.cache import cache_consultas
+
+
+@pytest.fixture
+def vuelos(pool):
+    # (fecha, origen, destino, capacidad, estado, registrados)
+    filas = [
+        ("2025-01-01", "MEX", "BOG", 2, "Completado", 3),
+        ("2025-01-01", "MEX", "BOG", 4, "Completado", 2),
+        ("2025-01-02", "BOG", "LIM", 5, "Cancelado", 0),
+        ("2025-01-09", "LIM", "MEX", 0, "Programado", 1),
+    ]
+    with pool.escritura() as conn:
+        for fecha, origen, destino, capacidad, estado, registrados in filas:
+            id_vuelo = conn.execute(
+                "INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) VALUES (?, ?, ?, ?, ?)",
+                (fecha, origen, destino, capacidad, estado),
+            ).lastrowid
+            conn.executemany("INSERT INTO pasajeros (vuelo_id, ticket, nombre, edad) VALUES (?, 'T', 'N', 30)",
+                             [(id_vuelo,)] * registrados)
+    return pool
+
+
+def test_por_vuelo(vuelos):
+    df = ocupacion.por_vuelo(orden="fecha")
+    assert df["id_vuelo"].tolist() == [4, 3, 1, 2]
+    assert df["registrados"].tolist() == [1, 0, 3, 2]
+    assert df["sobreventa"].tolist() == [1, 0, 1, 0]
+    assert df["factor_carga"].tolist()[1:] == [0.0, 1.5, 0.5]
+    # Sin capacidad no hay factor de carga.
+    assert pd.isna(df["factor_carga"].iloc[0])
+    sobrevendidos = ocupacion.por_vuelo(solo_sobrevendidos=True)
+    assert sobrevendidos["id_vuelo"].tolist() == [1, 4]
+
+
+def test_filtros(vuelos):
+    assert ocupacion.por_vuelo(desde=date(2025, 1, 2))["id_vuelo"].tolist() == [4, 3]
+    assert sorted(ocupacion.por_vuelo(aeropuertos=["LIM"])["id_vuelo"]) == [3, 4]
+    assert ocupacion.por_vuelo(estados=["Completado"], limite=1)["id_vuelo"].tolist() == [1]
+
+
+def test_por_ruta_y_periodo(vuelos):
+    rutas = ocupacion.por_ruta(min_vuelos=2)
+    assert rutas[["origen", "destino", "vuelos", "capacidad", "registrados"]].values.tolist() == [
+        ["MEX", "BOG", 2, 6, 5],
+    ]
+    assert rutas["factor_carga"].iloc[0] == pytest.approx(5 / 6)
+    semanas = ocupacion.por_periodo(resolucion="W")
+    assert semanas["vuelos"].tolist() == [3, 1]
+    assert semanas.index[0] == pd.Timestamp("2024-12-30")
+
+
+def test_resumen(vuelos):
+    assert ocupacion.resumen() == {
+        "vuelos": 4, "capacidad": 11, "registrados": 6, "factor_carga": pytest.approx(6 / 11),
+        "vuelos_sobrevendidos": 2, "plazas_sobrevendidas": 2, "vuelos_sin_pasajeros": 1,
+    }
+
+
+def test_resumen_sin_vuelos_ni_capacidad(vuelos):
+    # Filtro vacío: las sumas vienen NULL.
+    assert ocupacion.resumen(desde=date(2100, 1, 1)) == {
+        "vuelos": 0, "capacidad": 0, "registrados": 0, "factor_carga": None,
+        "vuelos_sobrevendidos": 0, "plazas_sobrevendidas": 0, "vuelos_sin_pasajeros": 0,
+    }
+    # Solo vuelos sin capacidad declarada: NULLIF deja el factor en NULL.
+    sin_capacidad = ocupacion.resumen(desde=date(2025, 1, 9))
+    assert (sin_capacidad["vuelos"], sin_capacidad["capacidad"], sin_capacidad["factor_carga"]) == (1, 0, None)
+
+
+def test_sigue_los_cambios_de_pasajeros(vuelos):
+    assert ocupacion.resumen()["registrados"] == 6
+    with vuelos.escritura() as conn:
+        conn.execute("DELETE FROM pasajeros WHERE vuelo_id = 1")
+    cache_consultas.invalidar("pasajeros")
+    assert ocupacion.resumen()["registrados"] == 3
+    assert ocupacion.por_vuelo(solo_sobrevendidos=True)["id_vuelo"].tolist() == [4]
+
+
+def test_linea_de_comandos(vuelos, capsys):
+    assert ocupacion.main(["--db", vuelos.ruta, "--por", "vuelo", "--sobrevendidos"]) == 0
+    assert "2 vuelos sobrevendidos" in capsys.readouterr().out
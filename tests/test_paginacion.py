@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from aeropuerto.consultas import Consulta, consulta_vuelos
+from aeropuerto.paginacion import contar_estimado, pagina_keyset
+
+ESTADOS = ["Programado", "Completado", "Cancelado"]
+
+
+@pytest.fixture
+def vuelos(pool):
+    rng = random.Random(3)
+    filas = [
+        (f"2025-01-{rng.randint(1, 28):02d}", rng.choice(["MEX", "GDL", "BOG"]), "LIM",
+         rng.randint(50, 60), rng.choice(ESTADOS))
+        for _ in range(237)
+    ]
+    with pool.escritura() as conn:
+        conn.executemany(
+            "INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) VALUES (?, ?, ?, ?, ?)", filas
+        )
+    return pool
+
+
+def _recorrer(consulta, **opciones):
+    paginas, cursor = [], None
+    while True:
+        df, cursor = pagina_keyset(consulta, "id_vuelo", cursor=cursor, **opciones)
+        paginas.append(df)
+        if cursor is None:
+            return paginas
+
+
+@pytest.mark.parametrize("orden", [None, "fecha", "num_pasajeros"])
+@pytest.mark.parametrize("descendente", [False, True])
+def test_paginas_recorren_todo_en_orden(vuelos, orden, descendente):
+    paginas = _recorrer(Consulta("vuelos"), orden=orden, descendente=descendente, tamano=40)
+    assert [len(p) for p in paginas] == [40] * 5 + [37]
+    ids = [i for p in paginas for i in p["id_vuelo"]]
+
+    completa = Consulta("vuelos").leer()
+    esperado = completa.sort_values([orden or "id_vuelo", "id_vuelo"], ascending=not descendente)
+    assert ids == esperado["id_vuelo"].tolist()
+
+
+@pytest.mark.parametrize("descendente", [False, True])
+def test_paginas_con_nulos_en_el_orden(vuelos, descendente):
+    with vuelos.escritura() as conn:
+        conn.execute("UPDATE vuelos SET num_pasajeros = NULL WHERE id_vuelo % 4 = 0")
+    paginas = _recorrer(Consulta("vuelos"), orden="num_pasajeros", descendente=descendente, tamano=9)
+    ids = [i for p in paginas for i in p["id_vuelo"]]
+    # Como SQLite: nulos primero en orden ascendente y al final en descendente.
+    completa = Consulta("vuelos").leer()
+    esperado = completa.sort_values(["num_pasajeros", "id_vuelo"], ascending=not descendente,
+                                    na_position="last" if descendente else "first")
+    assert ids == esperado["id_vuelo"].tolist()
+
+
+def test_paginas_respetan_los_filtros(vuelos):
+    consulta = consulta_vuelos(texto="mex", estado="Completado")
+    ids = [i for p in _recorrer(consulta, orden="fecha", tamano=7) for i in p["id_vuelo"]]
+    assert sorted(ids) == consulta.ordenar("id_vuelo").leer()["id_vuelo"].tolist()
+
+
+def test_ultima_pagina_exacta_no_tiene_siguiente(vuelos):
+    df, cursor = pagina_keyset(Consulta("vuelos").donde("id_vuelo <= ?", 20), "id_vuelo", tamano=20)
+    assert (len(df), cursor) == (20, None)
+
+
+def test_cursor_usa_tipos_de_python(vuelos):
+    _, cursor = pagina_keyset(Consulta("vuelos"), "id_vuelo", orden="num_pasajeros", tamano=5)
+    assert all(type(v) in (int, str) for v in cursor)
+
+
+def test_contar_estimado(vuelos):
+    assert contar_estimado(Consulta("vuelos"), "id_vuelo") == (237, "≈ 237")
+    filtrada = Consulta("vuelos").igual("origen", "MEX")
+    total = len(filtrada.leer())
+    assert contar_estimado(filtrada, "id_vuelo") == (total, f"{total:,}")
+    assert contar_estimado(filtrada, "id_vuelo", tope=10) == (10, "10+")
@@ -0,0 +1,188 @@
+import os
+import threading
+import uuid
+import warnings
+from urllib.parse import urlsplit
+
+import pandas as pd
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+from aeropuerto import registros  # noqa: E402
+from aeropuerto.cache import cache_consultas  # noqa: E402
+from aeropuerto.columnar import leer_tabla  # noqa: E402
+from aeropuerto.conexion import VARIABLE_RUTA_DB, cerrar_pools, get_pool, resolver_destino  # noqa: E402
+from aeropuerto.consultas import Consulta  # noqa: E402
+from aeropuerto.escritura import cerrar_colas, get_cola  # noqa: E402
+from aeropuerto.esquema import crear_esquema  # noqa: E402
+from aeropuerto.instantaneas import almacen_instantaneas  # noqa: E402
+from aeropuerto.notificaciones import VARIABLE_INTERVALO, CanalCambios  # noqa: E402
+from aeropuerto.paginacion import pagina_keyset  # noqa: E402
+from aeropuerto.postgres import PoolPostgres, adaptar_sql  # noqa: E402
+
+# URL de un servidor PostgreSQL para las pruebas; sin ella se levanta uno local con pgserver.
+VARIABLE_SERVIDOR = "AEROPUERTO_PG_PRUEBA"
+
+# ConexionPostgres imita a sqlite3; pytest restablece el filtro que pone aeropuerto/postgres.py.
+pytestmark = pytest.mark.filterwarnings("ignore:pandas only supports SQLAlchemy:UserWarning")
+
+
+@pytest.fixture(scope="module")
+def servidor(tmp_path_factory):
+    url = os.environ.get(VARIABLE_SERVIDOR)
+    if url:
+        yield url
+        return
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # platformdirs avisa si falta XDG_RUNTIME_DIR
+        pgserver = pytest.importorskip("pgserver")
+    local = pgserver.get_server(str(tmp_path_factory.mktemp("pg")), cleanup_mode="stop")
+    yield local.get_uri()
+    local.cleanup()
+
+
+@pytest.fixture
+def pg(servidor, monkeypatch):
+    """Pool de una base PostgreSQL nueva con el esquema creado, apuntada con AEROPUERTO_DB."""
+    nombre = f"prueba_{uuid.uuid4().hex[:12]}"
+    with psycopg.connect(servidor, autocommit=True) as admin:
+        admin.execute(f"CREATE DATABASE {nombre}")
+    monkeypatch.setenv(VARIABLE_RUTA_DB, urlsplit(servidor)._replace(path=f"/{nombre}").geturl())
+    monkeypatch.setenv(VARIABLE_INTERVALO, "0")
+    cache_consultas.limpiar()
+    cache_consultas.invalidar()
+    almacen_instantaneas.invalidar()
+    pool = get_pool()
+    with pool.escritura() as conn:
+        crear_esquema(conn)
+    yield pool
+    cerrar_colas()
+    almacen_instantaneas.invalidar()
+    cerrar_pools()
+    with psycopg.connect(servidor, autocommit=True) as admin:
+        admin.execute(f"DROP DATABASE {nombre} WITH (FORCE)")
+
+
+def _sembrar(pool, vuelos=60):
+    with pool.escritura() as conn:
+        conn.executemany(
+            "INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) VALUES (?, ?, ?, ?, ?)",
+            [(None if i % 10 == 0 else f"2025-01-{i % 28 + 1:02d}", "MEX" if i % 2 else "BOG", "GDL", i,
+              "Completado" if i % 3 else "Cancelado") for i in range(vuelos)],
+        )
+        conn.executemany(
+            "INSERT INTO pasajeros (vuelo_id, ticket, nombre, edad) VALUES (?, ?, ?, ?)",
+            [(i % vuelos + 1, f"TCK-{i}", f"Pasajero {i}", 20 + i % 50) for i in range(3 * vuelos)],
+        )
+
+
+def test_adaptar_sql():
+    assert adaptar_sql("SELECT * FROM t WHERE a LIKE ? AND b % 2 = 0 AND c = '50%?'") == (
+        "SELECT * FROM t WHERE a ILIKE %s AND b %% 2 = 0 AND c = '50%%?'"
+    )
+
+
+def test_get_pool_resuelve_postgres(pg):
+    url = os.environ[VARIABLE_RUTA_DB]
+    assert isinstance(pg, PoolPostgres) and get_pool(url) is pg
+    assert resolver_destino(url.replace("postgresql://", "postgres://", 1))[0] is PoolPostgres
+    ok, mensaje = pg.salud()
+    assert ok and "PostgreSQL" in mensaje
+    # El esquema se puede volver a crear sin error.
+    with pg.escritura() as conn:
+        crear_esquema(conn)
+    with pg.lectura() as conn:
+        assert sorted(f[0] for f in conn.execute("SELECT tabla FROM versiones_datos")) == [
+            "pasajeros", "pasajeros_transito", "vuelos",
+        ]
+
+
+def test_lectura_y_escritura(pg):
+    with pg.escritura() as conn:
+        id_vuelo = conn.execute("INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) "
+                                "VALUES (?, 'MEX', 'BOG', 10, 'Programado')", ("2025-03-01",)).lastrowid
+    with pytest.raises(RuntimeError):
+        with pg.escritura() as conn:
+            conn.execute("DELETE FROM vuelos")
+            raise RuntimeError("fallo a mitad")
+    with pg.lectura() as conn:
+        assert conn.execute("SELECT id_vuelo, fecha FROM vuelos").fetchall() == [(id_vuelo, "2025-03-01")]
+        with pytest.raises(pg.Error):
+            conn.execute("DELETE FROM vuelos")
+    # LIKE no distingue mayúsculas, como en SQLite.
+    assert len(Consulta("vuelos").contiene(["origen"], "me").leer()) == 1
+    assert pg.metricas()["rollbacks"] == 1
+
+
+def test_sentencias_preparadas(pg):
+    sql = "SELECT COUNT(*) FROM vuelos WHERE origen = ?"
+    with pg.lectura() as conn:
+        conn.execute(sql, ("MEX",)).fetchone()
+    # El lector vuelve al pool y el siguiente préstamo es la misma sesión, con la sentencia preparada.
+    with pg.lectura() as conn:
+        conn.execute(sql, ("BOG",)).fetchone()
+        preparadas = dict(conn.execute("SELECT statement, generic_plans + custom_plans "
+                                       "FROM pg_prepared_statements").fetchall())
+    assert preparadas["SELECT COUNT(*) FROM vuelos WHERE origen = $1"] == 2
+
+
+def test_cola_de_escritura(pg):
+    id_vuelo = registros.registrar_vuelo("2025-02-01", "gdl", "mex", 3, pool=pg).result(5)
+    bueno = registros.registrar_pasajero(id_vuelo, "t-1", "Ana", 30, pool=pg)
+    malo = get_cola(pg).encolar("INSERT INTO vuelos (no_existe) VALUES (?)", (1,))
+    assert bueno.result(5) > 0
+    with pytest.raises(pg.Error):
+        malo.result(5)
+    with pg.lectura() as conn:
+        assert conn.execute("SELECT v.origen, p.ticket FROM pasajeros p JOIN vuelos v ON v.id_vuelo = p.vuelo_id "
+                            "WHERE v.id_vuelo = ?", (id_vuelo,)).fetchone() == ("GDL", "T-1")
+
+
+def test_paginas_con_nulos(pg):
+    _sembrar(pg)
+    esperado = leer_tabla("vuelos", pg).sort_values(["fecha", "id_vuelo"], ascending=False, na_position="last")
+    vistos, cursor = [], None
+    while True:
+        df, cursor = pagina_keyset(Consulta("vuelos"), "id_vuelo", orden="fecha", descendente=True,
+                                   tamano=7, cursor=cursor)
+        vistos += df["id_vuelo"].tolist()
+        if cursor is None:
+            break
+    assert vistos == esperado["id_vuelo"].tolist()
+
+
+def test_instantaneas_con_delta(pg):
+    _sembrar(pg)
+    antes = almacen_instantaneas.obtener("vuelos", pg)
+    assert str(antes["fecha"].dtype).startswith("datetime64") and str(antes["estado"].dtype) == "category"
+    with pg.escritura() as conn:
+        conn.execute("UPDATE vuelos SET estado = 'Programado' WHERE id_vuelo % 7 = 0")
+        conn.execute("DELETE FROM vuelos WHERE id_vuelo % 11 = 0")
+        conn.execute("INSERT INTO vuelos (fecha, origen, destino, num_pasajeros, estado) "
+                     "VALUES ('2025-04-01', 'MEX', 'BOG', 1, 'Programado')")
+    assert almacen_instantaneas.sincronizar(pg) == ["vuelos"]
+    deltas = almacen_instantaneas.deltas
+    despues = almacen_instantaneas.obtener("vuelos", pg)
+    assert almacen_instantaneas.deltas == deltas + 1
+    pd.testing.assert_frame_equal(despues.astype(object), leer_tabla("vuelos", pg).astype(object))
+
+
+def test_canal_avisa_con_notify(pg):
+    canal = CanalCambios(pg, intervalo=0.05, recargar=False)
+    avisos = []
+    recibido = threading.Event()
+    canal.suscribir(lambda tablas: (avisos.append(tablas), recibido.set()))
+    canal.iniciar()
+    try:
+        # Conexión propia, como la de otro proceso; se escribe hasta que el canal esté escuchando.
+        with psycopg.connect(os.environ[VARIABLE_RUTA_DB], autocommit=True) as externa:
+            for _ in range(100):
+                externa.execute("INSERT INTO pasajeros_transito (fecha, aeropuerto, num_pasajeros) "
+                                "VALUES ('2025-01-01', 'MEX', 3)")
+                if recibido.wait(0.1):
+                    break
+    finally:
+        canal.detener(5)
+    assert recibido.is_set() and "pasajeros_transito" in avisos[0]
+    assert canal.metricas()["errores"] == 0
@@ -0,0 +1,36 @@
+from datetime import date
+
+import pytest
+
+from aeropuerto import registros
+
+ESPERA_S = 10
+
+
+def test_altas_normalizan_los_campos(pool):
+    id_vuelo = registros.registrar_vuelo(date(2025, 1, 1), " mex ", "bog", "10", pool=pool).result(ESPERA_S)
+    id_pasajero = registros.registrar_pasajero(id_vuelo, "t-001", " Ana Pérez ", 30, pool=pool).result(ESPERA_S)
+    id_transito = registros.registrar_transito("2025-01-02", "lim", 7, pool=pool).result(ESPERA_S)
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT fecha, origen, destino, num_pasajeros, estado FROM vuelos WHERE id_vuelo = ?",
+                            (id_vuelo,)).fetchone() == ("2025-01-01", "MEX", "BOG", 10, "Programado")
+        assert conn.execute("SELECT vuelo_id, ticket, nombre, edad FROM pasajeros WHERE id_pasajero = ?",
+                            (id_pasajero,)).fetchone() == (id_vuelo, "T-001", "Ana Pérez", 30)
+        assert conn.execute("SELECT aeropuerto FROM pasajeros_transito WHERE id_transito = ?",
+                            (id_transito,)).fetchone() == ("LIM",)
+
+
+@pytest.mark.parametrize("llamada, mensaje", [
+    (lambda: registros.registrar_vuelo("2025-01-01", "MEX", "BOG", estado="Retrasado"), "Estado no válido"),
+    (lambda: registros.registrar_vuelo("2025-13-01", "MEX", "BOG"), "month"),
+    (lambda: registros.registrar_vuelo("2025-01-01", " ", "BOG"), "Origen es obligatorio"),
+    (lambda: registros.registrar_vuelo("2025-01-01", "MEX", "BOG", num_pasajeros="x"), "número entero"),
+    (lambda: registros.registrar_pasajero(0, "T", "Ana", 30), "Vuelo fuera de rango"),
+    (lambda: registros.registrar_pasajero(1, "T", "Ana", 121), "Edad fuera de rango"),
+    (lambda: registros.registrar_transito("2025-01-01", "MEX", -1), "fuera de rango"),
+])
+def test_validacion_antes_de_encolar(pool, llamada, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        llamada()
+    with pool.lectura() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM vuelos").fetchone() == (0,)
@@ -0,0 +1,154 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from aeropuerto import resumenes
+from aeropuerto.cache import cache_consultas
+from aeropuerto.columnar import leer_tabla
+
+SERIES = {"serie_vuelos": ["total", "num_pasajeros"], "serie_transito": ["registros", "num_pasajeros"]}
+
+
+def _tabla(pool, tabla):
+    """Filas con algún contador distinto de 0 (los triggers dejan a 0 los grupos vaciados)."""
+    with pool.lectura() as conn:
+        df = pd.read_sql_query(f"SELECT * FROM {tabla}", conn)
+    contadores = [c for c in df.columns if c in ("total", "registros", "num_pasajeros", "valor", "registrados")]
+    df = df[(df[contadores] != 0).any(axis=1)]
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def _tablas_resumen():
+    return list(dict.fromkeys(r for lista in resumenes.RESUMENES.values() for r, _, _ in lista))
+
+
+def _modificar(pool):
+    # Altas, cambios de fecha/estado/aeropuerto, claves NULL y bajas: ejercitan los tres triggers.
+    with pool.escritura() as conn:
+        conn.execute("UPDATE vuelos SET fecha = date(fecha, '-40 days'), estado = 'Cancelado' WHERE id_vuelo % 7 = 0")
+        conn.execute("UPDATE vuelos SET origen = 'MEX' WHERE id_vuelo % 11 = 0")
+        conn.execute("UPDATE vuelos SET estado = NULL WHERE id_vuelo % 17 = 0")
+        conn.execute("DELETE FROM pasajeros WHERE vuelo_id % 13 = 0")
+        conn.execute("DELETE FROM vuelos WHERE id_vuelo % 13 = 0")
+        conn.execute("UPDATE pasajeros_transito SET fecha = date(fecha, '+3 days'), num_pasajeros = 5 "
+                     "WHERE id_transito % 5 = 0")
+        conn.execute("UPDATE pasajeros_transito SET num_pasajeros = NULL WHERE id_transito % 8 = 0")
+        conn.execute("DELETE FROM pasajeros_transito WHERE id_transito % 9 = 0")
+        conn.execute("UPDATE pasajeros SET edad = NULL WHERE id_pasajero % 19 = 0")
+        conn.execute("UPDATE pasajeros SET vuelo_id = NULL WHERE id_pasajero % 23 = 0")
+
+
+@pytest.mark.parametrize("modificar", [False, True])
+def test_triggers_coinciden_con_reconstruir(sembrado, modificar):
+    if modificar:
+        _modificar(sembrado)
+    mantenidas = {tabla: _tabla(sembrado, tabla) for tabla in _tablas_resumen()}
+    with sembrado.escritura() as conn:
+        resumenes.reconstruir(conn)
+    for tabla in _tablas_resumen():
+        pd.testing.assert_frame_equal(_tabla(sembrado, tabla), mantenidas[tabla], obj=tabla)
+
+
+def test_claves_nulas_con_centinela_de_su_tipo(pool):
+    with pool.escritura() as conn:
+        conn.execute("INSERT INTO pasajeros (vuelo_id, ticket, nombre, edad) VALUES (NULL, 'T-1', 'Ana', NULL)")
+        conn.execute("INSERT INTO pasajeros_transito (fecha, aeropuerto, num_pasajeros) VALUES ('2025-01-01', NULL, 3)")
+    for reconstruido in (False, True):
+        if reconstruido:
+            with pool.escritura() as conn:
+                resumenes.reconstruir(conn)
+        with pool.lectura() as conn:
+            # Una clave entera NULL no se guarda como '' (texto) en una columna INTEGER.
+            assert conn.execute("SELECT vuelo_id, typeof(vuelo_id) FROM resumen_pasajeros_vuelo").fetchall() == [
+                (-1, "integer")]
+            assert conn.execute("SELECT vuelo_id, edad FROM resumen_edades_vuelo").fetchall() == [(-1, -1)]
+            assert conn.execute("SELECT edad, total FROM resumen_edades").fetchall() == [(-1, 1)]
+            assert conn.execute("SELECT origen, destino, edad FROM resumen_edades_ruta").fetchall() == [("", "", -1)]
+            assert conn.execute("SELECT aeropuerto FROM resumen_transito_aeropuerto").fetchall() == [("",)]
+
+
+def test_lecturas_del_dashboard(sembrado):
+    _modificar(sembrado)
+    cache_consultas.invalidar()
+    with sembrado.lectura() as conn:
+        vuelos = pd.read_sql_query("SELECT * FROM vuelos", conn)
+        transito = pd.read_sql_query("SELECT * FROM pasajeros_transito", conn)
+        pasajeros = conn.execute("SELECT COUNT(*) FROM pasajeros").fetchone()[0]
+    assert resumenes.kpis_dashboard() == {
+        "total_vuelos": len(vuelos),
+        "vuelos_completados": int((vuelos["estado"] == "Completado").sum()),
+        "total_pasajeros_reg": pasajeros,
+        "total_pasajeros_trans": int(transito["num_pasajeros"].sum()),
+    }
+    por_estado = vuelos["estado"].fillna("").value_counts().sort_index()
+    assert resumenes.vuelos_por_estado().to_dict() == por_estado.to_dict()
+    origenes = vuelos["origen"].value_counts()
+    assert resumenes.top_origenes(3).tolist() == sorted(origenes, reverse=True)[:3]
+
+
+def test_reconstruir_conserva_todas_las_resoluciones(sembrado):
+    with sembrado.escritura() as conn:
+        resumenes.reconstruir(conn)
+    for tabla, contadores in SERIES.items():
+        with sembrado.lectura() as conn:
+            sumas = dict(conn.execute(
+                f"SELECT resolucion, SUM({contadores[0]}) FROM {tabla} GROUP BY resolucion"
+            ).fetchall())
+        # Cada resolución reparte todas las filas de hechos.
+        assert set(sumas) == set(resumenes.RESOLUCIONES), tabla
+        assert len(set(sumas.values())) == 1, tabla
+
+
+def test_rango_series(sembrado):
+    vuelos = leer_tabla("vuelos", sembrado)
+    transito = leer_tabla("pasajeros_transito", sembrado)
+    fechas = pd.concat([vuelos["fecha"], transito["fecha"]])
+    esperado = (fechas.min().date(), fechas.max().date())
+    assert resumenes.rango_series() == esperado
+    with sembrado.escritura() as conn:
+        resumenes.reconstruir(conn)
+    cache_consultas.invalidar()
+    assert resumenes.rango_series() == esperado
+
+
+def test_rango_series_vacio(pool):
+    assert resumenes.rango_series() is None
+
+
+@pytest.mark.parametrize("resolucion", list(resumenes.RESOLUCIONES))
+def test_serie_vuelos_por_resolucion(sembrado, resolucion):
+    vuelos = leer_tabla("vuelos", sembrado)
+    desde, hasta = date(2024, 3, 1), date(2024, 12, 31)
+    serie, usada = resumenes.serie_vuelos(desde, hasta, resolucion=resolucion)
+    assert usada == resolucion
+    # Cubetas completas: cuenta todo vuelo cuya cubeta empieza dentro del rango.
+    cubetas = vuelos["fecha"].dt.date.map(lambda f: resumenes.inicio_cubeta(f, resolucion))
+    en_rango = vuelos[(cubetas >= resumenes.inicio_cubeta(desde, resolucion)) & (cubetas <= hasta)]
+    assert serie["total"].sum() == len(en_rango)
+    assert serie["num_pasajeros"].sum() == en_rango["num_pasajeros"].sum()
+    assert serie.index.is_monotonic_increasing
+
+
+def test_serie_transito_por_aeropuerto(sembrado):
+    transito = leer_tabla("pasajeros_transito", sembrado)
+    desde, hasta = transito["fecha"].min().date(), transito["fecha"].max().date()
+    serie, usada = resumenes.serie_transito(desde, hasta, por="aeropuerto")
+    assert usada == resumenes.elegir_resolucion(desde, hasta)
+    esperado = transito.groupby("aeropuerto", observed=True)["num_pasajeros"].sum()
+    assert serie.sum().sort_index().to_dict() == esperado.sort_index().to_dict()
+
+
+def test_elegir_resolucion():
+    assert resumenes.elegir_resolucion(date(2025, 1, 1), date(2025, 3, 1)) == "D"
+    assert resumenes.elegir_resolucion(date(2024, 1, 1), date(2025, 12, 31)) == "W"
+    assert resumenes.elegir_resolucion(date(2010, 1, 1), date(2025, 12, 31)) == "M"
+
+
+def test_linea_de_comandos_reconstruye(sembrado, capsys):
+    with sembrado.escritura() as conn:
+        conn.execute("DELETE FROM resumen_vuelos_estado")
+    assert resumenes.main(["--db", sembrado.ruta]) == 0
+    assert "Resúmenes reconstruidos" in capsys.readouterr().out
+    with sembrado.lectura() as conn:
+        assert conn.execute("SELECT SUM(total) FROM resumen_vuelos_estado").fetchone() == (400,)
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+import secciones
+from aeropuerto.instantaneas import almacen_instantaneas
+from secciones import comun
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cada_seccion_declara_sus_datos():
+    for opcion in secciones.SECCIONES:
+        seccion = secciones.cargar(opcion)
+        assert isinstance(seccion.DATOS, dict)
+        assert callable(seccion.mostrar)
+
+
+def test_datos_carga_solo_lo_declarado_al_pedirlo(sembrado):
+    datos = comun.Datos({"pasajeros": ["id_pasajero", "edad"]})
+    assert almacen_instantaneas.en_memoria() == {}
+    df = datos["pasajeros"]
+    assert list(df.columns) == ["id_pasajero", "edad"]
+    assert datos["pasajeros"] is df
+    assert set(almacen_instantaneas.en_memoria()) == {"pasajeros"}
+    with pytest.raises(KeyError):
+        datos["vuelos"]
+
+
+@pytest.mark.parametrize("opcion", list(secciones.SECCIONES))
+def test_secciones_se_dibujan_sin_errores(sembrado, opcion):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    app = testing.AppTest.from_file(os.path.join(RAIZ, "app.py"), default_timeout=60)
+    app.run()
+    app.sidebar.radio[0].set_value(opcion).run()
+    assert not app.exception, [e.message for e in app.exception]
+    assert not app.error, [e.value for e in app.error]
+    # Solo quedan en memoria las tablas que la sección declara.
+    assert set(almacen_instantaneas.en_memoria()) <= set(secciones.cargar(opcion).DATOS)
+
+
+def test_busqueda_avanzada_pagina_sin_cargar_pasajeros(sembrado):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    app = testing.AppTest.from_file(os.path.join(RAIZ, "app.py"), default_timeout=60)
+    app.run()
+    app.sidebar.radio[0].set_value("👤 Gestión de Pasajeros").run()
+    app.text_input(key="busqueda_avanzada").set_value("ma").run()
+    assert not app.exception, [e.message for e in app.exception]
+    (metrica,) = [m for m in app.metric if m.label == "Pasajeros Encontrados"]
+    encontrados = int(metrica.value.replace(",", ""))
+    assert encontrados > 50
+    # Solo se envía la página visible (50 filas por defecto), no todos los que coinciden.
+    assert max(len(df.value) for df in app.dataframe) == 50
+    assert "pasajeros" not in almacen_instantaneas.en_memoria()